@@ -4,6 +4,7 @@ from contextlib import contextmanager
 from datetime import datetime
 from itertools import chain
 from typing import (
+    AbstractSet,
     Optional,
     Tuple,
     Callable,
@@ -35,7 +36,12 @@ from dbt.adapters.protocol import (
     AdapterConfig,
     ConnectionManagerProtocol,
 )
-from dbt.clients.agate_helper import empty_table, merge_tables, table_from_rows
+from dbt.clients.agate_helper import (
+    cast_columns_to_text,
+    empty_table,
+    merge_tables,
+    SeedFile,
+)
 from dbt.clients.jinja import MacroGenerator
 from dbt.contracts.graph.compiled import CompileResultNode, CompiledSeedNode
 from dbt.contracts.graph.manifest import Manifest, MacroManifest
@@ -43,7 +49,7 @@ from dbt.contracts.graph.parsed import ParsedSeedNode
 from dbt.exceptions import warn_or_error
 from dbt.events.functions import fire_event
 from dbt.events.types import CacheMiss, ListRelations
-from dbt.utils import filter_null_values, executor
+from dbt.utils import filter_null_values, executor, lowercase
 
 from dbt.adapters.base.connections import Connection, AdapterResponse
 from dbt.adapters.base.meta import AdapterMeta, available
@@ -62,6 +68,7 @@ SeedModel = Union[ParsedSeedNode, CompiledSeedNode]
 
 GET_CATALOG_MACRO_NAME = "get_catalog"
 FRESHNESS_MACRO_NAME = "collect_freshness"
+FRESHNESS_BATCH_MACRO_NAME = "collect_freshness_batch"
 
 
 def _expect_row_value(key: str, row: agate.Row):
@@ -85,7 +92,9 @@ def _catalog_filter_schemas(manifest: Manifest) -> Callable[[agate.Row], bool]:
         # be filtered out
         if table_schema is None:
             return False
-        return (table_database.lower(), table_schema.lower()) in schemas
+        # the rows are filtered before their names are cast to text, so a
+        # name like '1234' may still be a number here
+        return (str(table_database).lower(), str(table_schema).lower()) in schemas
 
     return test
 
@@ -114,6 +123,25 @@ def _utc(dt: Optional[datetime], source: BaseRelation, field_name: str) -> datet
         return dt.replace(tzinfo=pytz.UTC)
 
 
+def _freshness(
+    source: BaseRelation, loaded_at_field: str, max_loaded_at: Any, snapshotted_at: Any
+) -> Dict[str, Any]:
+    if max_loaded_at is None:
+        # no records in the table, so really the max_loaded_at was
+        # infinitely long ago. Just call it 0:00 January 1 year UTC
+        max_loaded_at = datetime(1, 1, 1, 0, 0, 0, tzinfo=pytz.UTC)
+    else:
+        max_loaded_at = _utc(max_loaded_at, source, loaded_at_field)
+
+    snapshotted_at = _utc(snapshotted_at, source, loaded_at_field)
+    age = (snapshotted_at - max_loaded_at).total_seconds()
+    return {
+        "max_loaded_at": max_loaded_at,
+        "snapshotted_at": snapshotted_at,
+        "age": age,
+    }
+
+
 def _relation_name(rel: Optional[BaseRelation]) -> str:
     if rel is None:
         return "null relation"
@@ -858,6 +886,31 @@ class BaseAdapter(metaclass=AdapterMeta):
 
         return None
 
+    ###
+    # Methods about loading seeds
+    ###
+    @available
+    @classmethod
+    def supports_seed_streaming(cls) -> bool:
+        """Whether this adapter implements load_seed_rows. If it does, the
+        seed materialization streams the seeds configured with `stream: true`
+        into their tables with it, rather than reading each file into an
+        agate table and inserting its rows with the load_csv_rows macro.
+        """
+        return False
+
+    @available
+    def load_seed_rows(self, relation: BaseRelation, columns_sql: str, seed_file: SeedFile) -> int:
+        """Insert the rows of a seed file into an existing table.
+
+        :param relation: The table to load.
+        :param columns_sql: The quoted, comma-separated column names.
+        :param seed_file: The seed file, whose `batches()` iterates over its
+            rows in batches, cast to the column types.
+        :return: The number of rows loaded.
+        """
+        raise NotImplementedException("`load_seed_rows` is not implemented for this adapter!")
+
     ###
     # Operations involving the manifest
     ###
@@ -930,13 +983,10 @@ class BaseAdapter(metaclass=AdapterMeta):
         """Filter the table as appropriate for catalog entries. Subclasses can
         override this to change filtering rules on a per-adapter basis.
         """
-        # force database + schema to be strings
-        table = table_from_rows(
-            table.rows,
-            table.column_names,
-            text_only_columns=["table_database", "table_schema", "table_name"],
-        )
-        return table.where(_catalog_filter_schemas(manifest))
+        table = table.where(_catalog_filter_schemas(manifest))
+        # force database + schema + name to be strings, in the rows that are
+        # left
+        return cast_columns_to_text(table, ["table_database", "table_schema", "table_name"])
 
     def _get_one_catalog(
         self,
@@ -976,6 +1026,40 @@ class BaseAdapter(metaclass=AdapterMeta):
 
         return catalogs, exceptions
 
+    def iter_catalogs(
+        self,
+        manifest: Manifest,
+        exceptions: List[Exception],
+        exclude: AbstractSet[Tuple[Optional[str], Optional[str]]] = frozenset(),
+    ) -> Iterator[Tuple[InformationSchema, Optional[str], agate.Table]]:
+        """Like get_catalog, but run one catalog query per schema, and yield
+        each schema's table as soon as its query finishes instead of merging
+        them all, so the caller can process and drop it. Schemas whose
+        lowercased (database, schema) pair is in `exclude` aren't queried.
+        Exceptions are collected in `exceptions`, as get_catalog returns them.
+        """
+        schema_map = self._get_catalog_schemas(manifest)
+
+        with executor(self.config) as tpe:
+            pending: Dict[Future[agate.Table], Tuple[InformationSchema, Optional[str]]] = {}
+            for info, schema in schema_map.search():
+                if (lowercase(info.database), schema) in exclude:
+                    continue
+                name = ".".join([str(info.database), "information_schema"])
+                fut = tpe.submit_connected(
+                    self, name, self._get_one_catalog, info, {schema}, manifest
+                )
+                pending[fut] = (info, schema)
+
+            # as_completed lets go of each future once it's yielded it, so
+            # once `pending` has too, a schema's table is only kept until
+            # the caller is done with it
+            for future in as_completed(list(pending)):
+                info, schema = pending.pop(future)
+                catalog = _catalog_result(future, exceptions)
+                if catalog is not None:
+                    yield info, schema, catalog
+
     def cancel_open_connections(self):
         """Cancel all open connections."""
         return self.connections.cancel_open()
@@ -1004,20 +1088,39 @@ class BaseAdapter(metaclass=AdapterMeta):
                     FRESHNESS_MACRO_NAME, [tuple(r) for r in table]
                 )
             )
-        if table[0][0] is None:
-            # no records in the table, so really the max_loaded_at was
-            # infinitely long ago. Just call it 0:00 January 1 year UTC
-            max_loaded_at = datetime(1, 1, 1, 0, 0, 0, tzinfo=pytz.UTC)
-        else:
-            max_loaded_at = _utc(table[0][0], source, loaded_at_field)
+        return _freshness(source, loaded_at_field, table[0][0], table[0][1])
 
-        snapshotted_at = _utc(table[0][1], source, loaded_at_field)
-        age = (snapshotted_at - max_loaded_at).total_seconds()
-        return {
-            "max_loaded_at": max_loaded_at,
-            "snapshotted_at": snapshotted_at,
-            "age": age,
+    def calculate_freshness_batch(
+        self,
+        sources: List[Tuple[BaseRelation, str, Optional[str]]],
+        manifest: Optional[Manifest] = None,
+    ) -> List[Dict[str, Any]]:
+        """Calculate the freshness of several sources, given as (relation,
+        loaded_at_field, filter), in one query. The results are in the same
+        order as the sources, as calculate_freshness returns them. Adapters
+        that can get the freshness of tables from warehouse metadata instead
+        can override this.
+        """
+        kwargs: Dict[str, Any] = {
+            "sources": [
+                {"relation": relation, "loaded_at_field": loaded_at_field, "filter": filter}
+                for relation, loaded_at_field, filter in sources
+            ],
         }
+        table = self.execute_macro(FRESHNESS_BATCH_MACRO_NAME, kwargs=kwargs, manifest=manifest)
+        # one row, of the current time according to the db and then the
+        # maximum `loaded_at_field` value of each source
+        if len(table) != 1 or len(table[0]) != len(sources) + 1:
+            raise_compiler_error(
+                'Got an invalid result from "{}" macro: {}'.format(
+                    FRESHNESS_BATCH_MACRO_NAME, [tuple(r) for r in table]
+                )
+            )
+        row = table[0]
+        return [
+            _freshness(relation, loaded_at_field, max_loaded_at, row[0])
+            for (relation, loaded_at_field, _), max_loaded_at in zip(sources, row[1:])
+        ]
 
     def pre_model_hook(self, config: Mapping[str, Any]) -> Any:
         """A hook for running some operation before the model materialization
@@ -1150,15 +1253,24 @@ def catch_as_completed(
     exceptions: List[Exception] = []
 
     for future in as_completed(futures):
-        exc = future.exception()
-        # we want to re-raise on ctrl+c and BaseException
-        if exc is None:
-            catalog = future.result()
+        catalog = _catalog_result(future, exceptions)
+        if catalog is not None:
             tables.append(catalog)
-        elif isinstance(exc, KeyboardInterrupt) or not isinstance(exc, Exception):
-            raise exc
-        else:
-            warn_or_error(f"Encountered an error while generating catalog: {str(exc)}")
-            # exc is not None, derives from Exception, and isn't ctrl+c
-            exceptions.append(exc)
     return merge_tables(tables), exceptions
+
+
+def _catalog_result(
+    future,  # typing: Future[agate.Table]
+    exceptions: List[Exception],
+) -> Optional[agate.Table]:
+    exc = future.exception()
+    # we want to re-raise on ctrl+c and BaseException
+    if exc is None:
+        return future.result()
+    elif isinstance(exc, KeyboardInterrupt) or not isinstance(exc, Exception):
+        raise exc
+    else:
+        warn_or_error(f"Encountered an error while generating catalog: {str(exc)}")
+        # exc is not None, derives from Exception, and isn't ctrl+c
+        exceptions.append(exc)
+        return None
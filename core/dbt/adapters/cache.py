@@ -1,6 +1,7 @@
 import threading
+from contextlib import contextmanager
 from copy import deepcopy
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from dbt.adapters.reference_keys import _make_key, _ReferenceKey
 import dbt.exceptions
@@ -32,6 +33,73 @@ def dot_separated(key: _ReferenceKey) -> str:
     return ".".join(map(str, key))
 
 
+_SchemaKey = Tuple[Optional[str], Optional[str]]
+
+
+class _ReadWriteLock:
+    """A lock that many threads can hold for reading at once, or one thread
+    for writing. Writing is reentrant, and the writing thread may also read.
+    Waiting writers block new readers, so reads can't be nested.
+
+    Using the lock itself as a context manager (`with lock:`) or calling
+    acquire() and release() takes it for writing, like an RLock.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    def acquire(self) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return True
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = me
+            self._writer_depth = 1
+        return True
+
+    def release(self) -> None:
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            # the writer already excludes everyone else
+            reading = self._writer != threading.get_ident()
+            if reading:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            if reading:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+
 class _CachedRelation:
     """Nothing about _CachedRelation is guaranteed to be thread-safe!
 
@@ -39,12 +107,16 @@ class _CachedRelation:
     :attr str identifier: The identifier of this relation.
     :attr Dict[_ReferenceKey, _CachedRelation] referenced_by: The relations
         that refer to this relation.
+    :attr Set[_ReferenceKey] references: The keys of the relations this
+        relation refers to, the reverse of their referenced_by.
     :attr BaseRelation inner: The underlying dbt relation.
     """
 
     def __init__(self, inner):
         self.referenced_by = {}
+        self.references = set()
         self.inner = inner
+        self._key = _make_key(self)
 
     def __str__(self) -> str:
         return ("_CachedRelation(database={}, schema={}, identifier={}, inner={})").format(
@@ -81,7 +153,10 @@ class _CachedRelation:
 
         :return _ReferenceKey: A key for this relation.
         """
-        return _make_key(self)
+        return self._key
+
+    def schema_key(self) -> _SchemaKey:
+        return (self._key.database, self._key.schema)
 
     def add_reference(self, referrer: "_CachedRelation"):
         """Add a reference from referrer to self, indicating that if this node
@@ -90,6 +165,7 @@ class _CachedRelation:
         :param _CachedRelation referrer: The node that refers to this node.
         """
         self.referenced_by[referrer.key()] = referrer
+        referrer.references.add(self.key())
 
     def collect_consequences(self):
         """Recursively collect a set of _ReferenceKeys that would
@@ -132,6 +208,7 @@ class _CachedRelation:
                 "identifier": new_relation.inner.identifier,
             },
         )
+        self._key = _make_key(self)
 
     def rename_key(self, old_key, new_key):
         """Rename a reference that may or may not exist. Only handles the
@@ -168,14 +245,17 @@ class RelationsCache:
     declared between tables and handles renames/drops as a real database would.
 
     :attr Dict[_ReferenceKey, _CachedRelation] relations: The known relations.
-    :attr threading.RLock lock: The lock around relations, held during updates.
-        The adapters also hold this lock while filling the cache.
+    :attr _ReadWriteLock lock: The lock around relations, held for writing
+        during updates and for reading during lookups. The adapters also hold
+        this lock while filling the cache.
     :attr Set[str] schemas: The set of known/cached schemas, all lowercased.
     """
 
     def __init__(self) -> None:
         self.relations: Dict[_ReferenceKey, _CachedRelation] = {}
-        self.lock = threading.RLock()
+        # the same relations, by their lowercased (database, schema)
+        self._schema_relations: Dict[_SchemaKey, Dict[_ReferenceKey, _CachedRelation]] = {}
+        self.lock = _ReadWriteLock()
         self.schemas: Set[Tuple[Optional[str], Optional[str]]] = set()
 
     def add_schema(
@@ -236,7 +316,7 @@ class RelationsCache:
         # we have to hold the lock for the entire dump, if other threads modify
         # self.relations or any cache entry's referenced_by during iteration
         # it's a runtime error!
-        with self.lock:
+        with self.lock.read():
             return {dot_separated(k): v.dump_graph_entry() for k, v in self.relations.items()}
 
     def _setdefault(self, relation: _CachedRelation):
@@ -248,7 +328,22 @@ class RelationsCache:
         """
         self.add_schema(relation.database, relation.schema)
         key = relation.key()
-        return self.relations.setdefault(key, relation)
+        if key not in self.relations:
+            self._insert(relation)
+        return self.relations[key]
+
+    def _insert(self, relation: _CachedRelation) -> None:
+        self.relations[relation.key()] = relation
+        self._schema_relations.setdefault(relation.schema_key(), {})[relation.key()] = relation
+
+    def _pop(self, key: _ReferenceKey) -> _CachedRelation:
+        relation = self.relations.pop(key)
+        schema_key = relation.schema_key()
+        in_schema = self._schema_relations[schema_key]
+        del in_schema[key]
+        if not in_schema:
+            del self._schema_relations[schema_key]
+        return relation
 
     def _add_link(self, referenced_key, dependent_key):
         """Add a link between two relations to the database. Both the old and
@@ -334,11 +429,14 @@ class RelationsCache:
         :param Iterable[_ReferenceKey] keys: The keys to remove.
         """
         # remove direct refs
-        for key in keys:
-            del self.relations[key]
-        # then remove all entries from each child
-        for cached in self.relations.values():
-            cached.release_references(keys)
+        removed = [self._pop(key) for key in keys]
+        # then remove them from the relations they referred to. Anything that
+        # refers to a removed relation is removed as well.
+        for relation in removed:
+            for referenced_key in relation.references:
+                referenced = self.relations.get(referenced_key)
+                if referenced is not None:
+                    referenced.release_references([relation.key()])
 
     def _drop_cascade_relation(self, dropped_key):
         """Drop the given relation and cascade it appropriately to all
@@ -380,20 +478,25 @@ class RelationsCache:
         # previously referenced by old_name to be referenced by new_name.
         # basically, the name changes but some underlying ID moves. Kind of
         # like an object reference!
-        relation = self.relations.pop(old_key)
+        relation = self._pop(old_key)
         new_key = new_relation.key()
 
         # relaton has to rename its innards, so it needs the _CachedRelation.
         relation.rename(new_relation)
-        # update all the relations that refer to it
-        for cached in self.relations.values():
-            if cached.is_referenced_by(old_key):
+        # update all the relations that it refers to
+        for referenced_key in sorted(relation.references, key=dot_separated):
+            cached = self.relations.get(referenced_key)
+            if cached is not None and cached.is_referenced_by(old_key):
                 fire_event(
                     UpdateReference(old_key=old_key, new_key=new_key, cached_key=cached.key())
                 )
                 cached.rename_key(old_key, new_key)
+        # and the relations that refer to it
+        for dependent in relation.referenced_by.values():
+            dependent.references.discard(old_key)
+            dependent.references.add(new_key)
 
-        self.relations[new_key] = relation
+        self._insert(relation)
         # also fixup the schemas!
         self.add_schema(new_key.database, new_key.schema)
 
@@ -457,14 +560,9 @@ class RelationsCache:
         :return List[BaseRelation]: The list of relations with the given
             schema
         """
-        database = lowercase(database)
-        schema = lowercase(schema)
-        with self.lock:
-            results = [
-                r.inner
-                for r in self.relations.values()
-                if (lowercase(r.schema) == schema and lowercase(r.database) == database)
-            ]
+        key = (lowercase(database), lowercase(schema))
+        with self.lock.read():
+            results = [r.inner for r in self._schema_relations.get(key, {}).values()]
 
         if None in results:
             dbt.exceptions.raise_cache_inconsistent(
@@ -476,6 +574,7 @@ class RelationsCache:
         """Clear the cache"""
         with self.lock:
             self.relations.clear()
+            self._schema_relations.clear()
             self.schemas.clear()
 
     def _list_relations_in_schema(
@@ -483,12 +582,7 @@ class RelationsCache:
     ) -> List[_CachedRelation]:
         """Get the relations in a schema. Callers should hold the lock."""
         key = (lowercase(database), lowercase(schema))
-
-        to_remove: List[_CachedRelation] = []
-        for cachekey, relation in self.relations.items():
-            if (cachekey.database, cachekey.schema) == key:
-                to_remove.append(relation)
-        return to_remove
+        return list(self._schema_relations.get(key, {}).values())
 
     def _remove_all(self, to_remove: List[_CachedRelation]):
         """Remove all the listed relations. Ignore relations that have been
@@ -3,9 +3,10 @@ from codecs import BOM_UTF8
 import agate
 import datetime
 import isodate
+import itertools
 import json
 import dbt.utils
-from typing import Iterable, List, Dict, Union, Optional, Any
+from typing import Iterable, Iterator, List, Dict, Tuple, Union, Optional, Any
 
 from dbt.exceptions import RuntimeException
 
@@ -79,6 +80,28 @@ def table_from_rows(
     return agate.Table(rows, column_names, column_types=column_types)
 
 
+def cast_columns_to_text(table: agate.Table, text_only_columns: Iterable[str]) -> agate.Table:
+    """Return a copy of the table with the given columns cast to text, the way
+    table_from_rows would with text_only_columns. Only the values in those
+    columns are cast again, the rest of each row is reused as it is.
+    """
+    text = agate.data_types.Text(null_values=())
+    names = set(text_only_columns)
+    indexes = [index for index, name in enumerate(table.column_names) if name in names]
+    column_types = list(table.column_types)
+    for index in indexes:
+        column_types[index] = text
+
+    rows: List[agate.Row] = []
+    for row in table.rows:
+        values = list(row.values())
+        for index in indexes:
+            values[index] = text.cast(values[index])
+        rows.append(agate.Row(values, table.column_names))
+    # _is_fork to tell agate that we already made things into `Row`s.
+    return agate.Table(rows, table.column_names, column_types, _is_fork=True)
+
+
 def table_from_data(data, column_names: Iterable[str]) -> agate.Table:
     "Convert a list of dictionaries into an Agate table"
 
@@ -143,6 +166,85 @@ def from_csv(abspath, text_columns):
         return agate.Table.from_csv(fp, column_types=type_tester)
 
 
+# the number of rows a SeedFile infers its column types from
+SEED_SAMPLE_SIZE = 10000
+
+
+class SeedFile:
+    """A seed CSV that is read in batches of rows rather than all at once.
+
+    The column types are inferred from the first `sample_size` rows, which are
+    kept as `sample`: an agate table that can stand in for the whole file
+    wherever only its columns and their types are needed.
+    """
+
+    def __init__(self, abspath, text_columns, sample_size: int = SEED_SAMPLE_SIZE):
+        self.original_abspath = abspath
+        self.sample_size = sample_size
+        type_tester = build_type_tester(text_columns=text_columns)
+        with self._open() as fp:
+            reader = agate.csv.reader(fp)
+            column_names = next(reader, [])
+            rows = list(itertools.islice(reader, sample_size))
+        self.sample = agate.Table(rows, column_names, column_types=type_tester)
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return self.sample.column_names
+
+    @property
+    def column_types(self) -> Tuple[agate.data_types.DataType, ...]:
+        return self.sample.column_types
+
+    def _open(self):
+        fp = open(self.original_abspath, encoding="utf-8")
+        if fp.read(1) != BOM:
+            fp.seek(0)
+        return fp
+
+    def batches(self, batch_size: int) -> Iterator[List[Tuple[Any, ...]]]:
+        """Read the rows of the file, cast to the column types, in lists of at
+        most batch_size rows.
+        """
+        casts = [column_type.cast for column_type in self.column_types]
+        num_columns = len(casts)
+        with self._open() as fp:
+            reader = agate.csv.reader(fp)
+            next(reader, None)
+            batch: List[Tuple[Any, ...]] = []
+            for row in reader:
+                if len(row) > num_columns:
+                    raise RuntimeException(
+                        f"Line {reader.line_num} of {self.original_abspath} has "
+                        f"{len(row)} values, but the seed only has {num_columns} columns."
+                    )
+                elif len(row) < num_columns:
+                    row.extend([None] * (num_columns - len(row)))
+                try:
+                    batch.append(tuple(cast(value) for cast, value in zip(casts, row)))
+                except agate.exceptions.CastError:
+                    raise RuntimeException(self._cast_error(reader.line_num, row))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    def _cast_error(self, line_num: int, row: List[Any]) -> str:
+        for name, column_type, value in zip(self.column_names, self.column_types, row):
+            try:
+                column_type.cast(value)
+            except agate.exceptions.CastError:
+                return (
+                    f'Line {line_num} of {self.original_abspath} has the value "{value}" '
+                    f'in column "{name}", which was inferred to be '
+                    f"{type(column_type).__name__} from the first {self.sample_size} rows. "
+                    f"Set the type of the column with the column_types config, or turn "
+                    f"off the stream config to infer it from every row."
+                )
+        return f"Could not read line {line_num} of {self.original_abspath}"
+
+
 class _NullMarker:
     pass
 
@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+# This module is imported by wrappers that talk to a running `dbt daemon`, so
+# it must not import the rest of dbt: that would cost them the startup time
+# the daemon is there to save.
+
+# `dbt daemon` listens on <target-path>/daemon.sock unless it's given --socket
+DEFAULT_SOCKET_NAME = "daemon.sock"
+DEFAULT_SOCKET_PATH = os.path.join("target", DEFAULT_SOCKET_NAME)
+
+
+# Requests and responses are JSON objects, one per line. A request is one of
+#
+#   {"method": "command", "args": ["run", "--select", "my_model"]}
+#   {"method": "notify", "paths": ["models/my_model.sql"]}
+#   {"method": "shutdown"}
+#
+# and each one gets a response like {"success": true, "results": ...}, or
+# {"success": false, "error": "..."} if dbt couldn't carry it out.
+def encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes) -> Dict[str, Any]:
+    return json.loads(line.decode("utf-8"))
+
+
+class DaemonClient:
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH) -> None:
+        self.path = path
+
+    def request(self, method: str, **params: Any) -> Dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            sock.sendall(encode({"method": method, **params}))
+            with sock.makefile("rb") as fp:
+                line = fp.readline()
+        if not line:
+            raise ConnectionError(f"The dbt daemon at {self.path} closed the connection")
+        return decode(line)
+
+    def command(self, args: Iterable[str]) -> Dict[str, Any]:
+        """Run a dbt command, like ["ls", "--select", "my_model"], against the
+        daemon's manifest.
+        """
+        return self.request("command", args=list(args))
+
+    def notify(self, paths: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Tell the daemon that files in the project have changed, so it
+        reparses them before the next command. With no paths, the daemon
+        checks every file in the project.
+        """
+        return self.request("notify", paths=list(paths or ()))
+
+    def shutdown(self) -> Dict[str, Any]:
+        return self.request("shutdown")
+
+
+def print_results(results: Any) -> None:
+    if isinstance(results, list):
+        # the output of `dbt ls`
+        for line in results:
+            print(line)
+    elif isinstance(results, dict):
+        # a run_results.json artifact
+        for result in results.get("results", []):
+            line = f"{result['unique_id']}: {result['status']}"
+            if result.get("message"):
+                line += f" ({result['message']})"
+            print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dbt.clients.daemon",
+        description="Run a dbt command in a running `dbt daemon`.",
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    parsed = parser.parse_args(argv)
+
+    try:
+        response = DaemonClient(parsed.socket).command(parsed.args)
+    except OSError as exc:
+        print(f"Could not reach the dbt daemon at {parsed.socket}: {exc}", file=sys.stderr)
+        sys.exit(2)
+
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        sys.exit(2)
+    print_results(response.get("results"))
+    sys.exit(0 if response["success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -80,6 +80,35 @@ def clone(repo, cwd, dirname=None, remove_git_dir=False, revision=None, subdirec
     return result
 
 
+def resolve_revision(cwd, repo, revision="HEAD"):
+    """Find the commit that a revision points to in a remote repository,
+    without cloning it. Like checkout, this prefers tags to branches. Returns
+    None if the revision isn't a full commit sha, HEAD, a tag or a branch.
+    """
+    if _is_commit(revision):
+        return revision
+    try:
+        out, _ = run_cmd(
+            cwd, ["git", "ls-remote", repo, revision, f"{revision}^{{}}"], env={"LC_ALL": "C"}
+        )
+    except CommandResultError:
+        return None
+    refs = {}
+    for line in out.decode("utf-8").splitlines():
+        sha, _, ref = line.partition("\t")
+        refs[ref] = sha
+    # annotated tags are listed twice, and the ^{} entry is the commit
+    for ref in (
+        f"refs/tags/{revision}^{{}}",
+        f"refs/tags/{revision}",
+        f"refs/heads/{revision}",
+        revision,
+    ):
+        if ref in refs:
+            return refs[ref]
+    return None
+
+
 def list_tags(cwd):
     out, err = run_cmd(cwd, ["git", "tag", "--list"], env={"LC_ALL": "C"})
     tags = out.decode("utf-8").strip().split("\n")
@@ -42,6 +42,11 @@ def _get(path, registry_base_url=None):
     return resp.json()
 
 
+# registry responses don't change during a run, so each package and version is
+# only requested once, however many times it's resolved
+_get_cached = memoized(_get_with_retries)
+
+
 def index(registry_base_url=None):
     return _get_with_retries("api/v1/index.json", registry_base_url)
 
@@ -54,7 +59,7 @@ def packages(registry_base_url=None):
 
 
 def package(name, registry_base_url=None):
-    response = _get_with_retries("api/v1/{}.json".format(name), registry_base_url)
+    response = _get_cached("api/v1/{}.json".format(name), registry_base_url)
 
     # Either redirectnamespace or redirectname in the JSON response indicate a redirect
     # redirectnamespace redirects based on package ownership
@@ -80,7 +85,7 @@ def package(name, registry_base_url=None):
 
 
 def package_version(name, version, registry_base_url=None):
-    return _get_with_retries("api/v1/{}/{}.json".format(name, version), registry_base_url)
+    return _get_cached("api/v1/{}/{}.json".format(name, version), registry_base_url)
 
 
 def get_available_versions(name):
@@ -11,7 +11,18 @@ import sys
 import tarfile
 import requests
 import stat
-from typing import Type, NoReturn, List, Optional, Dict, Any, Tuple, Callable, Union
+from typing import (
+    Type,
+    NoReturn,
+    List,
+    Optional,
+    Dict,
+    Any,
+    Tuple,
+    Callable,
+    Union,
+    Iterable,
+)
 
 from dbt.events.functions import fire_event
 from dbt.events.types import (
@@ -82,6 +93,126 @@ def find_matching(
     return matching
 
 
+def _scan_tree(path: str, files: List[Tuple[str, str]], visited: Dict[str, int]) -> None:
+    """Walk `path` with os.scandir, appending (directory, file name) tuples
+    to `files` in the same order that os.walk (top-down, not following
+    symlinked directories) would produce them. Every directory descended into
+    is recorded in `visited` along with its offset into `files`.
+    """
+    visited[path] = len(files)
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return
+    subdirectories = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            files.append((path, entry.name))
+            continue
+        try:
+            is_symlink = entry.is_symlink()
+        except OSError:
+            is_symlink = False
+        if not is_symlink:
+            subdirectories.append(entry.path)
+    for subdirectory in subdirectories:
+        _scan_tree(subdirectory, files, visited)
+
+
+def find_matching_multi(
+    root_path: str,
+    searches: Dict[Any, Tuple[List[str], List[str]]],
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Like `find_matching`, but for many searches under the same `root_path`
+    at once. `searches` maps an arbitrary key to a tuple of
+    (relative_paths_to_search, file_patterns), and the result maps each key
+    to the same list of dictionaries `find_matching` would return for each
+    of the file patterns in turn.
+
+    Each distinct directory is only walked once, directories nested inside
+    another searched directory are not walked again, and the modification
+    time is only retrieved for files that match at least one pattern.
+    """
+    root_path = os.path.normpath(root_path)
+
+    # walk every distinct directory, shortest first so that nested search
+    # paths can be served from the walk of their parent
+    files: List[Tuple[str, str]] = []
+    visited: Dict[str, int] = {}
+    spans: Dict[str, Tuple[int, int]] = {}
+    search_dirs = {
+        os.path.normpath(os.path.join(root_path, relative_path))
+        for relative_paths, _ in searches.values()
+        for relative_path in relative_paths
+    }
+    for search_dir in sorted(search_dirs, key=len):
+        if search_dir in visited:
+            continue
+        start = len(files)
+        _scan_tree(search_dir, files, visited)
+        spans[search_dir] = (start, len(files))
+
+    def files_in(search_dir: str) -> List[Tuple[str, str]]:
+        if search_dir in spans:
+            start, end = spans[search_dir]
+            return files[start:end]
+        # a nested directory: its files are a contiguous run of its
+        # parent's walk, starting at the recorded offset
+        start = visited[search_dir]
+        end = start
+        prefix = search_dir + os.sep
+        while end < len(files) and (
+            files[end][0] == search_dir or files[end][0].startswith(prefix)
+        ):
+            end += 1
+        return files[start:end]
+
+    modification_times: Dict[str, float] = {}
+
+    def get_modification_time(absolute_path: str) -> float:
+        if absolute_path not in modification_times:
+            modification_time = 0.0
+            try:
+                modification_time = os.path.getmtime(absolute_path)
+            except OSError:
+                fire_event(SystemErrorRetrievingModTime(path=absolute_path))
+            modification_times[absolute_path] = modification_time
+        return modification_times[absolute_path]
+
+    results: Dict[Any, List[Dict[str, Any]]] = {}
+    for key, (relative_paths_to_search, file_patterns) in searches.items():
+        matching = []
+        for file_pattern in file_patterns:
+            reobj = re.compile(fnmatch.translate(file_pattern), re.IGNORECASE)
+            for relative_path_to_search in relative_paths_to_search:
+                absolute_path_to_search = os.path.normpath(
+                    os.path.join(root_path, relative_path_to_search)
+                )
+                # every walked path starts with the normalized search path,
+                # so slicing is equivalent to (and cheaper than) os.path.relpath
+                prefix_length = len(os.path.join(absolute_path_to_search, ""))
+                for current_path, local_file in files_in(absolute_path_to_search):
+                    if not reobj.match(local_file):
+                        continue
+                    absolute_path = os.path.join(current_path, local_file)
+                    matching.append(
+                        {
+                            "searched_path": relative_path_to_search,
+                            "absolute_path": absolute_path,
+                            "relative_path": absolute_path[prefix_length:],
+                            "modification_time": get_modification_time(absolute_path),
+                        }
+                    )
+        results[key] = matching
+
+    return results
+
+
 def load_file_contents(path: str, strip: bool = True) -> str:
     path = convert_path(path)
     with open(path, "rb") as handle:
@@ -170,6 +301,25 @@ def write_file(path: str, contents: str = "") -> bool:
     return True
 
 
+def write_file_atomic(path: str, chunks: Iterable[str]) -> bool:
+    """Write the chunks to a temporary file next to path, and then rename it
+    to path, so readers never see a partly written file.
+    """
+    path = convert_path(path)
+    make_directory(os.path.dirname(path))
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
+
+
 def read_json(path: str) -> Dict[str, Any]:
     return json.loads(load_file_contents(path))
 
@@ -1,6 +1,6 @@
 import os
 from collections import defaultdict
-from typing import List, Dict, Any, Tuple, cast, Optional
+from typing import List, Dict, Any, Tuple, cast, Optional, FrozenSet, Iterator
 
 import networkx as nx  # type: ignore
 import pickle
@@ -109,17 +109,15 @@ def _extend_prepended_ctes(prepended_ctes, new_prepended_ctes):
         _add_prepended_cte(prepended_ctes, new_cte)
 
 
-def _get_tests_for_node(manifest: Manifest, unique_id: UniqueID) -> List[UniqueID]:
-    """Get a list of tests that depend on the node with the
-    provided unique id"""
-
-    tests = []
-    if unique_id in manifest.child_map:
-        for child_unique_id in manifest.child_map[unique_id]:
-            if child_unique_id.startswith("test."):
-                tests.append(child_unique_id)
-
-    return tests
+def _bitset_members(mask: int, order: List[UniqueID]) -> Iterator[UniqueID]:
+    """Yield the unique id for each bit that is set in the given mask, where
+    bit n represents order[n]."""
+    # bin() is reversed (skipping the '0b') so that bit n is character n
+    bits = bin(mask)[:1:-1]
+    index = bits.find("1")
+    while index != -1:
+        yield order[index]
+        index = bits.find("1", index + 1)
 
 
 class Linker:
@@ -337,7 +335,8 @@ class Compiler:
         model.compiled_sql = injected_sql
         model.extra_ctes_injected = True
         model.extra_ctes = prepended_ctes
-        model.validate(model.to_dict(omit_none=True))
+        if flags.STRICT_VALIDATION:
+            model.validate(model.to_dict(omit_none=True))
 
         manifest.update_node(model)
 
@@ -358,16 +357,7 @@ class Compiler:
 
         fire_event(CompilingNode(unique_id=node.unique_id))
 
-        data = node.to_dict(omit_none=True)
-        data.update(
-            {
-                "compiled": False,
-                "compiled_sql": None,
-                "extra_ctes_injected": False,
-                "extra_ctes": [],
-            }
-        )
-        compiled_node = _compiled_type_for(node).from_dict(data)
+        compiled_node = _compiled_type_for(node).from_parsed(node)
 
         context = self._create_node_context(compiled_node, manifest, extra_context)
 
@@ -439,37 +429,59 @@ class Compiler:
         #  \/       |  test2 ----|  |
         # test1 ----|---------------|
 
-        for node_id in linker.graph:
-            # If node is executable (in manifest.nodes) and does _not_
-            # represent a test, continue.
+        # A test's dependencies are all upstream of a node exactly when the
+        # node is downstream of every one of them, so rather than walking
+        # the ancestors of every node, the descendants of every node are
+        # computed once, as bitsets indexed by topological ordinal, and each
+        # test is added upstream of the intersection of the descendants of
+        # its dependencies. Tests don't have descendants, so they aren't
+        # given ordinals.
+        graph = linker.graph
+        tests = []
+        order = []
+        for node_id in nx.topological_sort(graph):
             if (
                 node_id in manifest.nodes
-                and manifest.nodes[node_id].resource_type != NodeType.Test
+                and manifest.nodes[node_id].resource_type == NodeType.Test
             ):
-                # Get *everything* upstream of the node
-                all_upstream_nodes = nx.traversal.bfs_tree(linker.graph, node_id, reverse=True)
-                # Get the set of upstream nodes not including the current node.
-                upstream_nodes = set([n for n in all_upstream_nodes if n != node_id])
-
-                # Get all tests that depend on any upstream nodes.
-                upstream_tests = []
-                for upstream_node in upstream_nodes:
-                    upstream_tests += _get_tests_for_node(manifest, upstream_node)
-
-                for upstream_test in upstream_tests:
-                    # Get the set of all nodes that the test depends on
-                    # including the upstream_node itself. This is necessary
-                    # because tests can depend on multiple nodes (ex:
-                    # relationship tests). Test nodes do not distinguish
-                    # between what node the test is "testing" and what
-                    # node(s) it depends on.
-                    test_depends_on = set(manifest.nodes[upstream_test].depends_on_nodes)
-
-                    # If the set of nodes that an upstream test depends on
-                    # is a subset of all upstream nodes of the current node,
-                    # add an edge from the upstream test to the current node.
-                    if test_depends_on.issubset(upstream_nodes):
-                        linker.graph.add_edge(upstream_test, node_id)
+                tests.append(node_id)
+            else:
+                order.append(node_id)
+        ordinals = {node_id: ordinal for ordinal, node_id in enumerate(order)}
+
+        # Only executable (in manifest.nodes) non-test nodes get test edges
+        executable = 0
+        descendants = [0] * len(order)
+        for ordinal in reversed(range(len(order))):
+            node_id = order[ordinal]
+            if node_id in manifest.nodes:
+                executable |= 1 << ordinal
+            mask = 0
+            for child_id in graph.successors(node_id):
+                if child_id in ordinals:
+                    child_ordinal = ordinals[child_id]
+                    mask |= descendants[child_ordinal] | (1 << child_ordinal)
+            descendants[ordinal] = mask
+
+        # Tests can depend on multiple nodes (ex: relationship tests), and
+        # many tests share the same set of dependencies, so each distinct
+        # set is only resolved once. Tests that depend on nothing, or on
+        # something not in the graph, are never upstream of anything.
+        tests_by_depends_on: Dict[FrozenSet[UniqueID], List[UniqueID]] = defaultdict(list)
+        for test_id in tests:
+            test_depends_on = frozenset(manifest.nodes[test_id].depends_on_nodes)
+            if test_depends_on and all(node_id in ordinals for node_id in test_depends_on):
+                tests_by_depends_on[test_depends_on].append(test_id)
+
+        new_edges = []
+        for test_depends_on, test_ids in tests_by_depends_on.items():
+            mask = executable
+            for dependency in test_depends_on:
+                mask &= descendants[ordinals[dependency]]
+            for node_id in _bitset_members(mask, order):
+                for test_id in test_ids:
+                    new_edges.append((test_id, node_id))
+        graph.add_edges_from(new_edges)
 
     def compile(self, manifest: Manifest, write=True, add_test_edges=False) -> Graph:
         self.initialize()
@@ -1,3 +1,4 @@
+import collections.abc
 import json
 import os
 from typing import Any, Dict, NoReturn, Optional, Mapping
@@ -85,6 +86,22 @@ def get_context_modules() -> Dict[str, Dict[str, Any]]:
     }
 
 
+# the sections of `graph` are read-only mappings rather than dicts
+def _mapping_to_dict(value: Any) -> Dict[str, Any]:
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _MappingSafeDumper(yaml.SafeDumper):
+    pass
+
+
+_MappingSafeDumper.add_multi_representer(
+    collections.abc.Mapping, lambda dumper, value: dumper.represent_dict(dict(value))
+)
+
+
 class ContextMember:
     def __init__(self, value, name=None):
         self.name = name
@@ -397,7 +414,7 @@ class BaseContext(metaclass=ContextMeta):
             {% do log(my_json_string) %}
         """
         try:
-            return json.dumps(value, sort_keys=sort_keys)
+            return json.dumps(value, sort_keys=sort_keys, default=_mapping_to_dict)
         except ValueError:
             return default
 
@@ -453,7 +470,7 @@ class BaseContext(metaclass=ContextMeta):
             {% do log(my_yaml_string) %}
         """
         try:
-            return yaml.safe_dump(data=value, sort_keys=sort_keys)
+            return yaml.dump(value, Dumper=_MappingSafeDumper, sort_keys=sort_keys)
         except (ValueError, yaml.YAMLError):
             return default
 
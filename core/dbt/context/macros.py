@@ -1,4 +1,18 @@
-from typing import Any, Dict, Iterable, Union, Optional, List, Iterator, Mapping, Set
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Union,
+    Optional,
+    List,
+    Iterator,
+    Mapping,
+    Tuple,
+)
+
+import jinja2
 
 from dbt.clients.jinja import MacroGenerator, MacroStack
 from dbt.contracts.graph.parsed import ParsedMacro
@@ -6,80 +20,242 @@ from dbt.include.global_project import PROJECT_NAME as GLOBAL_PROJECT_NAME
 from dbt.exceptions import raise_duplicate_macro_name, raise_compiler_error
 
 
-FlatNamespace = Dict[str, MacroGenerator]
+FlatNamespace = Mapping[str, MacroGenerator]
 NamespaceMember = Union[FlatNamespace, MacroGenerator]
 FullNamespace = Dict[str, NamespaceMember]
 
+# macro name -> key of the macro in the macros mapping (its unique_id)
+MacroIdNamespace = Dict[str, str]
+
+# The key of the node's MacroNamespace in the flattened context
+MACRO_NAMESPACE_KEY = "_dbt_macro_namespace"
+
+
+# The top level macros in a flattened context. These are shared by every
+# context with the same layout, so the node context is bound late: when
+# jinja calls the macro, it passes the calling context, which is used to
+# find the MacroNamespace of the node and its MacroGenerator for the macro.
+class LateBoundMacro:
+    def __init__(self, unique_id: str, name: str) -> None:
+        self.unique_id = unique_id
+        self.name = name
+
+    @jinja2.contextfunction
+    def __call__(self, context, *args, **kwargs):
+        namespace = context.get(MACRO_NAMESPACE_KEY)
+        if namespace is None:
+            raise_compiler_error(f"Macro '{self.name}' was called outside of a dbt context")
+        return namespace._get_generator(self.unique_id)(*args, **kwargs)
+
+
+# The layout of a MacroNamespace: which macro every name resolves to, for
+# one combination of root package, search package (the package of the node)
+# and internal packages. It only depends on the package and name of each
+# macro, so it is computed once and shared by every context that is built
+# from the same set of macros. The MacroNamespace binds macros to a node's
+# context when they are looked up.
+class MacroNamespaceLayout:
+    def __init__(
+        self,
+        macros: Mapping[str, ParsedMacro],
+        root_package: str,
+        search_package: str,
+        internal_packages: List[str],
+    ) -> None:
+        self.macro_ids = frozenset(macros)
+        internal_package_names = set(internal_packages)
+        internal: Dict[str, MacroIdNamespace] = {}
+        # non-internal packages: [package name][macro name] = unique_id
+        self.packages: Dict[str, MacroIdNamespace] = {}
+        for unique_id, macro in macros.items():
+            if macro.package_name in internal_package_names:
+                hierarchy = internal
+            else:
+                hierarchy = self.packages
+            hierarchy.setdefault(macro.package_name, {})[macro.name] = unique_id
+
+        # Iterate in reverse-order and overwrite: the packages that are first
+        # in the list are the ones we want to "win".
+        self.global_project_namespace: MacroIdNamespace = {}
+        for pkg in reversed(internal_packages):
+            if pkg in internal:
+                self.global_project_namespace.update(internal[pkg])
+
+        # Resolve the top level names from the lowest to the highest
+        # precedence: internal projects, dbt, non-internal packages, the root
+        # package (the "global" namespace), and finally the package of the
+        # node (the "local" namespace)
+        top_level: Dict[str, Tuple[bool, str]] = {}
+        for name, unique_id in self.global_project_namespace.items():
+            top_level[name] = (False, unique_id)
+        top_level[GLOBAL_PROJECT_NAME] = (True, GLOBAL_PROJECT_NAME)
+        for package_name in self.packages:
+            top_level[package_name] = (True, package_name)
+        for package_name in (root_package, search_package):
+            for name, unique_id in self.packages.get(package_name, {}).items():
+                top_level[name] = (False, unique_id)
+
+        self.names: Tuple[str, ...] = tuple(top_level)
+        # top level name -> unique_id of the macro
+        self.macro_names: MacroIdNamespace = {}
+        # top level name -> package name of the package namespace
+        self.package_names: Dict[str, str] = {}
+        for name, (is_package, target) in top_level.items():
+            if is_package:
+                self.package_names[name] = target
+            else:
+                self.macro_names[name] = target
+        self.late_bound_macros: Dict[str, LateBoundMacro] = {
+            name: LateBoundMacro(unique_id, name) for name, unique_id in self.macro_names.items()
+        }
+
+    def get_package(self, package_name: str) -> MacroIdNamespace:
+        if package_name == GLOBAL_PROJECT_NAME:
+            return self.global_project_namespace
+        return self.packages[package_name]
+
+
+_LAYOUT_CACHE_SIZE = 64
+_layout_cache: "OrderedDict[Tuple[str, str, Tuple[str, ...]], MacroNamespaceLayout]"
+_layout_cache = OrderedDict()
+_layout_cache_lock = threading.Lock()
+
+
+# Returns the (possibly cached) layout for the given macros. A cached layout
+# is only reused if it was built from the same set of unique_ids, which
+# protects against macros being added or removed by partial parsing.
+def get_macro_namespace_layout(
+    macros: Mapping[str, ParsedMacro],
+    root_package: str,
+    search_package: str,
+    internal_packages: List[str],
+) -> MacroNamespaceLayout:
+    key = (root_package, search_package, tuple(internal_packages))
+    with _layout_cache_lock:
+        layout = _layout_cache.get(key)
+        if layout is not None and macros.keys() == layout.macro_ids:
+            _layout_cache.move_to_end(key)
+            return layout
+
+    layout = MacroNamespaceLayout(macros, root_package, search_package, internal_packages)
+    with _layout_cache_lock:
+        _layout_cache[key] = layout
+        _layout_cache.move_to_end(key)
+        while len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return layout
+
+
+# The macros of one package, as seen from a MacroNamespace. The
+# MacroGenerators are created by the MacroNamespace when they're looked up.
+class PackageNamespace(Mapping):
+    def __init__(self, namespace: "MacroNamespace", macro_ids: MacroIdNamespace):
+        self._namespace = namespace
+        self._macro_ids = macro_ids
+
+    def __getitem__(self, key: str) -> MacroGenerator:
+        return self._namespace._get_generator(self._macro_ids[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._macro_ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._macro_ids)
+
+    def __len__(self) -> int:
+        return len(self._macro_ids)
+
 
 # The point of this class is to collect the various macros
 # and provide the ability to flatten them into the ManifestContexts
 # that are created for jinja, so that macro calls can be resolved.
-# Creates special iterators and _keys methods to flatten the lists.
-# When this class is created it has a static 'local_namespace' which
+# The names are resolved by the (shared) MacroNamespaceLayout, which
 # depends on the package of the node, so it only works for one
 # particular local package at a time for "flattening" into a context.
+# A MacroGenerator is only created when a macro is looked up, and the
+# same MacroGenerator is returned for every lookup of that macro.
 # 'get_by_package' should work for any macro.
 class MacroNamespace(Mapping):
     def __init__(
         self,
-        global_namespace: FlatNamespace,  # root package macros
-        local_namespace: FlatNamespace,  # packages for *this* node
-        global_project_namespace: FlatNamespace,  # internal packages
-        packages: Dict[str, FlatNamespace],  # non-internal packages
+        layout: MacroNamespaceLayout,
+        macros: Mapping[str, ParsedMacro],
+        ctx: Dict[str, Any],
+        node: Optional[Any] = None,
+        thread_ctx: Optional[MacroStack] = None,
     ):
-        self.global_namespace: FlatNamespace = global_namespace
-        self.local_namespace: FlatNamespace = local_namespace
-        self.packages: Dict[str, FlatNamespace] = packages
-        self.global_project_namespace: FlatNamespace = global_project_namespace
-
-    def _search_order(self) -> Iterable[Union[FullNamespace, FlatNamespace]]:
-        yield self.local_namespace  # local package
-        yield self.global_namespace  # root package
-        # TODO CT-211
-        yield self.packages  # type: ignore[misc] # non-internal packages
-        yield {
-            # TODO CT-211
-            GLOBAL_PROJECT_NAME: self.global_project_namespace,  # type: ignore[misc] # dbt
-        }
-        yield self.global_project_namespace  # other internal project besides dbt
-
-    # provides special keys method for MacroNamespace iterator
-    # returns keys from local_namespace, global_namespace, packages,
-    # global_project_namespace
-    def _keys(self) -> Set[str]:
-        keys: Set[str] = set()
-        for search in self._search_order():
-            keys.update(search)
-        return keys
-
-    # special iterator using special keys
+        self.layout = layout
+        self.macros = macros
+        self.ctx = ctx
+        self.node = node
+        self.thread_ctx = thread_ctx
+        self._generators: Dict[str, MacroGenerator] = {}
+        self._package_namespaces: Dict[str, PackageNamespace] = {}
+
+    def _get_generator(self, unique_id: str) -> MacroGenerator:
+        macro_func = self._generators.get(unique_id)
+        if macro_func is None:
+            # MacroGenerator is in clients/jinja.py
+            # a MacroGenerator object is a callable object that will
+            # execute the MacroGenerator.__call__ function
+            macro_func = MacroGenerator(
+                self.macros[unique_id], self.ctx, self.node, self.thread_ctx
+            )
+            macro_func = self._generators.setdefault(unique_id, macro_func)
+        return macro_func
+
+    def _get_package_namespace(self, package_name: str) -> PackageNamespace:
+        namespace = self._package_namespaces.get(package_name)
+        if namespace is None:
+            namespace = PackageNamespace(self, self.layout.get_package(package_name))
+            self._package_namespaces[package_name] = namespace
+        return namespace
+
     def __iter__(self) -> Iterator[str]:
-        for key in self._keys():
-            yield key
+        return iter(self.layout.names)
 
     def __len__(self):
-        return len(self._keys())
+        return len(self.layout.names)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.layout.macro_names or key in self.layout.package_names
 
     def __getitem__(self, key: str) -> NamespaceMember:
-        for dct in self._search_order():
-            if key in dct:
-                return dct[key]
+        unique_id = self.layout.macro_names.get(key)
+        if unique_id is not None:
+            return self._get_generator(unique_id)
+        package_name = self.layout.package_names.get(key)
+        if package_name is not None:
+            return self._get_package_namespace(package_name)
         raise KeyError(key)
 
+    # Returns a dict of all the top level names, for the context dict.
+    # Jinja copies the context into a plain dict when rendering, so the
+    # macros are the shared LateBoundMacros of the layout, which look up
+    # this namespace (by MACRO_NAMESPACE_KEY) when they are called.
+    def flatten(self) -> Dict[str, Any]:
+        flat: Dict[str, Any] = {
+            name: self._get_package_namespace(package_name)
+            for name, package_name in self.layout.package_names.items()
+        }
+        flat.update(self.layout.late_bound_macros)
+        flat[MACRO_NAMESPACE_KEY] = self
+        return flat
+
     def get_from_package(self, package_name: Optional[str], name: str) -> Optional[MacroGenerator]:
-        pkg: FlatNamespace
         if package_name is None:
             return self.get(name)
-        elif package_name == GLOBAL_PROJECT_NAME:
-            return self.global_project_namespace.get(name)
-        elif package_name in self.packages:
-            return self.packages[package_name].get(name)
+        elif package_name == GLOBAL_PROJECT_NAME or package_name in self.layout.packages:
+            unique_id = self.layout.get_package(package_name).get(name)
+            if unique_id is None:
+                return None
+            return self._get_generator(unique_id)
         else:
             raise_compiler_error(f"Could not find package '{package_name}'")
 
 
-# This class builds the MacroNamespace by adding macros to
-# internal_packages or packages, and locals/globals.
+# This class builds the MacroNamespace from the macros in the manifest
+# (or the macros added to it) and the shared MacroNamespaceLayout.
 # Call 'build_namespace' to return a MacroNamespace.
 # This is used by ManifestContext (and subclasses)
 class MacroNamespaceBuilder:
@@ -94,79 +270,44 @@ class MacroNamespaceBuilder:
         self.root_package = root_package
         self.search_package = search_package
         # internal packages comes from get_adapter_package_names
-        self.internal_package_names = set(internal_packages)
         self.internal_package_names_order = internal_packages
-        # macro_func is added here if in root package, since
-        # the root package acts as a "global" namespace, overriding
-        # everything else except local external package macro calls
-        self.globals: FlatNamespace = {}
-        # macro_func is added here if it's the package for this node
-        self.locals: FlatNamespace = {}
-        # Create a dictionary of [package name][macro name] =
-        #     MacroGenerator object which acts like a function
-        self.internal_packages: Dict[str, FlatNamespace] = {}
-        self.packages: Dict[str, FlatNamespace] = {}
+        # macros added with add_macro(s), by unique_id
+        self.macros: Dict[str, ParsedMacro] = {}
+        self._macros_by_name: Dict[Tuple[str, str], ParsedMacro] = {}
         self.thread_ctx = thread_ctx
         self.node = node
 
-    def _add_macro_to(
-        self,
-        hierarchy: Dict[str, FlatNamespace],
-        macro: ParsedMacro,
-        macro_func: MacroGenerator,
-    ):
-        if macro.package_name in hierarchy:
-            namespace = hierarchy[macro.package_name]
-        else:
-            namespace = {}
-            hierarchy[macro.package_name] = namespace
-
-        if macro.name in namespace:
-            raise_duplicate_macro_name(macro_func.macro, macro, macro.package_name)
-        hierarchy[macro.package_name][macro.name] = macro_func
-
     def add_macro(self, macro: ParsedMacro, ctx: Dict[str, Any]):
-        macro_name: str = macro.name
-
-        # MacroGenerator is in clients/jinja.py
-        # a MacroGenerator object is a callable object that will
-        # execute the MacroGenerator.__call__ function
-        macro_func: MacroGenerator = MacroGenerator(macro, ctx, self.node, self.thread_ctx)
-
-        # internal macros (from plugins) will be processed separately from
-        # project macros, so store them in a different place
-        if macro.package_name in self.internal_package_names:
-            self._add_macro_to(self.internal_packages, macro, macro_func)
-        else:
-            # if it's not an internal package
-            self._add_macro_to(self.packages, macro, macro_func)
-            # add to locals if it's the package this node is in
-            if macro.package_name == self.search_package:
-                self.locals[macro_name] = macro_func
-            # add to globals if it's in the root package
-            elif macro.package_name == self.root_package:
-                self.globals[macro_name] = macro_func
+        key = (macro.package_name, macro.name)
+        if key in self._macros_by_name:
+            raise_duplicate_macro_name(self._macros_by_name[key], macro, macro.package_name)
+        self._macros_by_name[key] = macro
+        self.macros[macro.unique_id] = macro
 
     def add_macros(self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]):
         for macro in macros:
             self.add_macro(macro, ctx)
 
     def build_namespace(
-        self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]
+        self,
+        macros: Union[Mapping[str, ParsedMacro], Iterable[ParsedMacro]],
+        ctx: Dict[str, Any],
     ) -> MacroNamespace:
-        self.add_macros(macros, ctx)
+        # A mapping of unique_id to macro (like manifest.macros) is used as-is,
+        # so the layout built from it can be shared with other contexts.
+        all_macros: Mapping[str, ParsedMacro]
+        if isinstance(macros, Mapping) and not self.macros:
+            all_macros = macros
+        else:
+            if isinstance(macros, Mapping):
+                macros = macros.values()
+            self.add_macros(macros, ctx)
+            all_macros = self.macros
 
-        # Iterate in reverse-order and overwrite: the packages that are first
-        # in the list are the ones we want to "win".
-        global_project_namespace: FlatNamespace = {}
-        for pkg in reversed(self.internal_package_names_order):
-            if pkg in self.internal_packages:
-                # add the macros pointed to by this package name
-                global_project_namespace.update(self.internal_packages[pkg])
-
-        return MacroNamespace(
-            global_namespace=self.globals,  # root package macros
-            local_namespace=self.locals,  # packages for *this* node
-            global_project_namespace=global_project_namespace,  # internal packages
-            packages=self.packages,  # non internal_packages
+        layout = get_macro_namespace_layout(
+            all_macros,
+            self.root_package,
+            self.search_package,
+            self.internal_package_names_order,
         )
+        return MacroNamespace(layout, all_macros, ctx, self.node, self.thread_ctx)
@@ -731,6 +731,19 @@ class ProviderContext(ManifestContext):
         table.original_abspath = os.path.abspath(path)
         return table
 
+    @contextmember
+    def load_seed_file(self) -> agate_helper.SeedFile:
+        if not isinstance(self.model, (ParsedSeedNode, CompiledSeedNode)):
+            raise_compiler_error(
+                "can only load_seed_file for seeds (got a {})".format(self.model.resource_type)
+            )
+        path = os.path.join(self.model.root_path, self.model.original_file_path)
+        column_types = self.model.config.column_types
+        try:
+            return agate_helper.SeedFile(os.path.abspath(path), text_columns=column_types)
+        except ValueError as e:
+            raise_compiler_error(str(e))
+
     @contextproperty
     def ref(self) -> Callable:
         """The most important function in dbt is `ref()`; it's impossible to
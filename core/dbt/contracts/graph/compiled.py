@@ -22,8 +22,9 @@ from dbt.node_types import NodeType
 from dbt.contracts.util import Replaceable
 
 from dbt.dataclass_schema import dbtClassMixin
-from dataclasses import dataclass, field
-from typing import Optional, List, Union, Dict, Type
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Optional, List, Union, Dict, Tuple, Type
 
 
 @dataclass
@@ -58,6 +59,19 @@ class CompiledNode(ParsedNode, CompiledNodeMixin):
         else:
             self.extra_ctes.append(InjectedCTE(id=cte_id, sql=sql))
 
+    @classmethod
+    def from_parsed(cls, parsed: ParsedNode):
+        """Build an uncompiled node of this type from a parsed node by
+        copying its fields, instead of round-tripping through to_dict() and
+        from_dict(). The two nodes share their configs, columns and other
+        nested values, which is fine because the compiled node replaces the
+        parsed one in the manifest. Private fields like _event_status aren't
+        serialized, so like the round trip, this leaves them at their
+        defaults.
+        """
+        kwargs = {name: getattr(parsed, name) for name in _field_names(type(parsed))}
+        return cls(compiled=False, **kwargs)
+
     def __post_serialize__(self, dct):
         dct = super().__post_serialize__(dct)
         if "_pre_injected_sql" in dct:
@@ -65,6 +79,11 @@ class CompiledNode(ParsedNode, CompiledNodeMixin):
         return dct
 
 
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.init and not f.name.startswith("_"))
+
+
 @dataclass
 class CompiledAnalysisNode(CompiledNode):
     resource_type: NodeType = field(metadata={"restrict": [NodeType.Analysis]})
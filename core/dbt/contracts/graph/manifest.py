@@ -1,10 +1,13 @@
 import enum
-from dataclasses import dataclass, field
+import functools
+import json
+from dataclasses import dataclass, field, fields
 from itertools import chain, islice
 from mashumaro import DataClassMessagePackMixin
 from multiprocessing.synchronize import Lock
 from typing import (
     Dict,
+    Iterator,
     List,
     Optional,
     Union,
@@ -41,6 +44,7 @@ from dbt.contracts.graph.parsed import (
 )
 from dbt.contracts.graph.unparsed import SourcePatch
 from dbt.contracts.files import SourceFile, SchemaSourceFile, FileHash, AnySourceFile
+from dbt.clients.system import write_file_atomic
 from dbt.contracts.util import BaseArtifactMetadata, SourceKey, ArtifactMixin, schema_version
 from dbt.dataclass_schema import dbtClassMixin
 from dbt.exceptions import (
@@ -223,6 +227,42 @@ class AnalysisLookup(RefableLookup):
     _lookup_types: ClassVar[set] = set([NodeType.Analysis])
 
 
+class SerializedMapping(Mapping[str, Dict[str, Any]]):
+    """A read-only view of a manifest's nodes (or sources, exposures or
+    metrics) as dicts, for the `graph` context variable. Each one is only
+    serialized when it's first read, and the dict is kept for later reads.
+    Two threads reading the same one at once might both serialize it, but
+    they both get back the dict that was kept.
+    """
+
+    def __init__(self, resources: Mapping[str, Any]):
+        # the resources as they were when the graph was built: the ones
+        # replaced in the manifest later on, like nodes as they're compiled,
+        # don't change what the graph shows
+        self._resources = dict(resources)
+        self._serialized: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        try:
+            return self._serialized[key]
+        except KeyError:
+            pass
+        serialized = self._resources[key].to_dict(omit_none=False)
+        return self._serialized.setdefault(key, serialized)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._resources
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resources)
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self)
+
+
 def _search_packages(
     current_project: str,
     node_package: str,
@@ -580,7 +620,12 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     selectors: MutableMapping[str, Any] = field(default_factory=dict)
     files: MutableMapping[str, AnySourceFile] = field(default_factory=dict)
     metadata: ManifestMetadata = field(default_factory=ManifestMetadata)
-    flat_graph: Dict[str, Any] = field(default_factory=dict)
+    # the serialized resources can always be built again from the manifest,
+    # so they're not saved with it
+    flat_graph: Dict[str, Any] = field(
+        default_factory=dict,
+        metadata={"serialize": lambda x: {}, "deserialize": lambda x: {}},
+    )
     state_check: ManifestStateCheck = field(default_factory=ManifestStateCheck)
     source_patches: MutableMapping[SourceKey, SourcePatch] = field(default_factory=dict)
     disabled: MutableMapping[str, List[CompileResultNode]] = field(default_factory=dict)
@@ -656,12 +701,15 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
         only build it once and avoid any concurrency issues around it.
         Make sure you don't call this until you're done with building your
         manifest!
+
+        Nothing is serialized here: each resource is only turned into a dict
+        if a macro reads it from `graph`.
         """
         self.flat_graph = {
-            "exposures": {k: v.to_dict(omit_none=False) for k, v in self.exposures.items()},
-            "metrics": {k: v.to_dict(omit_none=False) for k, v in self.metrics.items()},
-            "nodes": {k: v.to_dict(omit_none=False) for k, v in self.nodes.items()},
-            "sources": {k: v.to_dict(omit_none=False) for k, v in self.sources.items()},
+            "exposures": SerializedMapping(self.exposures),
+            "metrics": SerializedMapping(self.metrics),
+            "nodes": SerializedMapping(self.nodes),
+            "sources": SerializedMapping(self.sources),
         }
 
     def build_disabled_by_file_id(self):
@@ -775,22 +823,24 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
 
     def writable_manifest(self):
         self.build_parent_and_child_maps()
+        # copies of the mappings, since the manifest may be written on
+        # another thread while the task goes on replacing nodes in them
         return WritableManifest(
-            nodes=self.nodes,
-            sources=self.sources,
-            macros=self.macros,
-            docs=self.docs,
-            exposures=self.exposures,
-            metrics=self.metrics,
-            selectors=self.selectors,
+            nodes=dict(self.nodes),
+            sources=dict(self.sources),
+            macros=dict(self.macros),
+            docs=dict(self.docs),
+            exposures=dict(self.exposures),
+            metrics=dict(self.metrics),
+            selectors=dict(self.selectors),
             metadata=self.metadata,
-            disabled=self.disabled,
+            disabled=dict(self.disabled),
             child_map=self.child_map,
             parent_map=self.parent_map,
         )
 
-    def write(self, path):
-        self.writable_manifest().write(path)
+    def write(self, path, fast_json: bool = False):
+        self.writable_manifest().write(path, fast_json)
 
     # Called in dbt.compilation.Linker.write_graph and
     # dbt.graph.queue.get and ._include_in_cost
@@ -1135,6 +1185,45 @@ class WritableManifest(ArtifactMixin):
         )
     )
 
+    def write(self, path: str, fast_json: bool = False):
+        """Write the manifest a resource at a time, rather than serializing
+        all of it into one dict and one string first. The file is renamed
+        into place once it's complete.
+        """
+        if fast_json:
+            chunks = self._json_chunks(dbt.utils.fast_json_dumps, ",", ":")
+        else:
+            dumps = functools.partial(json.dumps, cls=dbt.utils.JSONEncoder)
+            chunks = self._json_chunks(dumps, ", ", ": ")
+        write_file_atomic(path, chunks)
+
+    # laid out the way Writable.write lays out to_dict(omit_none=False)
+    def _json_chunks(
+        self, dumps: Callable[[Any], str], item_separator: str, key_separator: str
+    ) -> Iterator[str]:
+        for index, manifest_field in enumerate(fields(self)):
+            yield ("{" if index == 0 else item_separator) + dumps(manifest_field.name)
+            yield key_separator
+            value = getattr(self, manifest_field.name)
+            if isinstance(value, Mapping):
+                yield "{"
+                for item_index, (key, item) in enumerate(value.items()):
+                    if item_index:
+                        yield item_separator
+                    yield dumps(key) + key_separator + dumps(_serialize_item(item))
+                yield "}"
+            else:
+                yield dumps(_serialize_item(value))
+        yield "}"
+
+
+def _serialize_item(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_serialize_item(item) for item in value]
+    if isinstance(value, dbtClassMixin):
+        return value.to_dict(omit_none=False)
+    return value
+
 
 def _check_duplicates(value: HasUniqueID, src: Mapping[str, HasUniqueID]):
     if value.unique_id in src:
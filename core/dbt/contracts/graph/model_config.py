@@ -431,6 +431,8 @@ class NodeConfig(NodeAndTestConfig):
 class SeedConfig(NodeConfig):
     materialized: str = "seed"
     quote_columns: Optional[bool] = None
+    # load the file with adapter.load_seed_rows, where the adapter supports it
+    stream: Optional[bool] = None
 
 
 @dataclass
@@ -154,6 +154,7 @@ BANNED_PROJECT_NAMES = {
     "graph",
     "invocation_id",
     "load_agate_table",
+    "load_seed_file",
     "load_result",
     "log",
     "model",
@@ -243,6 +244,7 @@ class UserConfig(ExtensibleDbtClassMixin, Replaceable, UserConfigContract):
     send_anonymous_usage_stats: bool = DEFAULT_SEND_ANONYMOUS_USAGE_STATS
     use_colors: Optional[bool] = None
     partial_parse: Optional[bool] = None
+    file_hash_cache: Optional[bool] = None
     printer_width: Optional[int] = None
     write_json: Optional[bool] = None
     warn_error: Optional[bool] = None
@@ -253,6 +255,11 @@ class UserConfig(ExtensibleDbtClassMixin, Replaceable, UserConfigContract):
     use_experimental_parser: Optional[bool] = None
     static_parser: Optional[bool] = None
     indirect_selection: Optional[str] = None
+    async_logging: Optional[bool] = None
+    scheduling_mode: Optional[str] = None
+    strict_validation: Optional[bool] = None
+    fast_json: Optional[bool] = None
+    stream_results: Optional[bool] = None
 
 
 @dataclass
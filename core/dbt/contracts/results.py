@@ -8,7 +8,7 @@ from dbt.contracts.util import (
     Replaceable,
     schema_version,
 )
-from dbt.exceptions import InternalException
+from dbt.exceptions import IncompatibleSchemaException, InternalException
 from dbt.events.functions import fire_event
 from dbt.events.types import TimingInfoCollected
 from dbt.logger import (
@@ -20,6 +20,9 @@ from dbt.dataclass_schema import dbtClassMixin, StrEnum
 
 import agate
 
+import json
+import os
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import (
@@ -30,9 +33,11 @@ from typing import (
     Any,
     NamedTuple,
     Sequence,
+    Iterator,
 )
 
-from dbt.clients.system import write_json
+from dbt.clients.system import make_directory, write_file_atomic, write_json
+import dbt.utils
 
 
 @dataclass
@@ -219,6 +224,106 @@ class RunResultsArtifact(ExecutionResult, ArtifactMixin):
         write_json(path, self.to_dict(omit_none=False))
 
 
+def _dumps(value: Any) -> str:
+    return json.dumps(value, cls=dbt.utils.JSONEncoder)
+
+
+class RunResultsSidecar:
+    """A JSON-lines file that results are appended to as nodes finish, used
+    with --stream-results. The first line holds the metadata and args, and
+    each line after that one result. Once the run is over, run_results.json
+    is assembled from the file and the file is removed, so if it's still
+    there, the run that wrote it never finished.
+    """
+
+    def __init__(self, path: str, args: Dict[str, Any]):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        make_directory(os.path.dirname(path))
+        self._fp = open(path, "w", encoding="utf-8")
+        metadata = RunResultsMetadata(
+            dbt_schema_version=str(RunResultsArtifact.dbt_schema_version)
+        )
+        self._write_line(_dumps({"metadata": metadata.to_dict(omit_none=False), "args": args}))
+
+    def _write_line(self, line: str) -> None:
+        self._fp.write(line + "\n")
+        # so the result survives the process being killed
+        self._fp.flush()
+
+    def append(self, result: RunResult) -> None:
+        line = _dumps(process_run_result(result).to_dict(omit_none=False))
+        with self._lock:
+            self._write_line(line)
+            self.count += 1
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def _result_lines(self) -> Iterator[str]:
+        with open(self.path, encoding="utf-8") as fp:
+            next(fp)
+            for line in fp:
+                yield line.rstrip("\n")
+
+    def write_artifact(self, result: RunExecutionResult, path: str) -> bool:
+        """Write run_results.json, copying the results from the sidecar
+        instead of serializing them again, and remove the sidecar. Returns
+        False without writing run_results.json if the sidecar doesn't hold
+        all of the results.
+        """
+        if self.count != len(result.results):
+            os.remove(self.path)
+            return False
+        # laid out the way RunResultsArtifact.write lays it out
+        artifact = RunResultsArtifact.from_execution_results(
+            results=[],
+            elapsed_time=result.elapsed_time,
+            generated_at=result.generated_at,
+            args=result.args,
+        )
+
+        def chunks() -> Iterator[str]:
+            yield '{"metadata": ' + _dumps(artifact.metadata.to_dict(omit_none=False))
+            yield ', "results": ['
+            for index, line in enumerate(self._result_lines()):
+                yield line if index == 0 else ", " + line
+            yield '], "elapsed_time": ' + _dumps(artifact.elapsed_time)
+            yield ', "args": ' + _dumps(artifact.args) + "}"
+
+        write_file_atomic(path, chunks())
+        os.remove(self.path)
+        return True
+
+    @classmethod
+    def read(cls, path: str) -> RunResultsArtifact:
+        """Read the results of an unfinished run. A last line that was only
+        partly written is left out.
+        """
+        with open(path, encoding="utf-8") as fp:
+            header = json.loads(next(fp))
+            found = header["metadata"].get("dbt_schema_version")
+            if found != str(RunResultsArtifact.dbt_schema_version):
+                raise IncompatibleSchemaException(
+                    expected=str(RunResultsArtifact.dbt_schema_version), found=found
+                )
+            results = []
+            for line in fp:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    break
+                results.append(RunResultOutput.from_dict(data))
+        return RunResultsArtifact(
+            metadata=RunResultsMetadata.from_dict(header["metadata"]),
+            results=results,
+            # the run never finished, so there is no elapsed time
+            elapsed_time=0.0,
+            args=header["args"],
+        )
+
+
 @dataclass
 class RunOperationResult(ExecutionResult):
     success: bool
@@ -1,6 +1,6 @@
 from pathlib import Path
 from .graph.manifest import WritableManifest
-from .results import RunResultsArtifact
+from .results import RunResultsArtifact, RunResultsSidecar
 from typing import Optional
 from dbt.exceptions import IncompatibleSchemaException
 
@@ -21,10 +21,24 @@ class PreviousState:
                 raise
 
         results_path = self.path / "run_results.json"
-        if results_path.exists() and results_path.is_file():
+        sidecar_path = self.path / "run_results.jsonl"
+        if _is_newer_file(sidecar_path, results_path):
+            # written by a run with --stream-results that never finished
+            try:
+                self.results = RunResultsSidecar.read(str(sidecar_path))
+            except IncompatibleSchemaException as exc:
+                exc.add_filename(str(sidecar_path))
+                raise
+        elif results_path.exists() and results_path.is_file():
             try:
                 # we want to bail with an error if schema versions don't match
                 self.results = RunResultsArtifact.read_and_check_versions(str(results_path))
             except IncompatibleSchemaException as exc:
                 exc.add_filename(str(results_path))
                 raise
+
+
+def _is_newer_file(path: Path, other: Path) -> bool:
+    if not path.is_file():
+        return False
+    return not other.is_file() or path.stat().st_mtime > other.stat().st_mtime
@@ -1,4 +1,5 @@
 import abc
+import concurrent.futures
 import os
 import tempfile
 from contextlib import contextmanager
@@ -11,6 +12,9 @@ from dbt.events.types import DepsSetDownloadDirectory
 
 DOWNLOADS_PATH = None
 
+# the most packages that are fetched or installed at once
+MAX_PACKAGE_THREADS = 8
+
 
 def get_downloads_path():
     return DOWNLOADS_PATH
@@ -41,6 +45,14 @@ def downloads_directory():
         DOWNLOADS_PATH = None
 
 
+def package_executor() -> concurrent.futures.ThreadPoolExecutor:
+    # fetching and installing packages is mostly waiting on http requests and
+    # git, so it's done on a pool of threads
+    return concurrent.futures.ThreadPoolExecutor(
+        max_workers=MAX_PACKAGE_THREADS, thread_name_prefix="deps"
+    )
+
+
 class BasePackage(metaclass=abc.ABCMeta):
     @abc.abstractproperty
     def name(self) -> str:
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from dbt.clients import system
+from dbt.events.functions import fire_event
+from dbt.events.types import DepsCacheCorrupt, DepsCacheEvicted, DepsCacheHit
+
+# the size the package cache is trimmed to after adding a package, unless
+# DBT_PACKAGE_CACHE_MAX_MB is set
+DEFAULT_MAX_SIZE_MB = 1024
+
+MANIFEST_NAME = "manifest.json"
+TREE_NAME = "tree"
+
+CacheKey = Tuple[str, ...]
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(1024 * 64), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_tree(root: str) -> Dict[str, str]:
+    """Map the path of every file under root, relative to it, to a hash of
+    its contents. Symlinks are recorded by their target.
+    """
+    hashes: Dict[str, str] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            relpath = os.path.relpath(path, root).replace(os.sep, "/")
+            if os.path.islink(path):
+                hashes[relpath] = "symlink:" + os.readlink(path)
+            else:
+                hashes[relpath] = "sha256:" + _hash_file(path)
+    return hashes
+
+
+class _Entry(NamedTuple):
+    path: str
+    last_used: float
+    size: int
+
+
+class PackageCache:
+    """A directory of extracted packages, shared by every project that uses
+    it. Each package is stored under a hash of its key, like
+    ('hub', 'dbt-labs/dbt_utils', '0.8.0') or ('git', url, sha, subdirectory),
+    along with a manifest of the hashes of its files. Entries are checked
+    against their manifests before every use, and the least recently used
+    ones are evicted once the cache grows past max_size bytes.
+
+    Other processes may be installing from an entry while it's removed, so
+    entries are renamed aside before they're deleted, and an install that
+    overlaps with that is treated as a cache miss.
+    """
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+
+    @classmethod
+    def from_env(cls) -> Optional["PackageCache"]:
+        # the cache is opt-in, by setting DBT_PACKAGE_CACHE_DIR
+        path = os.getenv("DBT_PACKAGE_CACHE_DIR")
+        if not path:
+            return None
+        max_size_mb = int(os.getenv("DBT_PACKAGE_CACHE_MAX_MB") or DEFAULT_MAX_SIZE_MB)
+        return cls(path, max_size_mb * 1024 * 1024)
+
+    def _entry_path(self, key: CacheKey) -> str:
+        digest = hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, digest)
+
+    def _remove(self, entry_path: str) -> bool:
+        # a dot-prefixed name, like an entry that is still being built
+        removed = tempfile.mkdtemp(prefix=".del-", dir=self.path)
+        try:
+            os.rename(entry_path, os.path.join(removed, TREE_NAME))
+        except OSError:
+            # another process removed it first
+            return False
+        finally:
+            shutil.rmtree(removed, ignore_errors=True)
+        return True
+
+    def _discard(self, entry_path: str, reason: str) -> None:
+        fire_event(DepsCacheCorrupt(path=entry_path, reason=reason))
+        self._remove(entry_path)
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """Return the path to the cached package tree for the key, or None if
+        it isn't cached or the cached copy has been modified.
+        """
+        entry_path = self._entry_path(key)
+        manifest_path = os.path.join(entry_path, MANIFEST_NAME)
+        try:
+            with open(manifest_path) as fp:
+                manifest = json.load(fp)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._discard(entry_path, "its manifest can't be read")
+            return None
+
+        tree = os.path.join(entry_path, TREE_NAME)
+        if manifest.get("key") != list(key) or manifest.get("files") != _hash_tree(tree):
+            self._discard(entry_path, "its files don't match its manifest")
+            return None
+        # the manifest's modification time is when the entry was last used
+        os.utime(manifest_path)
+        fire_event(DepsCacheHit(path=tree))
+        return tree
+
+    def put(self, key: CacheKey, src: str) -> None:
+        """Copy the package tree at src into the cache, then evict entries
+        until the cache fits in max_size.
+        """
+        system.make_directory(self.path)
+        # build the entry next to where it belongs, then move it into place,
+        # so other processes never see half an entry
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        try:
+            tree = os.path.join(staging, TREE_NAME)
+            shutil.copytree(src, tree, symlinks=True, ignore=shutil.ignore_patterns(".git"))
+            files = _hash_tree(tree)
+            size = sum(os.lstat(os.path.join(tree, relpath)).st_size for relpath in files)
+            with open(os.path.join(staging, MANIFEST_NAME), "w") as fp:
+                json.dump({"key": list(key), "files": files, "size": size}, fp)
+            try:
+                os.rename(staging, self._entry_path(key))
+            except OSError:
+                # another process cached the same package first
+                pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def install(self, tree: str, dest_path: str) -> bool:
+        """Recreate a cached package tree at dest_path, with hard links to
+        the cached files where possible and copies of them otherwise. Return
+        False, leaving nothing at dest_path, if the entry was removed in the
+        meantime.
+        """
+        entry_path = os.path.dirname(tree)
+        try:
+            entry = os.stat(entry_path)
+            self._link_tree(tree, dest_path)
+            # the entry is renamed aside before it's removed, so if it's still
+            # in place, every file was there when it was linked
+            installed = os.path.samestat(entry, os.stat(entry_path))
+        except OSError:
+            installed = False
+        if not installed:
+            shutil.rmtree(dest_path, ignore_errors=True)
+        return installed
+
+    def _link_tree(self, tree: str, dest_path: str) -> None:
+        def onerror(exc: OSError) -> None:
+            raise exc
+
+        for dirpath, dirnames, filenames in os.walk(tree, onerror=onerror):
+            dest_dir = os.path.join(dest_path, os.path.relpath(dirpath, tree))
+            os.makedirs(dest_dir, exist_ok=True)
+            for name in filenames:
+                src = os.path.join(dirpath, name)
+                dst = os.path.join(dest_dir, name)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                    continue
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    # different filesystems, or no hard links at all
+                    shutil.copy2(src, dst)
+
+    def _entries(self) -> List[_Entry]:
+        entries: List[_Entry] = []
+        for name in os.listdir(self.path):
+            if name.startswith("."):
+                continue
+            entry_path = os.path.join(self.path, name)
+            manifest_path = os.path.join(entry_path, MANIFEST_NAME)
+            try:
+                last_used = os.stat(manifest_path).st_mtime
+                with open(manifest_path) as fp:
+                    size = int(json.load(fp)["size"])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            entries.append(_Entry(entry_path, last_used, size))
+        return entries
+
+    def evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry.last_used)
+        total = sum(entry.size for entry in entries)
+        for entry in entries:
+            if total <= self.max_size:
+                break
+            total -= entry.size
+            if self._remove(entry.path):
+                fire_event(DepsCacheEvicted(path=entry.path, size=entry.size))
@@ -1,6 +1,6 @@
 import os
 import hashlib
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from dbt.clients import git, system
 from dbt.config import Project
@@ -9,6 +9,7 @@ from dbt.contracts.project import (
     GitPackage,
 )
 from dbt.deps.base import PinnedPackage, UnpinnedPackage, get_downloads_path
+from dbt.deps.cache import CacheKey, PackageCache
 from dbt.exceptions import ExecutableError, warn_or_error, raise_dependency_error
 from dbt.events.functions import fire_event
 from dbt.events.types import EnsureGitInstalled
@@ -49,6 +50,7 @@ class GitPinnedPackage(GitPackageMixin, PinnedPackage):
         self.warn_unpinned = warn_unpinned
         self.subdirectory = subdirectory
         self._checkout_name = md5sum(self.git)
+        self._cache_key: Optional[CacheKey] = None
 
     def get_version(self):
         return self.revision
@@ -89,8 +91,30 @@ class GitPinnedPackage(GitPackageMixin, PinnedPackage):
             raise
         return os.path.join(get_downloads_path(), dir_)
 
+    def _package_cache(self) -> Tuple[Optional[PackageCache], Optional[CacheKey]]:
+        """The package cache, if it's enabled, and this package's key in it.
+        Packages are cached by the commit their revision points to, so that
+        has to be looked up in the remote repository; if it can't be, the
+        key is None.
+        """
+        cache = PackageCache.from_env()
+        if cache is None:
+            return None, None
+        if self._cache_key is None:
+            sha = git.resolve_revision(get_downloads_path(), self.git, self.revision)
+            if sha is None:
+                return cache, None
+            self._cache_key = ("git", self.git, sha, self.subdirectory or "")
+        return cache, self._cache_key
+
+    def _cached_tree(self) -> Optional[str]:
+        cache, key = self._package_cache()
+        if cache is None or key is None:
+            return None
+        return cache.get(key)
+
     def _fetch_metadata(self, project, renderer) -> ProjectPackageMetadata:
-        path = self._checkout()
+        path = self._cached_tree() or self._checkout()
 
         if self.unpinned_msg() and self.warn_unpinned:
             warn_or_error(
@@ -111,7 +135,14 @@ class GitPinnedPackage(GitPackageMixin, PinnedPackage):
             else:
                 system.rmdir(dest_path)
 
+        cache, key = self._package_cache()
+        cached_tree = cache.get(key) if cache and key else None
+        if cache and cached_tree and cache.install(cached_tree, dest_path):
+            return
+
         system.move(self._checkout(), dest_path)
+        if cache and key:
+            cache.put(key, dest_path)
 
 
 class GitUnpinnedPackage(GitPackageMixin, UnpinnedPackage[GitPinnedPackage]):
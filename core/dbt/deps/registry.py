@@ -9,6 +9,7 @@ from dbt.contracts.project import (
     RegistryPackage,
 )
 from dbt.deps.base import PinnedPackage, UnpinnedPackage, get_downloads_path
+from dbt.deps.cache import PackageCache
 from dbt.exceptions import (
     package_version_not_found,
     VersionsNotCompatibleException,
@@ -68,10 +69,22 @@ class RegistryPinnedPackage(RegistryPackageMixin, PinnedPackage):
         deps_path = project.packages_install_path
         package_name = self.get_project_name(project, renderer)
 
+        cache = PackageCache.from_env()
+        cache_key = ("hub", self.package, self.version)
+        dest_path = os.path.join(deps_path, package_name)
+        cached_tree = cache.get(cache_key) if cache else None
+        if cache and cached_tree:
+            if os.path.exists(dest_path):
+                system.rmdir(dest_path)
+            if cache.install(cached_tree, dest_path):
+                return
+
         download_untar_fn = functools.partial(
             self.download_and_untar, download_url, tar_path, deps_path, package_name
         )
         connection_exception_retry(download_untar_fn, 5)
+        if cache:
+            cache.put(cache_key, dest_path)
 
     def download_and_untar(self, download_url, tar_path, deps_path, package_name):
         """
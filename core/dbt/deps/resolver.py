@@ -5,7 +5,7 @@ from dbt.exceptions import raise_dependency_error, InternalException
 
 from dbt.config import Project, RuntimeConfig
 from dbt.config.renderer import DbtProjectYamlRenderer
-from dbt.deps.base import BasePackage, PinnedPackage, UnpinnedPackage
+from dbt.deps.base import BasePackage, PinnedPackage, UnpinnedPackage, package_executor
 from dbt.deps.local import LocalUnpinnedPackage
 from dbt.deps.git import GitUnpinnedPackage
 from dbt.deps.registry import RegistryUnpinnedPackage
@@ -115,23 +115,42 @@ def _check_for_duplicate_project_names(
         seen.add(project_name)
 
 
+def _same_pin(a: PinnedPackage, b: PinnedPackage) -> bool:
+    return type(a) is type(b) and str(a) == str(b) and a.get_subdirectory() == b.get_subdirectory()
+
+
 def resolve_packages(
     packages: List[PackageContract], config: RuntimeConfig
 ) -> List[PinnedPackage]:
     pending = PackageListing.from_contracts(packages)
     final = PackageListing()
+    # the latest resolution of each package in final. When a package
+    # resolves to the same pin again, reusing it reuses its metadata.
+    pinned: Dict[str, PinnedPackage] = {}
 
     renderer = DbtProjectYamlRenderer(config, config.cli_vars)
 
-    while pending:
-        next_pending = PackageListing()
-        # resolve the dependency in question
-        for package in pending:
-            final.incorporate(package)
-            target = final[package].resolved().fetch_metadata(config, renderer)
-            next_pending.update_from(target.packages)
-        pending = next_pending
-
-    resolved = final.resolved()
+    def pin(package: UnpinnedPackage) -> PinnedPackage:
+        resolved = final[package].resolved()
+        previous = pinned.get(final._pick_key(package))
+        if previous is not None and _same_pin(previous, resolved):
+            resolved = previous
+        resolved.fetch_metadata(config, renderer)
+        return resolved
+
+    with package_executor() as executor:
+        while pending:
+            for package in pending:
+                final.incorporate(package)
+            # resolve the dependencies in question at once, then find their
+            # own dependencies in order
+            next_pending = PackageListing()
+            for package, resolved in zip(pending, executor.map(pin, pending)):
+                pinned[final._pick_key(package)] = resolved
+                target = resolved.fetch_metadata(config, renderer)
+                next_pending.update_from(target.packages)
+            pending = next_pending
+
+    resolved = [pinned[key] for key in final.packages]
     _check_for_duplicate_project_names(resolved, config, renderer)
     return resolved
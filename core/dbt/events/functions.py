@@ -16,10 +16,13 @@ import logging
 from logging import Logger
 import sys
 from logging.handlers import RotatingFileHandler
+import atexit
 import os
+import queue
 import uuid
 import threading
-from typing import Any, Dict, List, Optional, Union
+import traceback
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 from collections import deque
 
 global LOG_VERSION
@@ -49,6 +52,13 @@ STDOUT_LOG.addHandler(stdout_handler)
 format_color = True
 format_json = False
 invocation_id: Optional[str] = None
+# the secrets to scrub from log lines, read once per invocation by setup_event_logger
+log_secrets: Optional[List[str]] = None
+
+# the background writer used when flags.ASYNC_LOGGING is set
+ASYNC_LOG_QUEUE_SIZE = 10000
+ASYNC_LOG_BATCH_SIZE = 500
+EVENT_WRITER: Optional["AsyncEventWriter"] = None
 
 # Colorama needs some help on windows because we're using logger.info
 # intead of print(). If the Windows env doesn't have a TERM var set,
@@ -74,6 +84,9 @@ def setup_event_logger(log_path, level_override=None):
     # flags have been resolved, and log_path is known
     global EVENT_HISTORY
     EVENT_HISTORY = deque(maxlen=flags.EVENT_BUFFER_SIZE)  # type: ignore
+    # write out anything queued for the previous loggers before replacing them
+    stop_event_writer()
+    this.log_secrets = env_secrets()
 
     make_log_dir_if_missing(log_path)
     this.format_json = flags.LOG_FORMAT == "json"
@@ -116,6 +129,9 @@ def setup_event_logger(log_path, level_override=None):
     this.FILE_LOG.handlers.clear()
     this.FILE_LOG.addHandler(file_handler)
 
+    if flags.ASYNC_LOGGING:
+        this.EVENT_WRITER = AsyncEventWriter(ASYNC_LOG_QUEUE_SIZE, ASYNC_LOG_BATCH_SIZE)
+
 
 # used for integration tests
 def capture_stdout_logs() -> StringIO:
@@ -148,10 +164,19 @@ def scrub_secrets(msg: str, secrets: List[str]) -> str:
     return scrubbed
 
 
+# the secrets for log lines: cached for the invocation once the logger is set up
+def get_log_secrets() -> List[str]:
+    if this.log_secrets is None:
+        return env_secrets()
+    return this.log_secrets
+
+
 # returns a dictionary representation of the event fields.
 # the message may contain secrets which must be scrubbed at the usage site.
 def event_to_serializable_dict(
     e: T_Event,
+    ts: Optional[datetime] = None,
+    thread_name: Optional[str] = None,
 ) -> Dict[str, Any]:
 
     log_line = dict()
@@ -171,13 +196,13 @@ def event_to_serializable_dict(
     event_dict = {
         "type": "log_line",
         "log_version": LOG_VERSION,
-        "ts": get_ts_rfc3339(),
+        "ts": get_ts_rfc3339(ts),
         "pid": e.get_pid(),
         "msg": e.message(),
         "level": e.level_tag(),
         "data": log_line,
         "invocation_id": e.get_invocation_id(),
-        "thread_name": e.get_thread_name(),
+        "thread_name": thread_name or e.get_thread_name(),
         "code": e.code,
     }
 
@@ -186,94 +211,213 @@ def event_to_serializable_dict(
 
 # translates an Event to a completely formatted text-based log line
 # type hinting everything as strings so we don't get any unintentional string conversions via str()
-def create_info_text_log_line(e: T_Event) -> str:
+# the timestamp and thread name can be passed in by the AsyncEventWriter, which
+# formats events on its own thread, after they were fired.
+def create_info_text_log_line(e: T_Event, ts: Optional[datetime] = None) -> str:
     color_tag: str = "" if this.format_color else Style.RESET_ALL
-    ts: str = get_ts().strftime("%H:%M:%S")
-    scrubbed_msg: str = scrub_secrets(e.message(), env_secrets())
-    log_line: str = f"{color_tag}{ts}  {scrubbed_msg}"
+    ts_str: str = (ts or get_ts()).strftime("%H:%M:%S")
+    scrubbed_msg: str = scrub_secrets(e.message(), get_log_secrets())
+    log_line: str = f"{color_tag}{ts_str}  {scrubbed_msg}"
     return log_line
 
 
-def create_debug_text_log_line(e: T_Event) -> str:
+def create_debug_text_log_line(
+    e: T_Event, ts: Optional[datetime] = None, thread_name: Optional[str] = None
+) -> str:
+    ts = ts or get_ts()
     log_line: str = ""
     # Create a separator if this is the beginning of an invocation
     if type(e) == MainReportVersion:
         separator = 30 * "="
-        log_line = f"\n\n{separator} {get_ts()} | {get_invocation_id()} {separator}\n"
+        log_line = f"\n\n{separator} {ts} | {get_invocation_id()} {separator}\n"
     color_tag: str = "" if this.format_color else Style.RESET_ALL
-    ts: str = get_ts().strftime("%H:%M:%S.%f")
-    scrubbed_msg: str = scrub_secrets(e.message(), env_secrets())
+    ts_str: str = ts.strftime("%H:%M:%S.%f")
+    scrubbed_msg: str = scrub_secrets(e.message(), get_log_secrets())
     level: str = e.level_tag() if len(e.level_tag()) == 5 else f"{e.level_tag()} "
     thread = ""
-    if threading.current_thread().getName():
+    if thread_name is None:
         thread_name = threading.current_thread().getName()
+    if thread_name:
         thread_name = thread_name[:10]
         thread_name = thread_name.ljust(10, " ")
         thread = f" [{thread_name}]:"
-    log_line = log_line + f"{color_tag}{ts} [{level}]{thread} {scrubbed_msg}"
+    log_line = log_line + f"{color_tag}{ts_str} [{level}]{thread} {scrubbed_msg}"
     return log_line
 
 
 # translates an Event to a completely formatted json log line
-def create_json_log_line(e: T_Event) -> Optional[str]:
+def create_json_log_line(
+    e: T_Event, ts: Optional[datetime] = None, thread_name: Optional[str] = None
+) -> Optional[str]:
     if type(e) == EmptyLine:
         return None  # will not be sent to logger
     # using preformatted ts string instead of formatting it here to be extra careful about timezone
-    values = event_to_serializable_dict(e)
+    values = event_to_serializable_dict(e, ts, thread_name)
     raw_log_line = json.dumps(values, sort_keys=True)
-    return scrub_secrets(raw_log_line, env_secrets())
+    return scrub_secrets(raw_log_line, get_log_secrets())
 
 
 # calls create_stdout_text_log_line() or create_json_log_line() according to logger config
-def create_log_line(e: T_Event, file_output=False) -> Optional[str]:
+def create_log_line(
+    e: T_Event,
+    file_output=False,
+    ts: Optional[datetime] = None,
+    thread_name: Optional[str] = None,
+) -> Optional[str]:
     if this.format_json:
-        return create_json_log_line(e)  # json output, both console and file
+        return create_json_log_line(e, ts, thread_name)  # json output, both console and file
     elif file_output is True or flags.DEBUG:
-        return create_debug_text_log_line(e)  # default file output
+        return create_debug_text_log_line(e, ts, thread_name)  # default file output
     else:
-        return create_info_text_log_line(e)  # console output
+        return create_info_text_log_line(e, ts)  # console output
+
+
+LOG_LEVELS = {
+    # TODO after implmenting #3977 send to new test level
+    "test": logging.DEBUG,
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+
+def get_log_level(level_tag: str, log_line: str) -> int:
+    try:
+        return LOG_LEVELS[level_tag]
+    except KeyError:
+        raise AssertionError(
+            f"While attempting to log {log_line}, encountered the unhandled level: {level_tag}"
+        )
 
 
-# allows for resuse of this obnoxious if else tree.
 # do not use for exceptions, it doesn't pass along exc_info, stack_info, or extra
 def send_to_logger(l: Union[Logger, logbook.Logger], level_tag: str, log_line: str):
     if not log_line:
         return
-    if level_tag == "test":
-        # TODO after implmenting #3977 send to new test level
-        l.debug(log_line)
-    elif level_tag == "debug":
-        l.debug(log_line)
-    elif level_tag == "info":
-        l.info(log_line)
-    elif level_tag == "warn":
-        l.warning(log_line)
-    elif level_tag == "error":
-        l.error(log_line)
+    level = get_log_level(level_tag, log_line)
+    if isinstance(l, logbook.Logger):
+        # logbook numbers its levels differently, but has the same names
+        l.log(logging.getLevelName(level), log_line)
     else:
-        raise AssertionError(
-            f"While attempting to log {log_line}, encountered the unhandled level: {level_tag}"
-        )
+        l.log(level, log_line)
 
 
 def send_exc_to_logger(
     l: Logger, level_tag: str, log_line: str, exc_info=True, stack_info=False, extra=False
 ):
-    if level_tag == "test":
-        # TODO after implmenting #3977 send to new test level
-        l.debug(log_line, exc_info=exc_info, stack_info=stack_info, extra=extra)
-    elif level_tag == "debug":
-        l.debug(log_line, exc_info=exc_info, stack_info=stack_info, extra=extra)
-    elif level_tag == "info":
-        l.info(log_line, exc_info=exc_info, stack_info=stack_info, extra=extra)
-    elif level_tag == "warn":
-        l.warning(log_line, exc_info=exc_info, stack_info=stack_info, extra=extra)
-    elif level_tag == "error":
-        l.error(log_line, exc_info=exc_info, stack_info=stack_info, extra=extra)
-    else:
-        raise AssertionError(
-            f"While attempting to log {log_line}, encountered the unhandled level: {level_tag}"
-        )
+    level = get_log_level(level_tag, log_line)
+    l.log(level, log_line, exc_info=exc_info, stack_info=stack_info, extra=extra)
+
+
+# sends many log lines to a logger as one record, which the handlers write
+# (and flush) at once. Lines below the level of the logger are dropped.
+def send_lines_to_logger(l: Logger, lines: List[Tuple[int, str]]):
+    enabled = [(level, line) for level, line in lines if l.isEnabledFor(level)]
+    if not enabled:
+        return
+    level = max(level for level, _ in enabled)
+    l.log(level, "\n".join(line for _, line in enabled))
+
+
+# the log lines of an event, formatted when it was fired
+class QueuedEvent(NamedTuple):
+    level: int
+    file_line: Optional[str]
+    stdout_line: Optional[str]
+
+
+# formats an event's log lines, which are the same for both if they're json
+def format_queued_event(e: Event, to_file: bool, to_stdout: bool) -> QueuedEvent:
+    ts = get_ts()
+    thread_name = threading.current_thread().getName()
+    file_line = None
+    if to_file:
+        file_line = create_log_line(e, True, ts, thread_name)
+    stdout_line = None
+    if to_stdout:
+        if this.format_json and to_file:
+            stdout_line = file_line
+        else:
+            stdout_line = create_log_line(e, False, ts, thread_name)
+    return QueuedEvent(LOG_LEVELS[e.level_tag()], file_line, stdout_line)
+
+
+# writes a batch of queued events to the file and stdout loggers
+def write_queued_events(events: List[QueuedEvent]) -> None:
+    file_lines: List[Tuple[int, str]] = []
+    stdout_lines: List[Tuple[int, str]] = []
+    for queued in events:
+        if queued.file_line:
+            file_lines.append((queued.level, queued.file_line))
+        if queued.stdout_line:
+            stdout_lines.append((queued.level, queued.stdout_line))
+    send_lines_to_logger(FILE_LOG, file_lines)
+    send_lines_to_logger(STDOUT_LOG, stdout_lines)
+
+
+# Used when flags.ASYNC_LOGGING is set. fire_event formats the events and
+# puts their log lines on a bounded queue (blocking when it is full), and they
+# are written in batches by a background thread, instead of on the thread
+# that fired them. The lines are formatted when the event is fired because
+# events can refer to state that changes later, like the relation cache.
+class AsyncEventWriter:
+    def __init__(self, queue_size: int, batch_size: int) -> None:
+        self.batch_size = batch_size
+        # None is put on the queue to stop the thread
+        self.queue: "queue.Queue[Optional[QueuedEvent]]" = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self._run, name="EventWriter", daemon=True)
+        self.thread.start()
+
+    def put(self, e: Event, to_file: bool, to_stdout: bool) -> None:
+        self.queue.put(format_queued_event(e, to_file, to_stdout))
+
+    # blocks until all of the queued events have been written
+    def flush(self) -> None:
+        if self.thread.is_alive():
+            self.queue.join()
+
+    def stop(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            events = [queued for queued in batch if queued is not None]
+            try:
+                write_queued_events(events)
+            except Exception:
+                # keep writing the events that come after these
+                sys.stderr.write(traceback.format_exc())
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            if len(events) < len(batch):
+                return
+
+
+# writes out the queued events, if there is a background writer
+def flush_event_writer() -> None:
+    if this.EVENT_WRITER is not None:
+        this.EVENT_WRITER.flush()
+
+
+# writes out the queued events and stops the background writer
+def stop_event_writer() -> None:
+    writer = this.EVENT_WRITER
+    if writer is not None:
+        this.EVENT_WRITER = None
+        writer.stop()
+
+
+atexit.register(stop_event_writer)
 
 
 # top-level method for accessing the new eventing system
@@ -304,20 +448,32 @@ def fire_event(e: Event) -> None:
         return  # exit the function to avoid using the current logger as well
 
     # always logs debug level regardless of user input
-    if not isinstance(e, NoFile):
+    to_file = not isinstance(e, NoFile)
+    to_stdout = not isinstance(e, NoStdOut)
+    if to_stdout:
+        # explicitly checking the debug flag here so that potentially expensive-to-construct
+        # log messages are not constructed if debug messages are never shown.
+        if e.level_tag() == "debug" and not flags.DEBUG:
+            to_stdout = False  # eat the message in case it was one of the expensive ones
+        elif e.level_tag() != "error" and flags.QUIET:
+            to_stdout = False  # eat all non-exception messages in quiet mode
+
+    writer = this.EVENT_WRITER
+    if writer is not None:
+        if not isinstance(e, ShowException):
+            writer.put(e, to_file, to_stdout)
+            return
+        # the exception info is only available on this thread: write out the
+        # queued events first, and then log this one here.
+        writer.flush()
+
+    if to_file:
         log_line = create_log_line(e, file_output=True)
         # doesn't send exceptions to exception logger
         if log_line:
             send_to_logger(FILE_LOG, level_tag=e.level_tag(), log_line=log_line)
 
-    if not isinstance(e, NoStdOut):
-        # explicitly checking the debug flag here so that potentially expensive-to-construct
-        # log messages are not constructed if debug messages are never shown.
-        if e.level_tag() == "debug" and not flags.DEBUG:
-            return  # eat the message in case it was one of the expensive ones
-        if e.level_tag() != "error" and flags.QUIET:
-            return  # eat all non-exception messages in quiet mode
-
+    if to_stdout:
         log_line = create_log_line(e)
         if log_line:
             if not isinstance(e, ShowException):
@@ -354,7 +510,7 @@ def get_ts() -> datetime:
 
 
 # preformatted time stamp
-def get_ts_rfc3339() -> str:
-    ts = get_ts()
+def get_ts_rfc3339(ts: Optional[datetime] = None) -> str:
+    ts = ts or get_ts()
     ts_rfc3339 = ts.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
     return ts_rfc3339
@@ -1411,6 +1411,35 @@ class DepsNotifyUpdatesAvailable(InfoLevel):
         )
 
 
+@dataclass
+class DepsCacheHit(DebugLevel):
+    path: str
+    code: str = "M020"
+
+    def message(self) -> str:
+        return f"  Installing from the package cache at {self.path}"
+
+
+@dataclass
+class DepsCacheCorrupt(WarnLevel):
+    path: str
+    reason: str
+    code: str = "M021"
+
+    def message(self) -> str:
+        return f"Removing {self.path} from the package cache: {self.reason}"
+
+
+@dataclass
+class DepsCacheEvicted(DebugLevel):
+    path: str
+    size: int
+    code: str = "M022"
+
+    def message(self) -> str:
+        return f"Evicted {self.path} ({self.size} bytes) from the package cache"
+
+
 @dataclass
 class DatabaseErrorRunning(InfoLevel):
     hook_type: str
@@ -1502,6 +1531,55 @@ class FreshnessCheckComplete(InfoLevel):
         return "Done."
 
 
+@dataclass
+class FreshnessBatchesStart(InfoLevel):
+    num_sources: int
+    num_batches: int
+    code: str = "Q036"
+
+    def message(self) -> str:
+        return (
+            f"Checking the freshness of {self.num_sources} sources in "
+            f"{self.num_batches} batched queries"
+        )
+
+
+@dataclass
+class FreshnessBatchFailed(DebugLevel):
+    num_sources: int
+    exc: str
+    code: str = "Q037"
+
+    def message(self) -> str:
+        return (
+            f"Batched freshness query for {self.num_sources} sources failed, "
+            f"checking them one at a time: {self.exc}"
+        )
+
+
+@dataclass
+class TestBatchesStart(InfoLevel):
+    num_tests: int
+    num_batches: int
+    code: str = "Q038"
+
+    def message(self) -> str:
+        return f"Running {self.num_tests} tests in {self.num_batches} batched queries"
+
+
+@dataclass
+class TestBatchFailed(DebugLevel):
+    num_tests: int
+    exc: str
+    code: str = "Q039"
+
+    def message(self) -> str:
+        return (
+            f"Batched query for {self.num_tests} tests failed, "
+            f"running them one at a time: {self.exc}"
+        )
+
+
 @dataclass
 class ServingDocsPort(InfoLevel):
     address: str
@@ -2384,6 +2462,64 @@ class EventBufferFull(WarnLevel):
         return "Internal event buffer full. Earliest events will be dropped (FIFO)."
 
 
+@dataclass
+class DaemonListening(InfoLevel):
+    path: str
+    code: str = "Z049"
+
+    def message(self) -> str:
+        return f"Listening for dbt commands on {self.path}"
+
+
+@dataclass
+class DaemonRunningCommand(InfoLevel):
+    args: List[str]
+    code: str = "Z050"
+
+    def message(self) -> str:
+        return f"Running `dbt {' '.join(self.args)}`"
+
+
+@dataclass
+class DaemonFilesChanged(DebugLevel):
+    paths: List[str]
+    code: str = "Z051"
+
+    def message(self) -> str:
+        if not self.paths:
+            return "Reparsing the project"
+        return f"Reparsing the project after changes to {pluralize(len(self.paths), 'file')}"
+
+
+@dataclass
+class DaemonCommandFailed(ErrorLevel):
+    exc: str
+    code: str = "Z052"
+
+    def message(self) -> str:
+        return f"Daemon request failed: {self.exc}"
+
+
+@dataclass
+class FastJsonUnavailable(WarnLevel):
+    code: str = "Z053"
+
+    def message(self) -> str:
+        return (
+            "--fast-json was set, but orjson is not installed. Writing "
+            "manifest.json with the standard json module instead."
+        )
+
+
+@dataclass
+class ArtifactWriteFailed(ErrorLevel):
+    exc: str
+    code: str = "Z054"
+
+    def message(self) -> str:
+        return f"Failed to write an artifact after the command failed: {self.exc}"
+
+
 # since mypy doesn't run on every file we need to suggest to mypy that every
 # class gets instantiated. But we don't actually want to run this code.
 # making the conditional `if False` causes mypy to skip it as dead code so
@@ -2539,6 +2675,9 @@ if 1 == 0:
     DepsUpdateAvailable(version_latest="")
     DepsListSubdirectory(subdirectory="")
     DepsNotifyUpdatesAvailable(packages=[])
+    DepsCacheHit(path="")
+    DepsCacheCorrupt(path="", reason="")
+    DepsCacheEvicted(path="", size=0)
     DatabaseErrorRunning(hook_type="")
     EmptyLine()
     HooksRunning(num_hooks=0, hook_type="")
@@ -2549,6 +2688,10 @@ if 1 == 0:
     BuildingCatalog()
     CompileComplete()
     FreshnessCheckComplete()
+    FreshnessBatchesStart(num_sources=0, num_batches=0)
+    FreshnessBatchFailed(num_sources=0, exc="")
+    TestBatchesStart(num_tests=0, num_batches=0)
+    TestBatchFailed(num_tests=0, exc="")
     ServingDocsPort(address="", port=0)
     ServingDocsAccessInfo(port="")
     ServingDocsExitInfo()
@@ -2737,3 +2880,9 @@ if 1 == 0:
     GeneralWarningMsg(msg="", log_fmt="")
     GeneralWarningException(exc=Exception(""), log_fmt="")
     EventBufferFull()
+    DaemonListening(path="")
+    DaemonRunningCommand(args=[])
+    DaemonFilesChanged(paths=[])
+    DaemonCommandFailed(exc="")
+    FastJsonUnavailable()
+    ArtifactWriteFailed(exc="")
@@ -23,6 +23,7 @@ STATIC_PARSER = None
 WARN_ERROR = None
 WRITE_JSON = None
 PARTIAL_PARSE = None
+FILE_HASH_CACHE = None
 USE_COLORS = None
 DEBUG = None
 LOG_FORMAT = None
@@ -35,6 +36,11 @@ INDIRECT_SELECTION = None
 LOG_CACHE_EVENTS = None
 EVENT_BUFFER_SIZE = 100000
 QUIET = None
+ASYNC_LOGGING = None
+SCHEDULING_MODE = None
+STRICT_VALIDATION = None
+FAST_JSON = None
+STREAM_RESULTS = None
 
 # Global CLI defaults. These flags are set from three places:
 # CLI args, environment variables, and user_config (profiles.yml).
@@ -45,6 +51,7 @@ flag_defaults = {
     "WARN_ERROR": False,
     "WRITE_JSON": True,
     "PARTIAL_PARSE": True,
+    "FILE_HASH_CACHE": True,
     "USE_COLORS": True,
     "PROFILES_DIR": DEFAULT_PROFILES_DIR,
     "DEBUG": False,
@@ -57,6 +64,11 @@ flag_defaults = {
     "LOG_CACHE_EVENTS": False,
     "EVENT_BUFFER_SIZE": 100000,
     "QUIET": False,
+    "ASYNC_LOGGING": False,
+    "SCHEDULING_MODE": "depth",
+    "STRICT_VALIDATION": False,
+    "FAST_JSON": False,
+    "STREAM_RESULTS": False,
 }
 
 
@@ -107,6 +119,8 @@ def set_from_args(args, user_config):
     global WRITE_JSON, PARTIAL_PARSE, USE_COLORS, STORE_FAILURES, PROFILES_DIR, DEBUG, LOG_FORMAT
     global INDIRECT_SELECTION, VERSION_CHECK, FAIL_FAST, SEND_ANONYMOUS_USAGE_STATS
     global PRINTER_WIDTH, WHICH, LOG_CACHE_EVENTS, EVENT_BUFFER_SIZE, QUIET
+    global FILE_HASH_CACHE, ASYNC_LOGGING, SCHEDULING_MODE, STRICT_VALIDATION, FAST_JSON
+    global STREAM_RESULTS
 
     STRICT_MODE = False  # backwards compatibility
     # cli args without user_config or env var option
@@ -120,6 +134,7 @@ def set_from_args(args, user_config):
     WARN_ERROR = get_flag_value("WARN_ERROR", args, user_config)
     WRITE_JSON = get_flag_value("WRITE_JSON", args, user_config)
     PARTIAL_PARSE = get_flag_value("PARTIAL_PARSE", args, user_config)
+    FILE_HASH_CACHE = get_flag_value("FILE_HASH_CACHE", args, user_config)
     USE_COLORS = get_flag_value("USE_COLORS", args, user_config)
     PROFILES_DIR = get_flag_value("PROFILES_DIR", args, user_config)
     DEBUG = get_flag_value("DEBUG", args, user_config)
@@ -132,6 +147,11 @@ def set_from_args(args, user_config):
     LOG_CACHE_EVENTS = get_flag_value("LOG_CACHE_EVENTS", args, user_config)
     EVENT_BUFFER_SIZE = get_flag_value("EVENT_BUFFER_SIZE", args, user_config)
     QUIET = get_flag_value("QUIET", args, user_config)
+    ASYNC_LOGGING = get_flag_value("ASYNC_LOGGING", args, user_config)
+    SCHEDULING_MODE = get_flag_value("SCHEDULING_MODE", args, user_config)
+    STRICT_VALIDATION = get_flag_value("STRICT_VALIDATION", args, user_config)
+    FAST_JSON = get_flag_value("FAST_JSON", args, user_config)
+    STREAM_RESULTS = get_flag_value("STREAM_RESULTS", args, user_config)
 
 
 def get_flag_value(flag, args, user_config):
@@ -150,6 +170,7 @@ def get_flag_value(flag, args, user_config):
                 "PROFILES_DIR",
                 "INDIRECT_SELECTION",
                 "EVENT_BUFFER_SIZE",
+                "SCHEDULING_MODE",
             ]:
                 flag_value = env_value
             else:
@@ -173,6 +194,7 @@ def get_flag_dict():
         "warn_error": WARN_ERROR,
         "write_json": WRITE_JSON,
         "partial_parse": PARTIAL_PARSE,
+        "file_hash_cache": FILE_HASH_CACHE,
         "use_colors": USE_COLORS,
         "profiles_dir": PROFILES_DIR,
         "debug": DEBUG,
@@ -185,4 +207,9 @@ def get_flag_dict():
         "log_cache_events": LOG_CACHE_EVENTS,
         "event_buffer_size": EVENT_BUFFER_SIZE,
         "quiet": QUIET,
+        "async_logging": ASYNC_LOGGING,
+        "scheduling_mode": SCHEDULING_MODE,
+        "strict_validation": STRICT_VALIDATION,
+        "fast_json": FAST_JSON,
+        "stream_results": STREAM_RESULTS,
     }
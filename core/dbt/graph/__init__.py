@@ -13,5 +13,5 @@ from .cli import (  # noqa: F401
     parse_difference,
     parse_from_selectors_definition,
 )
-from .queue import GraphQueue  # noqa: F401
+from .queue import GraphQueue, SchedulingMode, load_execution_times  # noqa: F401
 from .graph import Graph, UniqueId  # noqa: F401
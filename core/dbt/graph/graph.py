@@ -1,4 +1,6 @@
-from typing import Set, Iterable, Iterator, Optional, NewType
+from array import array
+from copy import copy
+from typing import Dict, List, Set, Iterable, Iterator, Optional, NewType, Tuple
 from itertools import product
 import networkx as nx  # type: ignore
 
@@ -7,6 +9,94 @@ from dbt.exceptions import InternalException
 UniqueId = NewType("UniqueId", str)
 
 
+class AdjacencyIndex:
+    """The edges of a graph in compressed sparse row form, with the nodes
+    numbered in the graph's order: the successors of node i are
+    successors[successor_offsets[i]:successor_offsets[i + 1]], and likewise
+    for the predecessors.
+
+    An index can be restricted to a subset of the nodes, which shares the
+    arrays and skips the other nodes when searching.
+    """
+
+    def __init__(self, graph) -> None:
+        self.nodes: List[UniqueId] = list(graph.nodes())
+        self.ids: Dict[UniqueId, int] = {node: i for i, node in enumerate(self.nodes)}
+        self.successors, self.successor_offsets = self._build(graph.succ)
+        self.predecessors, self.predecessor_offsets = self._build(graph.pred)
+        # if set, only the nodes with a 1 here are in the index
+        self.members: Optional[bytearray] = None
+
+    def _build(self, adjacency) -> Tuple[array, array]:
+        ids = self.ids
+        targets = array("l")
+        offsets = array("l", [0])
+        for node in self.nodes:
+            targets.extend([ids[target] for target in adjacency[node]])
+            offsets.append(len(targets))
+        return targets, offsets
+
+    def restrict(self, nodes: Iterable[UniqueId]) -> "AdjacencyIndex":
+        restricted = copy(self)
+        restricted.members = bytearray(len(self.nodes))
+        for node in nodes:
+            if self.members is None or self.members[self.ids[node]]:
+                restricted.members[self.ids[node]] = 1
+        return restricted
+
+    def __contains__(self, node: UniqueId) -> bool:
+        node_id = self.ids.get(node)
+        return node_id is not None and (self.members is None or bool(self.members[node_id]))
+
+    def reachable(
+        self, sources: Iterable[UniqueId], reverse: bool = False, max_depth: Optional[int] = None
+    ) -> Set[UniqueId]:
+        """Return the nodes reachable from any of sources in at most max_depth
+        steps, following edges backwards if reverse is set. A source is only
+        included if it is reachable from another source.
+        """
+        if reverse:
+            targets, offsets = self.predecessors, self.predecessor_offsets
+        else:
+            targets, offsets = self.successors, self.successor_offsets
+        # found: the node is reachable from one of the sources
+        # queued: the node is a source or has been found, so it's been or
+        # will be expanded. Nodes outside of the index start out as found and
+        # queued, so they're skipped.
+        if self.members is None:
+            found = bytearray(len(self.nodes))
+        else:
+            found = self.members.translate(_INVERT)
+        queued = bytearray(found)
+        frontier = []
+        for source in sources:
+            if source not in self:
+                raise InternalException(f"Node {source} not found in the graph!")
+            node_id = self.ids[source]
+            queued[node_id] = 1
+            frontier.append(node_id)
+
+        result: List[int] = []
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node_id in frontier:
+                for target in targets[offsets[node_id] : offsets[node_id + 1]]:
+                    if not found[target]:
+                        found[target] = 1
+                        result.append(target)
+                        if not queued[target]:
+                            queued[target] = 1
+                            next_frontier.append(target)
+            frontier = next_frontier
+        return {self.nodes[node_id] for node_id in result}
+
+
+# maps the bytes 0 and 1 to 1 and 0
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
 class Graph:
     """A wrapper around the networkx graph that understands SelectionCriteria
     and how they interact with the graph.
@@ -14,6 +104,19 @@ class Graph:
 
     def __init__(self, graph):
         self.graph = graph
+        self._index: Optional[AdjacencyIndex] = None
+        # set for graphs made by subgraph(), which share their parent's index
+        self._parent: Optional[Graph] = None
+
+    # The index is built the first time it's needed, so the networkx graph
+    # must not be modified after that.
+    def index(self) -> AdjacencyIndex:
+        if self._index is None:
+            if self._parent is not None:
+                self._index = self._parent.index().restrict(self.graph)
+            else:
+                self._index = AdjacencyIndex(self.graph)
+        return self._index
 
     def nodes(self) -> Set[UniqueId]:
         return set(self.graph.nodes())
@@ -47,21 +150,24 @@ class Graph:
         ancestors_for = self.select_children(selected) | selected
         return self.select_parents(ancestors_for) | ancestors_for
 
+    # select_children and select_parents search from all of the selected
+    # nodes at once over the index, instead of from each one in turn. A
+    # single node is searched from directly until the index is needed for
+    # something else, since that's cheaper than building the index.
+
     def select_children(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
-        descendants: Set[UniqueId] = set()
-        for node in selected:
-            descendants.update(self.descendants(node, max_depth))
-        return descendants
+        if len(selected) == 1 and self._index is None:
+            return self.descendants(next(iter(selected)), max_depth)
+        return self.index().reachable(selected, max_depth=max_depth)
 
     def select_parents(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
-        ancestors: Set[UniqueId] = set()
-        for node in selected:
-            ancestors.update(self.ancestors(node, max_depth))
-        return ancestors
+        if len(selected) == 1 and self._index is None:
+            return self.ancestors(next(iter(selected)), max_depth)
+        return self.index().reachable(selected, reverse=True, max_depth=max_depth)
 
     def select_successors(self, selected: Set[UniqueId]) -> Set[UniqueId]:
         successors: Set[UniqueId] = set()
@@ -70,13 +176,56 @@ class Graph:
         return successors
 
     def get_subset_graph(self, selected: Iterable[UniqueId]) -> "Graph":
-        """Create and return a new graph that is a shallow copy of the graph,
-        but with only the nodes in include_nodes. Transitive edges across
-        removed nodes are preserved as explicit new edges.
+        """Create and return a new graph with only the nodes in selected.
+        Transitive edges across removed nodes are preserved as explicit new
+        edges: a selected node depends on another if there was a path between
+        them that only went through removed nodes.
         """
+        include_nodes = set(selected)
+        for node in include_nodes:
+            if node not in self.graph:
+                raise ValueError(
+                    "Couldn't find model '{}' -- does it exist or is " "it disabled?".format(node)
+                )
+
+        try:
+            order = list(nx.topological_sort(self.graph))
+        except (nx.NetworkXUnfeasible, nx.NetworkXError):
+            # the graph has a cycle or isn't directed
+            return self._get_subset_graph_by_elimination(include_nodes)
+
+        new_graph = self.graph.__class__()
+        new_graph.graph.update(self.graph.graph)
+        new_graph.add_nodes_from(node for node in self.graph if node in include_nodes)
+        for node, data in self.graph.nodes(data=True):
+            if data and node in include_nodes:
+                new_graph.nodes[node].update(data)
+        # In topological order, find the selected nodes each node can be
+        # reached from without going through another selected node. Those
+        # are the new parents of selected nodes, and are passed down through
+        # the removed ones.
+        reached_from: Dict[UniqueId, Set[UniqueId]] = {}
+        new_edges = []
+        for node in order:
+            parents: Set[UniqueId] = set()
+            for parent in self.graph.predecessors(node):
+                if parent in include_nodes:
+                    parents.add(parent)
+                elif parent in reached_from:
+                    parents.update(reached_from[parent])
+            if node in include_nodes:
+                new_edges.extend((parent, node) for parent in parents)
+            elif parents:
+                reached_from[node] = parents
+        new_graph.add_edges_from(new_edges)
 
+        return Graph(new_graph)
+
+    def _get_subset_graph_by_elimination(self, include_nodes: Set[UniqueId]) -> "Graph":
+        """Remove the unselected nodes one at a time, connecting each one's
+        parents to its children. Used for graphs with cycles.
+        """
         new_graph = self.graph.copy()
-        include_nodes = set(selected)
 
         for node in self:
             if node not in include_nodes:
@@ -91,16 +240,12 @@ class Graph:
                 new_graph.add_edges_from(non_cyclic_new_edges)
                 new_graph.remove_node(node)
 
-        for node in include_nodes:
-            if node not in new_graph:
-                raise ValueError(
-                    "Couldn't find model '{}' -- does it exist or is " "it disabled?".format(node)
-                )
-
         return Graph(new_graph)
 
     def subgraph(self, nodes: Iterable[UniqueId]) -> "Graph":
-        return Graph(self.graph.subgraph(nodes))
+        subgraph = Graph(self.graph.subgraph(nodes))
+        subgraph._parent = self
+        return subgraph
 
     def get_dependent_nodes(self, node: UniqueId):
         return nx.descendants(self.graph, node)
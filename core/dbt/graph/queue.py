@@ -1,29 +1,81 @@
+import json
 import networkx as nx  # type: ignore
+import statistics
 import threading
 
 from queue import PriorityQueue
-from typing import Dict, Set, List, Generator, Optional
+from typing import Dict, Set, List, Generator, Optional, Mapping
 
 from .graph import UniqueId
 from dbt.contracts.graph.parsed import ParsedSourceDefinition, ParsedExposure, ParsedMetric
 from dbt.contracts.graph.compiled import GraphMemberNode
 from dbt.contracts.graph.manifest import Manifest
+from dbt.dataclass_schema import StrEnum
+from dbt.exceptions import RuntimeException
 from dbt.node_types import NodeType
 
 
+class SchedulingMode(StrEnum):
+    # run nodes in order of their depth in the graph
+    Depth = "depth"
+    # run the nodes with the longest (slowest) chain of descendants first
+    CriticalPath = "critical-path"
+
+    # the --scheduling-mode choices are checked by argparse, but the
+    # DBT_SCHEDULING_MODE variable and profiles.yml setting are not
+    @classmethod
+    def from_flag(cls, value: str) -> "SchedulingMode":
+        try:
+            return cls(value)
+        except ValueError:
+            valid = ", ".join(f"'{mode}'" for mode in cls)
+            raise RuntimeException(
+                f"Invalid scheduling mode '{value}', expected one of {valid}"
+            ) from None
+
+
+def load_execution_times(path: str) -> Dict[UniqueId, float]:
+    """Read the execution time of every node from a run_results.json file.
+    Returns an empty dict if the file doesn't exist or can't be read.
+    """
+    try:
+        with open(path) as fp:
+            results = json.load(fp)["results"]
+        return {
+            result["unique_id"]: float(result["execution_time"])
+            for result in results
+            if result.get("execution_time") is not None
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
 class GraphQueue:
     """A fancy queue that is backed by the dependency graph.
-    Note: this will mutate input!
+
+    The graph itself is not modified: the queue keeps the number of unfinished
+    parents of every node, and marking a node as done only updates the counts
+    of its children.
 
     This queue is thread-safe for `mark_done` calls, though you must ensure
     that separate threads do not call `.empty()` or `__len__()` and `.get()` at
     the same time, as there is an unlocked race!
     """
 
-    def __init__(self, graph: nx.DiGraph, manifest: Manifest, selected: Set[UniqueId]):
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        manifest: Manifest,
+        selected: Set[UniqueId],
+        scheduling_mode: SchedulingMode = SchedulingMode.Depth,
+        execution_times: Optional[Mapping[UniqueId, float]] = None,
+    ):
         self.graph = graph
         self.manifest = manifest
         self._selected = selected
+        self.scheduling_mode = scheduling_mode
+        # historical execution times, used by SchedulingMode.CriticalPath
+        self.execution_times = execution_times or {}
         # store the queue as a priority queue.
         self.inner: PriorityQueue = PriorityQueue()
         # things that have been popped off the queue but not finished
@@ -31,12 +83,25 @@ class GraphQueue:
         self.in_progress: Set[UniqueId] = set()
         # things that are in the queue
         self.queued: Set[UniqueId] = set()
+        # the children of every node, and its number of unfinished parents
+        self._children: Dict[UniqueId, List[UniqueId]] = {
+            node: list(children) for node, children in self.graph.adjacency()
+        }
+        self._in_degree: Dict[UniqueId, int] = dict(self.graph.in_degree())
+        # the number of nodes that have not been marked as done
+        self._remaining = len(self._in_degree)
         # this lock controls most things
         self.lock = threading.Lock()
         # store the 'score' of each node as a number. Lower is higher priority.
-        self._scores = self._get_scores(self.graph)
+        self._scores: Mapping[str, float]
+        if self.scheduling_mode == SchedulingMode.CriticalPath:
+            self._scores = self._get_critical_path_scores(self.graph)
+        else:
+            self._scores = self._get_scores(self.graph)
         # populate the initial queue
-        self._find_new_additions()
+        for node, in_degree in self._in_degree.items():
+            if in_degree == 0:
+                self._add_to_queue(node)
         # awaits after task end
         self.some_task_done = threading.Condition(self.lock)
 
@@ -106,6 +171,34 @@ class GraphQueue:
 
         return scores
 
+    def _get_node_weights(self, graph: nx.DiGraph) -> Dict[str, float]:
+        """The expected execution time of every node. Nodes without a known
+        execution time are assumed to take the median time of the nodes that
+        have one. Without any execution times, every node counts as 1.
+        """
+        known = [self.execution_times[n] for n in graph if n in self.execution_times]
+        default = statistics.median(known) if known else 1.0
+        return {node: self.execution_times.get(node, default) for node in graph}
+
+    def _get_critical_path_scores(self, graph: nx.DiGraph) -> Dict[str, float]:
+        """Scoring nodes by the length of the longest path from the node to
+        any of its descendants, weighted by the expected execution time of each
+        node on the path. Nodes with the longest remaining path have the lowest
+        score, and should be processed first.
+
+        Args:
+            graph: The graph to be scored.
+
+        Returns:
+            A dictionary consisting of `node name`:`score` pairs.
+        """
+        weights = self._get_node_weights(graph)
+        remaining: Dict[str, float] = {}
+        for node in reversed(list(nx.topological_sort(graph))):
+            longest_child = max((remaining[child] for child in graph.successors(node)), default=0)
+            remaining[node] = weights[node] + longest_child
+        return {node: -length for node, length in remaining.items()}
+
     def get(self, block: bool = True, timeout: Optional[float] = None) -> GraphMemberNode:
         """Get a node off the inner priority queue. By default, this blocks.
 
@@ -131,7 +224,7 @@ class GraphQueue:
         This takes the lock.
         """
         with self.lock:
-            return len(self.graph) - len(self.in_progress)
+            return self._remaining - len(self.in_progress)
 
     def empty(self) -> bool:
         """The graph queue is 'empty' if it all remaining nodes in the graph
@@ -141,28 +234,19 @@ class GraphQueue:
         """
         return len(self) == 0
 
-    def _already_known(self, node: UniqueId) -> bool:
-        """Decide if a node is already known (either handed out as a task, or
-        in the queue).
-
-        Callers must hold the lock.
+    def _add_to_queue(self, node: UniqueId) -> None:
+        """Add a node whose parents are all done to the internal queue.
 
-        :param str node: The node ID to check
-        :returns bool: If the node is in progress/queued.
-        """
-        return node in self.in_progress or node in self.queued
+        Callers must hold the lock, except during initialization.
 
-    def _find_new_additions(self) -> None:
-        """Find any nodes in the graph that need to be added to the internal
-        queue and add them.
+        :param str node: The node ID to add
         """
-        for node, in_degree in self.graph.in_degree():
-            if not self._already_known(node) and in_degree == 0:
-                self.inner.put((self._scores[node], node))
-                self.queued.add(node)
+        self.inner.put((self._scores[node], node))
+        self.queued.add(node)
 
     def mark_done(self, node_id: UniqueId) -> None:
-        """Given a node's unique ID, mark it as done.
+        """Given a node's unique ID, mark it as done, and add any of its
+        children that have no other unfinished parents to the queue.
 
         This method takes the lock.
 
@@ -170,8 +254,11 @@ class GraphQueue:
         """
         with self.lock:
             self.in_progress.remove(node_id)
-            self.graph.remove_node(node_id)
-            self._find_new_additions()
+            self._remaining -= 1
+            for child in self._children[node_id]:
+                self._in_degree[child] -= 1
+                if self._in_degree[child] == 0:
+                    self._add_to_queue(child)
             self.inner.task_done()
             self.some_task_done.notify_all()
 
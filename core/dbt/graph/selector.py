@@ -1,7 +1,7 @@
-from typing import Set, List, Optional, Tuple
+from typing import Set, List, Optional, Tuple, Mapping
 
 from .graph import Graph, UniqueId
-from .queue import GraphQueue
+from .queue import GraphQueue, SchedulingMode
 from .selector_methods import MethodManager
 from .selector_spec import SelectionCriteria, SelectionSpec, IndirectSelection
 
@@ -264,14 +264,21 @@ class NodeSelector(MethodManager):
 
         return filtered_nodes
 
-    def get_graph_queue(self, spec: SelectionSpec) -> GraphQueue:
+    def get_graph_queue(
+        self,
+        spec: SelectionSpec,
+        scheduling_mode: SchedulingMode = SchedulingMode.Depth,
+        execution_times: Optional[Mapping[UniqueId, float]] = None,
+    ) -> GraphQueue:
         """Returns a queue over nodes in the graph that tracks progress of
         dependecies.
         """
         selected_nodes = self.get_selected(spec)
         new_graph = self.full_graph.get_subset_graph(selected_nodes)
         # should we give a way here for consumers to mutate the graph?
-        return GraphQueue(new_graph.graph, self.manifest, selected_nodes)
+        return GraphQueue(
+            new_graph.graph, self.manifest, selected_nodes, scheduling_mode, execution_times
+        )
 
 
 class ResourceTypeSelector(NodeSelector):
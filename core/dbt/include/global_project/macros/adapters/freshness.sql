@@ -24,3 +24,29 @@
   {% endcall %}
   {{ return(load_result('collect_freshness').table) }}
 {% endmacro %}
+
+
+{% macro collect_freshness_batch(sources) %}
+  {{ return(adapter.dispatch('collect_freshness_batch', 'dbt')(sources))}}
+{% endmacro %}
+
+{% macro default__collect_freshness_batch(sources) %}
+  {#-
+    One column per source, rather than one row per source in a `union all`:
+    a union would cast every source's max_loaded_at to one common type.
+  -#}
+  {% call statement('collect_freshness_batch', fetch_result=True, auto_begin=False) -%}
+    select
+      {{ current_timestamp() }} as snapshotted_at
+      {%- for source in sources %},
+      (
+        select max({{ source.loaded_at_field }})
+        from {{ source.relation }}
+        {% if source.filter %}
+        where {{ source.filter }}
+        {% endif %}
+      ) as max_loaded_at_{{ loop.index0 }}
+      {%- endfor %}
+  {% endcall %}
+  {{ return(load_result('collect_freshness_batch').table) }}
+{% endmacro %}
@@ -8,7 +8,15 @@
   {%- set exists_as_table = (old_relation is not none and old_relation.is_table) -%}
   {%- set exists_as_view = (old_relation is not none and old_relation.is_view) -%}
 
-  {%- set agate_table = load_agate_table() -%}
+  {#-- seeds configured to stream, on adapters that can, only load a sample
+       of the rows into the agate table, to infer the column types from --#}
+  {%- if config.get('stream', false) and adapter.supports_seed_streaming() -%}
+    {%- set seed_file = load_seed_file() -%}
+    {%- set agate_table = seed_file.sample -%}
+  {%- else -%}
+    {%- set seed_file = none -%}
+    {%- set agate_table = load_agate_table() -%}
+  {%- endif -%}
   {%- do store_result('agate_table', response='OK', agate_table=agate_table) -%}
 
   {{ run_hooks(pre_hooks, inside_transaction=False) }}
@@ -27,8 +35,14 @@
   {% endif %}
 
   {% set code = 'CREATE' if full_refresh_mode else 'INSERT' %}
-  {% set rows_affected = (agate_table.rows | length) %}
-  {% set sql = load_csv_rows(model, agate_table) %}
+  {% if seed_file is not none %}
+    {% set cols_sql = get_seed_column_quoted_csv(model, seed_file.column_names) %}
+    {% set rows_affected = adapter.load_seed_rows(this, cols_sql, seed_file) %}
+    {% set sql = "-- streamed " ~ rows_affected ~ " rows from " ~ model.original_file_path %}
+  {% else %}
+    {% set rows_affected = (agate_table.rows | length) %}
+    {% set sql = load_csv_rows(model, agate_table) %}
+  {% endif %}
 
   {% call noop_statement('main', code ~ ' ' ~ rows_affected, code, rows_affected) %}
     {{ create_table_sql }};
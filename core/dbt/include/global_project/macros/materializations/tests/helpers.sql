@@ -12,3 +12,17 @@
       {{ "limit " ~ limit if limit != none }}
     ) dbt_internal_test
 {%- endmacro %}
+
+{% macro get_batched_test_sql(tests) -%}
+  {{ adapter.dispatch('get_batched_test_sql', 'dbt')(tests) }}
+{%- endmacro %}
+
+{% macro default__get_batched_test_sql(tests) -%}
+  {%- for test in tests %}
+    select {{ loop.index0 }} as test_index, dbt_batched_test.*
+    from (
+      {{ get_test_sql(test.main_sql, test.fail_calc, test.warn_if, test.error_if, test.limit) }}
+    ) dbt_batched_test
+    {% if not loop.last %}union all{% endif %}
+  {%- endfor %}
+{%- endmacro %}
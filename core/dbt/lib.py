@@ -39,6 +39,7 @@ def get_dbt_config(project_dir, args=None, single_threaded=False):
 def get_task_by_type(type):
     # TODO: we need to tell dbt-server what tasks are available
     from dbt.task.run import RunTask
+    from dbt.task.compile import CompileTask
     from dbt.task.list import ListTask
     from dbt.task.seed import SeedTask
     from dbt.task.test import TestTask
@@ -48,6 +49,8 @@ def get_task_by_type(type):
 
     if type == "run":
         return RunTask
+    elif type == "compile":
+        return CompileTask
     elif type == "test":
         return TestTask
     elif type == "list":
@@ -2,6 +2,7 @@ from typing import List
 from dbt.logger import log_cache_events, log_manager
 
 import argparse
+import importlib
 import os.path
 import sys
 import traceback
@@ -9,7 +10,12 @@ from contextlib import contextmanager
 from pathlib import Path
 
 import dbt.version
-from dbt.events.functions import fire_event, setup_event_logger
+from dbt.events.functions import (
+    fire_event,
+    flush_event_writer,
+    setup_event_logger,
+    stop_event_writer,
+)
 from dbt.events.types import (
     MainEncounteredError,
     MainKeyboardInterrupt,
@@ -19,32 +25,49 @@ from dbt.events.types import (
     MainStackTrace,
 )
 import dbt.flags as flags
-import dbt.task.build as build_task
-import dbt.task.clean as clean_task
-import dbt.task.compile as compile_task
-import dbt.task.debug as debug_task
-import dbt.task.deps as deps_task
-import dbt.task.freshness as freshness_task
-import dbt.task.generate as generate_task
-import dbt.task.init as init_task
-import dbt.task.list as list_task
-import dbt.task.parse as parse_task
-import dbt.task.run as run_task
-import dbt.task.run_operation as run_operation_task
-import dbt.task.seed as seed_task
-import dbt.task.serve as serve_task
-import dbt.task.snapshot as snapshot_task
-import dbt.task.test as test_task
+from dbt.node_types import NodeType
 from dbt.profiler import profiler
-from dbt.adapters.factory import reset_adapters, cleanup_connections
 
 import dbt.tracking
 
 from dbt.utils import ExitCodes, args_to_dict
-from dbt.config.profile import DEFAULT_PROFILES_DIR, read_user_config
 from dbt.exceptions import InternalException, NotImplementedException, FailedToConnectException
 
 
+# The resource types that `dbt build` and `dbt ls` accept with --resource-type.
+# These match BuildTask.ALL_RESOURCE_VALUES and ListTask.ALL_RESOURCE_VALUES,
+# but are spelled out here so building the parser doesn't import the tasks.
+BUILD_RESOURCE_VALUES = frozenset(
+    (NodeType.Model, NodeType.Snapshot, NodeType.Seed, NodeType.Test)
+)
+LIST_RESOURCE_VALUES = frozenset(
+    (
+        NodeType.Model,
+        NodeType.Snapshot,
+        NodeType.Seed,
+        NodeType.Test,
+        NodeType.Source,
+        NodeType.Exposure,
+        NodeType.Metric,
+        NodeType.Analysis,
+    )
+)
+
+
+class _LazyTask:
+    """The task class a subcommand runs, named by module so that the task
+    modules (and the adapters, graph and manifest code they pull in) are only
+    imported once parse_args knows which subcommand was chosen.
+    """
+
+    def __init__(self, module: str, name: str) -> None:
+        self.module = module
+        self.name = name
+
+    def load(self):
+        return getattr(importlib.import_module(self.module), self.name)
+
+
 class DBTVersion(argparse.Action):
     """This is very similar to the built-in argparse._Version action,
     except it just calls dbt.version.get_version_information().
@@ -142,6 +165,10 @@ def main(args=None):
             fire_event(MainStackTrace(stack_trace=traceback.format_exc()))
             exit_code = ExitCodes.UnhandledError.value
 
+        finally:
+            # write out the events still queued with --async-logging
+            stop_event_writer()
+
     sys.exit(exit_code)
 
 
@@ -153,6 +180,8 @@ def handle(args):
 
 @contextmanager
 def adapter_management():
+    from dbt.adapters.factory import reset_adapters, cleanup_connections
+
     reset_adapters()
     try:
         yield
@@ -164,6 +193,8 @@ def handle_and_check(args):
     with log_manager.applicationbound():
         parsed = parse_args(args)
 
+        from dbt.config.profile import read_user_config
+
         # Set flags from args, user config, and env vars
         user_config = read_user_config(flags.PROFILES_DIR)  # This is read again later
         flags.set_from_args(parsed, user_config)
@@ -184,8 +215,11 @@ def handle_and_check(args):
 
             with adapter_management():
 
-                task, res = run_from_args(parsed)
-                success = task.interpret_results(res)
+                try:
+                    task, res = run_from_args(parsed)
+                    success = task.interpret_results(res)
+                finally:
+                    flush_event_writer()
 
             return res, success
 
@@ -207,6 +241,8 @@ def track_run(task):
 
 
 def run_from_args(parsed):
+    from dbt.task.artifacts import artifacts_written
+
     log_cache_events(getattr(parsed, "log_cache_events", False))
 
     # this will convert DbtConfigErrors into RuntimeExceptions
@@ -231,7 +267,8 @@ def run_from_args(parsed):
     results = None
 
     with track_run(task):
-        results = task.run()
+        with artifacts_written():
+            results = task.run()
     return task, results
 
 
@@ -256,7 +293,7 @@ def _build_base_subparser():
         help="""
         Which directory to look in for the profiles.yml file. Default = {}
         """.format(
-            DEFAULT_PROFILES_DIR
+            flags.DEFAULT_PROFILES_DIR
         ),
     )
 
@@ -345,7 +382,7 @@ def _build_init_subparser(subparsers, base_subparser):
         Skip interative profile setup.
         """,
     )
-    sub.set_defaults(cls=init_task.InitTask, which="init", rpc_method=None)
+    sub.set_defaults(cls=_LazyTask("dbt.task.init", "InitTask"), which="init", rpc_method=None)
     return sub
 
 
@@ -357,7 +394,9 @@ def _build_build_subparser(subparsers, base_subparser):
         Run all Seeds, Models, Snapshots, and tests in DAG order
         """,
     )
-    sub.set_defaults(cls=build_task.BuildTask, which="build", rpc_method="build")
+    sub.set_defaults(
+        cls=_LazyTask("dbt.task.build", "BuildTask"), which="build", rpc_method="build"
+    )
     sub.add_argument(
         "-x",
         "--fail-fast",
@@ -385,9 +424,7 @@ def _build_build_subparser(subparsers, base_subparser):
         """,
     )
 
-    resource_values: List[str] = [str(s) for s in build_task.BuildTask.ALL_RESOURCE_VALUES] + [
-        "all"
-    ]
+    resource_values: List[str] = [str(s) for s in BUILD_RESOURCE_VALUES] + ["all"]
     sub.add_argument(
         "--resource-type",
         choices=resource_values,
@@ -418,7 +455,7 @@ def _build_clean_subparser(subparsers, base_subparser):
         (usually the dbt_packages and target directories.)
         """,
     )
-    sub.set_defaults(cls=clean_task.CleanTask, which="clean", rpc_method=None)
+    sub.set_defaults(cls=_LazyTask("dbt.task.clean", "CleanTask"), which="clean", rpc_method=None)
     return sub
 
 
@@ -440,7 +477,7 @@ def _build_debug_subparser(subparsers, base_subparser):
         """,
     )
     _add_version_check(sub)
-    sub.set_defaults(cls=debug_task.DebugTask, which="debug", rpc_method=None)
+    sub.set_defaults(cls=_LazyTask("dbt.task.debug", "DebugTask"), which="debug", rpc_method=None)
     return sub
 
 
@@ -452,7 +489,7 @@ def _build_deps_subparser(subparsers, base_subparser):
         Pull the most recent version of the dependencies listed in packages.yml
         """,
     )
-    sub.set_defaults(cls=deps_task.DepsTask, which="deps", rpc_method="deps")
+    sub.set_defaults(cls=_LazyTask("dbt.task.deps", "DepsTask"), which="deps", rpc_method="deps")
     return sub
 
 
@@ -473,7 +510,9 @@ def _build_snapshot_subparser(subparsers, base_subparser):
         Overrides settings in profiles.yml.
         """,
     )
-    sub.set_defaults(cls=snapshot_task.SnapshotTask, which="snapshot", rpc_method="snapshot")
+    sub.set_defaults(
+        cls=_LazyTask("dbt.task.snapshot", "SnapshotTask"), which="snapshot", rpc_method="snapshot"
+    )
     return sub
 
 
@@ -510,7 +549,7 @@ def _build_run_subparser(subparsers, base_subparser):
         """,
     )
 
-    run_sub.set_defaults(cls=run_task.RunTask, which="run", rpc_method="run")
+    run_sub.set_defaults(cls=_LazyTask("dbt.task.run", "RunTask"), which="run", rpc_method="run")
     return run_sub
 
 
@@ -523,7 +562,9 @@ def _build_compile_subparser(subparsers, base_subparser):
         Compiled SQL files are written to the target/ directory.
         """,
     )
-    sub.set_defaults(cls=compile_task.CompileTask, which="compile", rpc_method="compile")
+    sub.set_defaults(
+        cls=_LazyTask("dbt.task.compile", "CompileTask"), which="compile", rpc_method="compile"
+    )
     sub.add_argument("--parse-only", action="store_true")
     return sub
 
@@ -536,7 +577,9 @@ def _build_parse_subparser(subparsers, base_subparser):
         Parsed the project and provides information on performance
         """,
     )
-    sub.set_defaults(cls=parse_task.ParseTask, which="parse", rpc_method="parse")
+    sub.set_defaults(
+        cls=_LazyTask("dbt.task.parse", "ParseTask"), which="parse", rpc_method="parse"
+    )
     sub.add_argument("--write-manifest", action="store_true")
     sub.add_argument("--compile", action="store_true")
     return sub
@@ -547,7 +590,9 @@ def _build_docs_generate_subparser(subparsers, base_subparser):
     # will cause weird errors about 'conflicting option strings'.
     generate_sub = subparsers.add_parser("generate", parents=[base_subparser])
     generate_sub.set_defaults(
-        cls=generate_task.GenerateTask, which="generate", rpc_method="docs.generate"
+        cls=_LazyTask("dbt.task.generate", "GenerateTask"),
+        which="generate",
+        rpc_method="docs.generate",
     )
     generate_sub.add_argument(
         "--no-compile",
@@ -557,6 +602,16 @@ def _build_docs_generate_subparser(subparsers, base_subparser):
         Do not run "dbt compile" as part of docs generation
         """,
     )
+    generate_sub.add_argument(
+        "--reuse-catalog-shards",
+        action="store_true",
+        help="""
+        Save the catalog of each schema in the target directory, and reuse it
+        instead of querying the schema again if none of the models, seeds,
+        snapshots or sources in it have changed since the last run with this
+        flag. Changes made to those relations outside of dbt are not noticed.
+        """,
+    )
     return generate_sub
 
 
@@ -672,7 +727,9 @@ def _build_seed_subparser(subparsers, base_subparser):
         Show a sample of the loaded data in the terminal
         """,
     )
-    seed_sub.set_defaults(cls=seed_task.SeedTask, which="seed", rpc_method="seed")
+    seed_sub.set_defaults(
+        cls=_LazyTask("dbt.task.seed", "SeedTask"), which="seed", rpc_method="seed"
+    )
     return seed_sub
 
 
@@ -691,7 +748,9 @@ def _build_docs_serve_subparser(subparsers, base_subparser):
         dest="open_browser",
         action="store_false",
     )
-    serve_sub.set_defaults(cls=serve_task.ServeTask, which="serve", rpc_method=None)
+    serve_sub.set_defaults(
+        cls=_LazyTask("dbt.task.serve", "ServeTask"), which="serve", rpc_method=None
+    )
     return serve_sub
 
 
@@ -729,8 +788,26 @@ def _build_test_subparser(subparsers, base_subparser):
             even if they those resources have been explicitly selected.
         """,
     )
+    sub.add_argument(
+        "--batched",
+        action="store_true",
+        help="""
+        Run the generic tests on the same resources with one query per batch
+        of tests, instead of one query per test. Tests that store their
+        failures are run one at a time, as are the tests in a batch whose
+        query fails.
+        """,
+    )
+    sub.add_argument(
+        "--batch-size",
+        type=int,
+        help="""
+        The number of tests to run in each query with --batched. Defaults to
+        50.
+        """,
+    )
 
-    sub.set_defaults(cls=test_task.TestTask, which="test", rpc_method="test")
+    sub.set_defaults(cls=_LazyTask("dbt.task.test", "TestTask"), which="test", rpc_method="test")
     return sub
 
 
@@ -760,8 +837,25 @@ def _build_source_freshness_subparser(subparsers, base_subparser):
         Specify number of threads to use. Overrides settings in profiles.yml
         """,
     )
+    sub.add_argument(
+        "--batched",
+        action="store_true",
+        help="""
+        Check the freshness of the sources in each schema with one query per
+        batch of sources, instead of one query per source. The sources in a
+        batch whose query fails are checked one at a time.
+        """,
+    )
+    sub.add_argument(
+        "--batch-size",
+        type=int,
+        help="""
+        The number of sources to check in each query with --batched. Defaults
+        to 50.
+        """,
+    )
     sub.set_defaults(
-        cls=freshness_task.FreshnessTask,
+        cls=_LazyTask("dbt.task.freshness", "FreshnessTask"),
         which="source-freshness",
         rpc_method="source-freshness",
     )
@@ -787,8 +881,8 @@ def _build_list_subparser(subparsers, base_subparser):
         """,
         aliases=["ls"],
     )
-    sub.set_defaults(cls=list_task.ListTask, which="list", rpc_method=None)
-    resource_values: List[str] = [str(s) for s in list_task.ListTask.ALL_RESOURCE_VALUES] + [
+    sub.set_defaults(cls=_LazyTask("dbt.task.list", "ListTask"), which="list", rpc_method=None)
+    resource_values: List[str] = [str(s) for s in LIST_RESOURCE_VALUES] + [
         "default",
         "all",
     ]
@@ -866,7 +960,32 @@ def _build_run_operation_subparser(subparsers, base_subparser):
         """,
     )
     sub.set_defaults(
-        cls=run_operation_task.RunOperationTask, which="run-operation", rpc_method="run-operation"
+        cls=_LazyTask("dbt.task.run_operation", "RunOperationTask"),
+        which="run-operation",
+        rpc_method="run-operation",
+    )
+    return sub
+
+
+def _build_daemon_subparser(subparsers, base_subparser):
+    sub = subparsers.add_parser(
+        "daemon",
+        parents=[base_subparser],
+        help="""
+        Keep the project parsed in a long-lived process, and run ls, compile,
+        run and test commands sent to it over a Unix socket.
+        """,
+    )
+    sub.add_argument(
+        "--socket",
+        default=None,
+        help="""
+        The path of the socket to listen on. Default is daemon.sock in the
+        project's target directory.
+        """,
+    )
+    sub.set_defaults(
+        cls=_LazyTask("dbt.task.daemon", "DaemonTask"), which="daemon", rpc_method=None
     )
     return sub
 
@@ -998,6 +1117,19 @@ def parse_args(args, cls=DBTArgumentParser):
         """,
     )
 
+    p.add_optional_argument_inverse(
+        "--file-hash-cache",
+        enable_help="""
+        Allow skipping reading and hashing project files whose path, inode,
+        modification time and size match the file hash cache in the target
+        directory. This overrides the user configuration file.
+        """,
+        disable_help="""
+        Read and hash every project file, rebuilding the file hash cache.
+        This overrides the user configuration file.
+        """,
+    )
+
     # if set, run dbt in single-threaded mode: thread count is ignored, and
     # calls go through `map` instead of the thread pool. This is useful for
     # getting performance information about aspects of dbt that normally run in
@@ -1040,7 +1172,7 @@ def parse_args(args, cls=DBTArgumentParser):
         help="""
         Which directory to look in for the profiles.yml file. Default = {}
         """.format(
-            DEFAULT_PROFILES_DIR
+            flags.DEFAULT_PROFILES_DIR
         ),
     )
 
@@ -1084,6 +1216,60 @@ def parse_args(args, cls=DBTArgumentParser):
         """,
     )
 
+    p.add_argument(
+        "--async-logging",
+        action="store_true",
+        default=None,
+        help="""
+        Format and write log lines in batches on a background thread,
+        instead of on the threads that emit them.
+        """,
+    )
+
+    p.add_argument(
+        "--scheduling-mode",
+        choices=["depth", "critical-path"],
+        default=None,
+        help="""
+        The order in which to run nodes that are ready to run. 'depth' runs
+        the nodes closest to the start of the DAG first, 'critical-path' runs
+        the nodes with the longest chain of descendants first, weighted by
+        their execution times in the previous run_results.json.
+        """,
+    )
+
+    p.add_argument(
+        "--strict-validation",
+        action="store_true",
+        default=None,
+        help="""
+        Validate every compiled node against its schema. This is slow on
+        large projects, and only useful when debugging dbt itself.
+        """,
+    )
+
+    p.add_argument(
+        "--fast-json",
+        action="store_true",
+        default=None,
+        help="""
+        Write manifest.json with orjson, if it is installed. The file is
+        compact, rather than laid out the way the json module lays it out.
+        """,
+    )
+
+    p.add_argument(
+        "--stream-results",
+        action="store_true",
+        default=None,
+        help="""
+        Append each result to run_results.jsonl in the target directory as
+        soon as its node finishes, and assemble run_results.json from it at
+        the end. If the run is killed, `result:` selection with --state
+        reads the results that made it into run_results.jsonl.
+        """,
+    )
+
     subs = p.add_subparsers(title="Available sub-commands")
 
     base_subparser = _build_base_subparser()
@@ -1123,6 +1309,7 @@ def parse_args(args, cls=DBTArgumentParser):
     _build_docs_serve_subparser(docs_subs, base_subparser)
     _build_source_freshness_subparser(source_subs, base_subparser)
     _build_run_operation_subparser(subs, base_subparser)
+    _build_daemon_subparser(subs, base_subparser)
 
     if len(args) == 0:
         p.print_help()
@@ -1166,4 +1353,7 @@ def parse_args(args, cls=DBTArgumentParser):
         p.print_help()
         p.exit(1)
 
+    if isinstance(parsed.cls, _LazyTask):
+        parsed.cls = parsed.cls.load()
+
     return parsed
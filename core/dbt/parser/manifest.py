@@ -38,20 +38,27 @@ from dbt.events.types import (
     InvalidRefInTestNode,
     PartialParsingProjectEnvVarsChanged,
     PartialParsingProfileEnvVarsChanged,
+    SystemCouldNotWrite,
 )
 from dbt.logger import DbtProcessState
 from dbt.node_types import NodeType
 from dbt.clients.jinja import get_rendered, MacroStack
 from dbt.clients.jinja_static import statically_extract_macro_calls
-from dbt.clients.system import make_directory
 from dbt.config import Project, RuntimeConfig
 from dbt.context.docs import generate_runtime_docs_context
 from dbt.context.macro_resolver import MacroResolver, TestMacroNamespace
 from dbt.context.configured import generate_macro_context
 from dbt.context.providers import ParseProvider
 from dbt.contracts.files import FileHash, ParseFileType, SchemaSourceFile
-from dbt.parser.read_files import read_files, load_source_file
+from dbt.parser.read_files import (
+    read_files,
+    load_source_file,
+    load_deferred_contents,
+    FileHashCache,
+    FILE_HASH_CACHE_FILE_NAME,
+)
 from dbt.parser.partial import PartialParsing, special_override_macros
+from dbt.parser.partial_parse_file import read_partial_parse_file, write_partial_parse_file
 from dbt.contracts.graph.compiled import ManifestNode
 from dbt.contracts.graph.manifest import (
     Manifest,
@@ -160,6 +167,7 @@ class ManifestLoader:
         root_project: RuntimeConfig,
         all_projects: Mapping[str, Project],
         macro_hook: Optional[Callable[[Manifest], Any]] = None,
+        saved_manifest: Optional[Manifest] = None,
     ) -> None:
         self.root_project: RuntimeConfig = root_project
         self.all_projects: Mapping[str, Project] = all_projects
@@ -187,8 +195,12 @@ class ManifestLoader:
         self.partially_parsing = False
         self.partial_parser = None
 
-        # This is a saved manifest from a previous run that's used for partial parsing
-        self.saved_manifest: Optional[Manifest] = self.read_manifest_for_partial_parse()
+        # This is a saved manifest from a previous run that's used for partial
+        # parsing. It's read from the target directory unless the caller
+        # still has the manifest in memory.
+        self.saved_manifest: Optional[Manifest] = self.read_manifest_for_partial_parse(
+            saved_manifest
+        )
 
     # This is the method that builds a complete manifest. We sometimes
     # use an abbreviated process in tests.
@@ -198,6 +210,7 @@ class ManifestLoader:
         config: RuntimeConfig,
         *,
         reset: bool = False,
+        saved_manifest: Optional[Manifest] = None,
     ) -> Manifest:
 
         adapter = get_adapter(config)  # type: ignore
@@ -213,7 +226,7 @@ class ManifestLoader:
             start_load_all = time.perf_counter()
 
             projects = config.load_dependencies()
-            loader = cls(config, projects, macro_hook)
+            loader = cls(config, projects, macro_hook, saved_manifest=saved_manifest)
 
             manifest = loader.load()
 
@@ -240,8 +253,11 @@ class ManifestLoader:
         saved_files = {}
         if self.saved_manifest:
             saved_files = self.saved_manifest.files
+        hash_cache = self.read_file_hash_cache()
         for project in self.all_projects.values():
-            read_files(project, self.manifest.files, project_parser_files, saved_files)
+            read_files(project, self.manifest.files, project_parser_files, saved_files, hash_cache)
+        if hash_cache is not None and hash_cache.dirty:
+            self.write_file_hash_cache(hash_cache)
         orig_project_parser_files = project_parser_files
         self._perf_info.path_count = len(self.manifest.files)
         self._perf_info.read_files_elapsed = time.perf_counter() - start_read_files
@@ -314,6 +330,7 @@ class ManifestLoader:
             # the other files are loaded.  Also need to parse tests, specifically
             # generic tests
             start_load_macros = time.perf_counter()
+            load_deferred_contents(self.manifest.files, project_parser_files)
             self.load_and_parse_macros(project_parser_files)
 
             # If we're partially parsing check that certain macros have not been changed
@@ -324,6 +341,7 @@ class ManifestLoader:
                 self.manifest = self.new_manifest  # contains newly read files
                 project_parser_files = orig_project_parser_files
                 self.partially_parsing = False
+                load_deferred_contents(self.manifest.files, project_parser_files)
                 self.load_and_parse_macros(project_parser_files)
 
             self._perf_info.load_macros_elapsed = time.perf_counter() - start_load_macros
@@ -544,10 +562,7 @@ class ManifestLoader:
                     ManifestWrongMetadataVersion(version=self.manifest.metadata.dbt_version)
                 )
                 self.manifest.metadata.dbt_version = __version__
-            manifest_msgpack = self.manifest.to_msgpack()
-            make_directory(os.path.dirname(path))
-            with open(path, "wb") as fp:
-                fp.write(manifest_msgpack)
+            write_partial_parse_file(self.manifest, path)
         except Exception:
             raise
 
@@ -628,7 +643,9 @@ class ManifestLoader:
                     return True
         return False
 
-    def read_manifest_for_partial_parse(self) -> Optional[Manifest]:
+    def read_manifest_for_partial_parse(
+        self, saved_manifest: Optional[Manifest] = None
+    ) -> Optional[Manifest]:
         if not flags.PARTIAL_PARSE:
             fire_event(PartialParsingNotEnabled())
             return None
@@ -636,11 +653,9 @@ class ManifestLoader:
 
         reparse_reason = None
 
-        if os.path.exists(path):
+        if saved_manifest is not None or os.path.exists(path):
             try:
-                with open(path, "rb") as fp:
-                    manifest_mp = fp.read()
-                manifest: Manifest = Manifest.from_msgpack(manifest_mp)  # type: ignore
+                manifest: Manifest = saved_manifest or read_partial_parse_file(path)
                 # keep this check inside the try/except in case something about
                 # the file has changed in weird ways, perhaps due to being a
                 # different version of dbt
@@ -663,6 +678,20 @@ class ManifestLoader:
 
         return None
 
+    def read_file_hash_cache(self) -> Optional[FileHashCache]:
+        # The cache is only useful when comparing against a saved manifest
+        if not flags.PARTIAL_PARSE:
+            return None
+        path = os.path.join(self.root_project.target_path, FILE_HASH_CACHE_FILE_NAME)
+        return FileHashCache.read(path, full_rehash=not flags.FILE_HASH_CACHE)
+
+    def write_file_hash_cache(self, hash_cache: FileHashCache):
+        path = os.path.join(self.root_project.target_path, FILE_HASH_CACHE_FILE_NAME)
+        try:
+            hash_cache.write(path)
+        except OSError as exc:
+            fire_event(SystemCouldNotWrite(path=path, reason=str(exc), exc=exc))
+
     def build_perf_info(self):
         mli = ManifestLoaderInfo(
             is_partial_parse_enabled=flags.PARTIAL_PARSE,
@@ -22,6 +22,7 @@ from dbt.events.types import (
     PartialParsingDeletedMetric,
 )
 from dbt.node_types import NodeType
+from dbt.parser.partial_parse_file import saved_file_checksum, saved_file_parse_file_type
 
 
 mssat_files = (
@@ -114,10 +115,11 @@ class PartialParsing:
         deleted_schema_files = []
         deleted = []
         for file_id in deleted_all_files:
-            if self.saved_files[file_id].parse_file_type == ParseFileType.Schema:
+            parse_file_type = saved_file_parse_file_type(self.saved_files, file_id)
+            if parse_file_type == ParseFileType.Schema:
                 deleted_schema_files.append(file_id)
             else:
-                if self.saved_files[file_id].parse_file_type in mg_files:
+                if parse_file_type in mg_files:
                     changed_or_deleted_macro_file = True
                 deleted.append(file_id)
 
@@ -125,7 +127,8 @@ class PartialParsing:
         changed_schema_files = []
         unchanged = []
         for file_id in common:
-            if self.saved_files[file_id].checksum == self.new_files[file_id].checksum:
+            # the saved files are only deserialized if they have changed
+            if saved_file_checksum(self.saved_files, file_id) == self.new_files[file_id].checksum:
                 unchanged.append(file_id)
             else:
                 # separate out changed schema files
@@ -966,6 +969,9 @@ class PartialParsing:
         for env_var in delete_vars:
             del self.saved_manifest.env_vars[env_var]
 
+        if not changed_vars:
+            return ([], {})
+
         env_vars_changed_source_files = []
         env_vars_changed_schema_files = {}
         # The SourceFiles contain a list of env_vars that were used in the file.
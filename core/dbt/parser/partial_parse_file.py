@@ -0,0 +1,494 @@
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Type, Union
+
+import msgpack
+from mashumaro import DataClassMessagePackMixin
+
+from dbt.clients.system import make_directory
+from dbt.contracts.files import AnySourceFile, FileHash, ParseFileType
+from dbt.contracts.graph.compiled import CompileResultNode, ManifestNode
+from dbt.contracts.graph.manifest import Manifest, ManifestMetadata, ManifestStateCheck
+from dbt.contracts.graph.parsed import (
+    ParsedDocumentation,
+    ParsedExposure,
+    ParsedMacro,
+    ParsedMetric,
+    ParsedSourceDefinition,
+)
+from dbt.dataclass_schema import dbtClassMixin
+from dbt.exceptions import InternalException
+
+# The partial parse file is an index into a set of segment files next to it
+# (partial_parse.<n>.segment), which hold one msgpack blob per entry of every
+# manifest section. The index is laid out as
+#
+#   MAGIC | header
+#
+# where the header is a msgpack map with the size of every segment, the
+# manifest state (metadata, state_check, selectors and env_vars), the
+# position of every entry and a summary of each saved file (its parse file
+# type and checksum).
+#
+# The state is decoded when the file is read, the entries only when they are
+# accessed, so checking whether partial parsing is possible and comparing
+# file checksums doesn't deserialize any nodes. When the file is written,
+# only the entries that were added or changed are written, to a new segment.
+# Segments are never modified once written and the index is replaced
+# atomically, so an interrupted write leaves the previous version intact.
+#
+# The daemon and the CLI can write the same file, so writes, and reading the
+# index and mapping its segments, hold a lock on partial_parse.msgpack.lock.
+# A writer only reuses the segments of the index its manifest was read from
+# if that is still the current index; otherwise another process has written
+# since, and may have removed them, so its entries are all written again.
+MAGIC = b"DBTPP\x00\x02\x00"
+SEGMENT_SUFFIX = ".segment"
+# The segments are compacted into a new one when more than half of their
+# bytes are no longer referenced, or when there would be more than this many.
+MAX_SEGMENTS = 16
+LOCK_SUFFIX = ".lock"
+
+
+@dataclass
+class _ManifestState(DataClassMessagePackMixin, dbtClassMixin):
+    metadata: ManifestMetadata
+    state_check: ManifestStateCheck
+    selectors: MutableMapping[str, Any] = field(default_factory=dict)
+    env_vars: MutableMapping[str, str] = field(default_factory=dict)
+
+
+# Each entry is wrapped in a single field dataclass, so it is decoded exactly
+# like the corresponding Manifest field (including the Union types).
+@dataclass
+class _NodeEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: ManifestNode
+
+
+@dataclass
+class _SourceEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: ParsedSourceDefinition
+
+
+@dataclass
+class _MacroEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: ParsedMacro
+
+
+@dataclass
+class _DocEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: ParsedDocumentation
+
+
+@dataclass
+class _ExposureEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: ParsedExposure
+
+
+@dataclass
+class _MetricEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: ParsedMetric
+
+
+@dataclass
+class _FileEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: AnySourceFile
+
+
+@dataclass
+class _DisabledEntry(DataClassMessagePackMixin, dbtClassMixin):
+    value: List[CompileResultNode]
+
+
+SECTIONS: Dict[str, Type[Any]] = {
+    "nodes": _NodeEntry,
+    "sources": _SourceEntry,
+    "macros": _MacroEntry,
+    "docs": _DocEntry,
+    "exposures": _ExposureEntry,
+    "metrics": _MetricEntry,
+    "files": _FileEntry,
+    "disabled": _DisabledEntry,
+}
+
+# (segment, offset, length) of an encoded entry
+Span = Tuple[int, int, int]
+# (parse_file_type, checksum name, checksum) of a saved file
+FileSummary = Tuple[Optional[str], str, str]
+# (inode, size, mtime) of an index file, to tell whether it was replaced
+IndexStat = Tuple[int, int, int]
+
+
+def segment_path(path: str, segment: int) -> str:
+    root, _ = os.path.splitext(path)
+    return f"{root}.{segment}{SEGMENT_SUFFIX}"
+
+
+# The segment files on disk that belong to the partial parse file at path,
+# by segment number
+def _find_segments(path: str) -> Dict[int, str]:
+    directory = os.path.dirname(path) or "."
+    root = os.path.basename(os.path.splitext(path)[0])
+    pattern = re.compile(re.escape(root) + r"\.(\d+)" + re.escape(SEGMENT_SUFFIX) + "$")
+    segments = {}
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            segments[int(match.group(1))] = os.path.join(directory, name)
+    return segments
+
+
+@contextmanager
+def _locked(path: str) -> Iterator[None]:
+    with open(path + LOCK_SUFFIX, "a+b") as fp:
+        if os.name == "nt":
+            import msvcrt
+
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+def _index_stat(path: str) -> Optional[IndexStat]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _read_buffer(path: str):
+    with open(path, "rb") as fp:
+        # A mapped file can't be deleted on Windows
+        if os.name == "nt":
+            return fp.read()
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# The segments referenced by a partial parse file. They are all mapped when
+# the file is read, so they stay readable after a later write removes them.
+class SegmentStore:
+    def __init__(self, path: str, sizes: Mapping[int, int], index_stat: Optional[IndexStat]):
+        self.path = path
+        self.sizes = dict(sizes)
+        # the index the segments were referenced by
+        self.index_stat = index_stat
+        self.buffers = {}
+        for segment, size in self.sizes.items():
+            buffer = _read_buffer(segment_path(path, segment))
+            if len(buffer) < size:
+                raise InternalException(f"{segment_path(path, segment)} is truncated")
+            self.buffers[segment] = buffer
+
+    def read(self, span: Span):
+        segment, offset, length = span
+        return self.buffers[segment][offset : offset + length]
+
+
+# A manifest section whose entries are decoded from the partial parse file
+# the first time they are accessed. Until then the value stored for a key is
+# its span; decoded values are never tuples.
+class LazyEntries(MutableMapping):
+    def __init__(self, store: SegmentStore, index: Mapping[str, Span], entry_cls: Type[Any]):
+        self._store = store
+        # the spans the entries were read from, to detect unchanged entries
+        self._index = index
+        self._entries: Dict[str, Any] = dict(index)
+        self._entry_cls = entry_cls
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str):
+        value = self._entries[key]
+        if isinstance(value, tuple):
+            with self._lock:
+                value = self._entries[key]
+                if isinstance(value, tuple):
+                    value = self._entry_cls.from_msgpack(self._store.read(value)).value
+                    self._entries[key] = value
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def keys(self):
+        return self._entries.keys()
+
+    def __repr__(self) -> str:
+        decoded = sum(1 for key in self._entries if self.is_decoded(key))
+        return f"<{type(self).__name__} {decoded}/{len(self)} decoded>"
+
+    # pickle and deepcopy get a regular dict
+    def __reduce__(self):
+        return dict, (list(self.items()),)
+
+    def is_decoded(self, key: str) -> bool:
+        return not isinstance(self._entries[key], tuple)
+
+    def rebind(self, store: SegmentStore, index: Mapping[str, Span]) -> None:
+        """Point the entries at the spans they were just written to, so that
+        a later write doesn't reference a segment that this one removed.
+        """
+        with self._lock:
+            for key, value in self._entries.items():
+                if isinstance(value, tuple) and key in index:
+                    self._entries[key] = index[key]
+            self._store = store
+            self._index = index
+
+    def stored_items(
+        self, store: Optional[SegmentStore]
+    ) -> Iterator[Tuple[str, Union[Span, bytes]]]:
+        """Return the span in the given store of every entry that is stored
+        there unchanged, and the encoded form of every other entry.
+        """
+        for key, value in list(self._entries.items()):
+            if isinstance(value, tuple):
+                if self._store is store:
+                    yield key, value
+                else:
+                    yield key, bytes(self._store.read(value))
+                continue
+            data = self._entry_cls(value=value).to_msgpack()
+            span = self._index.get(key)
+            if self._store is store and span is not None and self._store.read(span) == data:
+                yield key, span
+            else:
+                yield key, data
+
+
+# The files section also knows the parse file type and checksum of every
+# file, so comparing the saved files to the files on disk doesn't require
+# decoding them.
+class LazySourceFiles(LazyEntries):
+    def __init__(
+        self,
+        store: SegmentStore,
+        index: Mapping[str, Span],
+        entry_cls: Type[Any],
+        summaries: Mapping[str, FileSummary],
+    ):
+        super().__init__(store, index, entry_cls)
+        self._summaries = summaries
+
+    def get_summary(self, file_id: str) -> Optional[FileSummary]:
+        if self.is_decoded(file_id):
+            return None
+        return self._summaries.get(file_id)
+
+    def get_checksum(self, file_id: str) -> FileHash:
+        summary = self.get_summary(file_id)
+        if summary is None:
+            return self[file_id].checksum
+        return FileHash(name=summary[1], checksum=summary[2])
+
+    def get_parse_file_type(self, file_id: str) -> Optional[ParseFileType]:
+        summary = self.get_summary(file_id)
+        if summary is None:
+            return self[file_id].parse_file_type
+        return ParseFileType(summary[0]) if summary[0] else None
+
+
+def saved_file_checksum(saved_files: Mapping[str, AnySourceFile], file_id: str) -> FileHash:
+    if isinstance(saved_files, LazySourceFiles):
+        return saved_files.get_checksum(file_id)
+    return saved_files[file_id].checksum
+
+
+def saved_file_parse_file_type(
+    saved_files: Mapping[str, AnySourceFile], file_id: str
+) -> Optional[ParseFileType]:
+    if isinstance(saved_files, LazySourceFiles):
+        return saved_files.get_parse_file_type(file_id)
+    return saved_files[file_id].parse_file_type
+
+
+def _summarize_files(files: Mapping[str, AnySourceFile]) -> Dict[str, FileSummary]:
+    summaries: Dict[str, FileSummary] = {}
+    for file_id in files:
+        summary = files.get_summary(file_id) if isinstance(files, LazySourceFiles) else None
+        if summary is None:
+            source_file = files[file_id]
+            summary = (
+                source_file.parse_file_type.value if source_file.parse_file_type else None,
+                source_file.checksum.name,
+                source_file.checksum.checksum,
+            )
+        summaries[file_id] = summary
+    return summaries
+
+
+# The store the manifest was read from, if it was read from the file at path
+def _get_store(manifest: Manifest, path: str) -> Optional[SegmentStore]:
+    for name in SECTIONS:
+        entries = getattr(manifest, name)
+        if isinstance(entries, LazyEntries) and entries._store.path == path:
+            return entries._store
+    return None
+
+
+def _stored_items(entries, entry_cls, store) -> Iterator[Tuple[str, Union[Span, bytes]]]:
+    if isinstance(entries, LazyEntries):
+        return entries.stored_items(store)
+    return ((key, entry_cls(value=value).to_msgpack()) for key, value in entries.items())
+
+
+def _needs_compaction(store: SegmentStore, live: Dict[int, int], new_bytes: int) -> bool:
+    if len(live) + 1 > MAX_SEGMENTS:
+        return True
+    total = sum(store.sizes[segment] for segment in live) + new_bytes
+    return total > 2 * (sum(live.values()) + new_bytes)
+
+
+def _write_durably(path: str, chunks) -> int:
+    size = 0
+    with open(path, "wb") as fp:
+        for chunk in chunks:
+            size += fp.write(chunk)
+        fp.flush()
+        os.fsync(fp.fileno())
+    return size
+
+
+def write_partial_parse_file(manifest: Manifest, path: str) -> None:
+    make_directory(os.path.dirname(path))
+    with _locked(path):
+        _write_partial_parse_file(manifest, path)
+
+
+def _write_partial_parse_file(manifest: Manifest, path: str) -> None:
+    store = _get_store(manifest, path)
+    if store is not None and store.index_stat != _index_stat(path):
+        # another process replaced the index, and may have removed segments
+        store = None
+
+    sections: Dict[str, Dict[str, Union[Span, bytes]]] = {}
+    for name, entry_cls in SECTIONS.items():
+        sections[name] = dict(_stored_items(getattr(manifest, name), entry_cls, store))
+
+    # the bytes still referenced in each existing segment
+    live: Dict[int, int] = {}
+    new_bytes = 0
+    for items in sections.values():
+        for item in items.values():
+            if isinstance(item, tuple):
+                live[item[0]] = live.get(item[0], 0) + item[2]
+            else:
+                new_bytes += len(item)
+    if store is not None and live and _needs_compaction(store, live, new_bytes):
+        for items in sections.values():
+            for key, item in items.items():
+                if isinstance(item, tuple):
+                    items[key] = bytes(store.read(item))
+                    new_bytes += item[2]
+        live = {}
+
+    # The new entries go to a new segment, which isn't referenced until the
+    # index is replaced.
+    sizes = {segment: store.sizes[segment] for segment in live} if store else {}
+    if new_bytes:
+        new_segment = max(list(_find_segments(path)) + list(live) + [-1]) + 1
+
+        def new_entries():
+            position = 0
+            for items in sections.values():
+                for key, item in items.items():
+                    if not isinstance(item, tuple):
+                        items[key] = (new_segment, position, len(item))
+                        position += len(item)
+                        yield item
+
+        sizes[new_segment] = _write_durably(segment_path(path, new_segment), new_entries())
+
+    state = _ManifestState(
+        metadata=manifest.metadata,
+        state_check=manifest.state_check,
+        selectors=manifest.selectors,
+        env_vars=manifest.env_vars,
+    )
+    header = msgpack.packb(
+        {
+            "segments": list(sizes.items()),
+            "state": state.to_msgpack(),
+            "sections": sections,
+            "file_summaries": _summarize_files(manifest.files),
+        },
+        use_bin_type=True,
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        _write_durably(tmp_path, [MAGIC, header])
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    new_store = SegmentStore(path, sizes, _index_stat(path))
+    for name, items in sections.items():
+        entries = getattr(manifest, name)
+        if isinstance(entries, LazyEntries):
+            entries.rebind(new_store, items)
+
+    # Segments that are no longer referenced, including any left behind by an
+    # interrupted write, can be removed now: a writer that still references
+    # them will find the index replaced.
+    for segment, unused_path in _find_segments(path).items():
+        if segment not in sizes:
+            try:
+                os.remove(unused_path)
+            except OSError:
+                pass
+
+
+def read_partial_parse_file(path: str) -> Manifest:
+    # the segments can't be removed between reading the index and mapping them
+    with _locked(path):
+        with open(path, "rb") as fp:
+            data = fp.read()
+        if not data.startswith(MAGIC):
+            raise InternalException(f"{path} is not in the current partial parse file format")
+        header = msgpack.unpackb(data[len(MAGIC) :], raw=False, use_list=False)
+        store = SegmentStore(path, dict(header["segments"]), _index_stat(path))
+    state = _ManifestState.from_msgpack(header["state"])
+
+    sections: Dict[str, LazyEntries] = {}
+    for name, entry_cls in SECTIONS.items():
+        index = header["sections"][name]
+        if name == "files":
+            sections[name] = LazySourceFiles(store, index, entry_cls, header["file_summaries"])
+        else:
+            sections[name] = LazyEntries(store, index, entry_cls)
+    return Manifest(
+        metadata=state.metadata,
+        state_check=state.state_check,
+        selectors=state.selectors,
+        env_vars=state.env_vars,
+        **sections,
+    )
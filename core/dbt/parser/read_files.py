@@ -1,5 +1,8 @@
+import os
 import pathlib
-from dbt.clients.system import load_file_contents
+import time
+from dataclasses import dataclass, field
+from dbt.clients.system import load_file_contents, make_directory
 from dbt.contracts.files import (
     FilePath,
     ParseFileType,
@@ -10,9 +13,126 @@ from dbt.contracts.files import (
 )
 
 from dbt.parser.schemas import yaml_from_file, schema_file_keys, check_format_version
+from dbt.dataclass_schema import dbtClassMixin
+from dbt.events.functions import fire_event
+from dbt.events.types import ParsedFileLoadFailed
 from dbt.exceptions import ParsingException
-from dbt.parser.search import filesystem_search
-from typing import Optional
+from dbt.parser.partial_parse_file import saved_file_checksum
+from dbt.parser.search import filesystem_search_multi
+from concurrent.futures import ThreadPoolExecutor
+from dbt.version import __version__
+from mashumaro import DataClassMessagePackMixin
+from typing import Optional, Dict, List, Tuple
+
+
+# Reading and hashing files is I/O bound, so it is done on a thread pool
+# that is independent of the configured number of threads.
+READ_FILES_THREADS = min(32, (os.cpu_count() or 1) + 4)
+# Files are handed to the pool in chunks to keep the per-file overhead low.
+READ_FILES_CHUNK_SIZE = 64
+
+FILE_HASH_CACHE_FILE_NAME = "file_hash_cache.msgpack"
+# see FileHashCache
+RACY_INTERVAL_NS = 2 * 10**9
+
+
+# A persistent cache of file checksums, keyed on the absolute path of each
+# file and validated against its inode, modification time and size. Files
+# whose stat results match the cache don't need to be read or hashed.
+@dataclass
+class FileHashCacheEntry(dbtClassMixin):
+    inode: int
+    mtime_ns: int
+    size: int
+    checksum: FileHash
+
+
+@dataclass
+class FileHashCache(DataClassMessagePackMixin, dbtClassMixin):
+    dbt_version: str = __version__
+    entries: Dict[str, FileHashCacheEntry] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # when set, cached checksums are never used (but the cache is rebuilt)
+        self.full_rehash = False
+        self.dirty = False
+        self._stats: Dict[str, os.stat_result] = {}
+        # Files modified this close to the time the cache was loaded could be
+        # modified again without changing their mtime, so they aren't cached.
+        self._racy_after_ns = time.time_ns() - RACY_INTERVAL_NS
+
+    @classmethod
+    def read(cls, path: str, full_rehash: bool = False) -> "FileHashCache":
+        cache = None
+        if not full_rehash and os.path.exists(path):
+            try:
+                with open(path, "rb") as fp:
+                    cache = cls.from_msgpack(fp.read())
+            except Exception as exc:
+                fire_event(ParsedFileLoadFailed(path=path, exc=exc))
+        if cache is None or cache.dbt_version != __version__:
+            cache = cls()
+            cache.dirty = True
+        cache.full_rehash = full_rehash
+        return cache
+
+    def write(self, path: str) -> None:
+        # the stat results of every file read in this invocation are kept,
+        # files that no longer exist (or weren't searched for) are dropped
+        self.entries = {key: self.entries[key] for key in self._stats if key in self.entries}
+        make_directory(os.path.dirname(path))
+        with open(path, "wb") as fp:
+            fp.write(self.to_msgpack())
+        self.dirty = False
+
+    def get(self, path: str) -> Optional[FileHash]:
+        """Return the cached checksum of the file at the given path if the
+        file has not changed since it was cached.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        self._stats[path] = st
+        entry = self.entries.get(path)
+        if (
+            self.full_rehash
+            or entry is None
+            or entry.inode != st.st_ino
+            or entry.mtime_ns != st.st_mtime_ns
+            or entry.size != st.st_size
+        ):
+            return None
+        return entry.checksum
+
+    def set(self, path: str, checksum: FileHash) -> None:
+        """Cache the checksum of the file at the given path. 'get' must
+        have been called for the path before the file was read.
+        """
+        st = self._stats.get(path)
+        if st is None or st.st_mtime_ns >= self._racy_after_ns:
+            self.entries.pop(path, None)
+            return
+        self.entries[path] = FileHashCacheEntry(
+            inode=st.st_ino, mtime_ns=st.st_mtime_ns, size=st.st_size, checksum=checksum
+        )
+        self.dirty = True
+
+
+# If the file hash cache shows that the file has the same checksum as it had
+# when the saved manifest was written, return that checksum.
+def get_unchanged_checksum(
+    source_file: AnySourceFile, saved_files, hash_cache: Optional[FileHashCache]
+) -> Optional[FileHash]:
+    if hash_cache is None:
+        return None
+    # always look up the file, so the cache has its stat results
+    checksum = hash_cache.get(source_file.path.absolute_path)
+    if checksum is None or not saved_files or source_file.file_id not in saved_files:
+        return None
+    if saved_file_checksum(saved_files, source_file.file_id) != checksum:
+        return None
+    return checksum
 
 
 # This loads the files contents and creates the SourceFile object
@@ -21,6 +141,7 @@ def load_source_file(
     parse_file_type: ParseFileType,
     project_name: str,
     saved_files,
+    hash_cache: Optional[FileHashCache] = None,
 ) -> Optional[AnySourceFile]:
 
     sf_cls = SchemaSourceFile if parse_file_type == ParseFileType.Schema else SourceFile
@@ -31,11 +152,21 @@ def load_source_file(
         project_name=project_name,
     )
 
+    # The contents of unchanged files are only loaded if the file is
+    # scheduled for parsing, by 'load_deferred_contents'
+    unchanged_checksum = get_unchanged_checksum(source_file, saved_files, hash_cache)
+    if unchanged_checksum is not None:
+        source_file.checksum = unchanged_checksum
+        if parse_file_type == ParseFileType.Schema:
+            source_file.dfy = saved_files[source_file.file_id].dfy
+        return source_file
+
     skip_loading_schema_file = False
     if (
         parse_file_type == ParseFileType.Schema
         and saved_files
         and source_file.file_id in saved_files
+        and not (hash_cache and hash_cache.full_rehash)
     ):
         old_source_file = saved_files[source_file.file_id]
         if (
@@ -50,6 +181,8 @@ def load_source_file(
         file_contents = load_file_contents(path.absolute_path, strip=False)
         source_file.checksum = FileHash.from_contents(file_contents)
         source_file.contents = file_contents.strip()
+        if hash_cache is not None:
+            hash_cache.set(path.absolute_path, source_file.checksum)
 
     if parse_file_type == ParseFileType.Schema and source_file.contents:
         dfy = yaml_from_file(source_file)
@@ -91,104 +224,138 @@ def validate_yaml(file_path, dct):
 
 
 # Special processing for big seed files
-def load_seed_source_file(match: FilePath, project_name) -> SourceFile:
+def load_seed_source_file(
+    match: FilePath,
+    project_name,
+    saved_files=None,
+    hash_cache: Optional[FileHashCache] = None,
+) -> SourceFile:
     if match.seed_too_large():
         # We don't want to calculate a hash of this file. Use the path.
         source_file = SourceFile.big_seed(match)
     else:
-        file_contents = load_file_contents(match.absolute_path, strip=False)
-        checksum = FileHash.from_contents(file_contents)
-        source_file = SourceFile(path=match, checksum=checksum)
+        source_file = SourceFile(path=match, checksum=FileHash.empty())
+        source_file.parse_file_type = ParseFileType.Seed
+        source_file.project_name = project_name
+        unchanged_checksum = get_unchanged_checksum(source_file, saved_files, hash_cache)
+        if unchanged_checksum is not None:
+            source_file.checksum = unchanged_checksum
+        else:
+            file_contents = load_file_contents(match.absolute_path, strip=False)
+            source_file.checksum = FileHash.from_contents(file_contents)
+            if hash_cache is not None:
+                hash_cache.set(match.absolute_path, source_file.checksum)
         source_file.contents = ""
     source_file.parse_file_type = ParseFileType.Seed
     source_file.project_name = project_name
     return source_file
 
 
-# Use the FilesystemSearcher to get a bunch of FilePaths, then turn
-# them into a bunch of FileSource objects
-def get_source_files(project, paths, extension, parse_file_type, saved_files):
-    # file path list
-    fp_list = filesystem_search(project, paths, extension)
-    # file block list
-    fb_list = []
-    for fp in fp_list:
-        if parse_file_type == ParseFileType.Seed:
-            fb_list.append(load_seed_source_file(fp, project.project_name))
-        # singular tests live in /tests but only generic tests live
-        # in /tests/generic so we want to skip those
-        else:
-            if parse_file_type == ParseFileType.SingularTest:
-                path = pathlib.Path(fp.relative_path)
-                if path.parts[0] == "generic":
-                    continue
-            file = load_source_file(fp, parse_file_type, project.project_name, saved_files)
-            # only append the list if it has contents. added to fix #3568
-            if file:
-                fb_list.append(file)
-    return fb_list
-
-
-def read_files_for_parser(project, files, dirs, extension, parse_ft, saved_files):
-    parser_files = []
-    source_files = get_source_files(project, dirs, extension, parse_ft, saved_files)
-    for sf in source_files:
-        files[sf.file_id] = sf
-        parser_files.append(sf.file_id)
-    return parser_files
+# Load a single FilePath found by the filesystem search into a SourceFile.
+# Returns None for files that should be skipped.
+def load_file_path(
+    fp: FilePath,
+    parse_file_type: ParseFileType,
+    project_name: str,
+    saved_files,
+    hash_cache: Optional[FileHashCache] = None,
+) -> Optional[AnySourceFile]:
+    if parse_file_type == ParseFileType.Seed:
+        return load_seed_source_file(fp, project_name, saved_files, hash_cache)
+    # singular tests live in /tests but only generic tests live
+    # in /tests/generic so we want to skip those
+    if parse_file_type == ParseFileType.SingularTest:
+        path = pathlib.Path(fp.relative_path)
+        if path.parts[0] == "generic":
+            return None
+    # only return the file if it has contents. added to fix #3568
+    return load_source_file(fp, parse_file_type, project_name, saved_files, hash_cache)
+
+
+# The parser, directories and extensions to search for each parse file type,
+# in the order that files are added to the manifest.
+def get_file_types_for_project(project) -> Dict[ParseFileType, Tuple[str, List[str], List[str]]]:
+    return {
+        ParseFileType.Macro: ("MacroParser", project.macro_paths, [".sql"]),
+        ParseFileType.Model: ("ModelParser", project.model_paths, [".sql"]),
+        ParseFileType.Snapshot: ("SnapshotParser", project.snapshot_paths, [".sql"]),
+        ParseFileType.Analysis: ("AnalysisParser", project.analysis_paths, [".sql"]),
+        ParseFileType.SingularTest: ("SingularTestParser", project.test_paths, [".sql"]),
+        # all generic tests within /tests must be nested under a /generic subfolder
+        ParseFileType.GenericTest: (
+            "GenericTestParser",
+            project.generic_test_paths,
+            [".sql"],
+        ),
+        ParseFileType.Seed: ("SeedParser", project.seed_paths, [".csv"]),
+        ParseFileType.Documentation: ("DocumentationParser", project.docs_paths, [".md"]),
+        ParseFileType.Schema: ("SchemaParser", project.all_source_paths, [".yml", ".yaml"]),
+    }
 
 
 # This needs to read files for multiple projects, so the 'files'
 # dictionary needs to be passed in. What determines the order of
 # the various projects? Is the root project always last? Do the
 # non-root projects need to be done separately in order?
-def read_files(project, files, parser_files, saved_files):
+#
+# The project directories are walked once to find the files for every
+# parse file type, then the files are read and hashed on a thread pool.
+def read_files(project, files, parser_files, saved_files, hash_cache=None):
+    file_types = get_file_types_for_project(project)
+    searches = {
+        parse_ft: (dirs, extensions) for parse_ft, (_, dirs, extensions) in file_types.items()
+    }
+    file_paths = filesystem_search_multi(project, searches)
 
-    project_files = {}
+    to_load = [(fp, parse_ft) for parse_ft in file_types for fp in file_paths[parse_ft]]
 
-    project_files["MacroParser"] = read_files_for_parser(
-        project, files, project.macro_paths, ".sql", ParseFileType.Macro, saved_files
-    )
-
-    project_files["ModelParser"] = read_files_for_parser(
-        project, files, project.model_paths, ".sql", ParseFileType.Model, saved_files
-    )
+    def load_chunk(start):
+        return [
+            load_file_path(fp, parse_ft, project.project_name, saved_files, hash_cache)
+            for fp, parse_ft in to_load[start : start + READ_FILES_CHUNK_SIZE]
+        ]
 
-    project_files["SnapshotParser"] = read_files_for_parser(
-        project, files, project.snapshot_paths, ".sql", ParseFileType.Snapshot, saved_files
-    )
-
-    project_files["AnalysisParser"] = read_files_for_parser(
-        project, files, project.analysis_paths, ".sql", ParseFileType.Analysis, saved_files
-    )
-
-    project_files["SingularTestParser"] = read_files_for_parser(
-        project, files, project.test_paths, ".sql", ParseFileType.SingularTest, saved_files
-    )
+    source_files: List[Optional[AnySourceFile]] = []
+    with ThreadPoolExecutor(max_workers=READ_FILES_THREADS) as executor:
+        for chunk in executor.map(load_chunk, range(0, len(to_load), READ_FILES_CHUNK_SIZE)):
+            source_files.extend(chunk)
 
-    # all generic tests within /tests must be nested under a /generic subfolder
-    project_files["GenericTestParser"] = read_files_for_parser(
-        project, files, project.generic_test_paths, ".sql", ParseFileType.GenericTest, saved_files
-    )
+    project_files: Dict[str, List[str]] = {
+        parser_name: [] for parser_name, _, _ in file_types.values()
+    }
+    for (_, parse_ft), sf in zip(to_load, source_files):
+        if sf is None:
+            continue
+        files[sf.file_id] = sf
+        parser_name = file_types[parse_ft][0]
+        project_files[parser_name].append(sf.file_id)
 
-    project_files["SeedParser"] = read_files_for_parser(
-        project, files, project.seed_paths, ".csv", ParseFileType.Seed, saved_files
-    )
+    # Store the parser files for this particular project
+    parser_files[project.project_name] = project_files
 
-    project_files["DocumentationParser"] = read_files_for_parser(
-        project, files, project.docs_paths, ".md", ParseFileType.Documentation, saved_files
-    )
 
-    project_files["SchemaParser"] = read_files_for_parser(
-        project, files, project.all_source_paths, ".yml", ParseFileType.Schema, saved_files
-    )
+# Files that the file hash cache found to be unchanged are not read by
+# 'read_files'. Load the contents of any of them that have been scheduled
+# for parsing.
+def load_deferred_contents(files, project_parser_files) -> None:
+    to_load = []
+    for parser_files in project_parser_files.values():
+        for file_ids in parser_files.values():
+            for file_id in file_ids:
+                source_file = files.get(file_id)
+                if (
+                    source_file is not None
+                    and source_file.contents is None
+                    and source_file.parse_file_type != ParseFileType.Schema
+                    and isinstance(source_file.path, FilePath)
+                ):
+                    to_load.append(source_file)
+    if not to_load:
+        return
 
-    # Also read .yaml files for schema files. Might be better to change
-    # 'read_files_for_parser' accept an array in the future.
-    yaml_files = read_files_for_parser(
-        project, files, project.all_source_paths, ".yaml", ParseFileType.Schema, saved_files
-    )
-    project_files["SchemaParser"].extend(yaml_files)
+    def load(source_file):
+        file_contents = load_file_contents(source_file.path.absolute_path, strip=False)
+        source_file.contents = file_contents.strip()
 
-    # Store the parser files for this particular project
-    parser_files[project.project_name] = project_files
+    with ThreadPoolExecutor(max_workers=READ_FILES_THREADS) as executor:
+        list(executor.map(load, to_load))
@@ -1,9 +1,21 @@
 import os
 from dataclasses import dataclass
-from typing import List, Callable, Iterable, Set, Union, Iterator, TypeVar, Generic
+from typing import (
+    List,
+    Callable,
+    Iterable,
+    Set,
+    Union,
+    Iterator,
+    TypeVar,
+    Generic,
+    Dict,
+    Any,
+    Tuple,
+)
 
 from dbt.clients.jinja import extract_toplevel_blocks, BlockTag
-from dbt.clients.system import find_matching
+from dbt.clients.system import find_matching, find_matching_multi
 from dbt.config import Project
 from dbt.contracts.files import FilePath, AnySourceFile
 from dbt.exceptions import ParsingException, InternalException
@@ -61,24 +73,45 @@ class FullBlock(FileBlock):
         return self.block.full_block
 
 
+def _file_path_from_result(result: Dict[str, Any], root: str) -> FilePath:
+    if "searched_path" not in result or "relative_path" not in result:
+        raise InternalException("Invalid result from find_matching: {}".format(result))
+    return FilePath(
+        searched_path=result["searched_path"],
+        relative_path=result["relative_path"],
+        modification_time=result["modification_time"],
+        project_root=root,
+    )
+
+
 def filesystem_search(project: Project, relative_dirs: List[str], extension: str):
     ext = "[!.#~]*" + extension
     root = project.project_root
     file_path_list = []
     for result in find_matching(root, relative_dirs, ext):
-        if "searched_path" not in result or "relative_path" not in result:
-            raise InternalException("Invalid result from find_matching: {}".format(result))
-        file_match = FilePath(
-            searched_path=result["searched_path"],
-            relative_path=result["relative_path"],
-            modification_time=result["modification_time"],
-            project_root=root,
-        )
-        file_path_list.append(file_match)
+        file_path_list.append(_file_path_from_result(result, root))
 
     return file_path_list
 
 
+# Search for many (relative_dirs, extensions) combinations with a single
+# walk of the project's directories. The result maps each key of 'searches'
+# to the FilePaths that 'filesystem_search' would have returned for each of
+# its extensions in turn.
+def filesystem_search_multi(
+    project: Project, searches: Dict[Any, Tuple[List[str], List[str]]]
+) -> Dict[Any, List[FilePath]]:
+    root = project.project_root
+    patterns = {
+        key: (relative_dirs, ["[!.#~]*" + extension for extension in extensions])
+        for key, (relative_dirs, extensions) in searches.items()
+    }
+    return {
+        key: [_file_path_from_result(result, root) for result in results]
+        for key, results in find_matching_multi(root, patterns).items()
+    }
+
+
 Block = Union[BlockContents, FullBlock]
 
 BlockSearchResult = TypeVar("BlockSearchResult", BlockContents, FullBlock)
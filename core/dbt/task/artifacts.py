@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+from dbt import flags
+from dbt.events.functions import fire_event
+from dbt.events.types import ArtifactWriteFailed, FastJsonUnavailable
+import dbt.utils
+
+
+# Artifacts are written by a single background thread, in the order they were
+# queued, so a task can go on while a large manifest.json is written.
+# GraphRunnableTask.run waits for them in `artifacts_written` before it
+# returns, so they are there for embedders that run tasks from dbt.lib, and
+# dbt.main and the daemon wait for the ones other tasks queue.
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_PENDING: List[Future] = []
+_LOCK = threading.Lock()
+
+
+def write_in_background(func: Callable[..., Any], *args: Any) -> None:
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ArtifactWriter")
+        # forget the writes that are already done, unless they failed
+        _PENDING[:] = [
+            future for future in _PENDING if not future.done() or future.exception() is not None
+        ]
+        _PENDING.append(_EXECUTOR.submit(func, *args))
+
+
+def wait_for_artifacts() -> None:
+    """Block until every queued artifact has been written, and raise the
+    first error any of them hit.
+    """
+    with _LOCK:
+        pending = list(_PENDING)
+        _PENDING.clear()
+    errors = [future.exception() for future in pending]
+    for error in errors:
+        if error is not None:
+            raise error
+
+
+@contextmanager
+def artifacts_written() -> Iterator[None]:
+    """Wait for every queued artifact to be written when the block exits. An
+    error writing them is raised if the block succeeded, and only logged if
+    it failed, so it never hides the block's own error.
+    """
+    try:
+        yield
+    except BaseException:
+        try:
+            wait_for_artifacts()
+        except Exception as exc:
+            fire_event(ArtifactWriteFailed(exc=str(exc)))
+        raise
+    wait_for_artifacts()
+
+
+def use_fast_json() -> bool:
+    if not flags.FAST_JSON:
+        return False
+    if not dbt.utils.fast_json_available():
+        fire_event(FastJsonUnavailable())
+        return False
+    return True
@@ -0,0 +1,262 @@
+import copy
+import json
+import os
+import socket
+import socketserver
+from typing import Any, Dict, List, Optional
+
+import dbt.main
+import dbt.utils
+from dbt import flags
+from dbt.adapters.factory import register_adapter, reset_adapters
+from dbt.clients.daemon import DEFAULT_SOCKET_NAME, decode
+from dbt.config import RuntimeConfig
+from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.results import RunExecutionResult, RunResultsArtifact
+from dbt.events.functions import fire_event, set_invocation_id
+from dbt.events.types import (
+    DaemonCommandFailed,
+    DaemonFilesChanged,
+    DaemonListening,
+    DaemonRunningCommand,
+)
+from dbt.exceptions import RuntimeException
+from dbt.lib import create_task
+from dbt.parser.manifest import ManifestLoader
+from dbt.task.artifacts import artifacts_written
+from dbt.task.base import ConfiguredTask
+
+# the commands the daemon runs against the manifest it keeps in memory
+DAEMON_COMMANDS = frozenset(("list", "compile", "run", "test"))
+
+# the arguments the daemon's config and manifest are built from, which a
+# command sent to it can't change
+STATE_ARGS = ("project_dir", "profiles_dir", "profile", "target", "vars")
+
+# a change to any of these files means loading the config again, not just
+# reparsing the project
+CONFIG_FILE_NAMES = frozenset(("dbt_project.yml", "packages.yml", "profiles.yml", "selectors.yml"))
+
+
+def _is_within(path: str, directory: str) -> bool:
+    return os.path.commonpath([path, directory]) == directory
+
+
+def _working_copy(manifest: Manifest) -> Manifest:
+    # tasks replace nodes and sources in their manifest as they compile and
+    # run them, so every command gets its own copy of those mappings, and
+    # the daemon's manifest stays as it was parsed
+    working = copy.copy(manifest)
+    working.nodes = dict(manifest.nodes)
+    working.sources = dict(manifest.sources)
+    return working
+
+
+def _serialize_results(results: Any) -> Any:
+    if isinstance(results, RunExecutionResult):
+        return RunResultsArtifact.from_execution_results(
+            results=results.results,
+            elapsed_time=results.elapsed_time,
+            generated_at=results.generated_at,
+            args=results.args,
+        ).to_dict(omit_none=False)
+    # the lines `dbt ls` printed
+    return results
+
+
+def _remove_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            # left behind by a daemon that didn't shut down cleanly
+            os.remove(path)
+            return
+    raise RuntimeException(f"A dbt daemon is already listening on {path}")
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self):
+        task = self.server.task
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            self.wfile.write(task.handle_request(line))
+            if task.stopping:
+                break
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, task: "DaemonTask") -> None:
+        self.task = task
+        super().__init__(path, DaemonRequestHandler)
+
+
+class DaemonTask(ConfiguredTask):
+    """Serve dbt commands over a Unix socket from one long-lived process,
+    which keeps the config, the registered adapter and the parsed manifest
+    between commands. The manifest is only reparsed after a client reports
+    changed files, and then with partial parsing against the manifest in
+    memory rather than the one saved in the target directory.
+
+    Commands are handled one at a time, since dbt's flags and adapters are
+    global to the process.
+    """
+
+    def __init__(self, args, config):
+        super().__init__(args, config)
+        self.manifest: Optional[Manifest] = None
+        self.changed_paths: List[str] = []
+        self.reparse = False
+        self.reload_config = False
+        self.stopping = False
+
+    @property
+    def socket_path(self) -> str:
+        path = self.args.socket or os.path.join(self.config.target_path, DEFAULT_SOCKET_NAME)
+        return os.path.abspath(path)
+
+    def refresh(self) -> None:
+        """Bring the config and manifest up to date with the changes
+        reported since the last command.
+        """
+        if self.reload_config:
+            self.config = RuntimeConfig.from_args(self.args)
+            reset_adapters()
+            register_adapter(self.config)
+            self.reload_config = False
+            self.reparse = True
+
+        if self.manifest is not None and not self.reparse:
+            return
+        if self.reparse:
+            fire_event(DaemonFilesChanged(paths=self.changed_paths))
+        saved_manifest = self.manifest
+        # partial parsing updates the saved manifest in place, so if it fails
+        # part way through, start again from the one on disk
+        self.manifest = None
+        self.manifest = ManifestLoader.get_full_manifest(
+            self.config, reset=saved_manifest is not None, saved_manifest=saved_manifest
+        )
+        self.reparse = False
+        self.changed_paths = []
+
+    def notify(self, paths: List[str]) -> None:
+        """Record changed files. With no paths, the whole project is
+        checked for changes before the next command.
+        """
+        ignored = [
+            os.path.abspath(self.config.target_path),
+            os.path.abspath(self.config.log_path),
+        ]
+        changed = [
+            path
+            for path in paths
+            if not any(_is_within(os.path.abspath(path), directory) for directory in ignored)
+        ]
+        if paths and not changed:
+            return
+
+        packages_path = os.path.abspath(self.config.packages_install_path)
+        for path in changed:
+            if os.path.basename(path) in CONFIG_FILE_NAMES or _is_within(
+                os.path.abspath(path), packages_path
+            ):
+                self.reload_config = True
+        self.changed_paths.extend(changed)
+        self.reparse = True
+
+    def _parse_command(self, args: List[str]):
+        # parsing the arguments sets flags.PROFILES_DIR as a side effect, which
+        # would leak into later commands if these arguments are rejected
+        profiles_dir = flags.PROFILES_DIR
+        try:
+            parsed = dbt.main.parse_args(args)
+        except SystemExit:
+            raise RuntimeException(f"Invalid arguments: {' '.join(args)}")
+        finally:
+            flags.PROFILES_DIR = profiles_dir
+
+        if parsed.which not in DAEMON_COMMANDS:
+            raise RuntimeException(
+                f"The daemon can't run `dbt {parsed.which}`, only "
+                f"{', '.join(sorted(DAEMON_COMMANDS))}"
+            )
+        for name in STATE_ARGS:
+            value = getattr(parsed, name, None)
+            daemon_value = getattr(self.args, name, None)
+            if value not in (None, "{}") and value != daemon_value:
+                option = "--" + name.replace("_", "-")
+                raise RuntimeException(
+                    f"{option} can't be changed in a running daemon, restart it with "
+                    f"the new value instead"
+                )
+            setattr(parsed, name, daemon_value)
+        return parsed
+
+    def run_command(self, args: List[str]) -> Dict[str, Any]:
+        parsed = self._parse_command(args)
+        flags.set_from_args(parsed, self.config.user_config)
+        self.refresh()
+        set_invocation_id()
+        fire_event(DaemonRunningCommand(args=args))
+
+        config = copy.copy(self.config)
+        config.args = parsed
+        if getattr(parsed, "threads", None):
+            config.threads = parsed.threads
+        task = create_task(parsed.which, parsed, _working_copy(self.manifest), config)
+
+        results = None
+        with dbt.main.track_run(task):
+            with artifacts_written():
+                results = task.run()
+        if results is None:
+            # track_run reported the error, but didn't raise it
+            raise RuntimeException(f"`dbt {' '.join(args)}` failed, see the daemon's log")
+        return {
+            "success": task.interpret_results(results),
+            "results": _serialize_results(results),
+        }
+
+    def handle_request(self, line: bytes) -> bytes:
+        try:
+            request = decode(line)
+            method = request.get("method")
+            if method == "command":
+                response = self.run_command(list(request.get("args") or []))
+            elif method == "notify":
+                self.notify(list(request.get("paths") or []))
+                response = {"success": True}
+            elif method == "shutdown":
+                self.stopping = True
+                response = {"success": True}
+            else:
+                raise RuntimeException(f"Unknown daemon method: {method}")
+        except Exception as exc:
+            fire_event(DaemonCommandFailed(exc=str(exc)))
+            response = {"success": False, "error": str(exc)}
+        return (json.dumps(response, cls=dbt.utils.JSONEncoder) + "\n").encode("utf-8")
+
+    def run(self):
+        self.refresh()
+
+        path = self.socket_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _remove_stale_socket(path)
+        server = DaemonServer(path, self)
+        fire_event(DaemonListening(path=path))
+        try:
+            while not self.stopping:
+                server.handle_request()
+        finally:
+            server.server_close()
+            os.remove(path)
+        return None
+
+    def interpret_results(self, results):
+        return True
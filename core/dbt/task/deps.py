@@ -4,7 +4,7 @@ import dbt.exceptions
 
 from dbt.config import UnsetProfileConfig
 from dbt.config.renderer import DbtProjectYamlRenderer
-from dbt.deps.base import downloads_directory
+from dbt.deps.base import downloads_directory, package_executor
 from dbt.deps.resolver import resolve_packages
 
 from dbt.events.functions import fire_event
@@ -58,27 +58,33 @@ class DepsTask(BaseTask):
             renderer = DbtProjectYamlRenderer(self.config, self.config.cli_vars)
 
             packages_to_upgrade = []
-            for package in final_deps:
-                package_name = package.name
-                source_type = package.source_type()
-                version = package.get_version()
+            with package_executor() as executor:
+                # install every package at once, but report on them in order
+                installs = [
+                    executor.submit(package.install, self.config, renderer)
+                    for package in final_deps
+                ]
+                for package, install in zip(final_deps, installs):
+                    package_name = package.name
+                    source_type = package.source_type()
+                    version = package.get_version()
 
-                fire_event(DepsStartPackageInstall(package_name=package_name))
-                package.install(self.config, renderer)
-                fire_event(DepsInstallInfo(version_name=package.nice_version_name()))
-                if source_type == "hub":
-                    version_latest = package.get_version_latest()
-                    if version_latest != version:
-                        packages_to_upgrade.append(package_name)
-                        fire_event(DepsUpdateAvailable(version_latest=version_latest))
-                    else:
-                        fire_event(DepsUTD())
-                if package.get_subdirectory():
-                    fire_event(DepsListSubdirectory(subdirectory=package.get_subdirectory()))
+                    fire_event(DepsStartPackageInstall(package_name=package_name))
+                    install.result()
+                    fire_event(DepsInstallInfo(version_name=package.nice_version_name()))
+                    if source_type == "hub":
+                        version_latest = package.get_version_latest()
+                        if version_latest != version:
+                            packages_to_upgrade.append(package_name)
+                            fire_event(DepsUpdateAvailable(version_latest=version_latest))
+                        else:
+                            fire_event(DepsUTD())
+                    if package.get_subdirectory():
+                        fire_event(DepsListSubdirectory(subdirectory=package.get_subdirectory()))
 
-                self.track_package_install(
-                    package_name=package_name, source_type=source_type, version=version
-                )
+                    self.track_package_install(
+                        package_name=package_name, source_type=source_type, version=version
+                    )
             if packages_to_upgrade:
                 fire_event(EmptyLine())
                 fire_event(DepsNotifyUpdatesAvailable(packages=packages_to_upgrade))
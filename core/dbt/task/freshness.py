@@ -1,6 +1,7 @@
 import os
 import threading
 import time
+from typing import AbstractSet, Any, Dict, List, Optional, Tuple
 
 from .base import BaseRunner
 from .printer import (
@@ -18,6 +19,8 @@ from dbt.contracts.results import (
 from dbt.exceptions import RuntimeException, InternalException
 from dbt.events.functions import fire_event
 from dbt.events.types import (
+    FreshnessBatchesStart,
+    FreshnessBatchFailed,
     FreshnessCheckComplete,
     PrintStartLine,
     PrintHookEndErrorLine,
@@ -29,12 +32,16 @@ from dbt.node_types import NodeType
 
 from dbt.graph import ResourceTypeSelector
 from dbt.contracts.graph.parsed import ParsedSourceDefinition
+import dbt.utils
 
 
 RESULT_FILE_NAME = "sources.json"
 
 
 class FreshnessRunner(BaseRunner):
+    # the source's freshness, if it was already calculated in a batch
+    batched_freshness: Optional[Dict[str, Any]] = None
+
     def on_skip(self):
         raise RuntimeException("Freshness: nodes cannot be skipped!")
 
@@ -138,16 +145,18 @@ class FreshnessRunner(BaseRunner):
                 "Got to execute for source freshness of a source that has no " "loaded_at_field!"
             )
 
-        relation = self.adapter.Relation.create_from_source(compiled_node)
-        # given a Source, calculate its fresnhess.
-        with self.adapter.connection_for(compiled_node):
-            self.adapter.clear_transaction()
-            freshness = self.adapter.calculate_freshness(
-                relation,
-                compiled_node.loaded_at_field,
-                compiled_node.freshness.filter,
-                manifest=manifest,
-            )
+        freshness = self.batched_freshness
+        if freshness is None:
+            relation = self.adapter.Relation.create_from_source(compiled_node)
+            # given a Source, calculate its fresnhess.
+            with self.adapter.connection_for(compiled_node):
+                self.adapter.clear_transaction()
+                freshness = self.adapter.calculate_freshness(
+                    relation,
+                    compiled_node.loaded_at_field,
+                    compiled_node.freshness.filter,
+                    manifest=manifest,
+                )
 
         status = compiled_node.freshness.status(freshness["age"])
 
@@ -181,6 +190,10 @@ class FreshnessSelector(ResourceTypeSelector):
 
 
 class FreshnessTask(GraphRunnableTask):
+    def __init__(self, args, config):
+        super().__init__(args, config)
+        self._batched_freshness: Dict[str, Dict[str, Any]] = {}
+
     def result_path(self):
         if self.args.output:
             return os.path.realpath(self.args.output)
@@ -203,6 +216,66 @@ class FreshnessTask(GraphRunnableTask):
     def get_runner_type(self, _):
         return FreshnessRunner
 
+    def get_runner(self, node):
+        runner = super().get_runner(node)
+        runner.batched_freshness = self._batched_freshness.get(node.unique_id)
+        return runner
+
+    def before_run(self, adapter, selected_uids: AbstractSet[str]):
+        super().before_run(adapter, selected_uids)
+        if getattr(self.args, "batched", False):
+            self._batched_freshness = self.calculate_batched_freshness(adapter, selected_uids)
+
+    def get_freshness_batches(
+        self, selected_uids: AbstractSet[str]
+    ) -> List[List[ParsedSourceDefinition]]:
+        """Group the selected sources by database and schema, in batches of
+        at most --batch-size sources.
+        """
+        if self.manifest is None:
+            raise InternalException("manifest must be set to get freshness batches")
+
+        schemas: Dict[Tuple[Optional[str], str], List[ParsedSourceDefinition]] = {}
+        for unique_id in sorted(selected_uids):
+            source = self.manifest.sources[unique_id]
+            key = (dbt.utils.lowercase(source.database), source.schema.lower())
+            schemas.setdefault(key, []).append(source)
+
+        return self.make_batches(schemas.values())
+
+    def calculate_batched_freshness(
+        self, adapter, selected_uids: AbstractSet[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Calculate the freshness of the selected sources a batch at a time,
+        each batch as one query per schema.
+        """
+        batches = self.get_freshness_batches(selected_uids)
+        fire_event(FreshnessBatchesStart(num_sources=len(selected_uids), num_batches=len(batches)))
+
+        def calculate(batch: List[ParsedSourceDefinition]) -> Dict[str, Dict[str, Any]]:
+            adapter.clear_transaction()
+            results = adapter.calculate_freshness_batch(
+                [
+                    (
+                        adapter.Relation.create_from_source(source),
+                        source.loaded_at_field,
+                        source.freshness.filter,
+                    )
+                    for source in batch
+                ],
+                manifest=self.manifest,
+            )
+            return {source.unique_id: result for source, result in zip(batch, results)}
+
+        def on_failure(batch: List[ParsedSourceDefinition], exc: Exception) -> None:
+            fire_event(FreshnessBatchFailed(num_sources=len(batch), exc=str(exc)))
+
+        return self.run_batches(adapter, "freshness_batch", batches, calculate, on_failure)
+
+    def result_sidecar_path(self):
+        # sources.json is always written at the end
+        return None
+
     def write_result(self, result):
         artifact = FreshnessExecutionResultArtifact.from_result(result)
         artifact.write(self.result_path())
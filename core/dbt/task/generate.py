@@ -1,12 +1,18 @@
+import hashlib
+import json
 import os
 import shutil
+import tempfile
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Set
+
+import agate
 
 from dbt.dataclass_schema import ValidationError
 
 from .compile import CompileTask
 
+from dbt.adapters.base import BaseAdapter
 from dbt.adapters.factory import get_adapter
 from dbt.contracts.graph.compiled import CompileResultNode
 from dbt.contracts.graph.manifest import Manifest
@@ -21,7 +27,9 @@ from dbt.contracts.results import (
     StatsDict,
     ColumnMetadata,
     CatalogArtifact,
+    CatalogMetadata,
 )
+from dbt.clients.system import make_directory, write_json
 from dbt.exceptions import InternalException
 from dbt.include.global_project import DOCS_INDEX_FILE_PATH
 from dbt.events.functions import fire_event
@@ -32,12 +40,19 @@ from dbt.events.types import (
     BuildingCatalog,
 )
 from dbt.parser.manifest import ManifestLoader
+from dbt.version import __version__ as dbt_version
 import dbt.utils
 import dbt.compilation
 import dbt.exceptions
 
 
 CATALOG_FILENAME = "catalog.json"
+# where `dbt docs generate --reuse-catalog-shards` keeps each schema's catalog,
+# under the target path
+CATALOG_SHARDS_DIRECTORY = "catalog_shards"
+
+# lowercased database and schema names
+ShardKey = Tuple[Optional[str], Optional[str]]
 
 
 def get_stripped_prefix(source: Dict[str, Any], prefix: str) -> Dict[str, Any]:
@@ -62,7 +77,7 @@ def build_catalog_table(data) -> CatalogTable:
 
 # keys are database name, schema name, table name
 class Catalog(Dict[CatalogKey, CatalogTable]):
-    def __init__(self, columns: List[PrimitiveDict]):
+    def __init__(self, columns: Iterable[PrimitiveDict]):
         super().__init__()
         for col in columns:
             self.add_column(col)
@@ -104,11 +119,18 @@ class Catalog(Dict[CatalogKey, CatalogTable]):
 
     def make_unique_id_map(
         self, manifest: Manifest
+    ) -> Tuple[Dict[str, CatalogTable], Dict[str, CatalogTable]]:
+        node_map, source_map = get_unique_id_mapping(manifest)
+        return self.match_unique_ids(node_map, source_map)
+
+    def match_unique_ids(
+        self,
+        node_map: Dict[CatalogKey, str],
+        source_map: Dict[CatalogKey, Set[str]],
     ) -> Tuple[Dict[str, CatalogTable], Dict[str, CatalogTable]]:
         nodes: Dict[str, CatalogTable] = {}
         sources: Dict[str, CatalogTable] = {}
 
-        node_map, source_map = get_unique_id_mapping(manifest)
         table: CatalogTable
         for table in self.values():
             key = table.key()
@@ -198,6 +220,207 @@ def get_unique_id_mapping(
     return node_map, source_map
 
 
+def shard_key(database: Optional[str], schema: Optional[str]) -> ShardKey:
+    return dbt.utils.lowercase(database), dbt.utils.lowercase(schema)
+
+
+def serialize_tables(tables: Dict[str, CatalogTable]) -> Dict[str, Dict[str, Any]]:
+    return {unique_id: table.to_dict(omit_none=False) for unique_id, table in tables.items()}
+
+
+def _relation_name(table: CatalogTable) -> Tuple[Optional[str], str, str]:
+    return table.metadata.database, table.metadata.schema, table.metadata.name
+
+
+class CatalogBuilder:
+    """Match the tables in each catalog query's results to the manifest's
+    nodes and sources as the queries finish. Only the matched tables are
+    kept, not the rows they were built from.
+    """
+
+    def __init__(self, manifest: Manifest):
+        self.node_map, self.source_map = get_unique_id_mapping(manifest)
+        self.nodes: Dict[str, CatalogTable] = {}
+        self.sources: Dict[str, CatalogTable] = {}
+
+    def add_table(
+        self, table: agate.Table
+    ) -> Tuple[Dict[str, CatalogTable], Dict[str, CatalogTable]]:
+        """Group the rows of one catalog query into tables, and return the
+        nodes and sources among them that weren't in the catalog yet.
+        """
+        catalog = Catalog(
+            dict(zip(table.column_names, map(dbt.utils._coerce_decimal, row))) for row in table
+        )
+        nodes, sources = catalog.match_unique_ids(self.node_map, self.source_map)
+        return self.add(nodes, sources)
+
+    def add(
+        self, nodes: Dict[str, CatalogTable], sources: Dict[str, CatalogTable]
+    ) -> Tuple[Dict[str, CatalogTable], Dict[str, CatalogTable]]:
+        # a relation can turn up in more than one query if its database is
+        # spelled in more than one way, but it's only added once
+        new_nodes: Dict[str, CatalogTable] = {}
+        for unique_id, table in nodes.items():
+            if unique_id not in self.nodes:
+                self.nodes[unique_id] = new_nodes[unique_id] = table
+
+        new_sources: Dict[str, CatalogTable] = {}
+        for unique_id, table in sources.items():
+            existing = self.sources.get(unique_id)
+            if existing is None:
+                self.sources[unique_id] = new_sources[unique_id] = table
+            elif _relation_name(existing) != _relation_name(table):
+                dbt.exceptions.raise_ambiguous_catalog_match(
+                    unique_id,
+                    existing.to_dict(omit_none=True),
+                    table.to_dict(omit_none=True),
+                )
+        return new_nodes, new_sources
+
+
+class CatalogWriter:
+    """Write catalog.json a table at a time. Nodes and sources are appended
+    to temporary files as they're added, and joined with the metadata and
+    errors at the end, so the whole catalog is never serialized at once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        make_directory(os.path.dirname(path))
+        self._spools = {
+            section: tempfile.TemporaryFile("w+", encoding="utf-8", dir=os.path.dirname(path))
+            for section in ("nodes", "sources")
+        }
+        self._counts = {section: 0 for section in self._spools}
+
+    def __enter__(self) -> "CatalogWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        for spool in self._spools.values():
+            spool.close()
+
+    def _add(self, section: str, tables: Dict[str, Dict[str, Any]]) -> None:
+        spool = self._spools[section]
+        for unique_id, data in tables.items():
+            if self._counts[section]:
+                spool.write(", ")
+            spool.write(json.dumps(unique_id))
+            spool.write(": ")
+            spool.write(json.dumps(data, cls=dbt.utils.JSONEncoder))
+            self._counts[section] += 1
+
+    def add(self, nodes: Dict[str, Dict[str, Any]], sources: Dict[str, Dict[str, Any]]) -> None:
+        """Add serialized catalog tables, by unique ID."""
+        self._add("nodes", nodes)
+        self._add("sources", sources)
+
+    def write(self, metadata: CatalogMetadata, errors: Optional[List[str]]) -> None:
+        # laid out the way CatalogArtifact.write lays it out
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as fp:
+            fp.write('{"metadata": ')
+            fp.write(json.dumps(metadata.to_dict(omit_none=False), cls=dbt.utils.JSONEncoder))
+            for section, spool in self._spools.items():
+                fp.write(f', "{section}": {{')
+                spool.seek(0)
+                shutil.copyfileobj(spool, fp)
+                fp.write("}")
+            fp.write(', "errors": ')
+            fp.write(json.dumps(errors))
+            fp.write("}")
+        os.replace(temp_path, self.path)
+
+
+class CatalogShards:
+    """The catalog of each schema, saved by `dbt docs generate
+    --reuse-catalog-shards`. A saved schema is reused by the next run if none
+    of the models, seeds, snapshots and sources in it have changed since, and
+    all of them were found in it. Changes made to those relations outside of
+    dbt, like a loader adding a column to a source table, aren't noticed.
+    """
+
+    def __init__(self, path: str, manifest: Manifest):
+        self.path = path
+        self.expected: Dict[ShardKey, Set[str]] = {}
+        self.fingerprints: Dict[ShardKey, str] = {}
+        self._saved: Set[str] = set()
+
+        parts: Dict[ShardKey, List[str]] = {}
+        for unique_id, node in manifest.nodes.items():
+            if not node.is_relational or node.is_ephemeral_model:
+                continue
+            part = [
+                unique_id,
+                node.identifier,
+                node.checksum.checksum,
+                node.config.to_dict(omit_none=True),
+                # for persist_docs
+                node.description,
+                {name: column.description for name, column in node.columns.items()},
+            ]
+            self._add_part(parts, shard_key(node.database, node.schema), unique_id, part)
+        for unique_id, source in manifest.sources.items():
+            part = [unique_id, source.identifier]
+            self._add_part(parts, shard_key(source.database, source.schema), unique_id, part)
+
+        for key, key_parts in parts.items():
+            data = json.dumps([dbt_version, sorted(key_parts)])
+            self.fingerprints[key] = hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _add_part(
+        self, parts: Dict[ShardKey, List[str]], key: ShardKey, unique_id: str, part: List[Any]
+    ) -> None:
+        parts.setdefault(key, []).append(
+            json.dumps(part, cls=dbt.utils.JSONEncoder, sort_keys=True)
+        )
+        self.expected.setdefault(key, set()).add(unique_id)
+
+    def shard_path(self, key: ShardKey) -> str:
+        name = hashlib.md5(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, name + ".json")
+
+    def load(self, key: ShardKey) -> Optional[Dict[str, Any]]:
+        """Return the saved catalog of the schema, if it can be reused."""
+        path = self.shard_path(key)
+        try:
+            with open(path, encoding="utf-8") as fp:
+                shard = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if shard.get("fingerprint") != self.fingerprints[key]:
+            return None
+        if not self.expected[key] <= set(shard["nodes"]) | set(shard["sources"]):
+            return None
+        self._saved.add(path)
+        return shard
+
+    def save(
+        self,
+        key: ShardKey,
+        nodes: Dict[str, Dict[str, Any]],
+        sources: Dict[str, Dict[str, Any]],
+    ) -> None:
+        if key not in self.fingerprints:
+            return
+        path = self.shard_path(key)
+        shard = {"fingerprint": self.fingerprints[key], "nodes": nodes, "sources": sources}
+        write_json(path, shard)
+        self._saved.add(path)
+
+    def remove_stale(self) -> None:
+        """Remove the shards of schemas that weren't saved or reused by this
+        run, which may no longer match the warehouse.
+        """
+        if not os.path.isdir(self.path):
+            return
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if path not in self._saved:
+                os.remove(path)
+
+
 class GenerateTask(CompileTask):
     def _get_manifest(self) -> Manifest:
         if self.manifest is None:
@@ -234,41 +457,81 @@ class GenerateTask(CompileTask):
         if self.manifest is None:
             raise InternalException("self.manifest was None in run!")
 
+        path = os.path.join(self.config.target_path, CATALOG_FILENAME)
         adapter = get_adapter(self.config)
-        with adapter.connection_named("generate_catalog"):
-            fire_event(BuildingCatalog())
-            catalog_table, exceptions = adapter.get_catalog(self.manifest)
+        # adapters that override get_catalog return the whole catalog at once,
+        # so their catalogs can't be built, or saved, a schema at a time
+        per_schema = type(adapter).get_catalog is BaseAdapter.get_catalog
+        shards: Optional[CatalogShards] = None
+        if per_schema and getattr(self.args, "reuse_catalog_shards", False):
+            shards = CatalogShards(
+                os.path.join(self.config.target_path, CATALOG_SHARDS_DIRECTORY), self.manifest
+            )
+        builder = CatalogBuilder(self.manifest)
+        exceptions: List[Exception] = []
+
+        with CatalogWriter(path) as writer:
+            reused: Set[ShardKey] = set()
+            if shards is not None:
+                for key in shards.fingerprints:
+                    shard = shards.load(key)
+                    if shard is not None:
+                        self._add_shard(builder, writer, shard)
+                        reused.add(key)
+
+            with adapter.connection_named("generate_catalog"):
+                fire_event(BuildingCatalog())
+                if per_schema:
+                    catalogs = adapter.iter_catalogs(self.manifest, exceptions, exclude=reused)
+                    for information_schema, schema, table in catalogs:
+                        nodes, sources = builder.add_table(table)
+                        node_data = serialize_tables(nodes)
+                        source_data = serialize_tables(sources)
+                        writer.add(node_data, source_data)
+                        if shards is not None:
+                            key = shard_key(information_schema.database, schema)
+                            shards.save(key, node_data, source_data)
+                else:
+                    table, catalog_exceptions = adapter.get_catalog(self.manifest)
+                    exceptions.extend(catalog_exceptions)
+                    nodes, sources = builder.add_table(table)
+                    writer.add(serialize_tables(nodes), serialize_tables(sources))
 
-        catalog_data: List[PrimitiveDict] = [
-            dict(zip(catalog_table.column_names, map(dbt.utils._coerce_decimal, row)))
-            for row in catalog_table
-        ]
+            errors: Optional[List[str]] = None
+            if exceptions:
+                errors = [str(e) for e in exceptions]
 
-        catalog = Catalog(catalog_data)
+            generated_at = datetime.utcnow()
+            writer.write(CatalogMetadata(generated_at=generated_at), errors)
 
-        errors: Optional[List[str]] = None
-        if exceptions:
-            errors = [str(e) for e in exceptions]
+        if shards is not None:
+            shards.remove_stale()
 
-        nodes, sources = catalog.make_unique_id_map(self.manifest)
         results = self.get_catalog_results(
-            nodes=nodes,
-            sources=sources,
-            generated_at=datetime.utcnow(),
+            nodes=builder.nodes,
+            sources=builder.sources,
+            generated_at=generated_at,
             compile_results=compile_results,
             errors=errors,
         )
 
-        path = os.path.join(self.config.target_path, CATALOG_FILENAME)
-        results.write(path)
-        if self.args.compile:
-            self.write_manifest()
-
         if exceptions:
             fire_event(WriteCatalogFailure(num_exceptions=len(exceptions)))
         fire_event(CatalogWritten(path=os.path.abspath(path)))
         return results
 
+    def _add_shard(
+        self, builder: CatalogBuilder, writer: CatalogWriter, shard: Dict[str, Any]
+    ) -> None:
+        nodes, sources = builder.add(
+            {k: CatalogTable.from_dict(v) for k, v in shard["nodes"].items()},
+            {k: CatalogTable.from_dict(v) for k, v in shard["sources"].items()},
+        )
+        writer.add(
+            {k: shard["nodes"][k] for k in nodes},
+            {k: shard["sources"][k] for k in sources},
+        )
+
     def get_catalog_results(
         self,
         nodes: Dict[str, CatalogTable],
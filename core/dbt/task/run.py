@@ -431,8 +431,8 @@ class RunTask(CompileTask):
             other=deferred_manifest,
             selected=selected_uids,
         )
-        # TODO: is it wrong to write the manifest here? I think it's right...
-        self.write_manifest()
+        if not self._write_manifest_at_end:
+            self.write_manifest()
 
     def before_run(self, adapter, selected_uids: AbstractSet[str]):
         with adapter.connection_named("master"):
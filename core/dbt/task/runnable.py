@@ -5,7 +5,17 @@ from abc import abstractmethod
 from concurrent.futures import as_completed
 from datetime import datetime
 from multiprocessing.dummy import Pool as ThreadPool
-from typing import Optional, Dict, List, Set, Tuple, Iterable, AbstractSet
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Set,
+    Tuple,
+    Iterable,
+    AbstractSet,
+    Callable,
+    TypeVar,
+)
 
 from .printer import (
     print_run_result_error,
@@ -13,6 +23,7 @@ from .printer import (
 )
 
 from dbt.clients.system import write_file
+from dbt.task.artifacts import artifacts_written, use_fast_json, write_in_background
 from dbt.task.base import ConfiguredTask
 from dbt.adapters.base import BaseRelation
 from dbt.adapters.factory import get_adapter
@@ -38,7 +49,12 @@ from dbt.events.types import (
 from dbt.contracts.graph.compiled import CompileResultNode
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.parsed import ParsedSourceDefinition
-from dbt.contracts.results import NodeStatus, RunExecutionResult, RunningStatus
+from dbt.contracts.results import (
+    NodeStatus,
+    RunExecutionResult,
+    RunningStatus,
+    RunResultsSidecar,
+)
 from dbt.contracts.state import PreviousState
 from dbt.exceptions import (
     InternalException,
@@ -48,7 +64,15 @@ from dbt.exceptions import (
     warn_or_error,
 )
 
-from dbt.graph import GraphQueue, NodeSelector, SelectionSpec, parse_difference, Graph
+from dbt.graph import (
+    GraphQueue,
+    NodeSelector,
+    SelectionSpec,
+    parse_difference,
+    Graph,
+    SchedulingMode,
+    load_execution_times,
+)
 from dbt.parser.manifest import ManifestLoader
 
 import dbt.exceptions
@@ -57,8 +81,14 @@ import dbt.utils
 from dbt.ui import warning_tag
 
 RESULT_FILE_NAME = "run_results.json"
+RESULT_SIDECAR_FILE_NAME = "run_results.jsonl"
 MANIFEST_FILE_NAME = "manifest.json"
 RUNNING_STATE = DbtProcessState("running")
+# how many nodes a `--batched` task puts in one query, unless --batch-size is set
+DEFAULT_BATCH_SIZE = 50
+
+BatchNode = TypeVar("BatchNode")
+BatchResult = TypeVar("BatchResult")
 
 
 class ManifestTask(ConfiguredTask):
@@ -66,18 +96,23 @@ class ManifestTask(ConfiguredTask):
         super().__init__(args, config)
         self.manifest: Optional[Manifest] = None
         self.graph: Optional[Graph] = None
+        # set by tasks that write the manifest once they're done, which
+        # supersedes writing it as soon as it's loaded
+        self._write_manifest_at_end = False
 
     def write_manifest(self):
         if flags.WRITE_JSON:
             path = os.path.join(self.config.target_path, MANIFEST_FILE_NAME)
-            self.manifest.write(path)
+            writable = self.manifest.writable_manifest()
+            write_in_background(writable.write, path, use_fast_json())
         if os.getenv("DBT_WRITE_FILES"):
             path = os.path.join(self.config.target_path, "files.json")
             write_file(path, json.dumps(self.manifest.files, cls=dbt.utils.JSONEncoder, indent=4))
 
     def load_manifest(self):
         self.manifest = ManifestLoader.get_full_manifest(self.config)
-        self.write_manifest()
+        if not self._write_manifest_at_end:
+            self.write_manifest()
 
     def compile_manifest(self):
         if self.manifest is None:
@@ -107,6 +142,7 @@ class GraphRunnableTask(ManifestTask):
         self._raise_next_tick = None
         self.previous_state: Optional[PreviousState] = None
         self.set_previous_state()
+        self.results_sidecar: Optional[RunResultsSidecar] = None
 
     def set_previous_state(self):
         if self.args.state is not None:
@@ -144,7 +180,12 @@ class GraphRunnableTask(ManifestTask):
     def get_graph_queue(self) -> GraphQueue:
         selector = self.get_node_selector()
         spec = self.get_selection_spec()
-        return selector.get_graph_queue(spec)
+        scheduling_mode = SchedulingMode.from_flag(flags.SCHEDULING_MODE)
+        execution_times = None
+        if scheduling_mode == SchedulingMode.CriticalPath:
+            # the results of the previous invocation, if there was one
+            execution_times = load_execution_times(self.result_path())
+        return selector.get_graph_queue(spec, scheduling_mode, execution_times)
 
     def _runtime_initialize(self):
         super()._runtime_initialize()
@@ -176,6 +217,10 @@ class GraphRunnableTask(ManifestTask):
     def result_path(self):
         return os.path.join(self.config.target_path, RESULT_FILE_NAME)
 
+    # None for tasks whose results can't be streamed
+    def result_sidecar_path(self) -> Optional[str]:
+        return os.path.join(self.config.target_path, RESULT_SIDECAR_FILE_NAME)
+
     def get_runner(self, node):
         adapter = get_adapter(self.config)
         run_count: int = 0
@@ -314,6 +359,8 @@ class GraphRunnableTask(ManifestTask):
         is_ephemeral = result.node.is_ephemeral_model
         if not is_ephemeral:
             self.node_results.append(result)
+            if self.results_sidecar is not None:
+                self.results_sidecar.append(result)
 
         node = result.node
 
@@ -400,6 +447,48 @@ class GraphRunnableTask(ManifestTask):
         with adapter.connection_named("master"):
             self.populate_adapter_cache(adapter)
 
+    def make_batches(self, groups: Iterable[List[BatchNode]]) -> List[List[BatchNode]]:
+        """Split each group of nodes into batches of at most --batch-size
+        nodes.
+        """
+        batch_size = getattr(self.args, "batch_size", None) or DEFAULT_BATCH_SIZE
+        return [
+            group[start : start + batch_size]
+            for group in groups
+            for start in range(0, len(group), batch_size)
+        ]
+
+    def run_batches(
+        self,
+        adapter,
+        name: str,
+        batches: List[List[BatchNode]],
+        func: Callable[[List[BatchNode]], Dict[str, BatchResult]],
+        on_failure: Callable[[List[BatchNode], Exception], None],
+    ) -> Dict[str, BatchResult]:
+        """Call func on each batch, on the thread pool and with a connection
+        of its own, and merge the results it returns by unique_id. The nodes
+        in a batch that fails are left out, so that their runners run them
+        one at a time, and report an error only for the nodes that are
+        actually broken.
+        """
+        results: Dict[str, BatchResult] = {}
+        with dbt.utils.executor(self.config) as tpe:
+            futures = {
+                tpe.submit_connected(adapter, f"{name}_{index}", func, batch): batch
+                for index, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                exc = future.exception()
+                if exc is None:
+                    results.update(future.result())
+                elif isinstance(exc, Exception):
+                    on_failure(batch, exc)
+                else:
+                    raise exc
+        return results
+
     def after_run(self, adapter, results):
         pass
 
@@ -424,38 +513,61 @@ class GraphRunnableTask(ManifestTask):
         return result
 
     def write_result(self, result):
+        if self.results_sidecar is not None:
+            if self.results_sidecar.write_artifact(result, self.result_path()):
+                return
         result.write(self.result_path())
 
+    def open_results_sidecar(self) -> None:
+        path = self.result_sidecar_path()
+        if flags.WRITE_JSON and flags.STREAM_RESULTS and path is not None:
+            args = dbt.utils.args_to_dict(self.args)
+            self.results_sidecar = RunResultsSidecar(path, args)
+
     def run(self):
         """
         Run dbt for the query, based on the graph.
         """
-        self._runtime_initialize()
-
-        if self._flattened_nodes is None:
-            raise InternalException("after _runtime_initialize, _flattened_nodes was still None")
-
-        if len(self._flattened_nodes) == 0:
-            with TextOnly():
-                fire_event(EmptyLine())
-            msg = "Nothing to do. Try checking your model " "configs and model specification args"
-            warn_or_error(msg, log_fmt=warning_tag("{}"))
-            result = self.get_result(
-                results=[],
-                generated_at=datetime.utcnow(),
-                elapsed_time=0.0,
-            )
-        else:
-            with TextOnly():
-                fire_event(EmptyLine())
-            selected_uids = frozenset(n.unique_id for n in self._flattened_nodes)
-            result = self.execute_with_hooks(selected_uids)
+        self._write_manifest_at_end = True
+        with artifacts_written():
+            try:
+                self._runtime_initialize()
 
-        if flags.WRITE_JSON:
-            self.write_manifest()
-            self.write_result(result)
+                if self._flattened_nodes is None:
+                    raise InternalException(
+                        "after _runtime_initialize, _flattened_nodes was still None"
+                    )
+
+                if len(self._flattened_nodes) == 0:
+                    with TextOnly():
+                        fire_event(EmptyLine())
+                    msg = (
+                        "Nothing to do. Try checking your model "
+                        "configs and model specification args"
+                    )
+                    warn_or_error(msg, log_fmt=warning_tag("{}"))
+                    result = self.get_result(
+                        results=[],
+                        generated_at=datetime.utcnow(),
+                        elapsed_time=0.0,
+                    )
+                else:
+                    with TextOnly():
+                        fire_event(EmptyLine())
+                    selected_uids = frozenset(n.unique_id for n in self._flattened_nodes)
+                    self.open_results_sidecar()
+                    result = self.execute_with_hooks(selected_uids)
+            finally:
+                if self.results_sidecar is not None:
+                    self.results_sidecar.close()
+                # written even when the run fails, as it used to be before the run
+                if self.manifest is not None:
+                    self.write_manifest()
+
+            if flags.WRITE_JSON:
+                self.write_result(result)
 
-        self.task_end_messages(result.results)
+            self.task_end_messages(result.results)
         return result
 
     def interpret_results(self, results):
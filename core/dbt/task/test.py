@@ -5,7 +5,7 @@ from dbt.utils import _coerce_decimal
 from dbt.events.format import pluralize
 from dbt.dataclass_schema import dbtClassMixin
 import threading
-from typing import Union
+from typing import AbstractSet, Dict, List, Optional, Tuple, Union
 
 from .compile import CompileRunner
 from .run import RunTask
@@ -16,6 +16,7 @@ from dbt.contracts.graph.compiled import (
     CompiledTestNode,
 )
 from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.parsed import HasTestMetadata
 from dbt.contracts.results import TestStatus, PrimitiveDict, RunResult
 from dbt.context.providers import generate_runtime_model_context
 from dbt.clients.jinja import MacroGenerator
@@ -26,8 +27,15 @@ from dbt.events.types import (
     PrintWarnTestResult,
     PrintFailureTestResult,
     PrintStartLine,
+    TestBatchesStart,
+    TestBatchFailed,
+)
+from dbt.exceptions import (
+    InternalException,
+    RuntimeException,
+    invalid_bool_error,
+    missing_materialization,
 )
-from dbt.exceptions import InternalException, invalid_bool_error, missing_materialization
 from dbt.graph import (
     ResourceTypeSelector,
 )
@@ -58,8 +66,22 @@ class TestResultData(dbtClassMixin):
         # need this so we catch both true bools and 0/1
         return bool(field)
 
+    @classmethod
+    def from_row(cls, column_names, row) -> "TestResultData":
+        test_result_dct: PrimitiveDict = dict(
+            zip(
+                [column_name.lower() for column_name in column_names],
+                map(_coerce_decimal, row),
+            )
+        )
+        cls.validate(test_result_dct)
+        return cls.from_dict(test_result_dct)
+
 
 class TestRunner(CompileRunner):
+    # the test's result, if it was already run in a batch
+    batched_result: Optional[TestResultData] = None
+
     def describe_node(self):
         node_name = self.node.name
         return "test {}".format(node_name)
@@ -165,17 +187,19 @@ class TestRunner(CompileRunner):
                 f"3 columns"
             )
 
-        test_result_dct: PrimitiveDict = dict(
-            zip(
-                [column_name.lower() for column_name in table.column_names],
-                map(_coerce_decimal, table.rows[0]),
-            )
-        )
-        TestResultData.validate(test_result_dct)
-        return TestResultData.from_dict(test_result_dct)
+        return TestResultData.from_row(table.column_names, table.rows[0])
+
+    def compile(self, manifest):
+        # tests in a batch were already compiled, whether or not its query
+        # succeeded
+        if getattr(self.node, "compiled", False):
+            return self.node
+        return super().compile(manifest)
 
     def execute(self, test: CompiledTestNode, manifest: Manifest):
-        result = self.execute_test(test, manifest)
+        result = self.batched_result
+        if result is None:
+            result = self.execute_test(test, manifest)
 
         severity = test.config.severity.upper()
         thread_id = threading.current_thread().name
@@ -232,6 +256,10 @@ class TestTask(RunTask):
 
     __test__ = False
 
+    def __init__(self, args, config):
+        super().__init__(args, config)
+        self._batched_results: Dict[str, TestResultData] = {}
+
     def raise_on_first_error(self):
         return False
 
@@ -246,3 +274,99 @@ class TestTask(RunTask):
 
     def get_runner_type(self, _):
         return TestRunner
+
+    def get_runner(self, node):
+        runner = super().get_runner(node)
+        runner.batched_result = self._batched_results.get(node.unique_id)
+        return runner
+
+    def before_run(self, adapter, selected_uids: AbstractSet[str]):
+        super().before_run(adapter, selected_uids)
+        if getattr(self.args, "batched", False):
+            self._batched_results = self.run_batched_tests(adapter, selected_uids)
+
+    def get_test_batches(self, selected_uids: AbstractSet[str]) -> List[List[HasTestMetadata]]:
+        """Group the selected generic tests by the nodes they test, in batches
+        of at most --batch-size tests. Singular tests, tests with a custom
+        materialization and tests that store their failures are left to run
+        one at a time.
+        """
+        if self.manifest is None:
+            raise InternalException("manifest must be set to get test batches")
+
+        groups: Dict[Tuple[str, ...], List[HasTestMetadata]] = {}
+        for unique_id in sorted(selected_uids):
+            test = self.manifest.nodes[unique_id]
+            if not isinstance(test, HasTestMetadata) or test.get_materialization() != "test":
+                continue
+            if test.should_store_failures:
+                continue
+            groups.setdefault(tuple(sorted(test.depends_on.nodes)), []).append(test)
+
+        return self.make_batches(groups.values())
+
+    def run_batched_tests(
+        self, adapter, selected_uids: AbstractSet[str]
+    ) -> Dict[str, TestResultData]:
+        """Run the batchable tests a batch at a time, each batch as one query
+        that returns a row per test.
+        """
+        batches = self.get_test_batches(selected_uids)
+        if not batches:
+            return {}
+        fire_event(
+            TestBatchesStart(
+                num_tests=sum(len(batch) for batch in batches), num_batches=len(batches)
+            )
+        )
+        compiler = adapter.get_compiler()
+
+        def run(batch: List[HasTestMetadata]) -> Dict[str, TestResultData]:
+            tests = []
+            for test in batch:
+                try:
+                    tests.append(compiler.compile_node(test, self.manifest, {}))
+                except RuntimeException:
+                    # its runner will compile it again and report the error
+                    continue
+            if not tests:
+                return {}
+
+            sql = adapter.execute_macro(
+                "get_batched_test_sql",
+                kwargs={
+                    "tests": [
+                        {
+                            "main_sql": test.compiled_sql,
+                            "fail_calc": test.config.fail_calc,
+                            "warn_if": test.config.warn_if,
+                            "error_if": test.config.error_if,
+                            "limit": test.config.limit,
+                        }
+                        for test in tests
+                    ]
+                },
+                manifest=self.manifest,
+            )
+            adapter.clear_transaction()
+            _, table = adapter.execute(sql, auto_begin=True, fetch=True)
+            if len(table.rows) != len(tests):
+                raise InternalException(
+                    f"Batched test query returned {len(table.rows)} rows, "
+                    f"but expected {len(tests)} rows"
+                )
+
+            results = {}
+            column_names = [column_name.lower() for column_name in table.column_names]
+            index_column = column_names.index("test_index")
+            result_columns = column_names[:index_column] + column_names[index_column + 1 :]
+            for row in table.rows:
+                index = int(row[index_column])
+                values = row[:index_column] + row[index_column + 1 :]
+                results[tests[index].unique_id] = TestResultData.from_row(result_columns, values)
+            return results
+
+        def on_failure(batch: List[HasTestMetadata], exc: Exception) -> None:
+            fire_event(TestBatchFailed(num_tests=len(batch), exc=str(exc)))
+
+        return self.run_batches(adapter, "test_batch", batches, run, on_failure)
@@ -11,6 +11,7 @@ import json
 import os
 import requests
 from tarfile import ReadError
+import threading
 import time
 from pathlib import PosixPath, WindowsPath
 
@@ -49,6 +50,13 @@ except ImportError:
 else:
     DECIMALS = (decimal.Decimal, cdecimal.Decimal)
 
+# orjson is much faster than the json module, but it isn't a dependency of
+# dbt, so it's only used with --fast-json when it has been installed
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 
 class ExitCodes(int, Enum):
     Success = 0
@@ -273,11 +281,15 @@ class memoized:
     called later with the same arguments, the cached value is returned (not
     reevaluated).
 
+    Calls from several threads with the same arguments share one evaluation.
+
     Taken from https://wiki.python.org/moin/PythonDecoratorLibrary#Memoize"""
 
     def __init__(self, func):
         self.func = func
         self.cache = {}
+        self._lock = threading.Lock()
+        self._arg_locks: Dict[Any, threading.Lock] = {}
 
     def __call__(self, *args):
         if not isinstance(args, collections.abc.Hashable):
@@ -286,9 +298,12 @@ class memoized:
             return self.func(*args)
         if args in self.cache:
             return self.cache[args]
-        value = self.func(*args)
-        self.cache[args] = value
-        return value
+        with self._lock:
+            arg_lock = self._arg_locks.setdefault(args, threading.Lock())
+        with arg_lock:
+            if args not in self.cache:
+                self.cache[args] = self.func(*args)
+        return self.cache[args]
 
     def __repr__(self):
         """Return the function's docstring."""
@@ -337,6 +352,28 @@ class JSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _orjson_default(obj):
+    # what JSONEncoder.default does for the types orjson doesn't handle itself
+    if isinstance(obj, DECIMALS):
+        return float(obj)
+    if isinstance(obj, jinja2.Undefined):
+        return ""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict(omit_none=True)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def fast_json_available() -> bool:
+    return orjson is not None
+
+
+def fast_json_dumps(obj: Any) -> str:
+    """Serialize obj with orjson, handling the same types as JSONEncoder. The
+    output has no whitespace between items.
+    """
+    return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class ForgivingJSONEncoder(JSONEncoder):
     def default(self, obj):
         # let dbt's default JSON encoder handle it if possible, fallback to
@@ -3,7 +3,7 @@ import importlib.util
 import os
 import glob
 import json
-from typing import Iterator
+from typing import Iterator, Tuple
 
 import requests
 
@@ -104,7 +104,7 @@ def get_version_information():
         )
 
 
-def _get_adapter_plugin_names() -> Iterator[str]:
+def _get_adapter_version_paths() -> Iterator[Tuple[str, str]]:
     spec = importlib.util.find_spec("dbt.adapters")
     # If None, then nothing provides an importable 'dbt.adapters', so we will
     # not be reporting plugin versions today
@@ -117,19 +117,34 @@ def _get_adapter_plugin_names() -> Iterator[str]:
             # except it could be \\ on windows!
             plugin_root, _ = os.path.split(version_path)
             _, plugin_name = os.path.split(plugin_root)
-            yield plugin_name
+            yield plugin_name, version_path
+
+
+def _get_adapter_plugin_names() -> Iterator[str]:
+    for plugin_name, _ in _get_adapter_version_paths():
+        yield plugin_name
 
 
 def _get_dbt_plugins_info():
-    for plugin_name in _get_adapter_plugin_names():
+    for plugin_name, version_path in _get_adapter_version_paths():
         if plugin_name == "core":
             continue
+        # load the version file on its own: importing it as
+        # dbt.adapters.{plugin_name}.__version__ would import the whole
+        # adapter package first, which is most of dbt
+        spec = importlib.util.spec_from_file_location(
+            f"dbt.adapters.{plugin_name}.__version__", version_path
+        )
+        if spec is None or spec.loader is None:
+            continue
+        mod = importlib.util.module_from_spec(spec)
         try:
-            mod = importlib.import_module(f"dbt.adapters.{plugin_name}.__version__")
-        except ImportError:
+            spec.loader.exec_module(mod)  # type: ignore
+            version = mod.version  # type: ignore
+        except (ImportError, OSError, AttributeError):
             # not an adapter
             continue
-        yield plugin_name, mod.version
+        yield plugin_name, version
 
 
 __version__ = "1.0.1"
@@ -0,0 +1,143 @@
+"""Run the parse, compile and scheduling benchmarks against generated projects.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --compare baseline.json --threshold 0.2
+    python -m benchmarks --shapes wide deep --models 500 --filter parse
+
+(run from the `performance` directory with dbt-core and dbt-postgres
+installed)
+
+Each benchmark is run `--repeat` times, and the minimum and median wall times
+are reported. `--output` writes the results as JSON, which a later run can be
+compared against with `--compare`: a benchmark regressed when its minimum is
+more than `--threshold` slower than the baseline's, and the run then exits
+with status 1. The minimum is compared since it is the least affected by
+whatever else the machine is doing. Benchmarks that are not in the baseline
+are listed but never count as regressions.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.projects import SHAPES, generate_project
+from benchmarks.suite import BENCHMARKS, Benchmark, ProjectState
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        benchmark.before_each()
+        start = time.perf_counter()
+        benchmark.run()
+        runs.append(time.perf_counter() - start)
+    return {
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "runs": runs,
+    }
+
+
+def run_suite(args) -> Dict[str, Any]:
+    # imported here so that generating projects doesn't need dbt
+    import dbt.version
+    from dbt.events.functions import setup_event_logger
+
+    pattern = re.compile(args.filter) if args.filter else None
+    results: Dict[str, Any] = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # log to a file like a real invocation, but keep stdout for the report
+        setup_event_logger(os.path.join(tmpdir, "logs"), level_override=logging.ERROR)
+        for shape in [None] + args.shapes:
+            project: Optional[ProjectState] = None
+            for benchmark_cls in BENCHMARKS:
+                if benchmark_cls.needs_project != (shape is not None):
+                    continue
+                name = f"{shape}.{benchmark_cls.name}" if shape else benchmark_cls.name
+                if pattern and not pattern.search(name):
+                    continue
+                if shape is not None and project is None:
+                    path = os.path.join(tmpdir, shape)
+                    generate_project(path, shape, args.models, args.seed)
+                    project = ProjectState(path)
+                benchmark = benchmark_cls()
+                benchmark.setup(project)
+                try:
+                    results[name] = measure(benchmark, args.repeat)
+                finally:
+                    benchmark.teardown()
+                print(format_result(name, results[name]), file=sys.stderr)
+        os.chdir(cwd)
+    return {
+        "dbt_version": dbt.version.__version__,
+        "python_version": platform.python_version(),
+        "models": args.models,
+        "repeat": args.repeat,
+        "benchmarks": results,
+    }
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    return f"{name:40} median {result['median']:8.4f}s  min {result['min']:8.4f}s"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print how each benchmark compares to the baseline, and return the
+    names of those that regressed.
+    """
+    regressions = []
+    current = results["benchmarks"]
+    previous = baseline["benchmarks"]
+    for name in sorted(current):
+        if name not in previous:
+            print(f"{name:40} new")
+            continue
+        ratio = current[name]["min"] / previous[name]["min"]
+        status = ""
+        if ratio > 1 + threshold:
+            status = "REGRESSED"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            status = "improved"
+        print(f"{name:40} {ratio:6.2f}x baseline  {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument("--models", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", help="only run benchmarks whose name matches this regex")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results to a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        if baseline.get("models") != results["models"]:
+            print(f"warning: the baseline was run with {baseline.get('models')} models")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare the current `Compiler.add_test_edges` against the original
+per-node breadth-first implementation on a synthetic DAG.
+
+    python -m benchmarks.add_test_edges --models 2000 --depth 50
+
+(run from the `performance` directory with dbt-core installed)
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+import networkx as nx
+
+from dbt.compilation import Compiler, Linker
+from dbt.node_types import NodeType
+
+
+def legacy_add_test_edges(graph, manifest):
+    """The original implementation: a reverse breadth-first search per node."""
+    for node_id in graph:
+        if node_id in manifest.nodes and manifest.nodes[node_id].resource_type != NodeType.Test:
+            all_upstream_nodes = nx.traversal.bfs_tree(graph, node_id, reverse=True)
+            upstream_nodes = set([n for n in all_upstream_nodes if n != node_id])
+            upstream_tests = []
+            for upstream_node in upstream_nodes:
+                upstream_tests += [
+                    child
+                    for child in manifest.child_map.get(upstream_node, [])
+                    if child.startswith("test.")
+                ]
+            for upstream_test in upstream_tests:
+                test_depends_on = set(manifest.nodes[upstream_test].depends_on_nodes)
+                if test_depends_on.issubset(upstream_nodes):
+                    graph.add_edge(upstream_test, node_id)
+
+
+def make_manifest(models, depth, tests_per_model, seed=0):
+    """A manifest-like object with `models` models spread over `depth`
+    layers, each depending on up to three models in the layers above, with
+    `tests_per_model` single-model tests and one relationships test each."""
+    rng = random.Random(seed)
+    nodes = {}
+    layers = [[] for _ in range(depth)]
+    for i in range(models):
+        layer = i % depth
+        unique_id = f"model.bench.model_{i}"
+        candidates = [m for upstream in layers[max(0, layer - 3) : layer] for m in upstream]
+        parents = rng.sample(candidates, min(len(candidates), rng.randint(1, 3)))
+        nodes[unique_id] = SimpleNamespace(resource_type=NodeType.Model, depends_on_nodes=parents)
+        layers[layer].append(unique_id)
+    model_ids = list(nodes)
+    for unique_id in model_ids:
+        for n in range(tests_per_model):
+            nodes[f"test.bench.{unique_id}_{n}"] = SimpleNamespace(
+                resource_type=NodeType.Test, depends_on_nodes=[unique_id]
+            )
+        other = rng.choice(model_ids)
+        nodes[f"test.bench.{unique_id}_relationships"] = SimpleNamespace(
+            resource_type=NodeType.Test, depends_on_nodes=[unique_id, other]
+        )
+    child_map = {unique_id: [] for unique_id in nodes}
+    for unique_id, node in nodes.items():
+        for parent in node.depends_on_nodes:
+            child_map[parent].append(unique_id)
+    return SimpleNamespace(nodes=nodes, child_map=child_map)
+
+
+def make_linker(manifest):
+    linker = Linker()
+    for unique_id, node in manifest.nodes.items():
+        linker.add_node(unique_id)
+        for dependency in node.depends_on_nodes:
+            linker.dependency(unique_id, dependency)
+    return linker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=50)
+    parser.add_argument("--tests-per-model", type=int, default=2)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    manifest = make_manifest(args.models, args.depth, args.tests_per_model)
+
+    linker = make_linker(manifest)
+    start = time.perf_counter()
+    Compiler(None).add_test_edges(linker, manifest)
+    current = time.perf_counter() - start
+    print(f"current: {current:.3f}s ({linker.graph.number_of_edges()} edges)")
+
+    if not args.skip_legacy:
+        legacy_linker = make_linker(manifest)
+        start = time.perf_counter()
+        legacy_add_test_edges(legacy_linker.graph, manifest)
+        legacy = time.perf_counter() - start
+        print(f"legacy:  {legacy:.3f}s ({legacy_linker.graph.number_of_edges()} edges)")
+        if set(legacy_linker.graph.edges) != set(linker.graph.edges):
+            raise SystemExit("the graphs are different!")
+        print(f"speedup: {legacy / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
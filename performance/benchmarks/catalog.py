@@ -0,0 +1,74 @@
+"""A made-up catalog for the catalog.write benchmark in `benchmarks.suite`,
+which measures building catalog.json a schema at a time, as `dbt docs
+generate` does.
+
+There's no database: each schema's rows are made up into an agate table, the
+way the get_catalog macro returns them, before the timed runs.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from dbt.adapters.postgres import PostgresAdapter
+from dbt.clients import agate_helper
+from dbt.task import generate
+
+COLUMN_NAMES = [
+    "table_database",
+    "table_schema",
+    "table_name",
+    "table_type",
+    "table_comment",
+    "table_owner",
+    "column_name",
+    "column_index",
+    "column_type",
+    "column_comment",
+]
+
+
+class Manifest(SimpleNamespace):
+    def get_used_schemas(self):
+        return {(node.database, node.schema) for node in self.nodes.values()}
+
+
+def make_manifest(schemas, tables):
+    nodes = {}
+    for schema in range(schemas):
+        for table in range(tables):
+            unique_id = f"model.bench.s{schema}_t{table}"
+            nodes[unique_id] = SimpleNamespace(
+                database="dbt", schema=f"schema_{schema}", identifier=f"table_{table}"
+            )
+    return Manifest(nodes=nodes, sources={})
+
+
+def schema_catalog(schema, tables, columns):
+    rows = [
+        (
+            "dbt",
+            f"schema_{schema}",
+            f"table_{table}",
+            "BASE TABLE",
+            None,
+            "dbt_user",
+            f"column_{column}",
+            column + 1,
+            "text",
+            f"the column called column_{column}",
+        )
+        for table in range(tables)
+        for column in range(columns)
+    ]
+    return agate_helper.table_from_rows(rows, COLUMN_NAMES)
+
+
+def write_catalog(manifest, schema_tables, path):
+    """Write catalog.json from each schema's catalog rows, in turn."""
+    builder = generate.CatalogBuilder(manifest)
+    with generate.CatalogWriter(path) as writer:
+        for table in schema_tables:
+            table = PostgresAdapter._catalog_filter_table(table, manifest)
+            nodes, sources = builder.add_table(table)
+            writer.add(generate.serialize_tables(nodes), generate.serialize_tables(sources))
+        writer.write(generate.CatalogMetadata(generated_at=datetime.utcnow()), None)
+    return len(builder.nodes)
@@ -0,0 +1,66 @@
+"""Parsed models for the compile.from_parsed benchmark in `benchmarks.suite`,
+which measures turning parsed nodes into compiled nodes the way
+`Compiler._compile_node` does.
+
+Only the per-node work outside of Jinja rendering is measured: every model
+is converted, and the ones that select from an ephemeral model (one in
+`ephemeral_every`) also get the CTE injection bookkeeping that
+`_recursively_prepend_ctes` does.
+"""
+from dbt.contracts.files import FileHash
+from dbt.contracts.graph.compiled import COMPILED_TYPES, InjectedCTE
+from dbt.contracts.graph.parsed import ColumnInfo, DependsOn, NodeConfig, ParsedModelNode
+from dbt.node_types import NodeType
+
+
+def make_nodes(models, columns):
+    nodes = []
+    for i in range(models):
+        name = f"model_{i}"
+        parents = [f"model.bench.model_{j}" for j in range(max(0, i - 3), i)]
+        nodes.append(
+            ParsedModelNode(
+                name=name,
+                database="dbt",
+                schema="analytics",
+                alias=name,
+                resource_type=NodeType.Model,
+                unique_id=f"model.bench.{name}",
+                fqn=["bench", "staging", name],
+                package_name="bench",
+                root_path="/usr/src/app",
+                path=f"staging/{name}.sql",
+                original_file_path=f"models/staging/{name}.sql",
+                raw_sql="select * from {{ ref('model_0') }}",
+                checksum=FileHash.from_contents(name),
+                config=NodeConfig(materialized="view", tags=["nightly"]),
+                tags=["nightly"],
+                refs=[[parent.rsplit(".", 1)[1]] for parent in parents],
+                depends_on=DependsOn(nodes=parents),
+                description=f"The {name} model.",
+                columns={
+                    f"column_{c}": ColumnInfo(
+                        name=f"column_{c}", description=f"Column {c} of {name}."
+                    )
+                    for c in range(columns)
+                },
+                meta={"owner": "analytics"},
+            )
+        )
+    return nodes
+
+
+def inject_ctes(compiled, ephemeral):
+    compiled.compiled_sql = "select * from __dbt__cte__ephemeral"
+    compiled.compiled = True
+    if ephemeral:
+        compiled.extra_ctes = [InjectedCTE(id="model.bench.ephemeral", sql="select 1")]
+        compiled._pre_injected_sql = compiled.compiled_sql
+        compiled.compiled_sql = "with __dbt__cte__ephemeral as (select 1) " + compiled.compiled_sql
+    compiled.extra_ctes_injected = True
+
+
+def compile_nodes(nodes, ephemeral_every):
+    for i, node in enumerate(nodes):
+        compiled = COMPILED_TYPES[type(node)].from_parsed(node)
+        inject_ctes(compiled, i % ephemeral_every == 0)
@@ -0,0 +1,73 @@
+"""Compare draining a GraphQueue with the original implementation, which
+removed every finished node from the graph and scanned the in-degree of all
+remaining nodes.
+
+    python -m benchmarks.graph_queue --nodes 10000
+
+(run from the `performance` directory with dbt-core installed)
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+import networkx as nx  # type: ignore
+
+from dbt.graph import GraphQueue
+
+
+class LegacyGraphQueue(GraphQueue):
+    def mark_done(self, node_id):
+        with self.lock:
+            self.in_progress.remove(node_id)
+            self.graph.remove_node(node_id)
+            for node, in_degree in self.graph.in_degree():
+                known = node in self.in_progress or node in self.queued
+                if not known and in_degree == 0:
+                    self.inner.put((self._scores[node], node))
+                    self.queued.add(node)
+            self.inner.task_done()
+            self.some_task_done.notify_all()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.graph) - len(self.in_progress)
+
+
+def make_graph(nodes, seed):
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    for n in range(nodes):
+        graph.add_node(n)
+        for parent in rng.sample(range(max(n - 200, 0), n), min(n, rng.randint(0, 3))):
+            graph.add_edge(parent, n)
+    return nx.relabel_nodes(graph, lambda n: f"model.bench.node_{n}")
+
+
+def drain(queue_cls, graph):
+    manifest = SimpleNamespace(expect=lambda unique_id: SimpleNamespace(unique_id=unique_id))
+    queue = queue_cls(graph.copy(), manifest, set(graph))
+    start = time.perf_counter()
+    while not queue.empty():
+        node = queue.get(block=False)
+        queue.mark_done(node.unique_id)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = make_graph(args.nodes, args.seed)
+    current = drain(GraphQueue, graph)
+    legacy = drain(LegacyGraphQueue, graph)
+    print(f"{len(graph)} nodes, {len(graph.edges())} edges")
+    print(f"current: {current:.3f}s ({current / len(graph) * 1e6:.1f}us per node)")
+    print(f"legacy:  {legacy:.3f}s ({legacy / len(graph) * 1e6:.1f}us per node)")
+    print(f"speedup: {legacy / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Compare building the macro namespace of a node context with the shared
+MacroNamespaceLayout against the original per-node MacroNamespaceBuilder.
+
+    python -m benchmarks.macro_namespace --nodes 2000 --package-macros 250
+
+(run from the `performance` directory with dbt-core installed)
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from dbt.clients.jinja import MacroGenerator, MacroStack
+from dbt.context.macros import MacroNamespaceBuilder
+from dbt.include.global_project import PROJECT_NAME as GLOBAL_PROJECT_NAME
+
+INTERNAL_PACKAGES = ["dbt_postgres", GLOBAL_PROJECT_NAME]
+
+
+def legacy_namespace(macros, root_package, search_package, internal_packages, ctx, node, stack):
+    """The original implementation: a MacroGenerator for every macro and new
+    globals, locals and package dicts for every node, flattened like
+    `ManifestContext.to_dict` did."""
+    globals_, locals_, internal, packages = {}, {}, {}, {}
+    for macro in macros.values():
+        macro_func = MacroGenerator(macro, ctx, node, stack)
+        if macro.package_name in internal_packages:
+            internal.setdefault(macro.package_name, {})[macro.name] = macro_func
+        else:
+            packages.setdefault(macro.package_name, {})[macro.name] = macro_func
+            if macro.package_name == search_package:
+                locals_[macro.name] = macro_func
+            elif macro.package_name == root_package:
+                globals_[macro.name] = macro_func
+    global_project_namespace = {}
+    for pkg in reversed(internal_packages):
+        global_project_namespace.update(internal.get(pkg, {}))
+    flat = dict(global_project_namespace)
+    flat[GLOBAL_PROJECT_NAME] = global_project_namespace
+    flat.update(packages)
+    flat.update(globals_)
+    flat.update(locals_)
+    return flat, packages
+
+
+def make_macros(internal_macros, package_macros, packages, root_macros):
+    """Macros for the internal projects, `packages` dbt_utils-sized packages
+    and the root project."""
+    macros = {}
+    counts = [
+        (GLOBAL_PROJECT_NAME, internal_macros),
+        ("dbt_postgres", internal_macros // 8),
+        ("root", root_macros),
+    ] + [(f"package_{n}", package_macros) for n in range(packages)]
+    for package_name, count in counts:
+        for i in range(count):
+            name = f"{package_name}_macro_{i}"
+            unique_id = f"macro.{package_name}.{name}"
+            macros[unique_id] = SimpleNamespace(
+                unique_id=unique_id, package_name=package_name, name=name
+            )
+    return macros
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--internal-macros", type=int, default=450)
+    parser.add_argument("--package-macros", type=int, default=250)
+    parser.add_argument("--packages", type=int, default=2)
+    parser.add_argument("--root-macros", type=int, default=30)
+    parser.add_argument("--calls-per-node", type=int, default=5)
+    args = parser.parse_args()
+
+    macros = make_macros(
+        args.internal_macros, args.package_macros, args.packages, args.root_macros
+    )
+    rng = random.Random(0)
+    # every node looks up a few package macros, like adapter.dispatch does
+    lookups = [
+        [
+            (macro.package_name, macro.name)
+            for macro in rng.sample(list(macros.values()), args.calls_per_node)
+            if macro.package_name not in INTERNAL_PACKAGES
+        ]
+        for _ in range(args.nodes)
+    ]
+
+    start = time.perf_counter()
+    for node_lookups in lookups:
+        ctx = {}
+        builder = MacroNamespaceBuilder("root", "root", MacroStack(), INTERNAL_PACKAGES)
+        namespace = builder.build_namespace(macros, ctx)
+        ctx.update(namespace.flatten())
+        for package_name, name in node_lookups:
+            namespace.get_from_package(package_name, name)
+    current = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for node_lookups in lookups:
+        ctx = {}
+        flat, packages = legacy_namespace(
+            macros, "root", "root", INTERNAL_PACKAGES, ctx, None, MacroStack()
+        )
+        ctx.update(flat)
+        for package_name, name in node_lookups:
+            packages[package_name].get(name)
+    legacy = time.perf_counter() - start
+
+    print(f"{len(macros)} macros, {args.nodes} node contexts")
+    print(f"current: {current:.3f}s ({current / args.nodes * 1000:.3f}ms per node)")
+    print(f"legacy:  {legacy:.3f}s ({legacy / args.nodes * 1000:.3f}ms per node)")
+    print(f"speedup: {legacy / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare reading the lazily decoded partial parse file with decoding every
+entry of it, which is what `Manifest.from_msgpack` used to do, and writing
+all of it with writing only the changed entries.
+
+    python -m benchmarks.partial_parse_file path/to/target/partial_parse.msgpack
+
+(run from the `performance` directory with dbt-core installed, after a
+`dbt parse` of the project)
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from dbt.parser.partial_parse_file import (
+    SECTIONS,
+    read_partial_parse_file,
+    write_partial_parse_file,
+)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    manifest, lazy = timed(lambda: read_partial_parse_file(args.path))
+    _, summary = timed(
+        lambda: [manifest.files.get_checksum(file_id) for file_id in manifest.files]
+    )
+
+    manifest = read_partial_parse_file(args.path)
+    _, full = timed(lambda: [list(getattr(manifest, name).values()) for name in SECTIONS])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out_path = os.path.join(tmpdir, "partial_parse.msgpack")
+        _, full_write = timed(lambda: write_partial_parse_file(manifest, out_path))
+        untouched = read_partial_parse_file(out_path)
+        _, rewrite_raw = timed(lambda: write_partial_parse_file(untouched, out_path))
+        # like a partial parse: every node is looked at, one is changed
+        edited = read_partial_parse_file(out_path)
+        nodes = list(edited.nodes.values())
+        nodes[0].raw_sql += "\n-- edited"
+        _, rewrite_one = timed(lambda: write_partial_parse_file(edited, out_path))
+
+    print(f"{len(manifest.nodes)} nodes, {len(manifest.files)} files")
+    print(f"read header and state:   {lazy:.3f}s")
+    print(f"read all file checksums: {summary:.3f}s")
+    print(f"decode every entry:      {full:.3f}s")
+    print(f"write everything:        {full_write:.3f}s")
+    print(f"write, none decoded:     {rewrite_raw:.3f}s")
+    print(f"write, one node changed: {rewrite_one:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Generate synthetic dbt projects of a few shapes that stress different parts
+of parsing and compilation.
+
+    python -m benchmarks.projects wide path/to/project --models 2000
+
+(run from the `performance` directory)
+
+- wide: many models reading from a handful of sources and staging models
+- deep: long chains of models, each also depending on an earlier model
+- macros: models calling into a large graph of macros that call each other
+- yaml: few lines of SQL, but large property files with many columns, tests
+  and descriptions
+
+Every project has a `profiles.yml` pointing at a local postgres database. No
+connection is made while parsing or compiling the project.
+"""
+import argparse
+import os
+import random
+from typing import Callable, Dict, List
+
+PROJECT_NAME = "bench"
+
+DBT_PROJECT_YML = f"""\
+name: {PROJECT_NAME}
+version: '1.0'
+config-version: 2
+profile: {PROJECT_NAME}
+"""
+
+PROFILES_YML = f"""\
+config:
+  send_anonymous_usage_stats: false
+{PROJECT_NAME}:
+  target: dev
+  outputs:
+    dev:
+      type: postgres
+      host: localhost
+      port: 5432
+      user: bench
+      pass: bench
+      dbname: bench
+      schema: bench
+      threads: 4
+"""
+
+# number of models described by each properties file
+MODELS_PER_YML = 50
+
+
+def model_name(n: int) -> str:
+    return f"model_{n}"
+
+
+def tags_config(n: int) -> str:
+    return "{{ config(tags=['even']) }}\n" if n % 2 == 0 else ""
+
+
+def write_file(path: str, contents: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fp:
+        fp.write(contents)
+
+
+def write_models(path: str, models: Dict[str, str]) -> None:
+    for name, sql in models.items():
+        write_file(os.path.join(path, "models", f"{name}.sql"), sql)
+
+
+def column_tests(name: str, columns: int, with_tests: bool) -> List[str]:
+    lines = [f"  - name: {name}", f"    description: The {name} model", "    columns:"]
+    for c in range(columns):
+        lines.append(f"      - name: column_{c}")
+        lines.append(f"        description: Column {c} of {name}")
+        if with_tests and c == 0:
+            lines.append("        tests: [unique, not_null]")
+        elif with_tests and c % 5 == 1:
+            lines.append("        tests:")
+            lines.append("          - accepted_values:")
+            lines.append("              values: ['a', 'b', 'c']")
+    return lines
+
+
+def write_properties(path: str, names: List[str], columns: int, with_tests=True) -> None:
+    for start in range(0, len(names), MODELS_PER_YML):
+        lines = ["version: 2", "models:"]
+        for name in names[start : start + MODELS_PER_YML]:
+            lines.extend(column_tests(name, columns, with_tests))
+        write_file(os.path.join(path, "models", f"schema_{start}.yml"), "\n".join(lines) + "\n")
+
+
+def write_sources(path: str, tables: int) -> None:
+    lines = ["version: 2", "sources:", "  - name: raw", "    tables:"]
+    lines.extend(f"      - name: table_{t}" for t in range(tables))
+    write_file(os.path.join(path, "models", "sources.yml"), "\n".join(lines) + "\n")
+
+
+def generate_wide(path: str, models: int, rng: random.Random) -> None:
+    staging = min(20, models)
+    write_sources(path, 10)
+    sql = {}
+    for n in range(models):
+        if n < staging:
+            body = f"select * from {{{{ source('raw', 'table_{n % 10}') }}}}"
+        else:
+            body = f"select * from {{{{ ref('{model_name(rng.randrange(staging))}') }}}}"
+        sql[model_name(n)] = tags_config(n) + body + "\n"
+    write_models(path, sql)
+    write_properties(path, list(sql), columns=2)
+
+
+def generate_deep(path: str, models: int, rng: random.Random) -> None:
+    chain_length = 100
+    sql = {}
+    for n in range(models):
+        if n % chain_length == 0:
+            body = "select 1 as column_0"
+        else:
+            parents = {n - 1, rng.randrange(n)}
+            body = " union all ".join(
+                f"select * from {{{{ ref('{model_name(p)}') }}}}" for p in sorted(parents)
+            )
+        sql[model_name(n)] = tags_config(n) + body + "\n"
+    write_models(path, sql)
+    write_properties(path, list(sql), columns=2)
+
+
+def generate_macros(path: str, models: int, rng: random.Random) -> None:
+    macros = max(models // 2, 1)
+    macros_per_file = 20
+    for start in range(0, macros, macros_per_file):
+        lines = []
+        for m in range(start, min(start + macros_per_file, macros)):
+            callees = rng.sample(range(m), min(m, 2))
+            calls = " ~ ".join(f"bench_macro_{c}(arg)" for c in callees) or "arg"
+            lines.append(f"{{% macro bench_macro_{m}(arg) -%}}")
+            lines.append(f"  {{{{ return({calls} ~ '_{m}') }}}}")
+            lines.append("{%- endmacro %}")
+        write_file(os.path.join(path, "macros", f"macros_{start}.sql"), "\n".join(lines) + "\n")
+    sql = {}
+    for n in range(models):
+        calls = ", ".join(
+            f"'{{{{ bench_macro_{m}('c') }}}}' as column_{i}"
+            for i, m in enumerate(rng.sample(range(macros), min(macros, 3)))
+        )
+        parent = f" from {{{{ ref('{model_name(rng.randrange(n))}') }}}}" if n else ""
+        sql[model_name(n)] = tags_config(n) + f"select {calls}{parent}\n"
+    write_models(path, sql)
+    write_properties(path, list(sql), columns=2)
+
+
+def generate_yaml(path: str, models: int, rng: random.Random) -> None:
+    write_sources(path, max(models // 10, 1))
+    sql = {}
+    for n in range(models):
+        parent = model_name(rng.randrange(n)) if n else None
+        body = f"select * from {{{{ ref('{parent}') }}}}" if parent else "select 1 as column_0"
+        sql[model_name(n)] = tags_config(n) + body + "\n"
+    write_models(path, sql)
+    write_properties(path, list(sql), columns=20)
+
+
+SHAPES: Dict[str, Callable[[str, int, random.Random], None]] = {
+    "wide": generate_wide,
+    "deep": generate_deep,
+    "macros": generate_macros,
+    "yaml": generate_yaml,
+}
+
+
+def generate_project(path: str, shape: str, models: int, seed: int = 0) -> None:
+    """Write a project of the given shape with `models` models to `path`,
+    along with a `profiles.yml` for it.
+    """
+    write_file(os.path.join(path, "dbt_project.yml"), DBT_PROJECT_YML)
+    write_file(os.path.join(path, "profiles.yml"), PROFILES_YML)
+    SHAPES[shape](path, models, random.Random(seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("shape", choices=list(SHAPES))
+    parser.add_argument("path")
+    parser.add_argument("--models", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_project(args.path, args.shape, args.models, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""A relations cache workload for the relations_cache benchmark in
+`benchmarks.suite`: lookups mixed with table rebuilds from several threads.
+
+Each thread mostly lists the relations of a random schema, like
+`adapter.get_relation` does, and otherwise rebuilds a table in one of its own
+schemas the way the table materialization does: create `x__dbt_tmp`, rename
+`x` to `x__dbt_backup` and `x__dbt_tmp` to `x`, and drop the backup, which
+cascades to the views selecting from it. The views are then added back, so
+the cache holds the same relations after every run.
+"""
+import random
+import threading
+
+from dbt.adapters.base.relation import BaseRelation
+
+DATABASE = "bench"
+
+
+def table(schema, identifier):
+    return BaseRelation.create(
+        database=DATABASE, schema=schema, identifier=identifier, type="table"
+    )
+
+
+def view(schema, identifier):
+    return BaseRelation.create(
+        database=DATABASE, schema=schema, identifier=identifier, type="view"
+    )
+
+
+def schema_name(n):
+    return f"schema_{n}"
+
+
+def fill(cache, schemas, relations):
+    """Every schema has tables, and as many views, each selecting from one
+    table in the same schema.
+    """
+    tables = relations // 2
+    for s in range(schemas):
+        schema = schema_name(s)
+        for t in range(tables):
+            cache.add(table(schema, f"table_{t}"))
+        for v in range(relations - tables):
+            add_view(cache, schema, v, tables)
+
+
+def add_view(cache, schema, v, tables):
+    cache.add(view(schema, f"view_{v}"))
+    cache.add_link(table(schema, f"table_{v % tables}"), view(schema, f"view_{v}"))
+
+
+def rebuild_table(cache, schema, t, tables, relations):
+    identifier = f"table_{t}"
+    cache.add(table(schema, f"{identifier}__dbt_tmp"))
+    cache.rename(table(schema, identifier), table(schema, f"{identifier}__dbt_backup"))
+    cache.rename(table(schema, f"{identifier}__dbt_tmp"), table(schema, identifier))
+    cache.drop(table(schema, f"{identifier}__dbt_backup"))
+    for v in range(t, relations - tables, tables):
+        add_view(cache, schema, v, tables)
+
+
+def worker(cache, thread, threads, schemas, relations, operations, write_ratio):
+    rng = random.Random(thread)
+    tables = relations // 2
+    own_schemas = list(range(thread, schemas, threads))
+    for _ in range(operations):
+        if rng.random() < write_ratio and own_schemas:
+            schema = schema_name(rng.choice(own_schemas))
+            rebuild_table(cache, schema, rng.randrange(tables), tables, relations)
+        else:
+            cache.get_relations(DATABASE, schema_name(rng.randrange(schemas)))
+
+
+def run_workload(cache, threads, schemas, relations, operations, write_ratio):
+    """Run `operations` lookups and rebuilds on each of `threads` threads,
+    against a cache that was filled with `fill`.
+    """
+    workers = [
+        threading.Thread(
+            target=worker,
+            args=(cache, n, threads, schemas, relations, operations, write_ratio),
+        )
+        for n in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    assert len(cache.relations) == schemas * relations
@@ -0,0 +1,126 @@
+"""Replay a run with each GraphQueue scheduling mode and compare the makespan.
+
+    python -m benchmarks.scheduling --manifest target/manifest.json \\
+        --run-results target/run_results.json --threads 8
+    python -m benchmarks.scheduling --nodes 2000 --threads 8
+
+(run from the `performance` directory with dbt-core installed)
+
+With a manifest and run results, the nodes in the run results are replayed
+with their recorded execution times. Otherwise a random DAG is generated. The
+simulation assumes a node takes exactly its recorded time on any thread, so
+the recorded times are also what the critical-path mode is given.
+"""
+import argparse
+import heapq
+import json
+import random
+from queue import Empty
+from types import SimpleNamespace
+
+import networkx as nx  # type: ignore
+
+from dbt.graph import Graph, GraphQueue, SchedulingMode, load_execution_times
+
+
+def load_recorded_run(manifest_path, run_results_path):
+    durations = load_execution_times(run_results_path)
+    with open(manifest_path) as fp:
+        manifest = json.load(fp)
+    graph = nx.DiGraph()
+    for section in ("nodes", "sources", "exposures", "metrics"):
+        for unique_id, node in manifest.get(section, {}).items():
+            graph.add_node(unique_id)
+            for parent in node.get("depends_on", {}).get("nodes", []):
+                graph.add_edge(parent, unique_id)
+    selected = {unique_id for unique_id in durations if unique_id in graph}
+    return Graph(graph).get_subset_graph(selected).graph, durations
+
+
+def make_random_run(nodes, seed):
+    """A layered DAG with log-normally distributed execution times, where a
+    few nodes head long chains of slow models.
+    """
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    durations = {}
+    layers = []
+    for n in range(nodes):
+        unique_id = f"model.bench.node_{n}"
+        level = min(int(rng.expovariate(0.5)), 9)
+        while len(layers) <= level:
+            layers.append([])
+        graph.add_node(unique_id)
+        if level:
+            candidates = [node for layer in layers[:level] for node in layer]
+            if candidates:
+                for parent in rng.sample(candidates, min(len(candidates), rng.randint(1, 3))):
+                    graph.add_edge(parent, unique_id)
+        layers[level].append(unique_id)
+        durations[unique_id] = rng.lognormvariate(0, 1)
+    for n in range(max(1, nodes // 500)):
+        parent = rng.choice(layers[0])
+        for i in range(20):
+            unique_id = f"model.bench.chain_{n}_{i}"
+            graph.add_edge(parent, unique_id)
+            durations[unique_id] = rng.uniform(10, 30)
+            parent = unique_id
+    return graph, durations
+
+
+def remaining_times(graph, durations):
+    remaining = {}
+    for node in reversed(list(nx.topological_sort(graph))):
+        longest_child = max((remaining[child] for child in graph.successors(node)), default=0.0)
+        remaining[node] = durations.get(node, 0.0) + longest_child
+    return remaining
+
+
+def simulate(graph, durations, threads, scheduling_mode, execution_times=None):
+    manifest = SimpleNamespace(expect=lambda unique_id: SimpleNamespace(unique_id=unique_id))
+    queue = GraphQueue(graph.copy(), manifest, set(graph), scheduling_mode, execution_times)
+    running = []
+    now = 0.0
+    while True:
+        while len(running) < threads:
+            try:
+                node = queue.get(block=False)
+            except Empty:
+                break
+            heapq.heappush(running, (now + durations.get(node.unique_id, 0.0), node.unique_id))
+        if not running:
+            return now
+        now, unique_id = heapq.heappop(running)
+        queue.mark_done(unique_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--manifest")
+    parser.add_argument("--run-results")
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.manifest and args.run_results:
+        graph, durations = load_recorded_run(args.manifest, args.run_results)
+    else:
+        graph, durations = make_random_run(args.nodes, args.seed)
+
+    longest_path = max(remaining_times(graph, durations).values(), default=0.0)
+    lower_bound = max(longest_path, sum(durations.get(n, 0.0) for n in graph) / args.threads)
+
+    print(f"{len(graph)} nodes, {args.threads} threads, lower bound {lower_bound:.1f}s")
+    runs = [
+        ("depth", SchedulingMode.Depth, None),
+        ("critical-path, node count", SchedulingMode.CriticalPath, None),
+        ("critical-path, execution times", SchedulingMode.CriticalPath, durations),
+    ]
+    for label, scheduling_mode, execution_times in runs:
+        makespan = simulate(graph, durations, args.threads, scheduling_mode, execution_times)
+        print(f"{label + ':':32} {makespan:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
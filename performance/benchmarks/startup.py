@@ -0,0 +1,73 @@
+"""Measure how much of dbt's startup time is spent importing modules, per
+subcommand, from the totals reported by `python -X importtime`.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --command "--version" --command "ls --help"
+
+(run from the `performance` directory with dbt-core installed)
+
+Each command is run in a fresh interpreter, the way the `dbt` entry point
+runs it, and the best of --runs is reported: the import time is the sum of
+the cumulative times of the top-level imports, and the wall time covers the
+whole process. Commands that need a project, like `ls` itself, should be run
+from inside one with --project-dir.
+"""
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+DEFAULT_COMMANDS = [
+    "--version",
+    "--help",
+    "ls --help",
+    "run --help",
+    "build --help",
+    "deps --help",
+    "docs generate --help",
+]
+
+
+def import_time(stderr):
+    # lines look like "import time:  self [us] | cumulative | imported package",
+    # with nested imports indented under the module that imported them
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total / 1e6
+
+
+# what the `dbt` console script runs
+ENTRY_POINT = "import sys; from dbt.main import main; main(sys.argv[1:])"
+
+
+def measure(command, cwd):
+    args = [sys.executable, "-X", "importtime", "-c", ENTRY_POINT] + shlex.split(command)
+    start = time.perf_counter()
+    proc = subprocess.run(args, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    elapsed = time.perf_counter() - start
+    return import_time(proc.stderr.decode("utf-8", "replace")), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", action="append", dest="commands")
+    parser.add_argument("--project-dir", default=os.getcwd())
+    args = parser.parse_args()
+
+    for command in args.commands or DEFAULT_COMMANDS:
+        results = [measure(command, args.project_dir) for _ in range(args.runs)]
+        imports = min(imported for imported, _ in results)
+        wall = min(elapsed for _, elapsed in results)
+        print(f"dbt {command}: imports {imports:.2f}s, wall {wall:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""The benchmarks run by `python -m benchmarks`.
+
+Each benchmark is a `Benchmark` subclass in `BENCHMARKS`. Benchmarks that
+need a project are run once per generated project shape, and share that
+project's `ProjectState`. The others run once, on a synthetic workload of a
+fixed size, so that `--compare` catches regressions in them too.
+"""
+import csv
+import os
+import random
+import shutil
+import tempfile
+from typing import List, Optional, Type
+
+from dbt import flags
+from dbt.adapters.cache import RelationsCache
+from dbt.adapters.postgres.impl import SEED_BATCH_SIZE, SeedCopyStream
+from dbt.clients import agate_helper
+from dbt.compilation import Compiler
+from dbt.contracts.graph.manifest import Manifest
+from dbt.events.functions import (
+    ASYNC_LOG_BATCH_SIZE,
+    ASYNC_LOG_QUEUE_SIZE,
+    AsyncEventWriter,
+    fire_event,
+)
+from dbt.events.types import SQLQuery
+from dbt.graph import Graph, GraphQueue, NodeSelector, parse_difference
+from dbt.lib import get_dbt_config
+from dbt.parser.manifest import ManifestLoader
+from dbt.parser.read_files import read_files
+import dbt.events.functions
+import dbt.utils
+
+from benchmarks import catalog, compile_nodes, relations_cache
+from benchmarks.graph_queue import make_graph
+
+# the number of events fired by each run of the fire_event benchmarks
+EVENTS_PER_RUN = 10000
+# the number of nodes in the graph of the graph.* benchmarks
+GRAPH_NODES = 15000
+
+
+class ProjectState:
+    """The config, parsed manifest and compiled graph of a generated project,
+    each built the first time a benchmark asks for it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # like dbt itself, run from the project directory, since the target
+        # path is relative to it
+        os.chdir(path)
+        # the profile is read before get_dbt_config sets the flags
+        os.environ["DBT_PROFILES_DIR"] = flags.PROFILES_DIR = path
+        self.config = get_dbt_config(path)
+        self.projects = self.config.load_dependencies()
+        self._manifest = None
+        self._graph = None
+
+    def load_manifest(self, partial_parse: bool):
+        flags.PARTIAL_PARSE = partial_parse
+        return ManifestLoader(self.config, self.projects).load()
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            self._manifest = self.load_manifest(partial_parse=False)
+        return self._manifest
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            compiler = Compiler(self.config)
+            self._graph = compiler.compile(self.manifest, write=False, add_test_edges=True)
+        return self._graph
+
+    def middle_model(self) -> str:
+        models = sorted(
+            node.name for node in self.manifest.nodes.values() if node.resource_type == "model"
+        )
+        return models[len(models) // 2]
+
+
+class Benchmark:
+    name: str
+    needs_project: bool = True
+
+    def setup(self, project: Optional[ProjectState]) -> None:
+        self.project = project
+
+    def before_each(self) -> None:
+        pass
+
+    def run(self) -> None:
+        raise NotImplementedError
+
+    def teardown(self) -> None:
+        pass
+
+
+class ReadFiles(Benchmark):
+    name = "read_files"
+
+    def run(self):
+        files, parser_files = {}, {}
+        for project in self.project.projects.values():
+            read_files(project, files, parser_files, {})
+
+
+class FullParse(Benchmark):
+    name = "parse.full"
+
+    def run(self):
+        self.project.load_manifest(partial_parse=False)
+
+
+class PartialParseUnchanged(Benchmark):
+    name = "parse.partial.unchanged"
+
+    def setup(self, project):
+        super().setup(project)
+        # writes the partial parse file
+        project.load_manifest(partial_parse=True)
+
+    def run(self):
+        self.project.load_manifest(partial_parse=True)
+
+
+class PartialParseOneChanged(PartialParseUnchanged):
+    name = "parse.partial.one_changed"
+
+    def setup(self, project):
+        super().setup(project)
+        node = project.manifest.nodes[f"model.bench.{project.middle_model()}"]
+        self.path = os.path.join(project.path, node.original_file_path)
+        with open(self.path) as fp:
+            self.original = fp.read()
+        self.edits = 0
+
+    def before_each(self):
+        self.edits += 1
+        with open(self.path, "w") as fp:
+            fp.write(f"{self.original}-- edit {self.edits}\n")
+
+    def teardown(self):
+        with open(self.path, "w") as fp:
+            fp.write(self.original)
+
+
+class Compile(Benchmark):
+    name = "compile"
+    add_test_edges = False
+
+    def setup(self, project):
+        super().setup(project)
+        self.compiler = Compiler(project.config)
+        # parse before the timed runs
+        project.manifest
+
+    def run(self):
+        self.compiler.compile(
+            self.project.manifest, write=False, add_test_edges=self.add_test_edges
+        )
+
+
+class CompileWithTestEdges(Compile):
+    name = "compile.test_edges"
+    add_test_edges = True
+
+
+class GraphQueueDrain(Benchmark):
+    name = "graph_queue.drain"
+
+    def setup(self, project):
+        super().setup(project)
+        selector = NodeSelector(project.graph, project.manifest)
+        self.selected = selector.get_selected(parse_difference(None, None))
+        self.graph = project.graph.get_subset_graph(self.selected).graph
+
+    def run(self):
+        queue = GraphQueue(self.graph, self.project.manifest, self.selected)
+        while not queue.empty():
+            node = queue.get(block=False)
+            queue.mark_done(node.unique_id)
+
+
+class Select(Benchmark):
+    name = "select.graph_operators"
+    selector_format = "+{model}+"
+
+    def setup(self, project):
+        super().setup(project)
+        self.selector = NodeSelector(project.graph, project.manifest)
+        selection = self.selector_format.format(model=project.middle_model())
+        self.spec = parse_difference([selection], None)
+
+    def run(self):
+        self.selector.get_selected(self.spec)
+
+
+class SelectAt(Select):
+    name = "select.at_operator"
+    selector_format = "@{model}"
+
+
+class SelectTag(Select):
+    name = "select.tag"
+    selector_format = "tag:even"
+
+
+class FireEvent(Benchmark):
+    name = "fire_event"
+    needs_project = False
+
+    def run(self):
+        for n in range(EVENTS_PER_RUN):
+            fire_event(SQLQuery(conn_name="master", sql=f"select {n}"))
+
+
+class FireEventAsync(FireEvent):
+    name = "fire_event.async"
+
+    def setup(self, project):
+        super().setup(project)
+        dbt.events.functions.EVENT_WRITER = AsyncEventWriter(
+            ASYNC_LOG_QUEUE_SIZE, ASYNC_LOG_BATCH_SIZE
+        )
+
+    def run(self):
+        super().run()
+        dbt.events.functions.flush_event_writer()
+
+    def teardown(self):
+        dbt.events.functions.stop_event_writer()
+
+
+class SubsetGraph(Benchmark):
+    name = "graph.subset"
+    needs_project = False
+    selected = 2000
+
+    def setup(self, project):
+        super().setup(project)
+        self.graph = Graph(make_graph(GRAPH_NODES, 0))
+        self.nodes = set(random.Random(0).sample(list(self.graph), self.selected))
+
+    def run(self):
+        self.graph.get_subset_graph(self.nodes)
+
+
+class SubsetGraphMost(SubsetGraph):
+    name = "graph.subset.most"
+    selected = 13500
+
+
+class GraphSelectParents(Benchmark):
+    name = "graph.select_parents"
+    needs_project = False
+    method = "select_parents"
+
+    def setup(self, project):
+        super().setup(project)
+        self.nx_graph = make_graph(GRAPH_NODES, 0)
+        self.nodes = set(random.Random(0).sample(list(self.nx_graph), 3000))
+
+    def run(self):
+        # a new Graph, so that building its index is timed too
+        getattr(Graph(self.nx_graph), self.method)(self.nodes)
+
+
+class GraphSelectChildren(GraphSelectParents):
+    name = "graph.select_children"
+    method = "select_children"
+
+
+class GraphSelectChildrensParents(GraphSelectParents):
+    name = "graph.select_childrens_parents"
+    method = "select_childrens_parents"
+
+
+class RelationsCacheMixed(Benchmark):
+    name = "relations_cache.mixed"
+    needs_project = False
+    schemas = 60
+    relations = 1000
+    threads = 8
+    operations = 200
+    write_ratio = 0.1
+
+    def setup(self, project):
+        super().setup(project)
+        self.cache = RelationsCache()
+        relations_cache.fill(self.cache, self.schemas, self.relations)
+
+    def run(self):
+        relations_cache.run_workload(
+            self.cache,
+            self.threads,
+            self.schemas,
+            self.relations,
+            self.operations,
+            self.write_ratio,
+        )
+
+
+class SeedStream(Benchmark):
+    """Only the client side: the rows are formatted for COPY and thrown away."""
+
+    name = "seed.stream"
+    needs_project = False
+    rows = 50000
+
+    def setup(self, project):
+        super().setup(project)
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "seed.csv")
+        with open(self.path, "w") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(["id", "name", "amount", "flag", "loaded_at"])
+            for i in range(self.rows):
+                writer.writerow([i, f"name {i}", f"{i}.25", i % 2 == 0, "2021-01-01 10:00:00"])
+
+    def run(self):
+        seed_file = agate_helper.SeedFile(self.path, ())
+        stream = SeedCopyStream(seed_file.batches(SEED_BATCH_SIZE))
+        while stream.read(8192):
+            pass
+
+    def teardown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+class SeedAgateTable(SeedStream):
+    """Only reading the seed into the agate table that load_csv_rows inserts."""
+
+    name = "seed.agate_table"
+
+    def run(self):
+        agate_helper.from_csv(self.path, ())
+
+
+class CatalogWrite(Benchmark):
+    name = "catalog.write"
+    needs_project = False
+    schemas = 20
+    tables = 100
+    columns = 40
+
+    def setup(self, project):
+        super().setup(project)
+        self.manifest = catalog.make_manifest(self.schemas, self.tables)
+        self.schema_tables = [
+            catalog.schema_catalog(schema, self.tables, self.columns)
+            for schema in range(self.schemas)
+        ]
+        self.tmpdir = tempfile.mkdtemp()
+
+    def run(self):
+        path = os.path.join(self.tmpdir, "catalog.json")
+        catalog.write_catalog(self.manifest, self.schema_tables, path)
+
+    def teardown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+class CompileNodes(Benchmark):
+    name = "compile.from_parsed"
+    needs_project = False
+
+    def setup(self, project):
+        super().setup(project)
+        self.nodes = compile_nodes.make_nodes(10000, 20)
+
+    def run(self):
+        compile_nodes.compile_nodes(self.nodes, ephemeral_every=10)
+
+
+class ManifestJson(Benchmark):
+    name = "manifest_json.write"
+    needs_project = False
+    fast_json = False
+
+    def setup(self, project):
+        super().setup(project)
+        nodes = compile_nodes.make_nodes(10000, 20)
+        self.manifest = Manifest(nodes={node.unique_id: node for node in nodes})
+        self.tmpdir = tempfile.mkdtemp()
+
+    def run(self):
+        self.manifest.write(os.path.join(self.tmpdir, "manifest.json"), self.fast_json)
+
+    def teardown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+class ManifestJsonFastJson(ManifestJson):
+    name = "manifest_json.write.fast_json"
+    fast_json = True
+
+
+BENCHMARKS: List[Type[Benchmark]] = [
+    ReadFiles,
+    FullParse,
+    PartialParseUnchanged,
+    PartialParseOneChanged,
+    Compile,
+    CompileWithTestEdges,
+    GraphQueueDrain,
+    Select,
+    SelectAt,
+    SelectTag,
+    FireEvent,
+    FireEventAsync,
+    SubsetGraph,
+    SubsetGraphMost,
+    GraphSelectParents,
+    GraphSelectChildren,
+    GraphSelectChildrensParents,
+    RelationsCacheMixed,
+    SeedStream,
+    SeedAgateTable,
+    CatalogWrite,
+    CompileNodes,
+    ManifestJson,
+]
+# --fast-json needs orjson
+if dbt.utils.fast_json_available():
+    BENCHMARKS.append(ManifestJsonFastJson)
@@ -1,16 +1,19 @@
 from contextlib import contextmanager
+import time
 
 import psycopg2
 
 import dbt.exceptions
 from dbt.adapters.base import Credentials
 from dbt.adapters.sql import SQLConnectionManager
-from dbt.contracts.connection import AdapterResponse
+from dbt.contracts.connection import AdapterResponse, Connection
 from dbt.events import AdapterLogger
+from dbt.events.functions import fire_event
+from dbt.events.types import ConnectionUsed, SQLQuery, SQLQueryStatus
 
 from dbt.helper_types import Port
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 
 logger = AdapterLogger("Postgres")
@@ -170,6 +173,31 @@ class PostgresConnectionManager(SQLConnectionManager):
 
         logger.debug("Cancel query '{}': {}".format(connection_name, res))
 
+    def copy_from(self, sql: str, file: Any) -> Tuple[Connection, Any]:
+        """Run a `COPY ... FROM STDIN` statement, reading its input from the
+        file-like object, in a transaction like add_query.
+        """
+        connection = self.get_thread_connection()
+        if connection.transaction_open is False:
+            self.begin()
+        fire_event(ConnectionUsed(conn_type=self.TYPE, conn_name=connection.name))
+
+        sql = self._add_query_comment(sql)
+        with self.exception_handler(sql):
+            fire_event(SQLQuery(conn_name=connection.name, sql=sql))
+            pre = time.time()
+
+            cursor = connection.handle.cursor()
+            cursor.copy_expert(sql, file)
+
+            fire_event(
+                SQLQueryStatus(
+                    status=str(self.get_response(cursor)), elapsed=round((time.time() - pre), 2)
+                )
+            )
+
+            return connection, cursor
+
     @classmethod
     def get_credentials(cls, credentials):
         return credentials
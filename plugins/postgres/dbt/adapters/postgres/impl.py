@@ -1,8 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime
 from dataclasses import dataclass
-from typing import Optional, Set, List, Any
+import io
+from typing import Optional, Set, List, Any, Iterator, Tuple
 from dbt.adapters.base.meta import available
 from dbt.adapters.base.impl import AdapterConfig
+from dbt.clients.agate_helper import SeedFile
 from dbt.adapters.sql import SQLAdapter
 from dbt.adapters.postgres import PostgresConnectionManager
 from dbt.adapters.postgres import PostgresColumn
@@ -15,6 +17,49 @@ import dbt.utils
 # note that this isn't an adapter macro, so just a single underscore
 GET_RELATIONS_MACRO_NAME = "postgres_get_relations"
 
+# the number of seed rows formatted for COPY at a time
+SEED_BATCH_SIZE = 10000
+
+
+def _copy_csv_value(value: Any) -> str:
+    # in COPY's csv format an empty unquoted value is null, and a quoted one
+    # is the empty string
+    if value is None:
+        return ""
+    elif isinstance(value, str):
+        return '"{}"'.format(value.replace('"', '""'))
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, date):
+        return value.isoformat()
+    else:
+        return str(value)
+
+
+class SeedCopyStream:
+    """A file-like object over seed rows, formatted as the input of
+    `COPY ... FROM STDIN WITH (FORMAT csv)`. Only one batch of rows is held
+    in memory at a time.
+    """
+
+    def __init__(self, batches: Iterator[List[Tuple[Any, ...]]]) -> None:
+        self._batches = batches
+        self._buffer = io.StringIO()
+        self.rows = 0
+
+    def read(self, size: int = -1) -> str:
+        data = self._buffer.read(size)
+        while not data:
+            batch = next(self._batches, None)
+            if batch is None:
+                return ""
+            self.rows += len(batch)
+            self._buffer = io.StringIO(
+                "".join(",".join(map(_copy_csv_value, row)) + "\n" for row in batch)
+            )
+            data = self._buffer.read(size)
+        return data
+
 
 @dataclass
 class PostgresIndexConfig(dbtClassMixin):
@@ -85,6 +130,22 @@ class PostgresAdapter(SQLAdapter):
     def parse_index(self, raw_index: Any) -> Optional[PostgresIndexConfig]:
         return PostgresIndexConfig.parse(raw_index)
 
+    @available
+    @classmethod
+    def supports_seed_streaming(cls) -> bool:
+        # adapters built on this one don't necessarily support COPY FROM
+        # STDIN (redshift doesn't), so they have to opt in for themselves
+        return cls.type() == "postgres"
+
+    @available
+    def load_seed_rows(
+        self, relation: PostgresRelation, columns_sql: str, seed_file: SeedFile
+    ) -> int:
+        sql = f"copy {relation.render()} ({columns_sql}) from stdin with (format csv)"
+        stream = SeedCopyStream(seed_file.batches(SEED_BATCH_SIZE))
+        self.connections.copy_from(sql, stream)
+        return stream.rows
+
     def _link_cached_database_relations(self, schemas: Set[str]):
         """
         :param schemas: The set of schemas that should have links added.
@@ -346,4 +346,85 @@ class TestSimpleBigSeedBatched(DBTIntegrationTest):
     @use_profile('postgres')
     def test_postgres_big_batched_seed(self):
         self.test_big_batched_seed()
-    
\ No newline at end of file
+    
+
+class StreamedSeedBase(DBTIntegrationTest):
+    # more rows than SeedFile samples to infer the column types
+    rows = 25000
+    stream = True
+
+    @property
+    def schema(self):
+        return "simple_seed_005"
+
+    @property
+    def models(self):
+        return "models"
+
+    @property
+    def project_config(self):
+        return {
+            'config-version': 2,
+            'seed-paths': ['seeds-streamed'],
+            'seeds': {
+                'quote_columns': False,
+                'stream': self.stream,
+            }
+        }
+
+    def write_seed(self, last_row):
+        os.makedirs('seeds-streamed', exist_ok=True)
+        with open('seeds-streamed/streamed_seed.csv', 'w') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'name', 'amount', 'flag', 'loaded_at'])
+            for i in range(self.rows - 1):
+                writer.writerow([i, f'row "{i}", quoted', f'{i}.25', i % 2 == 0, '2021-01-01 10:00:00'])
+            writer.writerow(last_row)
+
+
+class TestStreamedSeed(StreamedSeedBase):
+    @use_profile('postgres')
+    def test_postgres_streamed_seed(self):
+        self.write_seed([self.rows - 1, '', '', 'null', ''])
+        results = self.run_dbt(["seed"])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].adapter_response['rows_affected'], self.rows)
+
+        count, = self.run_sql('select count(*) from {schema}.streamed_seed', fetch='one')
+        self.assertEqual(count, self.rows)
+        first = self.run_sql('select * from {schema}.streamed_seed where id = 1', fetch='one')
+        self.assertEqual(first[1:4], ('row "1", quoted', 1.25, False))
+        self.assertEqual(str(first[4]), '2021-01-01 10:00:00')
+        last = self.run_sql(
+            'select * from {schema}.streamed_seed where id = ' + str(self.rows - 1), fetch='one'
+        )
+        self.assertEqual(last[1:], (None, None, None, None))
+
+        # seeding again truncates the table and loads it again
+        self.run_dbt(["seed"])
+        count, = self.run_sql('select count(*) from {schema}.streamed_seed', fetch='one')
+        self.assertEqual(count, self.rows)
+
+    @use_profile('postgres')
+    def test_postgres_streamed_seed_type_outside_sample(self):
+        # the amount column is inferred as a number from the sample
+        self.write_seed([self.rows - 1, 'last', 'not a number', 'true', ''])
+        results = self.run_dbt(["seed"], expect_pass=False)
+        self.assertIn('column "amount"', results[0].message)
+        self.assertTableDoesNotExist('streamed_seed')
+
+
+class TestUnstreamedSeed(StreamedSeedBase):
+    stream = False
+
+    @use_profile('postgres')
+    def test_postgres_type_outside_sample(self):
+        # without the stream config, the types are inferred from every row
+        self.write_seed([self.rows - 1, 'last', 'not a number', 'true', ''])
+        results = self.run_dbt(["seed"])
+        self.assertEqual(results[0].adapter_response['rows_affected'], self.rows)
+        amount, = self.run_sql(
+            'select amount from {schema}.streamed_seed where id = ' + str(self.rows - 1),
+            fetch='one'
+        )
+        self.assertEqual(amount, 'not a number')
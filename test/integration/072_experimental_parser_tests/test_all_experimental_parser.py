@@ -1,4 +1,5 @@
 from dbt.contracts.graph.manifest import Manifest
+from dbt.parser.partial_parse_file import read_partial_parse_file
 import os
 from test.integration.base import DBTIntegrationTest, use_profile
 
@@ -6,9 +7,7 @@ from test.integration.base import DBTIntegrationTest, use_profile
 def get_manifest():
     path = './target/partial_parse.msgpack'
     if os.path.exists(path):
-        with open(path, 'rb') as fp:
-            manifest_mp = fp.read()
-        manifest: Manifest = Manifest.from_msgpack(manifest_mp)
+        manifest: Manifest = read_partial_parse_file(path)
         return manifest
     else:
         return None
@@ -33,6 +33,7 @@ from dbt.events.test_types import (
     IntegrationTestException
 )
 from dbt.contracts.graph.manifest import Manifest
+from dbt.parser.partial_parse_file import read_partial_parse_file
 
 
 INITIAL_ROOT = os.getcwd()
@@ -1150,9 +1151,7 @@ class AnyStringWith:
 def get_manifest():
     path = './target/partial_parse.msgpack'
     if os.path.exists(path):
-        with open(path, 'rb') as fp:
-            manifest_mp = fp.read()
-        manifest: Manifest = Manifest.from_msgpack(manifest_mp)
+        manifest: Manifest = read_partial_parse_file(path)
         return manifest
     else:
         return None
@@ -9,6 +9,7 @@ import os
 from shutil import rmtree
 from tempfile import mkdtemp
 from dbt.clients import agate_helper
+from dbt.exceptions import RuntimeException
 
 SAMPLE_CSV_DATA = """a,b,c,d,e,f,g
 1,n,test,3.2,20180806T11:33:29.320Z,True,NULL
@@ -62,6 +63,44 @@ class TestAgateHelper(unittest.TestCase):
         for idx, row in enumerate(tbl):
             self.assertEqual(list(row), EXPECTED[idx])
 
+    def test_seed_file_batches(self):
+        path = os.path.join(self.tempdir, 'input.csv')
+        with open(path, 'wb') as fp:
+            fp.write(SAMPLE_CSV_BOM_DATA.encode('utf-8'))
+        seed_file = agate_helper.SeedFile(path, ())
+        self.assertEqual(seed_file.column_names, tuple('abcdefg'))
+        self.assertEqual(len(seed_file.sample), len(EXPECTED))
+        batches = list(seed_file.batches(1))
+        self.assertEqual(batches, [[tuple(row)] for row in EXPECTED])
+
+    def test_seed_file_sample(self):
+        path = os.path.join(self.tempdir, 'input.csv')
+        with open(path, 'w') as fp:
+            fp.write('a,b\n1,x\n2,y\n3\n4,z\n')
+        seed_file = agate_helper.SeedFile(path, (), sample_size=2)
+        self.assertEqual(len(seed_file.sample), 2)
+        self.assertIsInstance(seed_file.column_types[0], agate.Number)
+        # short rows are padded with nulls, like agate does
+        self.assertEqual(
+            list(seed_file.batches(3)),
+            [[(1, 'x'), (2, 'y'), (3, None)], [(4, 'z')]],
+        )
+
+    def test_seed_file_outside_sample(self):
+        path = os.path.join(self.tempdir, 'input.csv')
+        with open(path, 'w') as fp:
+            fp.write('a,b\n1,x\n2,y\nthree,z\n')
+        seed_file = agate_helper.SeedFile(path, (), sample_size=2)
+        with self.assertRaisesRegex(RuntimeException, 'Line 4 .* "three" in column "a"'):
+            list(seed_file.batches(10))
+
+        # forcing the column to text avoids that
+        seed_file = agate_helper.SeedFile(path, ('a',), sample_size=2)
+        self.assertEqual(
+            list(seed_file.batches(10)),
+            [[('1', 'x'), ('2', 'y'), ('three', 'z')]],
+        )
+
     def test_from_csv_all_reserved(self):
         path = os.path.join(self.tempdir, 'input.csv')
         with open(path, 'wb') as fp:
@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from dbt.task import artifacts
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    def test_writes_in_order(self):
+        written = []
+        for name in ('manifest.json', 'run_results.json'):
+            artifacts.write_in_background(written.append, name)
+        artifacts.wait_for_artifacts()
+        self.assertEqual(written, ['manifest.json', 'run_results.json'])
+
+    def test_raises_first_error_after_all_writes(self):
+        written = []
+
+        def fail(message):
+            raise OSError(message)
+
+        artifacts.write_in_background(fail, 'disk full')
+        artifacts.write_in_background(written.append, 'run_results.json')
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            artifacts.wait_for_artifacts()
+        self.assertEqual(written, ['run_results.json'])
+        # nothing is left pending
+        artifacts.wait_for_artifacts()
+
+    def test_forgets_finished_writes(self):
+        written = []
+        for name in ('manifest.json', 'run_results.json'):
+            artifacts.write_in_background(written.append, name)
+        # the writer runs one thing at a time, so both writes are done
+        artifacts._EXECUTOR.submit(lambda: None).result()
+        artifacts.write_in_background(written.append, 'catalog.json')
+        self.assertEqual(len(artifacts._PENDING), 1)
+        artifacts.wait_for_artifacts()
+
+    @mock.patch('dbt.task.artifacts.fire_event')
+    def test_write_error_does_not_hide_block_error(self, fire_event):
+        def fail(message):
+            raise OSError(message)
+
+        with self.assertRaisesRegex(RuntimeError, 'run failed'):
+            with artifacts.artifacts_written():
+                artifacts.write_in_background(fail, 'disk full')
+                raise RuntimeError('run failed')
+        fire_event.assert_called_once()
+        self.assertEqual(fire_event.call_args[0][0].exc, 'disk full')
+
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            with artifacts.artifacts_written():
+                artifacts.write_in_background(fail, 'disk full')
+
+    @mock.patch('dbt.flags.FAST_JSON', True)
+    @mock.patch('dbt.utils.orjson', None)
+    @mock.patch('dbt.task.artifacts.fire_event')
+    def test_fast_json_unavailable(self, fire_event):
+        self.assertFalse(artifacts.use_fast_json())
+        fire_event.assert_called_once()
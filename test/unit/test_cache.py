@@ -1,10 +1,11 @@
 from unittest import TestCase
-from dbt.adapters.cache import RelationsCache
+from dbt.adapters.cache import RelationsCache, _ReadWriteLock
 from dbt.adapters.base.relation import BaseRelation
 from multiprocessing.dummy import Pool as ThreadPool
 import dbt.exceptions
 
 import random
+import threading
 import time
 
 
@@ -489,3 +490,79 @@ class TestComplexCache(TestCase):
         self.assertEqual(len(self.cache.get_relations('dbt', 'bar')), 1)
         self.assertEqual(len(self.cache.get_relations('dbt_2', 'foo')), 1)
         self.assertEqual(len(self.cache.relations), 2)
+
+    def test_drop_leaf_releases_reference(self):
+        self.cache.drop(make_relation('dbt', 'foo', 'table4'))
+        table1 = self.cache.relations[('dbt', 'foo', 'table1')]
+        self.assertEqual(
+            set(table1.referenced_by),
+            {('dbt', 'foo', 'table3'), ('dbt_2', 'foo', 'table1')}
+        )
+        self.assertEqual(len(self.cache.get_relations('dbt', 'foo')), 2)
+
+    def test_rename_dependent_then_drop_it(self):
+        self.cache.rename(make_relation('dbt', 'foo', 'table4'),
+                          make_relation('dbt', 'bar', 'table4'))
+        table1 = self.cache.relations[('dbt', 'foo', 'table1')]
+        self.assertIn(('dbt', 'bar', 'table4'), table1.referenced_by)
+        self.assertNotIn(('dbt', 'foo', 'table4'), table1.referenced_by)
+
+        self.cache.drop(make_relation('dbt', 'bar', 'table4'))
+        self.assertNotIn(('dbt', 'bar', 'table4'), table1.referenced_by)
+        self.assertEqual(len(self.cache.get_relations('dbt', 'bar')), 2)
+
+    def test_drop_schema(self):
+        self.cache.drop_schema('DBT', 'FOO')
+        self.assertNotIn(('dbt', 'foo'), self.cache.schemas)
+        self.assertEqual(len(self.cache.get_relations('dbt', 'foo')), 0)
+        # dbt.bar.table3 and dbt_2.foo.table1 were cascaded out
+        self.assertEqual(len(self.cache.get_relations('dbt', 'bar')), 1)
+        self.assertEqual(len(self.cache.get_relations('dbt_2', 'foo')), 1)
+        self.assertEqual(len(self.cache.relations), 2)
+
+
+class TestReadWriteLock(TestCase):
+    def setUp(self):
+        self.lock = _ReadWriteLock()
+
+    def test_readers_share(self):
+        both_reading = threading.Barrier(2, timeout=5)
+
+        def read():
+            with self.lock.read():
+                both_reading.wait()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        # would time out if the readers excluded each other
+        read()
+        thread.join()
+
+    def test_writer_excludes_readers(self):
+        events = []
+
+        def read():
+            with self.lock.read():
+                events.append('read')
+
+        with self.lock:
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+            events.append('write')
+        thread.join()
+        self.assertEqual(events, ['write', 'read'])
+
+    def test_writer_is_reentrant_and_can_read(self):
+        with self.lock:
+            with self.lock:
+                with self.lock.read():
+                    pass
+        # the lock is free again
+        self.assertTrue(self.lock.acquire())
+        self.lock.release()
+
+    def test_release_unacquired(self):
+        with self.assertRaises(RuntimeError):
+            self.lock.release()
@@ -218,10 +218,10 @@ class CompilerTest(unittest.TestCase):
             'select * from source_table'
         )
 
-    def test__prepend_ctes(self):
+    def _ephemeral_cte_manifest(self):
         ephemeral_config = self.model_config.replace(materialized='ephemeral')
 
-        manifest = Manifest(
+        return Manifest(
             macros={},
             nodes={
                 'model.root.view': ParsedModelNode(
@@ -266,12 +266,17 @@ class CompilerTest(unittest.TestCase):
             selectors={},
         )
 
+    def test__prepend_ctes(self):
+        manifest = self._ephemeral_cte_manifest()
+
         compiler = dbt.compilation.Compiler(self.config)
-        result = compiler.compile_node(
-            manifest.nodes['model.root.view'],
-            manifest,
-            write=False
-        )
+        with patch.object(CompiledModelNode, 'validate') as validate:
+            result = compiler.compile_node(
+                manifest.nodes['model.root.view'],
+                manifest,
+                write=False
+            )
+        validate.assert_not_called()
         self.assertTrue(result.extra_ctes_injected)
         self.assertEqualIgnoreWhitespace(
             result.compiled_sql,
@@ -282,6 +287,19 @@ class CompilerTest(unittest.TestCase):
         self.assertTrue(
             manifest.nodes['model.root.ephemeral'].extra_ctes_injected)
 
+    def test__prepend_ctes__strict_validation(self):
+        manifest = self._ephemeral_cte_manifest()
+
+        compiler = dbt.compilation.Compiler(self.config)
+        with patch.object(dbt.flags, 'STRICT_VALIDATION', True), \
+                patch.object(CompiledModelNode, 'validate') as validate:
+            result = compiler.compile_node(
+                manifest.nodes['model.root.view'],
+                manifest,
+                write=False
+            )
+        validate.assert_called_once_with(result.to_dict(omit_none=True))
+
     def test__prepend_ctes__cte_not_compiled(self):
         ephemeral_config = self.model_config.replace(materialized='ephemeral')
         parsed_ephemeral = ParsedModelNode(
@@ -569,3 +587,62 @@ class CompilerTest(unittest.TestCase):
             'select * from __dbt__cte__inner_ephemeral')
         )
 
+
+
+def _reference_add_test_edges(graph, manifest):
+    # the straightforward (and slow) algorithm add_test_edges must match:
+    # walk every ancestor of every non-test node
+    import networkx as nx
+    for node_id in list(graph):
+        if node_id in manifest.nodes and manifest.nodes[node_id].resource_type != NodeType.Test:
+            upstream_nodes = set(nx.ancestors(graph, node_id))
+            for upstream_node in upstream_nodes:
+                for child_id in manifest.child_map.get(upstream_node, []):
+                    if not child_id.startswith('test.'):
+                        continue
+                    test_depends_on = set(manifest.nodes[child_id].depends_on_nodes)
+                    if test_depends_on.issubset(upstream_nodes):
+                        graph.add_edge(child_id, node_id)
+
+
+class AddTestEdgesTest(unittest.TestCase):
+    def _make_manifest(self, seed):
+        import random
+        from types import SimpleNamespace
+        rng = random.Random(seed)
+        nodes = {}
+        child_map = {}
+        model_ids = []
+        for i in range(60):
+            unique_id = f'model.pkg.model_{i}'
+            parents = rng.sample(model_ids, min(len(model_ids), rng.randint(0, 3)))
+            nodes[unique_id] = SimpleNamespace(
+                resource_type=NodeType.Model, depends_on_nodes=parents
+            )
+            model_ids.append(unique_id)
+        for i in range(80):
+            unique_id = f'test.pkg.test_{i}'
+            parents = rng.sample(model_ids, rng.choice([0, 1, 1, 1, 2, 3]))
+            nodes[unique_id] = SimpleNamespace(
+                resource_type=NodeType.Test, depends_on_nodes=parents
+            )
+        for unique_id, node in nodes.items():
+            child_map.setdefault(unique_id, [])
+            for parent in node.depends_on_nodes:
+                child_map.setdefault(parent, []).append(unique_id)
+        return SimpleNamespace(nodes=nodes, child_map=child_map)
+
+    def test_add_test_edges_matches_reference(self):
+        for seed in range(5):
+            manifest = self._make_manifest(seed)
+            linker = dbt.compilation.Linker()
+            for unique_id, node in manifest.nodes.items():
+                linker.add_node(unique_id)
+                for dependency in node.depends_on_nodes:
+                    linker.dependency(unique_id, dependency)
+            expected = linker.graph.copy()
+            _reference_add_test_edges(expected, manifest)
+
+            dbt.compilation.Compiler(None).add_test_edges(linker, manifest)
+            self.assertEqual(set(linker.graph.nodes), set(expected.nodes))
+            self.assertEqual(set(linker.graph.edges), set(expected.edges))
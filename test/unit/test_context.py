@@ -4,6 +4,7 @@ import os
 from typing import Set, Dict, Any
 from unittest import mock
 
+import jinja2
 import pytest
 
 from dbt.adapters import postgres
@@ -16,6 +17,7 @@ from dbt.contracts.graph.parsed import (
 from dbt.config.project import VarProvider
 from dbt.context import base, target, configured, providers, docs, manifest, macros
 from dbt.contracts.files import FileHash
+from dbt.contracts.graph.manifest import SerializedMapping
 from dbt.node_types import NodeType
 import dbt.exceptions
 from .utils import profile_from_dict, config_from_parts_or_dicts, inject_adapter, clear_plugin
@@ -191,7 +193,7 @@ REQUIRED_BASE_KEYS = frozenset({
 
 REQUIRED_TARGET_KEYS = REQUIRED_BASE_KEYS | {'target'}
 REQUIRED_DOCS_KEYS = REQUIRED_TARGET_KEYS | {'project_name'} | {'doc'}
-MACROS = frozenset({'macro_a', 'macro_b', 'root', 'dbt'})
+MACROS = frozenset({'macro_a', 'macro_b', 'root', 'dbt', '_dbt_macro_namespace'})
 REQUIRED_QUERY_HEADER_KEYS = REQUIRED_TARGET_KEYS | {'project_name'} | MACROS
 REQUIRED_MACRO_KEYS = REQUIRED_QUERY_HEADER_KEYS | {
     '_sql_results',
@@ -203,6 +205,7 @@ REQUIRED_MACRO_KEYS = REQUIRED_QUERY_HEADER_KEYS | {
     'render',
     'try_or_compiler_error',
     'load_agate_table',
+    'load_seed_file',
     'ref',
     'source',
     'config',
@@ -290,6 +293,26 @@ def test_base_context():
     assert_has_keys(REQUIRED_BASE_KEYS, MAYBE_KEYS, ctx)
 
 
+def test_tojson_graph():
+    node = mock.MagicMock()
+    node.to_dict.return_value = {'unique_id': 'model.root.a'}
+    graph = {'nodes': SerializedMapping({'model.root.a': node})}
+    ctx = base.generate_base_context({})
+    assert ctx['tojson'](graph) == '{"nodes": {"model.root.a": {"unique_id": "model.root.a"}}}'
+    rendered = jinja2.Template('{{ graph.nodes["model.root.a"].unique_id }}').render(graph=graph)
+    assert rendered == 'model.root.a'
+
+
+def test_toyaml_graph():
+    node = mock.MagicMock()
+    node.to_dict.return_value = {'unique_id': 'model.root.a'}
+    graph = {'nodes': SerializedMapping({'model.root.a': node})}
+    ctx = base.generate_base_context({})
+    assert ctx['toyaml'](graph) == 'nodes:\n  model.root.a:\n    unique_id: model.root.a\n'
+    # anything else that can't be represented still gets the default
+    assert ctx['toyaml']({'a': object()}, default='oops') == 'oops'
+
+
 def mock_macro(name, package_name):
     macro = mock.MagicMock(
         __class__=ParsedMacro,
@@ -464,3 +487,44 @@ def test_macro_namespace(config_postgres, manifest_fx):
         assert result['dbt']['some_macro'].macro is pg_macro
         assert result['root']['some_macro'].macro is package_macro
         assert result['some_macro'].macro is package_macro
+
+
+def test_macro_namespace_layout_is_shared(config_postgres, manifest_fx):
+    def build(search_package, all_macros):
+        mn = macros.MacroNamespaceBuilder(
+            'root', search_package, MacroStack(), ['dbt_postgres', 'dbt'])
+        return mn.build_namespace(all_macros, {})
+
+    all_macros = dict(manifest_fx.macros)
+    first = build('root', all_macros)
+    second = build('root', all_macros)
+    assert first.layout is second.layout
+    assert first['macro_a'] is first.get_from_package('root', 'macro_a')
+    assert first['macro_a'] is not second['macro_a']
+    assert first.flatten()['macro_a'] is second.flatten()['macro_a']
+    assert build('search', all_macros).layout is not first.layout
+
+    # adding a macro invalidates the cached layout
+    new_macro = mock_macro('macro_c', 'root')
+    all_macros[new_macro.unique_id] = new_macro
+    third = build('root', all_macros)
+    assert third.layout is not first.layout
+    assert third['macro_c'].macro is new_macro
+
+
+def test_macro_namespace_late_binding(config_postgres, manifest_fx):
+    mn = macros.MacroNamespaceBuilder(
+        'root', 'root', MacroStack(), ['dbt_postgres', 'dbt'])
+    namespace = mn.build_namespace(manifest_fx.macros, {})
+    flat = namespace.flatten()
+    assert flat[macros.MACRO_NAMESPACE_KEY] is namespace
+    assert set(flat['root']) == {'macro_a', 'macro_b'}
+    # nothing is bound until a macro is looked up or called
+    assert namespace._generators == {}
+
+    macro_a = mock.MagicMock(return_value='called')
+    namespace._generators['macro.root.macro_a'] = macro_a
+    template = jinja2.Environment().from_string('{{ macro_a(1, b=2) }}')
+    assert template.render(flat) == 'called'
+    macro_a.assert_called_once_with(1, b=2)
+    assert list(namespace._generators) == ['macro.root.macro_a']
@@ -3,7 +3,7 @@ import pytest
 
 from dbt.contracts.files import FileHash
 from dbt.contracts.graph.compiled import (
-    CompiledModelNode, InjectedCTE, CompiledGenericTestNode
+    CompiledModelNode, InjectedCTE, CompiledGenericTestNode, parsed_instance_for
 )
 from dbt.contracts.graph.parsed import (
     DependsOn, NodeConfig, TestConfig, TestMetadata, ColumnInfo
@@ -590,3 +590,21 @@ def test_compare_to_compiled(basic_uncompiled_schema_test_node, basic_compiled_s
     fixed_compiled = compiled.replace(
         config=fixed_config, unrendered_config=uncompiled.unrendered_config)
     assert uncompiled.same_contents(fixed_compiled)
+
+
+@pytest.mark.parametrize('fixture_name', [
+    'basic_uncompiled_model', 'basic_uncompiled_schema_test_node',
+])
+def test_from_parsed(fixture_name, request):
+    uncompiled = request.getfixturevalue(fixture_name)
+    parsed = parsed_instance_for(uncompiled)
+    node = type(uncompiled).from_parsed(parsed)
+    assert node == uncompiled
+    # same result as the dict round trip it replaces
+    data = parsed.to_dict(omit_none=True)
+    data['compiled'] = False
+    assert node == type(uncompiled).from_dict(data)
+    # the runners' status is kept per node
+    parsed._event_status['node_status'] = 'started'
+    assert node._event_status == {}
+    assert type(uncompiled).from_parsed(parsed)._event_status == {}
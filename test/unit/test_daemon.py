@@ -0,0 +1,147 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from argparse import Namespace
+from types import SimpleNamespace
+from unittest import mock
+
+from dbt import flags
+from dbt.clients.daemon import DaemonClient
+from dbt.contracts.graph.manifest import Manifest
+from dbt.exceptions import RuntimeException
+from dbt.task.daemon import DaemonTask, _working_copy
+
+
+def make_task(project_dir):
+    # skip ConfiguredTask.__init__, which registers an adapter for the config
+    task = DaemonTask.__new__(DaemonTask)
+    task.args = Namespace(
+        socket=None,
+        project_dir=project_dir,
+        profiles_dir=flags.PROFILES_DIR,
+        profile=None,
+        target='dev',
+        vars='{}',
+    )
+    task.config = SimpleNamespace(
+        target_path=os.path.join(project_dir, 'target'),
+        log_path=os.path.join(project_dir, 'logs'),
+        packages_install_path=os.path.join(project_dir, 'dbt_packages'),
+    )
+    task.manifest = None
+    task.changed_paths = []
+    task.reparse = False
+    task.reload_config = False
+    task.stopping = False
+    return task
+
+
+class TestDaemonTask(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.project_dir = os.path.realpath(self.tmpdir.name)
+        self.task = make_task(self.project_dir)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.project_dir, *parts)
+
+    def test_notify_model_reparses(self):
+        self.task.notify([self.path('models', 'my_model.sql')])
+        self.assertTrue(self.task.reparse)
+        self.assertFalse(self.task.reload_config)
+        self.assertEqual(self.task.changed_paths, [self.path('models', 'my_model.sql')])
+
+    def test_notify_ignores_target_and_logs(self):
+        self.task.notify([self.path('target', 'manifest.json'), self.path('logs', 'dbt.log')])
+        self.assertFalse(self.task.reparse)
+        self.assertEqual(self.task.changed_paths, [])
+
+    def test_notify_without_paths_reparses(self):
+        self.task.notify([])
+        self.assertTrue(self.task.reparse)
+
+    def test_notify_project_file_reloads_config(self):
+        self.task.notify([self.path('dbt_project.yml')])
+        self.assertTrue(self.task.reload_config)
+
+    def test_notify_package_reloads_config(self):
+        self.task.notify([self.path('dbt_packages', 'dbt_utils', 'macros', 'x.sql')])
+        self.assertTrue(self.task.reload_config)
+
+    def test_parse_command(self):
+        parsed = self.task._parse_command(['ls', '--select', 'my_model'])
+        self.assertEqual(parsed.which, 'list')
+        self.assertEqual(parsed.select, ['my_model'])
+        # the daemon's own project and target apply to every command
+        self.assertEqual(parsed.project_dir, self.project_dir)
+        self.assertEqual(parsed.target, 'dev')
+
+    def test_parse_command_rejects_other_commands(self):
+        with self.assertRaises(RuntimeException):
+            self.task._parse_command(['seed'])
+
+    def test_parse_command_rejects_changed_state(self):
+        with self.assertRaises(RuntimeException):
+            self.task._parse_command(['run', '--target', 'prod'])
+        with self.assertRaises(RuntimeException):
+            self.task._parse_command(['run', '--vars', '{a: 1}'])
+        # matching the daemon is fine
+        self.task._parse_command(['run', '--target', 'dev'])
+
+    @mock.patch('dbt.main.DBTArgumentParser.print_usage')
+    def test_parse_command_invalid_arguments(self, print_usage):
+        with self.assertRaises(RuntimeException):
+            self.task._parse_command(['ls', '--not-an-argument'])
+
+    def test_handle_request_errors(self):
+        response = self.task.handle_request(b'{"method": "unknown"}\n')
+        self.assertIn(b'"success": false', response)
+        self.assertIn(b'Unknown daemon method', response)
+
+    def test_serve(self):
+        socket_path = self.path('daemon.sock')
+        self.task.args.socket = socket_path
+        self.task.refresh = mock.MagicMock()
+        self.task.run_command = mock.MagicMock(
+            side_effect=lambda args: {'success': True, 'results': args}
+        )
+
+        server = threading.Thread(target=self.task.run)
+        server.start()
+        try:
+            for _ in range(100):
+                if os.path.exists(socket_path):
+                    break
+                time.sleep(0.05)
+            client = DaemonClient(socket_path)
+            self.assertEqual(
+                client.command(['ls', '--select', 'a']),
+                {'success': True, 'results': ['ls', '--select', 'a']},
+            )
+            self.assertEqual(client.notify([self.path('models', 'a.sql')]), {'success': True})
+            self.assertEqual(self.task.changed_paths, [self.path('models', 'a.sql')])
+            self.assertEqual(client.shutdown(), {'success': True})
+        finally:
+            self.task.stopping = True
+            server.join(timeout=10)
+
+        self.assertFalse(server.is_alive())
+        self.assertFalse(os.path.exists(socket_path))
+        self.task.refresh.assert_called_once_with()
+
+
+class TestWorkingCopy(unittest.TestCase):
+    def test_updates_stay_in_copy(self):
+        node = mock.MagicMock(unique_id='model.test.a', original_file_path='models/a.sql')
+        manifest = Manifest(nodes={'model.test.a': node})
+        working = _working_copy(manifest)
+
+        replacement = mock.MagicMock(unique_id='model.test.a', original_file_path='models/a.sql')
+        working.update_node(replacement)
+        self.assertIs(working.nodes['model.test.a'], replacement)
+        self.assertIs(manifest.nodes['model.test.a'], node)
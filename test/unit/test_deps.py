@@ -1,3 +1,12 @@
+import functools
+import http.server
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import threading
 import unittest
 from unittest import mock
 
@@ -7,6 +16,10 @@ from dbt.deps.git import GitUnpinnedPackage
 from dbt.deps.local import LocalUnpinnedPackage
 from dbt.deps.registry import RegistryUnpinnedPackage
 from dbt.deps.resolver import resolve_packages
+from dbt.clients import git, registry
+from dbt.deps.cache import PackageCache
+from dbt.task.deps import DepsTask
+from dbt.utils import memoized
 from dbt.contracts.project import (
     LocalPackage,
     GitPackage,
@@ -596,3 +609,264 @@ class TestPackageSpec(unittest.TestCase):
         self.assertEqual(resolved[0].version, '0.1.3')
         self.assertEqual(resolved[1].name, 'dbt-labs-test/b')
         self.assertEqual(resolved[1].version, '0.2.1')
+
+
+class FakeRegistryHandler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        return super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _run_git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=dbt', '-c', 'user.email=dbt@example.com', *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+class TestDepsInstall(unittest.TestCase):
+    """Resolve and install packages from a registry served from a temporary
+    directory and from bare git repositories on disk.
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0),
+            functools.partial(FakeRegistryHandler, directory=self.root('registry')),
+        )
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = 'http://127.0.0.1:{}/'.format(self.server.server_address[1])
+
+        self.patchers = [
+            mock.patch('dbt.clients.registry.DEFAULT_REGISTRY_BASE_URL', self.url),
+            mock.patch('dbt.clients.registry.index_cached', memoized(registry.index)),
+            mock.patch(
+                'dbt.clients.registry._get_cached', memoized(registry._get_with_retries)
+            ),
+            mock.patch.object(DepsTask, 'track_package_install'),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tempdir)
+
+    def root(self, *parts):
+        path = os.path.join(self.tempdir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def write_project(self, path, name, packages):
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'dbt_project.yml'), 'w') as fp:
+            json.dump({'name': name, 'version': '1.0', 'config-version': 2}, fp)
+        with open(os.path.join(path, 'packages.yml'), 'w') as fp:
+            json.dump({'packages': packages}, fp)
+
+    def write_json(self, path, data):
+        with open(self.root('registry', 'api', 'v1', path), 'w') as fp:
+            json.dump(data, fp)
+
+    def add_hub_package(self, name, versions):
+        self.write_json('index.json', [f'dbt-labs-test/{name}'])
+        self.write_json(f'dbt-labs-test/{name}.json', {
+            'name': name, 'namespace': 'dbt-labs-test', 'versions': {v: {} for v in versions},
+        })
+        for version in versions:
+            source = self.root('sources', f'{name}-{version}')
+            self.write_project(source, name, [])
+            tarball = self.root('registry', 'tarballs', f'{name}-{version}.tar.gz')
+            with tarfile.open(tarball, 'w:gz') as tar:
+                tar.add(source, arcname=f'{name}-{version}')
+            self.write_json(f'dbt-labs-test/{name}/{version}.json', {
+                'id': f'dbt-labs-test/{name}/{version}',
+                'name': name,
+                'version': version,
+                'packages': [],
+                'downloads': {'tarball': f'{self.url}tarballs/{name}-{version}.tar.gz'},
+            })
+
+    def add_git_package(self, name, packages):
+        work = self.root('work', name)
+        self.write_project(work, name, packages)
+        _run_git(work, 'init', '-q')
+        _run_git(work, 'add', '.')
+        _run_git(work, 'commit', '-q', '-m', 'init')
+        bare = self.root('git', f'{name}.git')
+        _run_git(self.tempdir, 'clone', '-q', '--bare', work, bare)
+        return 'file://' + bare
+
+    def test_install(self):
+        self.add_hub_package('c', ['1.0.0', '1.1.0'])
+        hub = {'package': 'dbt-labs-test/c', 'version': '>=1.0.0'}
+        git_a = self.add_git_package('git_a', [hub])
+        git_b = self.add_git_package(
+            'git_b', [{'git': git_a, 'warn-unpinned': False}, hub]
+        )
+        packages = PackageConfig.from_dict({'packages': [
+            {'git': git_b, 'warn-unpinned': False},
+            {'package': 'dbt-labs-test/c', 'version': '<1.1.0'},
+        ]})
+        config = mock.MagicMock(
+            project_name='test',
+            packages_install_path=self.root('dbt_packages'),
+            cli_vars={},
+        )
+        config.packages = packages
+
+        DepsTask(mock.MagicMock(), config).run()
+
+        self.assertEqual(
+            sorted(os.listdir(self.root('dbt_packages'))), ['c', 'git_a', 'git_b']
+        )
+        with open(self.root('dbt_packages', 'c', 'dbt_project.yml')) as fp:
+            self.assertEqual(json.load(fp)['name'], 'c')
+        # every package resolved to c 1.0.0, which was only looked up once
+        self.assertEqual(self.server.requests.count('/api/v1/dbt-labs-test/c.json'), 1)
+        self.assertEqual(
+            self.server.requests.count('/api/v1/dbt-labs-test/c/1.0.0.json'), 1
+        )
+        self.assertEqual(self.server.requests.count('/tarballs/c-1.0.0.tar.gz'), 1)
+
+    def install_with_cache(self, packages, install_dir):
+        config = mock.MagicMock(
+            project_name='test',
+            packages_install_path=self.root(install_dir),
+            cli_vars={},
+        )
+        config.packages = PackageConfig.from_dict({'packages': packages})
+        env = {'DBT_PACKAGE_CACHE_DIR': self.root('cache')}
+        with mock.patch.dict(os.environ, env), \
+                mock.patch('dbt.deps.git.git.clone_and_checkout',
+                           wraps=git.clone_and_checkout) as clone:
+            DepsTask(mock.MagicMock(), config).run()
+        return clone.call_count
+
+    def test_install_from_cache(self):
+        self.add_hub_package('c', ['1.0.0'])
+        git_a = self.add_git_package('git_a', [])
+        packages = [
+            {'git': git_a, 'warn-unpinned': False},
+            {'package': 'dbt-labs-test/c', 'version': '1.0.0'},
+        ]
+
+        self.assertGreater(self.install_with_cache(packages, 'first'), 0)
+        # the second project installs both packages from the cache
+        self.assertEqual(self.install_with_cache(packages, 'second'), 0)
+        self.assertEqual(self.server.requests.count('/tarballs/c-1.0.0.tar.gz'), 1)
+        for name in ('c', 'git_a'):
+            installed = self.root('second', name, 'dbt_project.yml')
+            with open(installed) as fp:
+                self.assertEqual(json.load(fp)['name'], name)
+            # installed by hard link
+            self.assertGreater(os.stat(installed).st_nlink, 1)
+
+        # a modified cache entry is discarded, and the package downloaded again
+        with open(self.root('second', 'c', 'dbt_project.yml'), 'a') as fp:
+            fp.write('\n')
+        self.install_with_cache(packages, 'third')
+        self.assertEqual(self.server.requests.count('/tarballs/c-1.0.0.tar.gz'), 2)
+        with open(self.root('third', 'c', 'dbt_project.yml')) as fp:
+            self.assertEqual(json.load(fp)['name'], 'c')
+
+
+class TestPackageCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.cache = PackageCache(os.path.join(self.tempdir, 'cache'), max_size=250)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def make_package(self, name, size):
+        path = os.path.join(self.tempdir, name)
+        os.makedirs(os.path.join(path, 'macros'))
+        with open(os.path.join(path, 'macros', 'a.sql'), 'w') as fp:
+            fp.write('x' * size)
+        return path
+
+    def test_get_put(self):
+        self.assertIsNone(self.cache.get(('hub', 'a', '1.0')))
+        self.cache.put(('hub', 'a', '1.0'), self.make_package('a', 10))
+        tree = self.cache.get(('hub', 'a', '1.0'))
+        with open(os.path.join(tree, 'macros', 'a.sql')) as fp:
+            self.assertEqual(fp.read(), 'x' * 10)
+        self.assertIsNone(self.cache.get(('hub', 'a', '1.1')))
+
+        dest = os.path.join(self.tempdir, 'installed')
+        self.assertTrue(self.cache.install(tree, dest))
+        with open(os.path.join(dest, 'macros', 'a.sql')) as fp:
+            self.assertEqual(fp.read(), 'x' * 10)
+
+    def test_install_removed_entry(self):
+        self.cache.put(('hub', 'a', '1.0'), self.make_package('a', 10))
+        tree = self.cache.get(('hub', 'a', '1.0'))
+        entry_path = os.path.dirname(tree)
+        dest = os.path.join(self.tempdir, 'installed')
+        link = os.link
+
+        def link_then_remove(src, dst):
+            # another process evicts the entry while this one installs it
+            link(src, dst)
+            self.cache._remove(entry_path)
+
+        with mock.patch('os.link', side_effect=link_then_remove):
+            self.assertFalse(self.cache.install(tree, dest))
+        self.assertFalse(os.path.exists(dest))
+        # or before this one started
+        self.assertFalse(self.cache.install(tree, dest))
+        self.assertFalse(os.path.exists(dest))
+        self.assertEqual(os.listdir(self.cache.path), [])
+
+    def test_corrupt_entry(self):
+        self.cache.put(('hub', 'a', '1.0'), self.make_package('a', 10))
+        tree = self.cache.get(('hub', 'a', '1.0'))
+        os.remove(os.path.join(tree, 'macros', 'a.sql'))
+        self.assertIsNone(self.cache.get(('hub', 'a', '1.0')))
+        # and the entry is gone
+        self.assertEqual(os.listdir(self.cache.path), [])
+
+    def test_evict_least_recently_used(self):
+        self.cache.put(('hub', 'a', '1.0'), self.make_package('a', 100))
+        self.cache.put(('hub', 'b', '1.0'), self.make_package('b', 100))
+        for key, mtime in ((('hub', 'a', '1.0'), 2000), (('hub', 'b', '1.0'), 1000)):
+            manifest = os.path.join(self.cache._entry_path(key), 'manifest.json')
+            os.utime(manifest, (mtime, mtime))
+
+        self.cache.put(('hub', 'c', '1.0'), self.make_package('c', 100))
+        self.assertIsNotNone(self.cache.get(('hub', 'a', '1.0')))
+        self.assertIsNone(self.cache.get(('hub', 'b', '1.0')))
+        self.assertIsNotNone(self.cache.get(('hub', 'c', '1.0')))
+        self.assertEqual(len(os.listdir(self.cache.path)), 2)
+
+
+class TestResolveRevision(unittest.TestCase):
+    def test_resolve_revision(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            _run_git(tempdir, 'init', '-q', '-b', 'main', 'repo')
+            repo = os.path.join(tempdir, 'repo')
+            _run_git(repo, 'commit', '-q', '--allow-empty', '-m', 'one')
+            _run_git(repo, 'tag', '-a', 'v1', '-m', 'v1')
+            _run_git(repo, 'commit', '-q', '--allow-empty', '-m', 'two')
+            shas = subprocess.run(
+                ['git', 'rev-list', 'main'], cwd=repo, check=True, capture_output=True
+            ).stdout.decode('utf-8').split()
+
+            url = 'file://' + repo
+            self.assertEqual(git.resolve_revision(tempdir, url, 'main'), shas[0])
+            self.assertEqual(git.resolve_revision(tempdir, url, 'HEAD'), shas[0])
+            self.assertEqual(git.resolve_revision(tempdir, url, 'v1'), shas[1])
+            self.assertEqual(git.resolve_revision(tempdir, url, shas[1]), shas[1])
+            self.assertIsNone(git.resolve_revision(tempdir, url, 'missing'))
+        finally:
+            shutil.rmtree(tempdir)
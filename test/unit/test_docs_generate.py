@@ -1,9 +1,16 @@
 from datetime import datetime
 from decimal import Decimal
 from unittest import mock
+import os
+import tempfile
 import unittest
 
+import agate
+
+import dbt.exceptions
 import dbt.flags
+from dbt.clients import agate_helper
+from dbt.contracts.files import FileHash
 from dbt.task import generate
 
 
@@ -352,3 +359,158 @@ class GenerateTest(unittest.TestCase):
 
         self.mock_get_unique_id_mapping.assert_called_once_with(self.manifest)
         self.assertEqual(result, expected)
+
+
+def make_table(rows):
+    column_names = [
+        'table_database', 'table_schema', 'table_name', 'table_type',
+        'table_comment', 'table_owner', 'column_name', 'column_index',
+        'column_type', 'column_comment',
+    ]
+    return agate.Table(rows, column_names, agate_helper.DEFAULT_TYPE_TESTER)
+
+
+def make_relation(unique_id, schema, name, **kwargs):
+    return mock.MagicMock(
+        unique_id=unique_id,
+        database='dbt',
+        schema=schema,
+        identifier=name,
+        is_relational=True,
+        is_ephemeral_model=False,
+        checksum=FileHash.from_contents(unique_id),
+        description='',
+        columns={},
+        **kwargs
+    )
+
+
+class CatalogBuilderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'catalog.json')
+        self.manifest = mock.MagicMock()
+        self.manifest.nodes = {
+            'model.test.a': make_relation('model.test.a', 'analytics', 'a'),
+            'model.test.b': make_relation('model.test.b', 'analytics', 'b'),
+        }
+        self.manifest.sources = {
+            'source.test.raw.c': make_relation('source.test.raw.c', 'raw', 'c'),
+        }
+        for node in self.manifest.nodes.values():
+            node.config.to_dict.return_value = {'materialized': 'table'}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_add_table(self):
+        builder = generate.CatalogBuilder(self.manifest)
+        nodes, sources = builder.add_table(make_table([
+            ('dbt', 'analytics', 'a', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None),
+            ('dbt', 'analytics', 'a', 'BASE TABLE', None, 'me', 'name', 2, 'text', None),
+            ('dbt', 'analytics', 'not_in_project', 'VIEW', None, 'me', 'id', 1, 'integer', None),
+        ]))
+        self.assertEqual(list(nodes), ['model.test.a'])
+        self.assertEqual(list(nodes['model.test.a'].columns), ['id', 'name'])
+        self.assertEqual(sources, {})
+
+        nodes, sources = builder.add_table(make_table([
+            ('dbt', 'raw', 'c', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None),
+            # the same relation from a second query isn't added again
+            ('DBT', 'analytics', 'a', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None),
+        ]))
+        self.assertEqual(nodes, {})
+        self.assertEqual(list(sources), ['source.test.raw.c'])
+        self.assertEqual(set(builder.nodes), {'model.test.a'})
+        self.assertEqual(set(builder.sources), {'source.test.raw.c'})
+
+    def test_ambiguous_source(self):
+        builder = generate.CatalogBuilder(self.manifest)
+        builder.add_table(make_table([
+            ('dbt', 'raw', 'c', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None),
+        ]))
+        with self.assertRaises(dbt.exceptions.CompilationException):
+            builder.add_table(make_table([
+                ('dbt', 'raw', 'C', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None),
+            ]))
+
+    def test_writer_matches_artifact(self):
+        builder = generate.CatalogBuilder(self.manifest)
+        generated_at = datetime.utcnow()
+        with generate.CatalogWriter(self.path) as writer:
+            for rows in (
+                [('dbt', 'analytics', 'a', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None)],
+                [('dbt', 'analytics', 'b', 'VIEW', 'b!', 'me', 'id', 1, 'integer', 'id!')],
+                [('dbt', 'raw', 'c', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None)],
+            ):
+                nodes, sources = builder.add_table(make_table(rows))
+                writer.add(generate.serialize_tables(nodes), generate.serialize_tables(sources))
+            writer.write(generate.CatalogMetadata(generated_at=generated_at), ['oops'])
+
+        artifact_path = os.path.join(self.tmpdir.name, 'artifact.json')
+        generate.CatalogArtifact.from_results(
+            generated_at=generated_at,
+            nodes=builder.nodes,
+            sources=builder.sources,
+            compile_results=None,
+            errors=['oops'],
+        ).write(artifact_path)
+
+        with open(self.path) as fp, open(artifact_path) as artifact_fp:
+            self.assertEqual(fp.read(), artifact_fp.read())
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_shards(self):
+        shards_path = os.path.join(self.tmpdir.name, 'catalog_shards')
+        shards = generate.CatalogShards(shards_path, self.manifest)
+        analytics = ('dbt', 'analytics')
+        self.assertEqual(set(shards.fingerprints), {analytics, ('dbt', 'raw')})
+
+        table = {'metadata': {'name': 'a'}}
+        shards.save(analytics, {'model.test.a': table, 'model.test.b': table}, {})
+        # not every relation in the schema was found
+        shards.save(('dbt', 'raw'), {}, {})
+        with open(os.path.join(shards_path, 'left_over.json'), 'w') as fp:
+            fp.write('{}')
+        shards.remove_stale()
+        self.assertEqual(len(os.listdir(shards_path)), 2)
+
+        shards = generate.CatalogShards(shards_path, self.manifest)
+        self.assertEqual(shards.load(analytics)['nodes']['model.test.a'], table)
+        self.assertIsNone(shards.load(('dbt', 'raw')))
+
+        # a change to a model means querying its schema again
+        self.manifest.nodes['model.test.b'].checksum = FileHash.from_contents('changed')
+        shards = generate.CatalogShards(shards_path, self.manifest)
+        self.assertIsNone(shards.load(analytics))
+        shards.remove_stale()
+        self.assertEqual(os.listdir(shards_path), [])
+
+    def test_adapter_get_catalog_override(self):
+        task = generate.GenerateTask.__new__(generate.GenerateTask)
+        task.args = mock.MagicMock(compile=False, reuse_catalog_shards=True)
+        task.config = mock.MagicMock(target_path=self.tmpdir.name, asset_paths=[])
+        task.manifest = None
+        table = make_table([
+            ('dbt', 'analytics', 'a', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None),
+            ('dbt', 'raw', 'c', 'BASE TABLE', None, 'me', 'id', 1, 'integer', None),
+        ])
+
+        class CustomCatalogAdapter(mock.MagicMock):
+            def get_catalog(self, manifest):
+                self.catalog_manifest = manifest
+                return table, [RuntimeError('oops')]
+
+        adapter = CustomCatalogAdapter()
+
+        with mock.patch.object(generate.ManifestLoader, 'get_full_manifest', return_value=self.manifest), \
+                mock.patch.object(generate, 'get_adapter', return_value=adapter):
+            results = task.run()
+
+        self.assertIs(adapter.catalog_manifest, self.manifest)
+        adapter.iter_catalogs.assert_not_called()
+        self.assertEqual(list(results.nodes), ['model.test.a'])
+        self.assertEqual(list(results.sources), ['source.test.raw.c'])
+        self.assertEqual(results.errors, ['oops'])
+        # nor are its catalogs saved a schema at a time
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, 'catalog_shards')))
@@ -12,6 +12,9 @@ import dbt.events.functions as event_funcs
 import dbt.flags as flags
 from dbt.helper_types import Lazy
 import inspect
+import io
+import logging
+import threading
 import json
 from unittest import TestCase
 from dbt.contracts.graph.parsed import (
@@ -310,6 +313,9 @@ sample_values = [
     DepsUpdateAvailable(version_latest=''),
     DepsListSubdirectory(subdirectory=''),
     DepsNotifyUpdatesAvailable(packages=[]),
+    DepsCacheHit(path=''),
+    DepsCacheCorrupt(path='', reason=''),
+    DepsCacheEvicted(path='', size=0),
     DatabaseErrorRunning(hook_type=''),
     EmptyLine(),
     HooksRunning(num_hooks=0, hook_type=''),
@@ -320,6 +326,10 @@ sample_values = [
     BuildingCatalog(),
     CompileComplete(),
     FreshnessCheckComplete(),
+    FreshnessBatchesStart(num_sources=0, num_batches=0),
+    FreshnessBatchFailed(num_sources=0, exc=''),
+    TestBatchesStart(num_tests=0, num_batches=0),
+    TestBatchFailed(num_tests=0, exc=''),
     ServingDocsPort(address='', port=0),
     ServingDocsAccessInfo(port=''),
     ServingDocsExitInfo(),
@@ -414,6 +424,12 @@ sample_values = [
     IntegrationTestError(msg=''),
     IntegrationTestException(msg=''),
     EventBufferFull(),
+    DaemonListening(path=''),
+    DaemonRunningCommand(args=[]),
+    DaemonFilesChanged(paths=[]),
+    DaemonCommandFailed(exc=''),
+    FastJsonUnavailable(),
+    ArtifactWriteFailed(exc=''),
     UnitTestInfo(msg=''),
 ]
 
@@ -596,3 +612,90 @@ class TestLazyMemoizationInCacheEventsJSON(TestCase):
 
     def test_all_cache_events_are_lazy_JSON(self):
         all_cache_events_are_lazy(self)
+
+
+class TestAsyncEventWriter(TestCase):
+
+    def setUp(self):
+        flags.EVENT_BUFFER_SIZE = 100000
+        reload(event_funcs)
+        self.file_buf = io.StringIO()
+        self.stdout_buf = io.StringIO()
+        event_funcs.FILE_LOG = self.make_logger('test_async_file', self.file_buf, logging.DEBUG)
+        event_funcs.STDOUT_LOG = self.make_logger('test_async_stdout', self.stdout_buf, logging.INFO)
+        event_funcs.EVENT_WRITER = event_funcs.AsyncEventWriter(queue_size=4, batch_size=3)
+
+    def tearDown(self):
+        event_funcs.stop_event_writer()
+        reload(event_funcs)
+
+    def make_logger(self, name, buf, level):
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.handlers = [logging.StreamHandler(buf)]
+        return logger
+
+    def test_events_are_written_in_order(self):
+        for n in range(10):
+            event_funcs.fire_event(UnitTestInfo(msg=f'Test Event {n}'))
+            event_funcs.fire_event(GenericTestFileParse(path=f'file_{n}.sql'))
+        event_funcs.flush_event_writer()
+
+        stdout_lines = self.stdout_buf.getvalue().splitlines()
+        self.assertEqual(len(stdout_lines), 10)
+        for n, line in enumerate(stdout_lines):
+            self.assertTrue(line.endswith(f'Unit Test: Test Event {n}'))
+
+        file_lines = self.file_buf.getvalue().splitlines()
+        self.assertEqual(len(file_lines), 10)
+        for n, line in enumerate(file_lines):
+            self.assertTrue(line.endswith(f'Parsing file_{n}.sql'))
+            self.assertIn('[MainThread]', line)
+
+    def test_thread_name_is_from_firing_thread(self):
+        thread = threading.Thread(
+            target=event_funcs.fire_event,
+            args=(GenericTestFileParse(path='file.sql'),),
+            name='Thread-42',
+        )
+        thread.start()
+        thread.join()
+        event_funcs.stop_event_writer()
+        self.assertIsNone(event_funcs.EVENT_WRITER)
+        self.assertIn('[Thread-42 ]: Parsing file.sql', self.file_buf.getvalue())
+
+    def test_events_are_formatted_when_fired(self):
+        flags.LOG_CACHE_EVENTS = True
+        try:
+            graph = {'analytics.a': []}
+            event_funcs.fire_event(DumpBeforeAddGraph(dump=Lazy.defer(lambda: dict(graph))))
+            graph['analytics.b'] = []
+        finally:
+            flags.LOG_CACHE_EVENTS = False
+        event_funcs.flush_event_writer()
+        self.assertIn("before adding : {'analytics.a': []}", self.file_buf.getvalue())
+
+    def test_secrets_are_scrubbed(self):
+        event_funcs.log_secrets = ['hunter2']
+        event_funcs.fire_event(UnitTestInfo(msg='password is hunter2'))
+        event_funcs.flush_event_writer()
+        self.assertIn('password is *****', self.stdout_buf.getvalue())
+
+
+class TestSendToLogger(TestCase):
+
+    def test_levels(self):
+        import logbook
+        buf = io.StringIO()
+        logger = logging.getLogger('test_send_to_logger')
+        logger.setLevel(logging.INFO)
+        logger.handlers = [logging.StreamHandler(buf)]
+        for level_tag in ('test', 'debug', 'info', 'warn', 'error'):
+            event_funcs.send_to_logger(logger, level_tag, f'{level_tag} line')
+        self.assertEqual(buf.getvalue().splitlines(), ['info line', 'warn line', 'error line'])
+        with self.assertRaises(AssertionError):
+            event_funcs.send_to_logger(logger, 'loud', 'line')
+
+        with logbook.TestHandler(level=logbook.DEBUG) as handler:
+            event_funcs.send_to_logger(logbook.Logger('test'), 'warn', 'warn line')
+        self.assertEqual([r.level for r in handler.records], [logbook.WARNING])
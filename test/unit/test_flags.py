@@ -94,6 +94,21 @@ class TestFlags(TestCase):
         delattr(self.args, 'partial_parse')
         self.user_config.partial_parse = False
 
+        # file_hash_cache
+        self.user_config.file_hash_cache = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.FILE_HASH_CACHE, True)
+        os.environ['DBT_FILE_HASH_CACHE'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.FILE_HASH_CACHE, False)
+        setattr(self.args, 'file_hash_cache', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.FILE_HASH_CACHE, True)
+        # cleanup
+        os.environ.pop('DBT_FILE_HASH_CACHE')
+        delattr(self.args, 'file_hash_cache')
+        self.user_config.file_hash_cache = None
+
         # use_colors
         self.user_config.use_colors = True
         flags.set_from_args(self.args, self.user_config)
@@ -224,3 +239,86 @@ class TestFlags(TestCase):
         self.assertEqual(flags.QUIET, True)
         # cleanup
         self.user_config.quiet = None
+
+        # async_logging
+        self.user_config.async_logging = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ASYNC_LOGGING, True)
+        os.environ['DBT_ASYNC_LOGGING'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ASYNC_LOGGING, False)
+        setattr(self.args, 'async_logging', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ASYNC_LOGGING, True)
+        # cleanup
+        os.environ.pop('DBT_ASYNC_LOGGING')
+        delattr(self.args, 'async_logging')
+        self.user_config.async_logging = None
+
+        # scheduling_mode
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.SCHEDULING_MODE, 'depth')
+        self.user_config.scheduling_mode = 'critical-path'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.SCHEDULING_MODE, 'critical-path')
+        os.environ['DBT_SCHEDULING_MODE'] = 'depth'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.SCHEDULING_MODE, 'depth')
+        setattr(self.args, 'scheduling_mode', 'critical-path')
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.SCHEDULING_MODE, 'critical-path')
+        # cleanup
+        os.environ.pop('DBT_SCHEDULING_MODE')
+        delattr(self.args, 'scheduling_mode')
+        self.user_config.scheduling_mode = None
+
+        # strict_validation
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STRICT_VALIDATION, False)
+        self.user_config.strict_validation = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STRICT_VALIDATION, True)
+        os.environ['DBT_STRICT_VALIDATION'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STRICT_VALIDATION, False)
+        setattr(self.args, 'strict_validation', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STRICT_VALIDATION, True)
+        # cleanup
+        os.environ.pop('DBT_STRICT_VALIDATION')
+        delattr(self.args, 'strict_validation')
+        self.user_config.strict_validation = None
+
+        # fast_json
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.FAST_JSON, False)
+        self.user_config.fast_json = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.FAST_JSON, True)
+        os.environ['DBT_FAST_JSON'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.FAST_JSON, False)
+        setattr(self.args, 'fast_json', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.FAST_JSON, True)
+        # cleanup
+        os.environ.pop('DBT_FAST_JSON')
+        delattr(self.args, 'fast_json')
+        self.user_config.fast_json = None
+
+        # stream_results
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STREAM_RESULTS, False)
+        self.user_config.stream_results = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STREAM_RESULTS, True)
+        os.environ['DBT_STREAM_RESULTS'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STREAM_RESULTS, False)
+        setattr(self.args, 'stream_results', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.STREAM_RESULTS, True)
+        # cleanup
+        os.environ.pop('DBT_STREAM_RESULTS')
+        delattr(self.args, 'stream_results')
+        self.user_config.stream_results = None
@@ -0,0 +1,86 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from dbt.adapters.postgres import Plugin
+from dbt.contracts.results import FreshnessStatus
+from dbt.task.freshness import FreshnessRunner, FreshnessTask
+
+from .utils import batched_task, clear_plugin
+
+
+def make_source(name, schema, database='dbt'):
+    return SimpleNamespace(
+        unique_id=f'source.test.{schema}.{name}',
+        database=database,
+        schema=schema,
+        loaded_at_field='loaded_at',
+        freshness=SimpleNamespace(filter=None),
+    )
+
+
+def make_task(sources, batch_size=None):
+    manifest = SimpleNamespace(sources={source.unique_id: source for source in sources})
+    return batched_task(FreshnessTask, manifest, batch_size)
+
+
+class TestFreshnessBatches(unittest.TestCase):
+    def setUp(self):
+        self.sources = [
+            make_source('a', 'raw'),
+            make_source('b', 'RAW'),
+            make_source('c', 'raw'),
+            make_source('d', 'other'),
+        ]
+        self.addCleanup(clear_plugin, Plugin)
+
+    def test_batches_by_schema(self):
+        task = make_task(self.sources, batch_size=2)
+        batches = task.get_freshness_batches({s.unique_id for s in self.sources})
+        self.assertEqual(
+            sorted([source.unique_id for source in batch] for batch in batches),
+            [
+                ['source.test.RAW.b', 'source.test.raw.a'],
+                ['source.test.other.d'],
+                ['source.test.raw.c'],
+            ],
+        )
+
+    def test_failed_batch_is_left_out(self):
+        task = make_task(self.sources, batch_size=2)
+        adapter = mock.MagicMock()
+
+        def calculate_freshness_batch(sources, manifest):
+            if len(sources) == 2:
+                raise RuntimeError('relation "raw.a" does not exist')
+            return [{'age': 1.0}]
+
+        adapter.calculate_freshness_batch.side_effect = calculate_freshness_batch
+        freshness = task.calculate_batched_freshness(
+            adapter, {s.unique_id for s in self.sources}
+        )
+        self.assertEqual(
+            freshness,
+            {'source.test.raw.c': {'age': 1.0}, 'source.test.other.d': {'age': 1.0}},
+        )
+        self.assertEqual(adapter.calculate_freshness_batch.call_count, 3)
+
+
+class TestFreshnessRunner(unittest.TestCase):
+    def test_uses_batched_freshness(self):
+        adapter = mock.MagicMock()
+        node = mock.MagicMock(loaded_at_field='loaded_at')
+        node.freshness.status.return_value = FreshnessStatus.Pass
+        runner = FreshnessRunner(mock.MagicMock(), adapter, node, 1, 1)
+        runner.batched_freshness = {
+            'max_loaded_at': None,
+            'snapshotted_at': None,
+            'age': 12.0,
+        }
+
+        result = runner.execute(node, mock.MagicMock())
+
+        adapter.calculate_freshness.assert_not_called()
+        node.freshness.status.assert_called_once_with(12.0)
+        self.assertEqual(result.status, FreshnessStatus.Pass)
+        self.assertEqual(result.age, 12.0)
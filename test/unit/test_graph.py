@@ -58,13 +58,15 @@ class GraphTest(unittest.TestCase):
         self.mock_models = []  # used by filesystem_searcher
 
         # Create file filesystem searcher
-        self.filesystem_search = patch('dbt.parser.read_files.filesystem_search')
-        def mock_filesystem_search(project, relative_dirs, extension):
-            if 'sql' not in extension:
-                return []
-            if 'models' not in relative_dirs:
-                return []
-            return [model.path for model in self.mock_models]
+        self.filesystem_search = patch('dbt.parser.read_files.filesystem_search_multi')
+        def mock_filesystem_search(project, searches):
+            results = {}
+            for key, (relative_dirs, extensions) in searches.items():
+                if '.sql' not in extensions or 'models' not in relative_dirs:
+                    results[key] = []
+                else:
+                    results[key] = [model.path for model in self.mock_models]
+            return results
         self.mock_filesystem_search = self.filesystem_search.start()
         self.mock_filesystem_search.side_effect = mock_filesystem_search
 
@@ -98,7 +100,7 @@ class GraphTest(unittest.TestCase):
         # Create the source file patcher
         self.load_source_file_patcher = patch('dbt.parser.read_files.load_source_file')
         self.mock_source_file = self.load_source_file_patcher.start()
-        def mock_load_source_file(path, parse_file_type, project_name, saved_files):
+        def mock_load_source_file(path, parse_file_type, project_name, saved_files, hash_cache=None):
             for sf in self.mock_models:
                 if sf.path == path:
                     source_file = sf
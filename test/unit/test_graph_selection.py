@@ -3,6 +3,7 @@ from unittest import mock
 
 import pytest
 
+import random
 import string
 import dbt.exceptions
 import dbt.graph.selector as graph_selector
@@ -195,3 +196,96 @@ invalid_specs = [
 def test_invalid_specs(invalid):
     with pytest.raises(dbt.exceptions.RuntimeException):
         graph_selector.SelectionCriteria.from_single_spec(invalid)
+
+
+def test_subset_graph_keeps_transitive_edges():
+    graph = _get_graph()
+    subset = graph.get_subset_graph(['m.X.a', 'm.Y.d', 'm.X.e', 'm.X.c'])
+    assert set(subset.graph.nodes()) == {'m.X.a', 'm.Y.d', 'm.X.e', 'm.X.c'}
+    assert set(subset.edges()) == {('m.X.a', 'm.Y.d'), ('m.X.a', 'm.X.e'), ('m.X.a', 'm.X.c')}
+    # the original graph is unchanged
+    assert len(graph.graph) == 7
+
+
+def test_subset_graph_does_not_skip_selected_nodes():
+    graph = graph_selector.Graph(nx.DiGraph([('a', 'b'), ('b', 'c'), ('a', 'x'), ('x', 'c')]))
+    subset = graph.get_subset_graph(['a', 'b', 'c'])
+    # a -> c through x, but not through b
+    assert set(subset.edges()) == {('a', 'b'), ('b', 'c'), ('a', 'c')}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_subset_graph_matches_elimination(seed):
+    rng = random.Random(seed)
+    integer_graph = nx.gnp_random_graph(60, 0.08, seed=seed, directed=True)
+    dag = nx.DiGraph([(u, v) for u, v in integer_graph.edges() if u < v])
+    dag.add_nodes_from(integer_graph)
+    graph = graph_selector.Graph(dag)
+    selected = set(rng.sample(list(dag), 15))
+
+    subset = graph.get_subset_graph(selected)
+    expected = graph._get_subset_graph_by_elimination(selected)
+    assert set(subset.graph.nodes()) == selected
+    assert set(subset.edges()) == set(expected.edges())
+
+
+def test_subset_graph_with_cycle():
+    graph = graph_selector.Graph(nx.DiGraph([('a', 'x'), ('x', 'b'), ('b', 'x')]))
+    subset = graph.get_subset_graph(['a', 'b'])
+    assert set(subset.edges()) == {('a', 'b')}
+
+
+def test_subset_graph_missing_node():
+    with pytest.raises(ValueError):
+        _get_graph().get_subset_graph(['m.X.a', 'm.X.missing'])
+
+
+def _per_node_relatives(graph, selected, max_depth, reverse):
+    relatives = set()
+    for node in selected:
+        if reverse:
+            relatives.update(graph.ancestors(node, max_depth))
+        else:
+            relatives.update(graph.descendants(node, max_depth))
+    return relatives
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('max_depth', [None, 0, 1, 3])
+def test_select_relatives_matches_per_node_search(seed, max_depth):
+    rng = random.Random(seed)
+    integer_graph = nx.gnp_random_graph(80, 0.05, seed=seed, directed=True)
+    dag = nx.DiGraph([(u, v) for u, v in integer_graph.edges() if u < v])
+    dag.add_nodes_from(integer_graph)
+    graph = graph_selector.Graph(dag)
+    selected = set(rng.sample(list(dag), 10))
+
+    assert graph.select_parents(selected, max_depth) == _per_node_relatives(
+        graph, selected, max_depth, reverse=True
+    )
+    assert graph.select_children(selected, max_depth) == _per_node_relatives(
+        graph, selected, max_depth, reverse=False
+    )
+
+
+def test_select_parents_includes_selected_ancestors():
+    graph = _get_graph()
+    assert graph.select_parents({'m.X.a', 'm.Y.d'}) == {'m.X.a', 'm.Y.b'}
+    assert graph.select_children({'m.X.a', 'm.Y.b'}, 1) == {'m.Y.b', 'm.X.c', 'm.Y.d', 'm.X.e'}
+
+
+def test_select_parents_missing_node():
+    with pytest.raises(dbt.exceptions.InternalException):
+        _get_graph().select_parents({'m.X.missing'})
+
+
+def test_select_relatives_in_subgraph():
+    graph = _get_graph()
+    # without m.Y.b, m.Y.d and m.X.e aren't reachable from m.X.a
+    subgraph = graph.subgraph(['m.X.a', 'm.X.c', 'm.Y.d', 'm.X.e', 'm.Y.f', 'm.X.g'])
+    assert subgraph.select_children({'m.X.a', 'm.X.e'}) == {'m.X.c', 'm.Y.f', 'm.X.g'}
+    assert subgraph.select_parents({'m.Y.d', 'm.Y.f'}) == {'m.X.a', 'm.X.c'}
+    # the parent graph's index is shared, and not restricted
+    assert graph.select_children({'m.X.a', 'm.X.e'}) == {'m.Y.b', 'm.X.c', 'm.Y.d', 'm.X.e', 'm.Y.f', 'm.X.g'}
+    with pytest.raises(dbt.exceptions.InternalException):
+        subgraph.select_parents({'m.Y.b', 'm.Y.f'})
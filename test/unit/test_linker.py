@@ -1,3 +1,4 @@
+import json
 import os
 import tempfile
 import unittest
@@ -9,6 +10,8 @@ try:
 except ImportError:
     from Queue import Empty
 
+from dbt.exceptions import RuntimeException
+from dbt.graph.queue import SchedulingMode, load_execution_times
 from dbt.graph.selector import NodeSelector
 from dbt.graph.cli import parse_difference
 
@@ -63,11 +66,11 @@ class LinkerTest(unittest.TestCase):
         """test join() without timeout risk"""
         self.assertEqual(queue.inner.unfinished_tasks, 0)
 
-    def _get_graph_queue(self, manifest, include=None, exclude=None):
+    def _get_graph_queue(self, manifest, include=None, exclude=None, **kwargs):
         graph = compilation.Graph(self.linker.graph)
         selector = NodeSelector(graph, manifest)
         spec = parse_difference(include, exclude)
-        return selector.get_graph_queue(spec)
+        return selector.get_graph_queue(spec, **kwargs)
 
     def test_linker_add_dependency(self):
         actual_deps = [('A', 'B'), ('A', 'C'), ('B', 'C')]
@@ -165,6 +168,75 @@ class LinkerTest(unittest.TestCase):
         queue_2.mark_done('A')
         self.assert_would_join(queue_2)
 
+    def test_graph_is_not_modified(self):
+        self.linker.dependency('A', 'B')
+        self.linker.dependency('A', 'C')
+        self.linker.dependency('B', 'C')
+
+        queue = self._get_graph_queue(_mock_manifest('ABC'))
+        for expected in 'CBA':
+            self.assertEqual(len(queue), 3 - 'CBA'.index(expected))
+            got = queue.get(block=False)
+            self.assertEqual(got.unique_id, expected)
+            queue.mark_done(expected)
+        self.assertTrue(queue.empty())
+        self.assert_would_join(queue)
+        self.assertEqual(set(queue.graph.nodes()), {'A', 'B', 'C'})
+        self.assertEqual(len(queue.graph.edges()), 3)
+
+    def _add_chain_and_single_node(self):
+        # 'A' has no dependencies, 'Z' heads the chain Z -> Y -> W
+        self.linker.add_node('A')
+        self.linker.dependency('Y', 'Z')
+        self.linker.dependency('W', 'Y')
+
+    def test_depth_scheduling(self):
+        self._add_chain_and_single_node()
+        queue = self._get_graph_queue(_mock_manifest('AZYW'))
+        self.assertEqual(queue.get(block=False).unique_id, 'A')
+        self.assertEqual(queue.get(block=False).unique_id, 'Z')
+
+    def test_critical_path_scheduling(self):
+        self._add_chain_and_single_node()
+        queue = self._get_graph_queue(
+            _mock_manifest('AZYW'), scheduling_mode=SchedulingMode.CriticalPath
+        )
+        self.assertEqual(queue.get(block=False).unique_id, 'Z')
+        self.assertEqual(queue.get(block=False).unique_id, 'A')
+        queue.mark_done('Z')
+        queue.mark_done('A')
+        self.assertEqual(queue.get(block=False).unique_id, 'Y')
+
+    def test_critical_path_scheduling_with_execution_times(self):
+        self._add_chain_and_single_node()
+        # 'A' takes longer than the whole chain
+        queue = self._get_graph_queue(
+            _mock_manifest('AZYW'),
+            scheduling_mode=SchedulingMode.CriticalPath,
+            execution_times={'A': 100.0, 'Z': 1.0, 'Y': 1.0, 'W': 1.0},
+        )
+        self.assertEqual(queue.get(block=False).unique_id, 'A')
+        self.assertEqual(queue.get(block=False).unique_id, 'Z')
+
+    def test_scheduling_mode_from_flag(self):
+        self.assertEqual(SchedulingMode.from_flag('critical-path'), SchedulingMode.CriticalPath)
+        with self.assertRaisesRegex(RuntimeException, "expected one of 'depth', 'critical-path'"):
+            SchedulingMode.from_flag('critical_path')
+
+    def test_load_execution_times(self):
+        run_results = {
+            'results': [
+                {'unique_id': 'model.pkg.a', 'execution_time': 1.5},
+                {'unique_id': 'model.pkg.b', 'execution_time': None},
+            ]
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'run_results.json')
+            self.assertEqual(load_execution_times(path), {})
+            with open(path, 'w') as fp:
+                json.dump(run_results, fp)
+            self.assertEqual(load_execution_times(path), {'model.pkg.a': 1.5})
+
     def test__find_cycles__cycles(self):
         actual_deps = [('A', 'B'), ('B', 'C'), ('C', 'A')]
 
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+import unittest
+
+import dbt.main
+from dbt.task.build import BuildTask
+from dbt.task.list import ListTask
+from dbt.task.run import RunTask
+
+
+class TestLazyTasks(unittest.TestCase):
+    def test_import_does_not_load_tasks(self):
+        # run in a fresh interpreter, since this one has already imported them
+        code = (
+            'import sys, dbt.main; '
+            'print(sorted(m for m in sys.modules '
+            'if m.startswith(("dbt.task.", "dbt.adapters.factory", "dbt.config"))))'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(output.strip(), b'[]')
+
+    def test_parse_args_loads_task(self):
+        parsed = dbt.main.parse_args(['run'])
+        self.assertIs(parsed.cls, RunTask)
+
+    def test_resource_values_match_tasks(self):
+        self.assertEqual(dbt.main.BUILD_RESOURCE_VALUES, BuildTask.ALL_RESOURCE_VALUES)
+        self.assertEqual(dbt.main.LIST_RESOURCE_VALUES, ListTask.ALL_RESOURCE_VALUES)
@@ -1,4 +1,6 @@
+import json
 import os
+import tempfile
 import unittest
 from unittest import mock
 
@@ -10,6 +12,7 @@ from datetime import datetime
 import pytest
 
 import dbt.flags
+import dbt.utils
 import dbt.version
 from dbt import tracking
 from dbt.contracts.files import FileHash
@@ -411,6 +414,84 @@ class ManifestTest(unittest.TestCase):
         for node in flat_nodes.values():
             self.assertEqual(frozenset(node), REQUIRED_PARSED_NODE_KEYS)
 
+    def test__flat_graph_is_lazy(self):
+        nodes = copy.copy(self.nested_nodes)
+        manifest = Manifest(nodes=nodes, sources={}, macros={}, docs={},
+                            disabled={}, files={}, exposures={},
+                            metrics={}, selectors={})
+        with mock.patch.object(ParsedModelNode, 'to_dict', autospec=True) as to_dict:
+            to_dict.side_effect = lambda node, omit_none: {'unique_id': node.unique_id}
+            manifest.build_flat_graph()
+            flat_nodes = manifest.flat_graph['nodes']
+            to_dict.assert_not_called()
+            self.assertIn('model.root.dep', flat_nodes)
+            self.assertEqual(len(flat_nodes), len(self.nested_nodes))
+            to_dict.assert_not_called()
+
+            dep = flat_nodes['model.root.dep']
+            self.assertEqual(dep, {'unique_id': 'model.root.dep'})
+            # the dict is kept for the next read
+            self.assertIs(flat_nodes['model.root.dep'], dep)
+            self.assertEqual(to_dict.call_count, 1)
+
+        # replacing a node in the manifest later doesn't change the graph
+        manifest.update_node(self.nested_nodes['model.root.sibling'].replace(tags=['new']))
+        self.assertEqual(flat_nodes['model.root.sibling']['tags'], [])
+        with self.assertRaises(TypeError):
+            flat_nodes['model.root.dep'] = {}
+
+    def test__flat_graph_not_serialized(self):
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources={}, macros={},
+                            docs={}, disabled={}, files={}, exposures={},
+                            metrics={}, selectors={})
+        manifest.build_flat_graph()
+        loaded = Manifest.from_msgpack(manifest.to_msgpack())
+        self.assertEqual(loaded.flat_graph, {})
+        self.assertEqual(set(loaded.nodes), set(self.nested_nodes))
+
+    def _manifest_to_write(self):
+        nodes = copy.copy(self.nested_nodes)
+        compiled = CompiledModelNode.from_parsed(nodes['model.root.multi'])
+        compiled.compiled = True
+        compiled.compiled_sql = 'select 1'
+        compiled._pre_injected_sql = 'select 1'
+        nodes['model.root.multi'] = compiled
+        disabled = {'model.root.dep': [self.nested_nodes['model.root.dep']]}
+        return Manifest(
+            nodes=nodes, sources=copy.copy(self.sources), macros={}, docs={},
+            disabled=disabled, files={}, exposures=copy.copy(self.exposures),
+            metrics=copy.copy(self.metrics),
+            selectors={'nightly': {'name': 'nightly', 'definition': 'tag:nightly'}},
+            metadata=ManifestMetadata(generated_at=datetime.utcnow()),
+        )
+
+    def test__write(self):
+        manifest = self._manifest_to_write()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'manifest.json')
+            manifest.write(path)
+            self.assertEqual(os.listdir(tmpdir), ['manifest.json'])
+            with open(path) as fp:
+                written = fp.read()
+        # byte for byte what serializing the whole manifest at once writes
+        expected = json.dumps(
+            manifest.writable_manifest().to_dict(omit_none=False), cls=dbt.utils.JSONEncoder
+        )
+        self.assertEqual(written, expected)
+
+    @unittest.skipUnless(dbt.utils.fast_json_available(), 'orjson is not installed')
+    def test__write_fast_json(self):
+        manifest = self._manifest_to_write()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'manifest.json')
+            manifest.write(path, fast_json=True)
+            with open(path) as fp:
+                written = json.load(fp)
+        expected = json.loads(json.dumps(
+            manifest.writable_manifest().to_dict(omit_none=False), cls=dbt.utils.JSONEncoder
+        ))
+        self.assertEqual(written, expected)
+
     @mock.patch.object(tracking, 'active_user')
     def test_metadata(self, mock_user):
         mock_user.id = 'cfc9500f-dc7f-4c83-9ea7-2c581c1b38cf'
@@ -78,6 +78,9 @@ class TestLoader(unittest.TestCase):
             {'root': self.root_project_config}
         )
 
+    def tearDown(self):
+        self.load_state_check.stop()
+
     def _new_manifest(self):
         state_check = ManifestStateCheck(MatchingHash(), MatchingHash, [])
         manifest = Manifest({}, {}, {}, {}, {}, {}, [], {})
@@ -101,3 +104,40 @@ class TestLoader(unittest.TestCase):
             project_root=normalize(self.root_project_config.project_root),
         )
         return SourceFile(path=path, checksum=checksum)
+
+    def _state_check(self, vars='vars'):
+        return ManifestStateCheck(
+            vars_hash=FileHash.from_contents(vars),
+            project_env_vars_hash=FileHash.from_contents(''),
+            profile_env_vars_hash=FileHash.from_contents(''),
+            profile_hash=FileHash.from_contents('profile'),
+            project_hashes={'root': FileHash.from_contents('root')},
+        )
+
+    def _loader_with_saved_manifest(self, saved_manifest):
+        self.mock_state_check.side_effect = None
+        self.mock_state_check.return_value = self._state_check()
+        return manifest.ManifestLoader(
+            self.root_project_config,
+            {'root': self.root_project_config},
+            saved_manifest=saved_manifest,
+        )
+
+    @patch('dbt.flags.PARTIAL_PARSE', True)
+    @patch('dbt.parser.manifest.read_partial_parse_file')
+    def test_partial_parse_from_manifest_in_memory(self, mock_read):
+        saved_manifest = Manifest()
+        saved_manifest.state_check = self._state_check()
+        loader = self._loader_with_saved_manifest(saved_manifest)
+        self.assertIs(loader.saved_manifest, saved_manifest)
+        mock_read.assert_not_called()
+
+    @patch('dbt.flags.PARTIAL_PARSE', True)
+    @patch('dbt.tracking.track_partial_parser')
+    @patch('dbt.parser.manifest.read_partial_parse_file')
+    def test_changed_vars_reject_manifest_in_memory(self, mock_read, mock_track):
+        saved_manifest = Manifest()
+        saved_manifest.state_check = self._state_check(vars='other vars')
+        loader = self._loader_with_saved_manifest(saved_manifest)
+        self.assertIsNone(loader.saved_manifest)
+        mock_read.assert_not_called()
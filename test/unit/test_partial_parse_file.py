@@ -0,0 +1,263 @@
+import os
+import shutil
+import threading
+import time
+import unittest
+from tempfile import mkdtemp
+from unittest import mock
+
+from dbt.contracts.files import ParseFileType, SourceFile, SchemaSourceFile, FilePath, FileHash
+from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.parsed import ParsedModelNode
+from dbt.exceptions import InternalException
+from dbt.node_types import NodeType
+from dbt.parser.partial import PartialParsing
+from dbt.parser.partial_parse_file import (
+    LazyEntries,
+    LazySourceFiles,
+    SECTIONS,
+    _locked,
+    read_partial_parse_file,
+    segment_path,
+    write_partial_parse_file,
+)
+
+
+class TestPartialParseFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'target', 'partial_parse.msgpack')
+        project_root = '/users/root'
+        self.model_file = SourceFile(
+            path=FilePath(project_root=project_root, searched_path='models', relative_path='my_model.sql', modification_time=time.time()),
+            checksum=FileHash.from_contents('abcdef'),
+            project_name='my_test',
+            parse_file_type=ParseFileType.Model,
+            nodes=['model.my_test.my_model'],
+        )
+        self.schema_file = SchemaSourceFile(
+            path=FilePath(project_root=project_root, searched_path='models', relative_path='schema.yml', modification_time=time.time()),
+            checksum=FileHash.from_contents('ghijkl'),
+            project_name='my_test',
+            parse_file_type=ParseFileType.Schema,
+            dfy={'version': 2, 'models': [{'name': 'my_model', 'description': 'Test model'}]},
+            ndp=['model.my_test.my_model'],
+        )
+        files = {
+            self.model_file.file_id: self.model_file,
+            self.schema_file.file_id: self.schema_file,
+        }
+        nodes = {
+            name: self.get_model(name)
+            for name in ('my_model', 'other_model')
+        }
+        nodes = {node.unique_id: node for node in nodes.values()}
+        self.manifest = Manifest(
+            files=files,
+            nodes=nodes,
+            disabled={'model.my_test.disabled': [self.get_model('disabled')]},
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def get_model(self, name):
+        return ParsedModelNode(
+            package_name='my_test',
+            root_path='/users/root/',
+            path=f'{name}.sql',
+            original_file_path=f'models/{name}.sql',
+            raw_sql='select * from wherever',
+            name=name,
+            resource_type=NodeType.Model,
+            unique_id=f'model.my_test.{name}',
+            fqn=['my_test', 'models', name],
+            database='test_db',
+            schema='test_schema',
+            alias='bar',
+            checksum=FileHash.from_contents(''),
+        )
+
+    def test_round_trip(self):
+        self.manifest.env_vars['MY_VAR'] = 'value'
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        self.assertIsInstance(manifest.nodes, LazyEntries)
+        self.assertIsInstance(manifest.files, LazySourceFiles)
+        self.assertEqual(manifest.nodes, self.manifest.nodes)
+        self.assertEqual(manifest.files, self.manifest.files)
+        self.assertEqual(manifest.disabled, self.manifest.disabled)
+        self.assertEqual(manifest.env_vars, self.manifest.env_vars)
+        self.assertEqual(manifest.metadata.invocation_id, self.manifest.metadata.invocation_id)
+        self.assertEqual(manifest.state_check.to_dict(), self.manifest.state_check.to_dict())
+        self.assertIsInstance(manifest.files[self.schema_file.file_id], SchemaSourceFile)
+
+    def test_entries_are_decoded_on_access(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        self.assertEqual(len(manifest.nodes), 2)
+        self.assertIn('model.my_test.my_model', manifest.nodes)
+        self.assertFalse(manifest.nodes.is_decoded('model.my_test.my_model'))
+
+        node = manifest.nodes['model.my_test.my_model']
+        self.assertTrue(manifest.nodes.is_decoded('model.my_test.my_model'))
+        self.assertFalse(manifest.nodes.is_decoded('model.my_test.other_model'))
+        self.assertIs(manifest.nodes['model.my_test.my_model'], node)
+
+    def test_checksums_are_read_from_the_summary(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        file_id = self.model_file.file_id
+        self.assertEqual(manifest.files.get_checksum(file_id), self.model_file.checksum)
+        self.assertEqual(manifest.files.get_parse_file_type(file_id), ParseFileType.Model)
+        self.assertFalse(manifest.files.is_decoded(file_id))
+
+        # nothing changed, so partial parsing doesn't decode any files
+        new_files = {
+            self.model_file.file_id: SourceFile.from_dict(self.model_file.to_dict()),
+            self.schema_file.file_id: SchemaSourceFile.from_dict(self.schema_file.to_dict()),
+        }
+        partial_parsing = PartialParsing(manifest, new_files)
+        self.assertTrue(partial_parsing.skip_parsing())
+        self.assertFalse(any(manifest.files.is_decoded(key) for key in manifest.files))
+
+    def test_rewrite_keeps_changes(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        manifest.nodes['model.my_test.my_model'].raw_sql = 'select 2'
+        del manifest.nodes['model.my_test.other_model']
+        new_node = self.get_model('new_model')
+        manifest.nodes[new_node.unique_id] = new_node
+        manifest.files[self.model_file.file_id].checksum = FileHash.from_contents('changed')
+
+        # the file being rewritten is still mapped by 'manifest'
+        write_partial_parse_file(manifest, self.path)
+        rewritten = read_partial_parse_file(self.path)
+        self.assertEqual(
+            list(rewritten.nodes), ['model.my_test.my_model', 'model.my_test.new_model']
+        )
+        self.assertEqual(rewritten.nodes['model.my_test.my_model'].raw_sql, 'select 2')
+        self.assertEqual(rewritten.nodes['model.my_test.new_model'], new_node)
+        self.assertEqual(
+            rewritten.files.get_checksum(self.model_file.file_id), FileHash.from_contents('changed')
+        )
+        self.assertEqual(rewritten.files[self.schema_file.file_id], self.schema_file)
+
+    def segments(self):
+        return sorted(name for name in os.listdir(os.path.dirname(self.path)) if name.endswith('.segment'))
+
+    def test_rewrite_only_writes_changed_entries(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        # decoded but unchanged entries are not written again
+        list(manifest.nodes.values())
+        list(manifest.files.values())
+        manifest.nodes['model.my_test.my_model'].raw_sql = 'select 2'
+
+        write_partial_parse_file(manifest, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.0.segment', 'partial_parse.1.segment'])
+        with open(segment_path(self.path, 1), 'rb') as fp:
+            new_segment = fp.read()
+        node = manifest.nodes['model.my_test.my_model']
+        self.assertEqual(new_segment, SECTIONS['nodes'](value=node).to_msgpack())
+        rewritten = read_partial_parse_file(self.path)
+        self.assertEqual(rewritten.nodes, manifest.nodes)
+        self.assertEqual(rewritten.files, self.manifest.files)
+
+    def test_segments_are_compacted(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        # most of the first segment is no longer referenced
+        for node in manifest.nodes.values():
+            node.raw_sql = 'select 2'
+        for source_file in manifest.files.values():
+            source_file.checksum = FileHash.from_contents('changed')
+        manifest.disabled.clear()
+
+        write_partial_parse_file(manifest, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.1.segment'])
+        rewritten = read_partial_parse_file(self.path)
+        self.assertEqual(rewritten.nodes, manifest.nodes)
+        self.assertEqual(rewritten.files, manifest.files)
+
+    def test_rewrite_after_compaction(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        manifest.nodes['model.my_test.my_model'].raw_sql = 'select 2'
+        with mock.patch('dbt.parser.partial_parse_file.MAX_SEGMENTS', 1):
+            write_partial_parse_file(manifest, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.1.segment'])
+
+        # the same manifest, written again, references the compacted segment
+        manifest.nodes['model.my_test.my_model'].raw_sql = 'select 3'
+        write_partial_parse_file(manifest, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.1.segment', 'partial_parse.2.segment'])
+        rewritten = read_partial_parse_file(self.path)
+        self.assertEqual(rewritten.nodes, manifest.nodes)
+        self.assertEqual(rewritten.files, self.manifest.files)
+        self.assertEqual(rewritten.disabled, self.manifest.disabled)
+
+    def test_interrupted_write_keeps_previous_version(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        manifest.nodes['model.my_test.my_model'].raw_sql = 'select 2'
+        with mock.patch('os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                write_partial_parse_file(manifest, self.path)
+
+        previous = read_partial_parse_file(self.path)
+        self.assertEqual(previous.nodes['model.my_test.my_model'].raw_sql, 'select * from wherever')
+        self.assertEqual(
+            self.segments(), ['partial_parse.0.segment', 'partial_parse.1.segment']
+        )
+
+        # the next write removes the unreferenced segment
+        write_partial_parse_file(previous, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.0.segment'])
+
+    def test_interleaved_writers(self):
+        # the daemon and the CLI both read the same version
+        write_partial_parse_file(self.manifest, self.path)
+        daemon_manifest = read_partial_parse_file(self.path)
+        cli_manifest = read_partial_parse_file(self.path)
+
+        # the CLI compacts the segments, which removes the one the daemon read
+        cli_manifest.nodes['model.my_test.my_model'].raw_sql = 'select 2'
+        with mock.patch('dbt.parser.partial_parse_file.MAX_SEGMENTS', 1):
+            write_partial_parse_file(cli_manifest, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.1.segment'])
+
+        # so the daemon writes all of its entries, instead of referencing it
+        daemon_manifest.nodes['model.my_test.other_model'].raw_sql = 'select 3'
+        write_partial_parse_file(daemon_manifest, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.2.segment'])
+        rewritten = read_partial_parse_file(self.path)
+        self.assertEqual(rewritten.nodes, daemon_manifest.nodes)
+        self.assertEqual(rewritten.files, self.manifest.files)
+        self.assertEqual(rewritten.disabled, self.manifest.disabled)
+
+        # and the CLI, in turn, doesn't reference the segment it wrote
+        write_partial_parse_file(cli_manifest, self.path)
+        self.assertEqual(self.segments(), ['partial_parse.3.segment'])
+        self.assertEqual(read_partial_parse_file(self.path).nodes, cli_manifest.nodes)
+
+    def test_write_waits_for_lock(self):
+        write_partial_parse_file(self.manifest, self.path)
+        manifest = read_partial_parse_file(self.path)
+        manifest.nodes['model.my_test.my_model'].raw_sql = 'select 2'
+
+        with _locked(self.path):
+            writer = threading.Thread(target=write_partial_parse_file, args=(manifest, self.path))
+            writer.start()
+            writer.join(0.2)
+            self.assertTrue(writer.is_alive())
+            self.assertEqual(self.segments(), ['partial_parse.0.segment'])
+        writer.join()
+        self.assertEqual(read_partial_parse_file(self.path).nodes, manifest.nodes)
+
+    def test_old_format_is_rejected(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'wb') as fp:
+            fp.write(self.manifest.to_msgpack())
+        with self.assertRaises(InternalException):
+            read_partial_parse_file(self.path)
@@ -1,5 +1,7 @@
 import agate
+import datetime
 import decimal
+import pytz
 import unittest
 from unittest import mock
 
@@ -12,7 +14,7 @@ from dbt.adapters.postgres import Plugin as PostgresPlugin
 from dbt.contracts.files import FileHash
 from dbt.contracts.graph.manifest import ManifestStateCheck
 from dbt.clients import agate_helper
-from dbt.exceptions import ValidationException, DbtConfigError
+from dbt.exceptions import CompilationException, DatabaseException, ValidationException, DbtConfigError
 from psycopg2 import extensions as psycopg2_extensions
 from psycopg2 import DatabaseError
 
@@ -299,6 +301,44 @@ class TestPostgresAdapter(unittest.TestCase):
             connect_timeout=10,
             application_name='dbt')
 
+    def test_supports_seed_streaming(self):
+        self.assertTrue(PostgresAdapter.supports_seed_streaming())
+
+        class DerivedAdapter(PostgresAdapter):
+            @classmethod
+            def type(cls):
+                return 'derived'
+
+        self.assertFalse(DerivedAdapter.supports_seed_streaming())
+
+    @mock.patch('dbt.adapters.postgres.connections.psycopg2')
+    def test_load_seed_rows(self, psycopg2):
+        seed_file = mock.MagicMock()
+        seed_file.batches.return_value = iter([
+            [(1, 'a "quoted", value', True), (2, '', None)],
+            [(decimal.Decimal('3.5'), None, False)],
+        ])
+        copied = []
+
+        def copy_expert(sql, file):
+            copied.append((sql, ''.join(iter(lambda: file.read(7), ''))))
+
+        connection = self.adapter.acquire_connection('dummy')
+        connection.handle.cursor.return_value.copy_expert.side_effect = copy_expert
+        relation = self.adapter.Relation.create(
+            database='postgres', schema='public', identifier='seed'
+        )
+
+        rows = self.adapter.load_seed_rows(relation, 'id, name, flag', seed_file)
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(copied, [(
+            'copy "postgres"."public"."seed" (id, name, flag) from stdin with (format csv)',
+            '1,"a ""quoted"", value",true\n2,"",\n3.5,,false\n',
+        )])
+        # the copy runs in a transaction, like any other query
+        self.assertTrue(connection.transaction_open)
+
     @mock.patch.object(PostgresAdapter, 'execute_macro')
     @mock.patch.object(PostgresAdapter, '_get_catalog_schemas')
     def test_get_catalog_various_schemas(self, mock_get_schemas, mock_execute):
@@ -326,6 +366,76 @@ class TestPostgresAdapter(unittest.TestCase):
         )
         self.assertEqual(exceptions, [])
 
+    @mock.patch.object(PostgresAdapter, 'execute_macro')
+    @mock.patch.object(PostgresAdapter, '_get_catalog_schemas')
+    def test_iter_catalogs(self, mock_get_schemas, mock_execute):
+        column_names = ['table_database', 'table_schema', 'table_name']
+
+        def get_catalog(macro_name, kwargs, manifest):
+            schema, = kwargs['schemas']
+            if schema == 'broken':
+                raise DatabaseException("broken")
+            rows = [('dbt', schema, 'bar'), ('dbt', 'skip', 'bar')]
+            return agate.Table(rows=rows, column_names=column_names)
+
+        mock_execute.side_effect = get_catalog
+        information_schema = mock.MagicMock(database='DBT')
+        mock_get_schemas.return_value.search.return_value = [
+            (information_schema, 'foo'),
+            (information_schema, 'quux'),
+            (information_schema, 'broken'),
+        ]
+
+        mock_manifest = mock.MagicMock()
+        mock_manifest.get_used_schemas.return_value = {('dbt', 'foo'), ('dbt', 'quux')}
+
+        exceptions = []
+        with mock.patch('dbt.adapters.base.impl.warn_or_error'):
+            catalogs = list(self.adapter.iter_catalogs(
+                mock_manifest, exceptions, exclude={('dbt', 'quux')}
+            ))
+        # one query per schema, and none for the excluded one
+        self.assertEqual(len(catalogs), 1)
+        info, schema, table = catalogs[0]
+        self.assertIs(info, information_schema)
+        self.assertEqual(schema, 'foo')
+        self.assertEqual([tuple(row) for row in table], [('dbt', 'foo', 'bar')])
+        self.assertEqual([str(exc) for exc in exceptions], ['Database Error\n  broken'])
+
+
+    @mock.patch.object(PostgresAdapter, 'execute_macro')
+    def test_calculate_freshness_batch(self, mock_execute):
+        snapshotted_at = datetime.datetime(2022, 1, 2, tzinfo=pytz.UTC)
+        loaded_at = datetime.datetime(2022, 1, 1, 23)
+        mock_execute.return_value = agate.Table(
+            rows=[(snapshotted_at, loaded_at, None)],
+            column_names=['snapshotted_at', 'max_loaded_at_0', 'max_loaded_at_1'],
+        )
+        sources = [
+            (mock.MagicMock(), 'loaded_at', None),
+            (mock.MagicMock(), 'loaded_at', 'id > 0'),
+        ]
+
+        freshness = self.adapter.calculate_freshness_batch(sources)
+
+        kwargs = mock_execute.call_args[1]['kwargs']
+        self.assertEqual(kwargs['sources'][1]['filter'], 'id > 0')
+        self.assertEqual(freshness[0]['age'], 3600)
+        self.assertEqual(freshness[0]['max_loaded_at'], loaded_at.replace(tzinfo=pytz.UTC))
+        # an empty table was loaded infinitely long ago
+        self.assertEqual(freshness[1]['max_loaded_at'].year, 1)
+        self.assertEqual(freshness[1]['snapshotted_at'], snapshotted_at)
+
+    @mock.patch.object(PostgresAdapter, 'execute_macro')
+    def test_calculate_freshness_batch_invalid_result(self, mock_execute):
+        mock_execute.return_value = agate.Table(
+            rows=[(datetime.datetime(2022, 1, 2), None)],
+            column_names=['snapshotted_at', 'max_loaded_at_0'],
+        )
+        sources = [(mock.MagicMock(), 'loaded_at', None)] * 2
+        with self.assertRaises(CompilationException):
+            self.adapter.calculate_freshness_batch(sources)
+
 
 class TestConnectingPostgresAdapter(unittest.TestCase):
     def setUp(self):
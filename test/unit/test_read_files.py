@@ -0,0 +1,86 @@
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+from dbt.contracts.files import FileHash, FilePath, ParseFileType
+from dbt.parser.read_files import (
+    FileHashCache,
+    load_source_file,
+    load_deferred_contents,
+)
+
+
+class TestFileHashCache(unittest.TestCase):
+    def setUp(self):
+        self.project_root = mkdtemp()
+        os.makedirs(os.path.join(self.project_root, 'models'))
+        self.path = FilePath(
+            searched_path='models',
+            relative_path='my_model.sql',
+            modification_time=0.0,
+            project_root=self.project_root,
+        )
+        self.write_model('select 1 as id')
+        self.cache_path = os.path.join(self.project_root, 'target', 'file_hash_cache.msgpack')
+
+    def tearDown(self):
+        shutil.rmtree(self.project_root)
+
+    def write_model(self, contents, mtime=1_000_000_000):
+        with open(self.path.absolute_path, 'w') as fp:
+            fp.write(contents)
+        # by default, an mtime in the past so the file is not considered "racy"
+        if mtime is not None:
+            os.utime(self.path.absolute_path, (mtime, mtime))
+
+    def load(self, saved_files, hash_cache):
+        return load_source_file(
+            self.path, ParseFileType.Model, 'test', saved_files, hash_cache
+        )
+
+    def test_unchanged_file_is_not_read(self):
+        hash_cache = FileHashCache.read(self.cache_path)
+        saved = self.load({}, hash_cache)
+        self.assertEqual(saved.checksum, FileHash.from_contents('select 1 as id'))
+        self.assertTrue(hash_cache.dirty)
+        hash_cache.write(self.cache_path)
+
+        hash_cache = FileHashCache.read(self.cache_path)
+        self.assertFalse(hash_cache.dirty)
+        source_file = self.load({saved.file_id: saved}, hash_cache)
+        self.assertEqual(source_file.checksum, saved.checksum)
+        self.assertIsNone(source_file.contents)
+
+        load_deferred_contents(
+            {source_file.file_id: source_file},
+            {'test': {'ModelParser': [source_file.file_id]}},
+        )
+        self.assertEqual(source_file.contents, 'select 1 as id')
+
+    def test_changed_file_is_read(self):
+        hash_cache = FileHashCache.read(self.cache_path)
+        saved = self.load({}, hash_cache)
+        hash_cache.write(self.cache_path)
+
+        self.write_model('select 2 as id', mtime=1_000_000_001)
+        hash_cache = FileHashCache.read(self.cache_path)
+        source_file = self.load({saved.file_id: saved}, hash_cache)
+        self.assertEqual(source_file.checksum, FileHash.from_contents('select 2 as id'))
+        self.assertEqual(source_file.contents, 'select 2 as id')
+
+    def test_full_rehash(self):
+        hash_cache = FileHashCache.read(self.cache_path)
+        saved = self.load({}, hash_cache)
+        hash_cache.write(self.cache_path)
+
+        hash_cache = FileHashCache.read(self.cache_path, full_rehash=True)
+        source_file = self.load({saved.file_id: saved}, hash_cache)
+        self.assertEqual(source_file.contents, 'select 1 as id')
+        self.assertTrue(hash_cache.dirty)
+
+    def test_recently_modified_file_is_not_cached(self):
+        self.write_model('select 1 as id', mtime=None)
+        hash_cache = FileHashCache.read(self.cache_path)
+        self.load({}, hash_cache)
+        self.assertEqual(hash_cache.entries, {})
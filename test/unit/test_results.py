@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from dbt.contracts.results import (
+    RunExecutionResult,
+    RunResult,
+    RunResultsSidecar,
+    RunStatus,
+    TimingInfo,
+)
+from dbt.contracts.state import PreviousState
+from dbt.exceptions import IncompatibleSchemaException
+
+
+def make_result(name, status=RunStatus.Success):
+    return RunResult(
+        node=SimpleNamespace(unique_id=f'model.test.{name}'),
+        status=status,
+        timing=[TimingInfo(name='execute', started_at=datetime(2022, 1, 1))],
+        thread_id='Thread-1',
+        execution_time=1.5,
+        adapter_response={'rows_affected': 1},
+        message='OK',
+        failures=None,
+    )
+
+
+class TestRunResultsSidecar(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.target = self.tmpdir.name
+        self.sidecar_path = os.path.join(self.target, 'run_results.jsonl')
+        self.results_path = os.path.join(self.target, 'run_results.json')
+        self.args = {'which': 'run'}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def stream(self, results):
+        sidecar = RunResultsSidecar(self.sidecar_path, self.args)
+        for result in results:
+            sidecar.append(result)
+        sidecar.close()
+        return sidecar
+
+    def test_write_artifact(self):
+        results = [make_result('a'), make_result('b', RunStatus.Error)]
+        sidecar = self.stream(results)
+        execution_result = RunExecutionResult(
+            results=results,
+            elapsed_time=3.0,
+            generated_at=datetime(2022, 1, 1, 12),
+            args=self.args,
+        )
+        self.assertTrue(sidecar.write_artifact(execution_result, self.results_path))
+        self.assertFalse(os.path.exists(self.sidecar_path))
+        with open(self.results_path) as fp:
+            streamed = fp.read()
+
+        expected_path = os.path.join(self.target, 'expected.json')
+        execution_result.write(expected_path)
+        with open(expected_path) as fp:
+            self.assertEqual(streamed, fp.read())
+
+    def test_write_artifact_missing_results(self):
+        results = [make_result('a'), make_result('b')]
+        sidecar = self.stream(results[:1])
+        execution_result = RunExecutionResult(results=results, elapsed_time=3.0)
+        self.assertFalse(sidecar.write_artifact(execution_result, self.results_path))
+        self.assertFalse(os.path.exists(self.results_path))
+        self.assertFalse(os.path.exists(self.sidecar_path))
+
+    def test_read_unfinished(self):
+        self.stream([make_result('a'), make_result('b', RunStatus.Error)])
+        # killed partway through writing a third result
+        with open(self.sidecar_path, 'a') as fp:
+            fp.write('{"unique_id": "model.test.c", "sta')
+
+        artifact = RunResultsSidecar.read(self.sidecar_path)
+        self.assertEqual(
+            [(r.unique_id, r.status) for r in artifact.results],
+            [('model.test.a', RunStatus.Success), ('model.test.b', RunStatus.Error)],
+        )
+        self.assertEqual(artifact.args, self.args)
+
+    def test_read_other_schema_version(self):
+        with open(self.sidecar_path, 'w') as fp:
+            fp.write('{"metadata": {"dbt_schema_version": "old"}, "args": {}}\n')
+        with self.assertRaises(IncompatibleSchemaException):
+            RunResultsSidecar.read(self.sidecar_path)
+
+    def test_previous_state_reads_newer_sidecar(self):
+        execution_result = RunExecutionResult(results=[make_result('a')], elapsed_time=1.0)
+        execution_result.write(self.results_path)
+        os.utime(self.results_path, (0, 0))
+        self.stream([make_result('b', RunStatus.Error)])
+
+        state = PreviousState(Path(self.target))
+        self.assertEqual([r.unique_id for r in state.results], ['model.test.b'])
+
+        # a finished run since then supersedes it
+        os.utime(self.sidecar_path, (0, 0))
+        os.utime(self.results_path, None)
+        state = PreviousState(Path(self.target))
+        self.assertEqual([r.unique_id for r in state.results], ['model.test.a'])
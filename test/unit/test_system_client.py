@@ -183,6 +183,34 @@ class TestFindMatching(unittest.TestCase):
             out = dbt.clients.system.find_matching(self.tempdir, [''], '*.sql')
             self.assertEqual(out, [])
 
+    def test_find_matching_multi_same_as_find_matching(self):
+        for relative_path in [
+            'models/a.sql', 'models/b.yml', 'models/sub/c.SQL', 'models/sub/d.md',
+            'tests/e.sql', 'tests/generic/f.sql', 'tests/generic/deeper/g.yaml',
+        ]:
+            path = os.path.join(self.base_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            Path(path).touch()
+        searches = {
+            'sql': (['models', 'tests', 'missing'], ['*.sql']),
+            'generic': (['tests/generic'], ['*.sql']),
+            'schema': (['models', 'tests'], ['*.yml', '*.yaml']),
+            'docs': (['models/'], ['*.md']),
+        }
+        out = dbt.clients.system.find_matching_multi(self.base_dir, searches)
+        for key, (relative_paths, patterns) in searches.items():
+            expected = []
+            for pattern in patterns:
+                expected.extend(
+                    dbt.clients.system.find_matching(self.base_dir, relative_paths, pattern)
+                )
+            self.assertEqual(
+                [(r['searched_path'], r['relative_path']) for r in out[key]],
+                [(r['searched_path'], r['relative_path']) for r in expected],
+            )
+        self.assertEqual(len(out['generic']), 1)
+        self.assertEqual(len(out['schema']), 2)
+
     def tearDown(self):
         try:
             shutil.rmtree(self.base_dir)
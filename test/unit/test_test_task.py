@@ -0,0 +1,196 @@
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import agate
+
+import dbt.compilation
+from dbt.adapters.postgres import Plugin
+from dbt.contracts.files import FileHash
+from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.model_config import TestConfig
+from dbt.contracts.graph.parsed import (
+    DependsOn,
+    ParsedGenericTestNode,
+    ParsedSingularTestNode,
+    TestMetadata,
+)
+from dbt.contracts.results import TestStatus
+from dbt.node_types import NodeType
+from dbt.task.test import TestResultData, TestRunner, TestTask
+
+from .utils import batched_task, clear_plugin
+
+
+def make_test(name, parents, generic=True, **config):
+    kwargs = dict(
+        name=name,
+        database='dbt',
+        schema='dbt_test__audit',
+        alias=name,
+        resource_type=NodeType.Test,
+        unique_id=f'test.test.{name}',
+        fqn=['test', name],
+        package_name='test',
+        root_path='/usr/src/app',
+        path=f'{name}.sql',
+        original_file_path=f'tests/{name}.sql',
+        raw_sql='select 1',
+        checksum=FileHash.from_contents(name),
+        config=TestConfig(**config),
+        depends_on=DependsOn(nodes=parents),
+    )
+    if not generic:
+        return ParsedSingularTestNode(**kwargs)
+    return ParsedGenericTestNode(
+        test_metadata=TestMetadata(name='not_null', kwargs={'column_name': 'id'}),
+        column_name='id',
+        **kwargs
+    )
+
+
+def make_task(tests, batch_size=None, **kwargs):
+    manifest = SimpleNamespace(nodes={test.unique_id: test for test in tests})
+    return batched_task(TestTask, manifest, batch_size, **kwargs)
+
+
+def compile_node(node, manifest, extra_context):
+    node.compiled_sql = f'select * from {node.depends_on.nodes[0]} where id is null'
+    return node
+
+
+def execute(sql, auto_begin, fetch):
+    # one row per test in the batch, in reverse order
+    num_tests = sql.count('select')
+    rows = [(index, index, index > 0, False) for index in reversed(range(num_tests))]
+    number, boolean = agate.Number(), agate.Boolean()
+    return None, agate.Table(
+        rows,
+        ['TEST_INDEX', 'FAILURES', 'SHOULD_WARN', 'SHOULD_ERROR'],
+        [number, number, boolean, boolean],
+    )
+
+
+def make_adapter():
+    adapter = mock.MagicMock()
+    adapter.get_compiler.return_value.compile_node.side_effect = compile_node
+
+    def execute_macro(name, kwargs, manifest):
+        return ' union all '.join(test['main_sql'] for test in kwargs['tests'])
+
+    adapter.execute_macro.side_effect = execute_macro
+    adapter.execute.side_effect = execute
+    return adapter
+
+
+class TestTestBatches(unittest.TestCase):
+    def setUp(self):
+        self.tests = [
+            make_test('a', ['model.test.orders']),
+            make_test('b', ['model.test.orders']),
+            make_test('c', ['model.test.orders']),
+            make_test('d', ['model.test.customers']),
+            make_test('e', ['model.test.orders'], generic=False),
+            make_test('f', ['model.test.orders'], store_failures=True),
+            make_test('g', ['model.test.orders'], materialized='custom_test'),
+        ]
+        self.addCleanup(clear_plugin, Plugin)
+
+    def test_batches_by_parents(self):
+        task = make_task(self.tests, batch_size=2)
+        batches = task.get_test_batches({t.unique_id for t in self.tests})
+        self.assertEqual(
+            sorted([test.name for test in batch] for batch in batches),
+            [['a', 'b'], ['c'], ['d']],
+        )
+
+    @mock.patch('dbt.flags.STORE_FAILURES', True)
+    def test_store_failures_flag(self):
+        task = make_task(self.tests)
+        tests = [make_test('h', ['model.test.orders'], store_failures=False)]
+        batches = task.get_test_batches({t.unique_id for t in self.tests})
+        self.assertEqual(batches, [])
+        task = make_task(tests)
+        batches = task.get_test_batches({t.unique_id for t in tests})
+        self.assertEqual([[test.name for test in batch] for batch in batches], [['h']])
+
+    def test_run_batched_tests(self):
+        task = make_task(self.tests)
+        adapter = make_adapter()
+        results = task.run_batched_tests(adapter, {t.unique_id for t in self.tests})
+        self.assertEqual(adapter.execute.call_count, 2)
+        self.assertEqual(
+            results,
+            {
+                'test.test.a': TestResultData(failures=0, should_warn=False, should_error=False),
+                'test.test.b': TestResultData(failures=1, should_warn=True, should_error=False),
+                'test.test.c': TestResultData(failures=2, should_warn=True, should_error=False),
+                'test.test.d': TestResultData(failures=0, should_warn=False, should_error=False),
+            },
+        )
+
+    def test_failed_batch_is_left_out(self):
+        task = make_task(self.tests, batch_size=2)
+        adapter = make_adapter()
+
+        def fail_on_orders(sql, auto_begin, fetch):
+            if 'orders' in sql:
+                raise RuntimeError('relation "orders" does not exist')
+            return execute(sql, auto_begin, fetch)
+
+        adapter.execute.side_effect = fail_on_orders
+        results = task.run_batched_tests(adapter, {t.unique_id for t in self.tests})
+        self.assertEqual(list(results), ['test.test.d'])
+        self.assertEqual(adapter.execute.call_count, 3)
+
+
+class TestFailedBatchFallback(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(clear_plugin, Plugin)
+
+        context_patch = mock.patch.object(
+            dbt.compilation, 'generate_runtime_model_context', return_value={}
+        )
+        context_patch.start()
+        self.addCleanup(context_patch.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_tests_run_one_at_a_time(self):
+        tests = [make_test('a', ['model.test.orders']), make_test('b', ['model.test.orders'])]
+        task = make_task(tests, project_root=self.tmpdir.name)
+        task.manifest = Manifest(nodes={test.unique_id: test for test in tests})
+        task.config.target_path = self.tmpdir.name
+        adapter = mock.MagicMock()
+        adapter.get_compiler.return_value = dbt.compilation.Compiler(task.config)
+        adapter.execute.side_effect = RuntimeError('relation "orders" does not exist')
+
+        results = task.run_batched_tests(adapter, {test.unique_id for test in tests})
+        self.assertEqual(results, {})
+
+        for test in tests:
+            # the batch left the compiled test in the manifest
+            node = task.manifest.nodes[test.unique_id]
+            self.assertTrue(node.compiled)
+            runner = TestRunner(task.config, adapter, node, 1, 1)
+            runner.batched_result = task._batched_results.get(test.unique_id)
+            self.assertIs(runner.compile(task.manifest), node)
+
+
+class TestTestRunner(unittest.TestCase):
+    @mock.patch('dbt.flags.WARN_ERROR', False)
+    def test_uses_batched_result(self):
+        test = make_test('a', ['model.test.orders'], severity='warn')
+        runner = TestRunner(mock.MagicMock(), mock.MagicMock(), test, 1, 1)
+        runner.batched_result = TestResultData(failures=3, should_warn=True, should_error=True)
+
+        with mock.patch.object(runner, 'execute_test') as execute_test:
+            result = runner.execute(test, mock.MagicMock())
+
+        execute_test.assert_not_called()
+        self.assertEqual(result.status, TestStatus.Warn)
+        self.assertEqual(result.failures, 3)
+        self.assertEqual(result.message, 'Got 3 results, configured to warn if != 0')
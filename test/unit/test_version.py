@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -209,21 +211,22 @@ class VersionTest(unittest.TestCase):
 
         mock_find_spec.assert_called_once_with('dbt.adapters')
 
-    @patch('dbt.version._get_adapter_plugin_names', autospec=True)
-    @patch('importlib.import_module', autospec=True)
-    def test_get_dbt_plugins_info_with_version_info(
-            self, mock_mod, mock_get_plugin_names
-    ):
-        mock_get_plugin_names.return_value = ['postgres', 'snowflake']
-        mod_version = unittest.mock.Mock()
-        mock_mod.return_value = mod_version
-        mod_version.version = '1.0'
-        self.assertEqual(
-            list(dbt.version._get_dbt_plugins_info()),
-            [('postgres', '1.0'), ('snowflake', '1.0')]
-        )
-        mock_get_plugin_names.assert_called_once_with()
-        mock_mod.assert_has_calls([
-            unittest.mock.call('dbt.adapters.postgres.__version__'),
-            unittest.mock.call('dbt.adapters.snowflake.__version__')
-        ])
+    @patch('importlib.util.find_spec', autospec=True)
+    def test_get_dbt_plugins_info_with_version_info(self, mock_find_spec):
+        with tempfile.TemporaryDirectory() as adapters_path:
+            for plugin_name in ('postgres', 'snowflake'):
+                plugin_path = os.path.join(adapters_path, plugin_name)
+                os.mkdir(plugin_path)
+                # the version is read without importing the adapter itself
+                with open(os.path.join(plugin_path, '__init__.py'), 'w') as fp:
+                    fp.write('raise AssertionError("imported the adapter")\n')
+                with open(os.path.join(plugin_path, '__version__.py'), 'w') as fp:
+                    fp.write('version = "1.0"\n')
+            mock_submodule = unittest.mock.MagicMock()
+            mock_find_spec.return_value = mock_submodule
+            mock_submodule.submodule_search_locations = [adapters_path]
+
+            self.assertEqual(
+                sorted(dbt.version._get_dbt_plugins_info()),
+                [('postgres', '1.0'), ('snowflake', '1.0')]
+            )
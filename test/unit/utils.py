@@ -143,6 +143,43 @@ def clear_plugin(plugin):
     FACTORY.adapters.pop(key, None)
 
 
+def batched_task(task_cls, manifest, batch_size=None, project_root='/tmp/dbt/does-not-exist'):
+    """Create a task as `dbt <command> --batched` would, for a postgres
+    project, that works on the given manifest and runs its batches in order
+    on the calling thread. Call clear_plugin(Plugin) when you're done with it.
+    """
+    project = {
+        'name': 'test',
+        'version': '0.1',
+        'profile': 'test',
+        'project-root': project_root,
+        'config-version': 2,
+    }
+    profile = {
+        'outputs': {
+            'test': {
+                'type': 'postgres',
+                'dbname': 'postgres',
+                'user': 'root',
+                'host': 'thishostshouldnotexist',
+                'pass': 'password',
+                'port': 5432,
+                'schema': 'public',
+            }
+        },
+        'target': 'test',
+    }
+    config = config_from_parts_or_dicts(project, profile)
+    config.args.single_threaded = True
+    args = Obj()
+    args.batched = True
+    args.batch_size = batch_size
+    args.state = None
+    task = task_cls(args, config)
+    task.manifest = manifest
+    return task
+
+
 class ContractTestCase(TestCase):
     ContractType = None
 